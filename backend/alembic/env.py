@@ -33,6 +33,13 @@ from src.app import models  # noqa: F401, E402
 target_metadata = Base.metadata
 
 
+def include_object(obj, name, type_, reflected, compare_to):
+    # FTS5-Indizes (virtuelle Tabellen, ihre Schattentabellen *_fts_data usw.
+    # und Trigger) legen die Migrationen per SQL an – sie stehen nicht in den
+    # Modellen, autogenerate würde sie sonst wieder löschen wollen
+    return not (name and "_fts" in name)
+
+
 def run_migrations_offline() -> None:
     context.configure(
         url=db_url,
@@ -40,6 +47,7 @@ def run_migrations_offline() -> None:
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
         compare_type=True,
+        include_object=include_object,
     )
     with context.begin_transaction():
         context.run_migrations()
@@ -54,6 +62,7 @@ def run_migrations_online() -> None:
             connection=connection,
             target_metadata=target_metadata,
             compare_type=True,
+            include_object=include_object,
         )
         with context.begin_transaction():
             context.run_migrations()
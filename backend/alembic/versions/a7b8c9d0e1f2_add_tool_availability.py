@@ -0,0 +1,48 @@
+"""add tool_availability counters
+
+Revision ID: a7b8c9d0e1f2
+Revises: f6a7b8c9d0e1
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7b8c9d0e1f2'
+down_revision: Union[str, Sequence[str], None] = 'f6a7b8c9d0e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_COUNTERS = ('total', 'available', 'loaned', 'defect', 'maintenance', 'retired')
+
+
+def upgrade() -> None:
+    op.create_table(
+        'tool_availability',
+        sa.Column('tool_id', sa.Integer(), nullable=False),
+        *(sa.Column(name, sa.Integer(), server_default='0', nullable=False) for name in _COUNTERS),
+        sa.ForeignKeyConstraint(['tool_id'], ['tools.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('tool_id'),
+    )
+    # Zähler aus dem aktuellen Bestand befüllen
+    op.execute(sa.text(
+        "INSERT INTO tool_availability (tool_id, total, available, loaned, defect, maintenance, retired) "
+        "SELECT t.id, COUNT(i.id), "
+        "COALESCE(SUM(CASE WHEN s.name = 'AVAILABLE' THEN 1 ELSE 0 END), 0), "
+        "COALESCE(SUM(CASE WHEN s.name = 'LOANED' THEN 1 ELSE 0 END), 0), "
+        "COALESCE(SUM(CASE WHEN s.name = 'DEFECT' THEN 1 ELSE 0 END), 0), "
+        "COALESCE(SUM(CASE WHEN s.name = 'MAINTENANCE' THEN 1 ELSE 0 END), 0), "
+        "COALESCE(SUM(CASE WHEN s.name = 'RETIRED' THEN 1 ELSE 0 END), 0) "
+        "FROM tools t "
+        "LEFT JOIN tool_items i ON i.tool_id = t.id "
+        "LEFT JOIN tool_status s ON s.id = i.status_id "
+        "GROUP BY t.id"
+    ))
+
+
+def downgrade() -> None:
+    op.drop_table('tool_availability')
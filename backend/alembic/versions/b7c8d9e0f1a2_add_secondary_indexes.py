@@ -0,0 +1,58 @@
+"""add secondary indexes on hot foreign keys and filter columns
+
+Revision ID: b7c8d9e0f1a2
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c8d9e0f1a2'
+down_revision: Union[str, Sequence[str], None] = 'a1b2c3d4e5f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_ACTIVE_LOANS = sa.text('returned_at IS NULL')
+
+
+def upgrade() -> None:
+    # Aktive Ausleihen pro Exemplar (Verfügbarkeitsprüfung, Ausmusterung, Issues)
+    op.create_index('ix_loan_items_tool_item_id', 'loan_items', ['tool_item_id'])
+
+    # Partieller Index: nur aktive Ausleihen, sortiert nach Fälligkeit
+    op.create_index(
+        'ix_loans_active_due_at', 'loans', ['due_at'],
+        sqlite_where=_ACTIVE_LOANS, postgresql_where=_ACTIVE_LOANS,
+    )
+    op.create_index('ix_loans_borrower_user_id', 'loans', ['borrower_user_id'])
+
+    op.create_index('ix_tool_items_tool_id_status_id', 'tool_items', ['tool_id', 'status_id'])
+    op.create_index('ix_tool_items_status_id', 'tool_items', ['status_id'])
+
+    op.create_index('ix_users_department_id', 'users', ['department_id'])
+
+    op.create_index('ix_loan_requests_requester_user_id', 'loan_requests', ['requester_user_id'])
+    op.create_index('ix_loan_requests_request_status_id', 'loan_requests', ['request_status_id'])
+
+    op.create_index(
+        'ix_tool_item_issues_tool_item_id_status_id', 'tool_item_issues', ['tool_item_id', 'status_id'],
+    )
+    op.create_index('ix_tool_item_issues_status_id', 'tool_item_issues', ['status_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tool_item_issues_status_id', table_name='tool_item_issues')
+    op.drop_index('ix_tool_item_issues_tool_item_id_status_id', table_name='tool_item_issues')
+    op.drop_index('ix_loan_requests_request_status_id', table_name='loan_requests')
+    op.drop_index('ix_loan_requests_requester_user_id', table_name='loan_requests')
+    op.drop_index('ix_users_department_id', table_name='users')
+    op.drop_index('ix_tool_items_status_id', table_name='tool_items')
+    op.drop_index('ix_tool_items_tool_id_status_id', table_name='tool_items')
+    op.drop_index('ix_loans_borrower_user_id', table_name='loans')
+    op.drop_index('ix_loans_active_due_at', table_name='loans')
+    op.drop_index('ix_loan_items_tool_item_id', table_name='loan_items')
@@ -0,0 +1,29 @@
+"""add tools.image_variants_ready for responsive image variants
+
+Revision ID: b8c9d0e1f2a3
+Revises: a7b8c9d0e1f2
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8c9d0e1f2a3'
+down_revision: Union[str, Sequence[str], None] = 'a7b8c9d0e1f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Vorhandene Bilder haben noch keine Varianten – der Wartungsjob build_image_variants erzeugt sie
+    with op.batch_alter_table('tools') as batch_op:
+        batch_op.add_column(sa.Column('image_variants_ready', sa.Boolean(), server_default=sa.text('0'), nullable=False))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('tools') as batch_op:
+        batch_op.drop_column('image_variants_ready')
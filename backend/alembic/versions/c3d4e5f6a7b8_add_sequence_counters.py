@@ -0,0 +1,41 @@
+"""add sequence_counters for O(1) inventory number allocation
+
+Revision ID: c3d4e5f6a7b8
+Revises: b7c8d9e0f1a2
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d4e5f6a7b8'
+down_revision: Union[str, Sequence[str], None] = 'b7c8d9e0f1a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    counters = op.create_table(
+        'sequence_counters',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('value', sa.Integer(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+    )
+
+    # Zähler aus den bestehenden Inventarnummern (INV-XXXX) initialisieren
+    conn = op.get_bind()
+    max_num = 0
+    for (inv_no,) in conn.execute(sa.text('SELECT inventory_no FROM tool_items')):
+        m = re.fullmatch(r'INV-(\d+)', inv_no or '')
+        if m:
+            max_num = max(max_num, int(m.group(1)))
+    op.bulk_insert(counters, [{'name': 'inventory_no', 'value': max_num}])
+
+
+def downgrade() -> None:
+    op.drop_table('sequence_counters')
@@ -0,0 +1,34 @@
+"""index tools.image_filename for content-addressed image reference counting
+
+Revision ID: c9d0e1f2a3b4
+Revises: b8c9d0e1f2a3
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9d0e1f2a3b4'
+down_revision: Union[str, Sequence[str], None] = 'b8c9d0e1f2a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # tools.image_filename kam bisher nur über create_all in die Datenbank –
+    # bei rein per Alembic aufgebauten Datenbanken fehlt die Spalte noch
+    columns = {c['name'] for c in sa.inspect(op.get_bind()).get_columns('tools')}
+    if 'image_filename' not in columns:
+        with op.batch_alter_table('tools') as batch_op:
+            batch_op.add_column(sa.Column('image_filename', sa.String(length=255), nullable=True))
+    # Bestehende Dateinamen ({tool_id}_{uuid}.{ext}) bleiben gültig – sie sind
+    # ebenfalls eindeutig und werden wie Hash-Namen gezählt
+    op.create_index('ix_tools_image_filename', 'tools', ['image_filename'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tools_image_filename', table_name='tools')
@@ -0,0 +1,49 @@
+"""add FTS5 full-text indexes for tools, tool items and issues
+
+Revision ID: d0e1f2a3b4c5
+Revises: c9d0e1f2a3b4
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd0e1f2a3b4c5'
+down_revision: Union[str, Sequence[str], None] = 'c9d0e1f2a3b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (FTS-Tabelle, Quelltabelle, indexierte Spalten) – siehe models/search_index.py
+_INDEXES = (
+    ('tools_fts', 'tools', ('tool_name', 'description')),
+    ('tool_items_fts', 'tool_items', ('inventory_no', 'description')),
+    ('tool_item_issues_fts', 'tool_item_issues', ('title', 'description')),
+)
+
+
+def upgrade() -> None:
+    for name, source, columns in _INDEXES:
+        cols = ', '.join(columns)
+        new = ', '.join(f'new.{c}' for c in columns)
+        old = ', '.join(f'old.{c}' for c in columns)
+        delete = f"INSERT INTO {name}({name}, rowid, {cols}) VALUES ('delete', old.id, {old});"
+        insert = f"INSERT INTO {name}(rowid, {cols}) VALUES (new.id, {new});"
+        op.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {name} USING fts5({cols}, content='{source}', "
+            f"content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+        op.execute(f"CREATE TRIGGER IF NOT EXISTS {name}_ai AFTER INSERT ON {source} BEGIN {insert} END")
+        op.execute(f"CREATE TRIGGER IF NOT EXISTS {name}_ad AFTER DELETE ON {source} BEGIN {delete} END")
+        op.execute(f"CREATE TRIGGER IF NOT EXISTS {name}_au AFTER UPDATE OF {cols} ON {source} BEGIN {delete} {insert} END")
+        # Index aus dem vorhandenen Bestand aufbauen
+        op.execute(f"INSERT INTO {name}({name}) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    for name, _source, _columns in _INDEXES:
+        for suffix in ('ai', 'ad', 'au'):
+            op.execute(f"DROP TRIGGER IF EXISTS {name}_{suffix}")
+        op.execute(f"DROP TABLE IF EXISTS {name}")
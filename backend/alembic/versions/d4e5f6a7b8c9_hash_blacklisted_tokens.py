@@ -0,0 +1,59 @@
+"""store blacklisted tokens as sha-256 hashes
+
+Revision ID: d4e5f6a7b8c9
+Revises: c3d4e5f6a7b8
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+import hashlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4e5f6a7b8c9'
+down_revision: Union[str, Sequence[str], None] = 'c3d4e5f6a7b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _create_hashed_table(name: str) -> None:
+    op.create_table(
+        name,
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('token_hash', sa.String(length=64), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+
+def upgrade() -> None:
+    # Die Tabelle fehlte in den bisherigen Migrationen (nur per create_all angelegt).
+    # Existiert sie bereits mit Klartext-Tokens, werden diese in Hashes umgewandelt.
+    conn = op.get_bind()
+    existing = sa.inspect(conn).get_table_names()
+
+    if 'blacklisted_tokens' in existing:
+        rows = conn.execute(sa.text('SELECT token, expires_at FROM blacklisted_tokens')).fetchall()
+        op.drop_table('blacklisted_tokens')
+    else:
+        rows = []
+
+    _create_hashed_table('blacklisted_tokens')
+    op.create_index('ix_blacklisted_tokens_token_hash', 'blacklisted_tokens', ['token_hash'], unique=True)
+    if rows:
+        conn.execute(
+            sa.text('INSERT INTO blacklisted_tokens (token_hash, expires_at) VALUES (:token_hash, :expires_at)'),
+            [
+                {'token_hash': hashlib.sha256(token.encode('utf-8')).hexdigest(), 'expires_at': expires_at}
+                for token, expires_at in rows
+            ],
+        )
+
+
+def downgrade() -> None:
+    # Klartext-Tokens lassen sich aus den Hashes nicht wiederherstellen
+    op.drop_index('ix_blacklisted_tokens_token_hash', table_name='blacklisted_tokens')
+    op.drop_table('blacklisted_tokens')
@@ -0,0 +1,45 @@
+"""add FTS5 trigram indexes for the name/inventory_no list filters
+
+Revision ID: e1f2a3b4c5d6
+Revises: d0e1f2a3b4c5
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1f2a3b4c5d6'
+down_revision: Union[str, Sequence[str], None] = 'd0e1f2a3b4c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (FTS-Tabelle, Quelltabelle, indexierte Spalte) – Teilstringsuche per LIKE, siehe models/search_index.py
+_INDEXES = (
+    ('tools_trigram_fts', 'tools', 'tool_name'),
+    ('tool_items_trigram_fts', 'tool_items', 'inventory_no'),
+)
+
+
+def upgrade() -> None:
+    for name, source, col in _INDEXES:
+        delete = f"INSERT INTO {name}({name}, rowid, {col}) VALUES ('delete', old.id, old.{col});"
+        insert = f"INSERT INTO {name}(rowid, {col}) VALUES (new.id, new.{col});"
+        op.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {name} USING fts5({col}, content='{source}', "
+            f"content_rowid='id', tokenize='trigram')"
+        )
+        op.execute(f"CREATE TRIGGER IF NOT EXISTS {name}_ai AFTER INSERT ON {source} BEGIN {insert} END")
+        op.execute(f"CREATE TRIGGER IF NOT EXISTS {name}_ad AFTER DELETE ON {source} BEGIN {delete} END")
+        op.execute(f"CREATE TRIGGER IF NOT EXISTS {name}_au AFTER UPDATE OF {col} ON {source} BEGIN {delete} {insert} END")
+        # Index aus dem vorhandenen Bestand aufbauen
+        op.execute(f"INSERT INTO {name}({name}) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    for name, _source, _col in _INDEXES:
+        for suffix in ('ai', 'ad', 'au'):
+            op.execute(f"DROP TRIGGER IF EXISTS {name}_{suffix}")
+        op.execute(f"DROP TABLE IF EXISTS {name}")
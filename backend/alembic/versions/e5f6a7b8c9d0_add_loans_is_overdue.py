@@ -0,0 +1,45 @@
+"""add materialized loans.is_overdue flag
+
+Revision ID: e5f6a7b8c9d0
+Revises: d4e5f6a7b8c9
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f6a7b8c9d0'
+down_revision: Union[str, Sequence[str], None] = 'd4e5f6a7b8c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('loans') as batch_op:
+        batch_op.add_column(sa.Column('is_overdue', sa.Boolean(), server_default=sa.text('0'), nullable=False))
+        batch_op.create_index('ix_loans_is_overdue', ['is_overdue'])
+
+    # Bestehende Ausleihen einmalig befüllen (danach übernimmt der Wartungsjob)
+    loans = sa.table(
+        'loans',
+        sa.column('is_overdue', sa.Boolean()),
+        sa.column('returned_at', sa.DateTime(timezone=True)),
+        sa.column('due_at', sa.DateTime(timezone=True)),
+    )
+    now = datetime.now(tz=timezone.utc)
+    op.execute(
+        loans.update()
+        .where(loans.c.returned_at.is_(None), loans.c.due_at < now)
+        .values(is_overdue=True)
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('loans') as batch_op:
+        batch_op.drop_index('ix_loans_is_overdue')
+        batch_op.drop_column('is_overdue')
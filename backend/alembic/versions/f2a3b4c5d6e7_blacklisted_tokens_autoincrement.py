@@ -0,0 +1,32 @@
+"""never reuse blacklisted_tokens ids (sqlite AUTOINCREMENT)
+
+Revision ID: f2a3b4c5d6e7
+Revises: e1f2a3b4c5d6
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a3b4c5d6e7'
+down_revision: Union[str, Sequence[str], None] = 'e1f2a3b4c5d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Ohne AUTOINCREMENT vergibt SQLite nach dem Leeren der Tabelle wieder id 1 –
+    # die Revocation-Caches der anderen Worker (sync: id > letzte id) sähen sie nie.
+    # Tabelle wird samt Zeilen neu angelegt; sqlite_sequence startet bei der höchsten id.
+    with op.batch_alter_table('blacklisted_tokens', recreate='always',
+                              table_kwargs={'sqlite_autoincrement': True}):
+        pass
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('blacklisted_tokens', recreate='always',
+                              table_kwargs={'sqlite_autoincrement': False}):
+        pass
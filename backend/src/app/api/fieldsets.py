@@ -0,0 +1,238 @@
+# ============================================================
+# api/fieldsets.py – Sparse Fieldsets (?fields=) und Relationen (?expand=)
+#
+# Die get*s-Listenendpunkte liefern standardmäßig das vollständige Read-Schema
+# inklusive aller verschachtelten Objekte. Mit zwei Query-Parametern lässt sich
+# die Antwort eingrenzen:
+#
+#   fields=id,due_at,borrower.lastname,items.id
+#       Nur diese Felder. Ein Pfad mit Punkt (borrower.lastname) wählt ein Feld
+#       innerhalb einer Relation und bettet diese damit ein; ein Relationsname
+#       allein (borrower) bettet sie mit allen einfachen Feldern ein.
+#   expand=borrower,items.tool_item
+#       Diese Relationen mit allen einfachen Feldern einbetten, ohne die Felder
+#       der übrigen Ebenen einzuschränken.
+#
+# Sobald einer der Parameter gesetzt ist, fehlen alle nicht genannten
+# Relationen; "id" ist immer enthalten. Die Auswahl bestimmt zugleich die
+# SQL-Abfrage: load_only() für die Spalten, joinedload/selectinload nur für
+# eingebettete Relationen – alles andere wird weder gejoint noch nachgeladen.
+#
+# Pro Auswahl werden ein Pydantic-Modell und der Loader-Plan einmal erzeugt
+# und gecacht (begrenzt, da die Schlüssel vom Client kommen).
+# ============================================================
+
+import types
+import typing
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Optional, Union
+
+from fastapi import HTTPException, Query
+from pydantic import BaseModel, ConfigDict, Field, computed_field
+from pydantic.fields import FieldInfo
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, load_only, selectinload
+
+FIELDS_QUERY = Query(None, description="Kommagetrennte Feldpfade, z.B. id,due_at,borrower.lastname")
+EXPAND_QUERY = Query(None, description="Kommagetrennte Relationspfade, z.B. borrower,items.tool_item")
+
+
+@dataclass(frozen=True)
+class Selection:
+    """Selected fields of one level: None means all plain fields; expand holds embedded relations."""
+    fields: Optional[frozenset[str]]
+    expand: tuple[tuple[str, "Selection"], ...] = ()
+
+
+@dataclass(frozen=True)
+class Fieldset:
+    """
+    Resolved ?fields=/?expand= for one endpoint: `schema` serializes the rows,
+    `options` is the loader plan for the crud query (None = the crud default).
+    """
+    schema: type[BaseModel]
+    options: Optional[tuple] = None
+
+    @property
+    def is_default(self) -> bool:
+        return self.options is None
+
+    @classmethod
+    def for_schema(cls, read_schema: type[BaseModel], model: type):
+        """FastAPI dependency factory for a list endpoint returning read_schema rows of ORM model."""
+        def dependency(fields: Optional[str] = FIELDS_QUERY, expand: Optional[str] = EXPAND_QUERY) -> "Fieldset":
+            if fields is None and expand is None:
+                return cls(read_schema)
+            try:
+                selection = parse_selection(read_schema, fields, expand)
+            except ValueError as exc:
+                raise HTTPException(status_code=400, detail=str(exc))
+            return _build_fieldset(read_schema, model, selection)
+        return dependency
+
+
+def _split(value: Optional[str]) -> list[list[str]]:
+    return [path.strip().split(".") for path in (value or "").split(",") if path.strip()]
+
+
+def _relation_schema(annotation: Any) -> Optional[type[BaseModel]]:
+    """The model inside X, Optional[X] or list[X], if the field is a nested object."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    for arg in typing.get_args(annotation):
+        if isinstance(arg, type) and issubclass(arg, BaseModel):
+            return arg
+    return None
+
+
+def _plain_fields(schema: type[BaseModel]) -> set[str]:
+    plain = {
+        name for name, info in schema.model_fields.items()
+        if _relation_schema(info.annotation) is None and not info.exclude
+    }
+    return plain | set(schema.model_computed_fields)
+
+
+def parse_selection(schema: type[BaseModel], fields: Optional[str], expand: Optional[str]) -> Selection:
+    """Turns the query strings into a Selection tree; raises ValueError for unknown names."""
+    # Veränderbarer Zwischenbaum: [fields-Menge oder None, {relation: Knoten}]
+    root = [set() if fields is not None else None, {}]
+
+    def walk(path: list[str], restrict: bool):
+        node, current = root, schema
+        for depth, name in enumerate(path):
+            info = current.model_fields.get(name)
+            related = _relation_schema(info.annotation) if info is not None else None
+            is_last = depth == len(path) - 1
+            if related is None:
+                if not is_last or name not in _plain_fields(current):
+                    raise ValueError(f"Unbekanntes Feld: {'.'.join(path)}")
+                if not restrict:
+                    raise ValueError(f"Keine Relation: {'.'.join(path)}")
+                if node[0] is not None:
+                    node[0].add(name)
+                return
+            # Ein Relationspfad mit Feldangabe schränkt die Felder der Relation ein
+            child_restricted = restrict and not is_last
+            child = node[1].get(name)
+            if child is None:
+                child = node[1][name] = [set() if child_restricted else None, {}]
+            elif not child_restricted:
+                child[0] = None
+            node, current = child, related
+
+    for path in _split(expand):
+        walk(path, restrict=False)
+    for path in _split(fields):
+        walk(path, restrict=True)
+
+    def freeze(node) -> Selection:
+        fields_ = frozenset(node[0]) if node[0] is not None else None
+        return Selection(fields_, tuple(sorted((name, freeze(child)) for name, child in node[1].items())))
+
+    return freeze(root)
+
+
+def _with_model(annotation: Any, model: type[BaseModel]) -> Any:
+    """Replaces the nested model in X / Optional[X] / list[X] by model."""
+    origin = typing.get_origin(annotation)
+    if origin is list:
+        return list[model]
+    if origin in (Union, types.UnionType):
+        return Optional[model]
+    return model
+
+
+def _own_functions(schema: type[BaseModel]) -> dict[str, Any]:
+    """Helper methods defined on the schema classes (used by computed fields)."""
+    functions = {}
+    for klass in reversed(schema.__mro__):
+        if klass is BaseModel or not issubclass(klass, BaseModel):
+            continue
+        functions.update(
+            (name, value) for name, value in vars(klass).items()
+            if isinstance(value, types.FunctionType) and not name.startswith("__")
+        )
+    return functions
+
+
+def _copy_field(info: FieldInfo, exclude: Optional[bool] = None) -> FieldInfo:
+    """Default, validation alias and exclude flag of a field for the projected model."""
+    return Field(
+        ... if info.is_required() else info.default,
+        validation_alias=info.validation_alias,
+        exclude=info.exclude if exclude is None else exclude,
+    )
+
+
+def _project_schema(schema: type[BaseModel], selection: Selection) -> type[BaseModel]:
+    """Pydantic model with only the selected fields of schema (recursively for relations)."""
+    expand = dict(selection.expand)
+    sources = getattr(schema, "computed_sources", {})
+    computed = [
+        name for name in schema.model_computed_fields
+        if selection.fields is None or name in selection.fields
+    ]
+    needed = {column for name in computed for column in sources[name]}
+
+    annotations: dict[str, Any] = {}
+    namespace: dict[str, Any] = {}
+    for name, info in schema.model_fields.items():
+        related = _relation_schema(info.annotation)
+        if related is not None:
+            if name not in expand:
+                continue
+            annotations[name] = _with_model(info.annotation, _project_schema(related, expand[name]))
+        elif not info.exclude and (selection.fields is None or name in selection.fields or name == "id"):
+            annotations[name] = info.annotation
+            namespace[name] = _copy_field(info)
+        elif name in needed or info.validation_alias in needed:
+            # Nur als Grundlage für computed fields laden, nicht ausgeben
+            annotations[name] = info.annotation
+            namespace[name] = _copy_field(info, exclude=True)
+
+    namespace.update(_own_functions(schema))
+    for name in computed:
+        info = schema.model_computed_fields[name]
+        namespace[name] = computed_field(info.wrapped_property, return_type=info.return_type)
+    namespace["__annotations__"] = annotations
+    namespace["model_config"] = ConfigDict(from_attributes=True)
+    namespace["__module__"] = schema.__module__
+    return type(schema.__name__, (BaseModel,), namespace)
+
+
+def _loader_options(model: type, schema: type[BaseModel], selection: Selection, required: tuple[str, ...] = ()) -> list:
+    """load_only for the columns plus one eager loader per embedded relation."""
+    mapper = inspect(model)
+    restrict = selection.fields is not None
+    # Primärschlüssel immer laden – die Identity-Map braucht ihn (nicht jeder heißt "id")
+    columns = {*(mapper.get_property_by_column(column).key for column in mapper.primary_key), *required}
+    if restrict:
+        sources = getattr(schema, "computed_sources", {})
+        for name in selection.fields:
+            for column in sources.get(name, (name,)):
+                if column in mapper.column_attrs:
+                    columns.add(column)
+                else:
+                    restrict = False  # kein Spaltenattribut (z.B. Python-Property) – ganze Zeile laden
+
+    options = []
+    for name, child_selection in selection.expand:
+        relationship = mapper.relationships[name]
+        # Fremdschlüssel beider Seiten werden zum Verknüpfen gebraucht
+        pairs = relationship.local_remote_pairs
+        columns.update(mapper.get_property_by_column(local).key for local, _ in pairs)
+        remote = tuple(relationship.mapper.get_property_by_column(column).key for _, column in pairs)
+        child_schema = _relation_schema(schema.model_fields[name].annotation)
+        child_options = _loader_options(relationship.mapper.class_, child_schema, child_selection, remote)
+        loader = selectinload if relationship.uselist else joinedload
+        options.append(loader(getattr(model, name)).options(*child_options))
+    if restrict:
+        options.insert(0, load_only(*(getattr(model, key) for key in sorted(columns))))
+    return options
+
+
+@lru_cache(maxsize=256)
+def _build_fieldset(read_schema: type[BaseModel], model: type, selection: Selection) -> Fieldset:
+    return Fieldset(_project_schema(read_schema, selection), tuple(_loader_options(model, read_schema, selection)))
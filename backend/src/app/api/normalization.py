@@ -0,0 +1,138 @@
+# ============================================================
+# api/normalization.py – Normalisierte Antwortform für große Listen
+#
+# Standardmäßig liefern /getloans, /gettoolitems und /gettoolitemissues jede
+# Zeile vollständig verschachtelt: dieselben Benutzer, Werkzeuge, Kategorien,
+# Status und Zustände stehen darin hundertfach. Mit ?shape=normalized kommt
+# stattdessen:
+#
+#   {
+#     "data":     [ flache Zeilen, Referenzen nur als *_id ],
+#     "included": { "users": {"<id>": {...}}, "tools": {...}, ... }
+#   }
+#
+# Jedes referenzierte Objekt steht genau einmal in "included" und wird auch
+# nur einmal validiert und serialisiert. Welche Zeilen-Schemas und welche
+# included-Typen es gibt, beschreibt je Endpunkt eine Normalization.
+# ============================================================
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Literal, Optional
+
+from fastapi import HTTPException, Query, Response
+from pydantic import BaseModel, TypeAdapter, create_model
+
+from src.app.api.serialization import json_response
+from src.app.schemas.loan import LoanFlat
+from src.app.schemas.tool import ToolFlat
+from src.app.schemas.tool_category import ToolCategoryRead
+from src.app.schemas.tool_condition import ToolConditionRead
+from src.app.schemas.tool_item import ToolItemFlat
+from src.app.schemas.tool_item_issue import ToolItemIssueFlat
+from src.app.schemas.tool_item_issue_status import ToolItemIssueStatusRead
+from src.app.schemas.tool_status import ToolStatusRead
+from src.app.schemas.user import UserSlim
+
+Shape = Literal["nested", "normalized"]
+
+# Query-Parameter für die Listenendpunkte
+SHAPE_QUERY = Query(
+    "nested",
+    description='"normalized": flache Zeilen mit IDs plus ein "included"-Objekt mit den referenzierten Objekten',
+)
+
+# included-Schlüssel -> Schema der Einträge
+INCLUDED_SCHEMAS: dict[str, type[BaseModel]] = {
+    "users": UserSlim,
+    "tool_items": ToolItemFlat,
+    "tools": ToolFlat,
+    "categories": ToolCategoryRead,
+    "tool_statuses": ToolStatusRead,
+    "tool_conditions": ToolConditionRead,
+    "issue_statuses": ToolItemIssueStatusRead,
+}
+
+
+class Included:
+    """Collects referenced ORM objects per included key, each id only once."""
+
+    def __init__(self, keys: Iterable[str]):
+        self.maps: dict[str, dict[int, Any]] = {key: {} for key in keys}
+
+    def add(self, key: str, obj: Any) -> None:
+        if obj is not None:
+            self.maps[key].setdefault(obj.id, obj)
+
+
+@dataclass(frozen=True)
+class Normalization:
+    name: str
+    schema: type[BaseModel]
+    included: tuple[str, ...]
+    collect: Callable[[Included, Any], None]
+
+
+def _collect_tool_item_refs(inc: Included, item: Any) -> None:
+    inc.add("tools", item.tool)
+    inc.add("categories", item.tool.category)
+    inc.add("tool_statuses", item.status)
+    inc.add("tool_conditions", item.condition)
+
+
+def _collect_loan(inc: Included, loan: Any) -> None:
+    inc.add("users", loan.borrower)
+    inc.add("users", loan.issuer)
+    inc.add("users", loan.return_processor)
+    for loan_item in loan.items:
+        inc.add("tool_items", loan_item.tool_item)
+        _collect_tool_item_refs(inc, loan_item.tool_item)
+        inc.add("tool_conditions", loan_item.return_condition)
+
+
+def _collect_issue(inc: Included, issue: Any) -> None:
+    inc.add("users", issue.reported_by)
+    inc.add("issue_statuses", issue.status)
+    inc.add("tool_items", issue.tool_item)
+    _collect_tool_item_refs(inc, issue.tool_item)
+
+
+_TOOL_ITEM_REFS = ("tools", "categories", "tool_statuses", "tool_conditions")
+
+LOANS = Normalization("Loans", LoanFlat, ("users", "tool_items", *_TOOL_ITEM_REFS), _collect_loan)
+TOOL_ITEMS = Normalization("ToolItems", ToolItemFlat, _TOOL_ITEM_REFS, _collect_tool_item_refs)
+TOOL_ITEM_ISSUES = Normalization(
+    "ToolItemIssues", ToolItemIssueFlat, ("users", "issue_statuses", "tool_items", *_TOOL_ITEM_REFS), _collect_issue
+)
+
+
+@lru_cache(maxsize=None)
+def envelope_adapter(spec: Normalization) -> TypeAdapter:
+    """TypeAdapter for {"data": [...], "included": {...}}, built once per endpoint."""
+    included = create_model(
+        f"{spec.name}Included",
+        **{key: (dict[int, INCLUDED_SCHEMAS[key]], ...) for key in spec.included},
+    )
+    envelope = create_model(f"{spec.name}Normalized", data=(list[spec.schema], ...), included=(included, ...))
+    return TypeAdapter(envelope)
+
+
+def dump_normalized(spec: Normalization, rows: Iterable[Any]) -> bytes:
+    """Validates rows and their deduplicated references in one pass and returns JSON bytes."""
+    rows = list(rows)
+    inc = Included(spec.included)
+    for row in rows:
+        spec.collect(inc, row)
+    adapter = envelope_adapter(spec)
+    return adapter.dump_json(adapter.validate_python({"data": rows, "included": inc.maps}, from_attributes=True))
+
+
+def normalized_response(spec: Normalization, rows: Iterable[Any], response: Optional[Response] = None) -> Response:
+    """Like list_response(), but in the normalized shape."""
+    return json_response(dump_normalized(spec, rows), response)
+
+
+def check_shape(shape: Shape, fieldset) -> None:
+    """shape=normalized has fixed row schemas and cannot be combined with ?fields= / ?expand=."""
+    if shape == "normalized" and not fieldset.is_default:
+        raise HTTPException(status_code=400, detail="fields/expand und shape=normalized lassen sich nicht kombinieren")
@@ -0,0 +1,42 @@
+# ============================================================
+# api/pagination.py – Query-Parameter und Header für Keyset-Pagination
+#
+# Alle get*s-Listenendpunkte akzeptieren ?limit=&cursor= und liefern weiterhin
+# eine JSON-Liste. Gibt es eine weitere Seite, stehen der nächste Cursor im
+# Header "X-Next-Cursor" und die vollständige URL im Header "Link" (rel="next").
+# ============================================================
+
+from operator import attrgetter
+from typing import Any, Callable, Optional
+
+from fastapi import Query, Request, Response
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+class PageParams:
+    """FastAPI-Dependency: liest limit und cursor aus der Query."""
+
+    def __init__(
+        self,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        cursor: Optional[int] = Query(None, ge=0, description="ID des letzten Eintrags der vorherigen Seite"),
+    ):
+        self.limit = limit
+        self.cursor = cursor
+
+    def finish(self, rows: list, request: Request, response: Response,
+               cursor_of: Callable[[Any], int] = attrgetter("id")) -> list:
+        """
+        Schneidet die Vorschau-Zeile ab und setzt bei Bedarf die Next-Header.
+        cursor_of liefert den Cursor einer Zeile (Standard: ihre ID).
+        """
+        if len(rows) <= self.limit:
+            return rows
+        rows = rows[: self.limit]
+        next_cursor = cursor_of(rows[-1])
+        next_url = request.url.include_query_params(cursor=next_cursor, limit=self.limit)
+        response.headers["X-Next-Cursor"] = str(next_cursor)
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+        return rows
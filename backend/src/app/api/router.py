@@ -26,6 +26,9 @@ from src.app.api.routes.loan_requests import router as loan_requests_router
 from src.app.api.routes.loans import router as loans_router
 from src.app.api.routes.loan_items import router as loan_items_router
 from src.app.api.routes.loan_request_items import router as loan_request_items_router
+from src.app.api.routes.dashboard import router as dashboard_router
+from src.app.api.routes.maintenance import router as maintenance_router
+from src.app.api.routes.search import router as search_router
 
 # Zentraler Router – in main.py eingebunden mit Prefix "/api/v1"
 api_router = APIRouter()
@@ -52,3 +55,12 @@ api_router.include_router(loan_requests_router)
 api_router.include_router(loans_router)
 api_router.include_router(loan_items_router)
 api_router.include_router(loan_request_items_router)
+
+# Dashboard-Kennzahlen (aggregiert)
+api_router.include_router(dashboard_router)
+
+# Volltextsuche über Werkzeuge, Exemplare und Issues
+api_router.include_router(search_router)
+
+# Wartungsjobs (Laufzeit-Metriken)
+api_router.include_router(maintenance_router)
@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from src.app.auth.principal import Principal
+from src.app.auth.security import get_current_user
+from src.app.core.role_ids import ADMIN_ID, MANAGER_ID, EMPLOYEE_ID
+from src.app.db.deps import get_db
+from src.app.schemas.dashboard import DashboardStats
+import src.app.crud.dashboard as crud
+
+router = APIRouter(tags=["Dashboard"])
+
+
+@router.get("/getdashboardstats", response_model=DashboardStats)
+def get_dashboard_stats(
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    overdue_limit: int = Query(5, ge=0, le=50),
+):
+    """Aggregated dashboard counters. Loans and requests are scoped like /getloans:
+    ADMIN sees all; DEPARTMENT_MANAGER sees their department; EMPLOYEE sees only their own.
+    Issue and user counters are only filled for ADMIN."""
+    borrower_user_id = None
+    department_id = None
+    if current_user.role_id == EMPLOYEE_ID:
+        borrower_user_id = current_user.id
+    elif current_user.role_id == MANAGER_ID:
+        department_id = current_user.department_id
+    return crud.get_dashboard_stats(
+        db,
+        borrower_user_id=borrower_user_id,
+        department_id=department_id,
+        include_admin_stats=current_user.role_id == ADMIN_ID,
+        overdue_limit=overdue_limit,
+    )
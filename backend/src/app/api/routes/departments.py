@@ -3,6 +3,7 @@ import random
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
+from src.app.api.serialization import list_response
 from src.app.auth.security import get_current_user, require_role
 from src.app.core.role_ids import ADMIN_ID
 from src.app.db.deps import get_db
@@ -17,7 +18,7 @@ router = APIRouter(tags=["Departments"])
 @router.get("/getdepartments", response_model=list[DepartmentRead],
             dependencies=[Depends(get_current_user)])
 def list_departments(db: Session = Depends(get_db)):
-    return crud.get_departments(db)
+    return list_response(DepartmentRead, crud.get_departments(db))
 
 
 @router.get("/getdepartment/{department_id}", response_model=DepartmentRead,
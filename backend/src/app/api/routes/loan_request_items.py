@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
+from src.app.api.serialization import list_response
 from src.app.auth.security import get_current_user, require_role
 from src.app.core.role_ids import ADMIN_ID, MANAGER_ID, EMPLOYEE_ID
 from src.app.db.deps import get_db
@@ -17,7 +18,7 @@ router = APIRouter(tags=["Loan Request Items"])
 @router.get("/getloanrequestitems", response_model=list[LoanRequestItemRead],
             dependencies=[Depends(get_current_user)])
 def list_loan_request_items(db: Session = Depends(get_db)):
-    return crud.get_loan_request_items(db)
+    return list_response(LoanRequestItemRead, crud.get_loan_request_items(db))
 
 
 @router.get("/getloanrequestitem/{item_id}", response_model=LoanRequestItemRead,
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
+from src.app.api.serialization import list_response
 from src.app.auth.security import require_role
 from src.app.core.role_ids import ADMIN_ID, MANAGER_ID, EMPLOYEE_ID
 from src.app.db.deps import get_db
@@ -17,7 +18,7 @@ router = APIRouter(tags=["Loan Request Statuses"])
 @router.get("/getloanrequeststatuses", response_model=list[LoanRequestStatusRead],
             dependencies=[Depends(require_role(ADMIN_ID, MANAGER_ID, EMPLOYEE_ID))])
 def list_loan_request_statuses(db: Session = Depends(get_db)):
-    return crud.get_loan_request_statuses(db)
+    return list_response(LoanRequestStatusRead, crud.get_loan_request_statuses(db))
 
 
 @router.get("/getloanrequeststatus/{status_id}", response_model=LoanRequestStatusRead,
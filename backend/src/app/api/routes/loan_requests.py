@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 
+from src.app.api.fieldsets import Fieldset
+from src.app.api.pagination import PageParams
+from src.app.api.serialization import list_response
+from src.app.auth.principal import Principal
 from src.app.auth.security import get_current_user, require_role
 from src.app.core.role_ids import ADMIN_ID, MANAGER_ID, EMPLOYEE_ID
 from src.app.db.deps import get_db
-from src.app.models.user import User
+from src.app.models.loan_request import LoanRequest
 from src.app.schemas.loan_request import LoanRequestCreate, LoanRequestUpdate, LoanRequestRead, DecideRequest
 import src.app.crud.loan_request as crud
 
@@ -13,15 +17,23 @@ router = APIRouter(tags=["Loan Requests"])
 
 @router.get("/getloanrequests", response_model=list[LoanRequestRead])
 def list_loan_requests(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
+    page: PageParams = Depends(),
+    fieldset: Fieldset = Depends(Fieldset.for_schema(LoanRequestRead, LoanRequest)),
 ):
     """ADMIN sees all; DEPARTMENT_MANAGER sees their department; EMPLOYEE sees only their own."""
     if current_user.role_id == EMPLOYEE_ID:
-        return crud.get_loan_requests_by_user(db, current_user.id)
-    if current_user.role_id == MANAGER_ID:
-        return crud.get_loan_requests_by_department(db, current_user.department_id)
-    return crud.get_loan_requests(db)
+        requests = crud.get_loan_requests_by_user(db, current_user.id, limit=page.limit,
+                                                  after_id=page.cursor, options=fieldset.options)
+    elif current_user.role_id == MANAGER_ID:
+        requests = crud.get_loan_requests_by_department(db, current_user.department_id, limit=page.limit,
+                                                        after_id=page.cursor, options=fieldset.options)
+    else:
+        requests = crud.get_loan_requests(db, limit=page.limit, after_id=page.cursor, options=fieldset.options)
+    return list_response(fieldset.schema, page.finish(requests, request, response), response)
 
 
 @router.get("/getloanrequest/{request_id}", response_model=LoanRequestRead,
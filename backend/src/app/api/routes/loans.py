@@ -1,54 +1,63 @@
-from datetime import datetime, timezone
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 
+from src.app.api.fieldsets import Fieldset
+from src.app.api.normalization import SHAPE_QUERY, Shape, LOANS, check_shape, normalized_response
+from src.app.api.pagination import PageParams
+from src.app.api.serialization import list_response
+from src.app.auth.principal import Principal
 from src.app.auth.security import get_current_user, require_role
 from src.app.core.role_ids import ADMIN_ID, MANAGER_ID, EMPLOYEE_ID
 from src.app.db.deps import get_db
-from src.app.models.user import User
+from src.app.models.loan import Loan
 from src.app.schemas.loan import LoanCreate, LoanUpdate, LoanRead, ReturnLoanRequest
 import src.app.crud.loan as crud
 
 router = APIRouter(tags=["Loans"])
 
 
-def _with_overdue_flag(loan) -> dict:
-    data = LoanRead.model_validate(loan).model_dump()
-    due = loan.due_at.replace(tzinfo=timezone.utc) if loan.due_at.tzinfo is None else loan.due_at
-    if loan.returned_at is None and due < datetime.now(tz=timezone.utc):
-        data["is_overdue"] = True
-    return data
-
-
 @router.get("/getloans", response_model=list[LoanRead])
 def list_loans(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     active_only: bool = False,
+    shape: Shape = SHAPE_QUERY,
+    page: PageParams = Depends(),
+    fieldset: Fieldset = Depends(Fieldset.for_schema(LoanRead, Loan)),
 ):
     """ADMIN sees all; DEPARTMENT_MANAGER sees their department; EMPLOYEE sees only their own."""
+    check_shape(shape, fieldset)
     if current_user.role_id == EMPLOYEE_ID:
-        loans = crud.get_loans(db, borrower_user_id=current_user.id, active_only=active_only)
+        loans = crud.get_loans(db, borrower_user_id=current_user.id, active_only=active_only,
+                               limit=page.limit, after_id=page.cursor, options=fieldset.options)
     elif current_user.role_id == MANAGER_ID:
-        loans = crud.get_loans_by_department(db, current_user.department_id)
+        loans = crud.get_loans_by_department(db, current_user.department_id,
+                                             limit=page.limit, after_id=page.cursor, options=fieldset.options)
     else:
-        loans = crud.get_loans(db, active_only=active_only)
-    return [_with_overdue_flag(loan) for loan in loans]
+        loans = crud.get_loans(db, active_only=active_only, limit=page.limit, after_id=page.cursor,
+                               options=fieldset.options)
+    loans = page.finish(loans, request, response)
+    if shape == "normalized":
+        return normalized_response(LOANS, loans, response)
+    return list_response(fieldset.schema, loans, response)
 
 
 @router.get("/getoverdueloans", response_model=list[LoanRead],
             dependencies=[Depends(require_role(ADMIN_ID, MANAGER_ID))])
 def list_overdue_loans(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
+    fieldset: Fieldset = Depends(Fieldset.for_schema(LoanRead, Loan)),
 ):
     """ADMIN sees all overdue loans; DEPARTMENT_MANAGER sees only their department."""
     dept_id = None
     if current_user.role_id == MANAGER_ID:
         dept_id = current_user.department_id
-    return crud.get_overdue_loans(db, department_id=dept_id)
+    return list_response(fieldset.schema, crud.get_overdue_loans(db, department_id=dept_id, options=fieldset.options))
 
 
 @router.get("/getloan/{loan_id}", response_model=LoanRead,
@@ -89,7 +98,10 @@ def return_loan(loan_id: int, data: ReturnLoanRequest, db: Session = Depends(get
     if loan.returned_at is not None:
         raise HTTPException(status_code=409, detail="Diese Ausleihe wurde bereits zurückgegeben")
     item_returns = [i.model_dump() for i in data.items]
-    return crud.return_loan(db, loan, data.returned_by_user_id, item_returns)
+    try:
+        return crud.return_loan(db, loan, data.returned_by_user_id, item_returns)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
 
 @router.delete("/deleteloan/{loan_id}", status_code=200,
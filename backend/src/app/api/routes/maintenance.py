@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Depends
+
+from src.app.api.serialization import list_response
+from src.app.auth.security import require_role
+from src.app.core.role_ids import ADMIN_ID
+from src.app.core.scheduler import scheduler
+from src.app.schemas.maintenance import MaintenanceJobStats
+
+router = APIRouter(tags=["System"])
+
+
+@router.get("/getmaintenancejobs", response_model=list[MaintenanceJobStats],
+            dependencies=[Depends(require_role(ADMIN_ID))])
+def list_maintenance_jobs():
+    """Only ADMIN: registered background jobs with interval, run counts and timings."""
+    return list_response(MaintenanceJobStats, scheduler.metrics())
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
+from src.app.api.serialization import list_response
 from src.app.auth.security import require_role
 from src.app.core.role_ids import ADMIN_ID, MANAGER_ID, EMPLOYEE_ID
 from src.app.db.deps import get_db
@@ -13,7 +14,7 @@ router = APIRouter(tags=["Roles"])
 @router.get("/getroles", response_model=list[RoleRead],
             dependencies=[Depends(require_role(ADMIN_ID))])
 def list_roles(db: Session = Depends(get_db)):
-    return crud.get_roles(db)
+    return list_response(RoleRead, crud.get_roles(db))
 
 
 @router.get("/getrole/{role_id}", response_model=RoleRead,
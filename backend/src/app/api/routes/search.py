@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from src.app.api.serialization import list_response
+from src.app.auth.principal import Principal
+from src.app.auth.security import get_current_user
+from src.app.core.role_ids import MANAGER_ID, EMPLOYEE_ID
+from src.app.db.deps import get_db
+from src.app.schemas.search import SearchHit, SearchType
+import src.app.crud.search as crud
+
+router = APIRouter(tags=["Search"])
+
+
+@router.get("/search", response_model=list[SearchHit])
+def search(
+    q: str = Query(..., min_length=1, max_length=200, description="Suchbegriffe – jedes Wort als Präfix, alle müssen vorkommen"),
+    types: list[SearchType] = Query(list(crud.SEARCH_TYPES)),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """
+    Full-text search over tools, tool items and issues, best matches first.
+    Issues: ADMIN sees all; DEPARTMENT_MANAGER those reported in their department; EMPLOYEE only their own.
+    """
+    if current_user.role_id == EMPLOYEE_ID:
+        hits = crud.search(db, q, types, limit, reporter_user_id=current_user.id)
+    elif current_user.role_id == MANAGER_ID:
+        hits = crud.search(db, q, types, limit, department_id=current_user.department_id)
+    else:
+        hits = crud.search(db, q, types, limit)
+    return list_response(SearchHit, hits)
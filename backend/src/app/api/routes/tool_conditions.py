@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
+from src.app.api.serialization import list_response
 from src.app.auth.security import get_current_user, require_role
 from src.app.core.role_ids import ADMIN_ID, MANAGER_ID, EMPLOYEE_ID
 from src.app.db.deps import get_db
@@ -13,7 +14,7 @@ router = APIRouter(tags=["Tool Conditions"])
 @router.get("/gettoolconditions", response_model=list[ToolConditionRead],
             dependencies=[Depends(get_current_user)])
 def list_tool_conditions(db: Session = Depends(get_db)):
-    return crud.get_tool_conditions(db)
+    return list_response(ToolConditionRead, crud.get_tool_conditions(db))
 
 
 @router.get("/gettoolcondition/{condition_id}", response_model=ToolConditionRead,
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
+from src.app.api.serialization import list_response
 from src.app.auth.security import get_current_user, require_role
 from src.app.core.role_ids import ADMIN_ID, MANAGER_ID, EMPLOYEE_ID
 from src.app.db.deps import get_db
@@ -17,7 +18,7 @@ router = APIRouter(tags=["Tool Item Issue Statuses"])
 @router.get("/gettoolitemissuestatuses", response_model=list[ToolItemIssueStatusRead],
             dependencies=[Depends(get_current_user)])
 def list_tool_item_issue_statuses(db: Session = Depends(get_db)):
-    return crud.get_tool_item_issue_statuses(db)
+    return list_response(ToolItemIssueStatusRead, crud.get_tool_item_issue_statuses(db))
 
 
 @router.get("/gettoolitemissuestatus/{status_id}", response_model=ToolItemIssueStatusRead,
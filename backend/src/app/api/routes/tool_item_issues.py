@@ -1,9 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 
+from src.app.api.fieldsets import Fieldset
+from src.app.api.normalization import SHAPE_QUERY, Shape, TOOL_ITEM_ISSUES, check_shape, normalized_response
+from src.app.api.pagination import PageParams
+from src.app.api.serialization import list_response
 from src.app.auth.security import get_current_user, require_role
 from src.app.core.role_ids import ADMIN_ID, MANAGER_ID
 from src.app.db.deps import get_db
+from src.app.models.tool_item_issue import ToolItemIssue
 from src.app.schemas.tool_item_issue import ToolItemIssueCreate, ToolItemIssueUpdate, ToolItemIssueRead
 import src.app.crud.tool_item_issue as crud
 
@@ -12,8 +17,20 @@ router = APIRouter(tags=["Tool Item Issues"])
 
 @router.get("/gettoolitemissues", response_model=list[ToolItemIssueRead],
             dependencies=[Depends(get_current_user)])
-def list_tool_item_issues(db: Session = Depends(get_db)):
-    return crud.get_tool_item_issues(db)
+def list_tool_item_issues(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    shape: Shape = SHAPE_QUERY,
+    page: PageParams = Depends(),
+    fieldset: Fieldset = Depends(Fieldset.for_schema(ToolItemIssueRead, ToolItemIssue)),
+):
+    check_shape(shape, fieldset)
+    issues = crud.get_tool_item_issues(db, limit=page.limit, after_id=page.cursor, options=fieldset.options)
+    issues = page.finish(issues, request, response)
+    if shape == "normalized":
+        return normalized_response(TOOL_ITEM_ISSUES, issues, response)
+    return list_response(fieldset.schema, issues, response)
 
 
 @router.get("/gettoolitemissue/{issue_id}", response_model=ToolItemIssueRead,
@@ -28,7 +45,10 @@ def get_tool_item_issue(issue_id: int, db: Session = Depends(get_db)):
 @router.post("/createtoolitemissue", response_model=ToolItemIssueRead, status_code=201,
              dependencies=[Depends(get_current_user)])
 def create_tool_item_issue(data: ToolItemIssueCreate, db: Session = Depends(get_db)):
-    return crud.create_tool_item_issue(db, data)
+    try:
+        return crud.create_tool_item_issue(db, data)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
 
 @router.patch("/updatetoolitemissue/{issue_id}", response_model=ToolItemIssueRead,
@@ -37,7 +57,10 @@ def update_tool_item_issue(issue_id: int, data: ToolItemIssueUpdate, db: Session
     issue = crud.get_tool_item_issue(db, issue_id)
     if not issue:
         raise HTTPException(status_code=404, detail="Tool item issue not found")
-    return crud.update_tool_item_issue(db, issue, data)
+    try:
+        return crud.update_tool_item_issue(db, issue, data)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
 
 @router.patch("/resolvetoolitemissue/{issue_id}", response_model=ToolItemIssueRead,
@@ -46,7 +69,10 @@ def resolve_tool_item_issue(issue_id: int, db: Session = Depends(get_db)):
     issue = crud.get_tool_item_issue(db, issue_id)
     if not issue:
         raise HTTPException(status_code=404, detail="Tool item issue not found")
-    return crud.resolve_tool_item_issue(db, issue)
+    try:
+        return crud.resolve_tool_item_issue(db, issue)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
 
 @router.delete("/deletetoolitemissue/{issue_id}", status_code=200,
@@ -56,5 +82,8 @@ def delete_tool_item_issue(issue_id: int, db: Session = Depends(get_db)):
     if not issue:
         raise HTTPException(status_code=404, detail="Tool item issue not found")
     title = issue.title
-    crud.delete_tool_item_issue(db, issue)
+    try:
+        crud.delete_tool_item_issue(db, issue)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     return {"message": f"Issue '{title}' wurde gelöscht", "id": issue_id}
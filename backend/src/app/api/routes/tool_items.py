@@ -1,31 +1,62 @@
-import io
-from typing import Optional
+from datetime import datetime
+from operator import itemgetter
+from typing import Literal, Optional
 
-import qrcode
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import Response
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session
 
+from src.app.api.fieldsets import Fieldset
+from src.app.api.serialization import list_response
+from src.app.api.normalization import SHAPE_QUERY, Shape, TOOL_ITEMS, check_shape, normalized_response
+from src.app.api.pagination import PageParams
 from src.app.auth.security import get_current_user, require_role
+from src.app.core import labels
+from src.app.core.config import settings
+from src.app.core.qrcodes import cache_key, payload_for, qr_codes
 from src.app.core.role_ids import ADMIN_ID, MANAGER_ID, EMPLOYEE_ID
 from src.app.db.deps import get_db
+from src.app.models.tool_item import ToolItem
 from src.app.schemas.tool_item import ToolItemCreate, ToolItemUpdate, ToolItemRead, ToolItemHistoryEntry
 import src.app.crud.tool_item as crud
 
 router = APIRouter(tags=["Tool Items"])
 
+# Mit ?v=<schlüssel> ändert sich der Inhalt unter der URL nie; ohne v muss neu geprüft werden
+_QR_IMMUTABLE = "private, max-age=31536000, immutable"
+_QR_REVALIDATE = "private, no-cache"
+
+
+def _etag_matches(if_none_match: Optional[str], key: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == f'"{key}"' for tag in if_none_match.split(","))
+
 
 @router.get("/gettoolitems", response_model=list[ToolItemRead],
             dependencies=[Depends(get_current_user)])
 def list_tool_items(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     tool_id: Optional[int] = None,
     status_id: Optional[int] = None,
     condition_id: Optional[int] = None,
     inventory_no: Optional[str] = None,
+    shape: Shape = SHAPE_QUERY,
+    page: PageParams = Depends(),
+    fieldset: Fieldset = Depends(Fieldset.for_schema(ToolItemRead, ToolItem)),
 ):
-    return crud.get_tool_items(db, tool_id=tool_id, status_id=status_id,
-                               condition_id=condition_id, inventory_no=inventory_no)
+    check_shape(shape, fieldset)
+    items = crud.get_tool_items(db, tool_id=tool_id, status_id=status_id,
+                                condition_id=condition_id, inventory_no=inventory_no,
+                                limit=page.limit, after_id=page.cursor, options=fieldset.options)
+    items = page.finish(items, request, response)
+    if shape == "normalized":
+        return normalized_response(TOOL_ITEMS, items, response)
+    return list_response(fieldset.schema, items, response)
 
 
 @router.get("/gettoolitem/{item_id}", response_model=ToolItemRead,
@@ -39,30 +70,126 @@ def get_tool_item(item_id: int, db: Session = Depends(get_db)):
 
 @router.get("/gettoolitemhistory/{item_id}", response_model=list[ToolItemHistoryEntry],
             dependencies=[Depends(get_current_user)])
-def get_tool_item_history(item_id: int, db: Session = Depends(get_db)):
-    """Chronological loan history for a specific tool item."""
+def get_tool_item_history(
+    item_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    since: Optional[datetime] = Query(None, description="Nur Ausleihen ab diesem Zeitpunkt (issued_at)"),
+    page: PageParams = Depends(),
+):
+    """
+    Chronological loan history for a specific tool item.
+    Paged like the list endpoints; the cursor is the loan_id of the last entry.
+    """
+    item = crud.get_tool_item(db, item_id)
+    if not item:
+        raise HTTPException(status_code=404, detail="Tool item not found")
+    history = crud.get_tool_item_loan_history(db, item_id, since=since, limit=page.limit, after_loan_id=page.cursor)
+    history = page.finish(history, request, response, cursor_of=itemgetter("loan_id"))
+    return list_response(ToolItemHistoryEntry, history, response)
+
+
+@router.get("/exporttoolitemhistory/{item_id}", dependencies=[Depends(get_current_user)])
+def export_tool_item_history(
+    item_id: int,
+    db: Session = Depends(get_db),
+    since: Optional[datetime] = Query(None, description="Nur Ausleihen ab diesem Zeitpunkt (issued_at)"),
+):
+    """Full loan history as NDJSON (one ToolItemHistoryEntry per line), streamed batch by batch."""
     item = crud.get_tool_item(db, item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Tool item not found")
-    return crud.get_tool_item_loan_history(db, item_id)
+
+    def lines():
+        for entry in crud.iter_tool_item_loan_history(db, item_id, since=since):
+            yield ToolItemHistoryEntry.model_validate(entry).model_dump_json() + "\n"
+
+    return StreamingResponse(
+        lines(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{item.inventory_no}-history.ndjson"'},
+    )
 
 
 @router.get("/gettoolitemqrcode/{item_id}", dependencies=[Depends(get_current_user)])
-def get_tool_item_qrcode(item_id: int, db: Session = Depends(get_db)):
-    """Returns a PNG QR code encoding the tool item ID for scanning."""
+def get_tool_item_qrcode(
+    item_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    v: Optional[str] = Query(None, description="Schlüssel des QR-Codes (siehe qrcode_url); macht die URL unveränderlich"),
+):
+    """
+    Returns a PNG QR code encoding the tool item ID for scanning.
+
+    The strong ETag is the hash of the QR payload, so If-None-Match is answered
+    with 304 before anything is rendered. With ?v=<key> the URL is
+    content-addressed and may be cached forever (immutable).
+    """
     item = crud.get_tool_item(db, item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Tool item not found")
 
-    qr = qrcode.QRCode(box_size=10, border=4)
-    qr.add_data(f"tool_item:{item_id}:{item.inventory_no}")
-    qr.make(fit=True)
-    img = qr.make_image(fill_color="black", back_color="white")
+    payload = payload_for(item.id, item.inventory_no)
+    key = cache_key(payload)
+    headers = {
+        "ETag": f'"{key}"',
+        "Cache-Control": _QR_IMMUTABLE if v == key else _QR_REVALIDATE,
+    }
+    if _etag_matches(request.headers.get("if-none-match"), key):
+        return Response(status_code=304, headers=headers)
+
+    # Eigener Pool begrenzt, wie viele Codes gleichzeitig gerendert werden
+    _, png = qr_codes.get_png(payload)
+    return Response(content=png, media_type="image/png", headers=headers)
 
-    buf = io.BytesIO()
-    img.save(buf, format="PNG")
-    buf.seek(0)
-    return Response(content=buf.read(), media_type="image/png")
+
+@router.get("/gettoolitemlabels", dependencies=[Depends(get_current_user)])
+def get_tool_item_labels(
+    db: Session = Depends(get_db),
+    item_ids: Optional[list[int]] = Query(None, description="Exemplare (mehrfach angeben: ?item_ids=1&item_ids=2)"),
+    tool_id: Optional[int] = Query(None, description="Alternativ: alle Exemplare eines Werkzeugs"),
+    format: Literal["pdf", "png"] = "pdf",
+    page: int = Query(1, ge=1, description="Nur für PNG: welche Seite"),
+):
+    """
+    Label sheet (QR code + inventory number) for many tool items.
+    PDF: all pages, streamed page by page. PNG: one page per request, page count in X-Total-Pages.
+    At most MAX_LABELS items per request (413 above).
+    """
+    if (item_ids is None) == (tool_id is None):
+        raise HTTPException(status_code=400, detail="Entweder item_ids oder tool_id angeben")
+    too_many = f"Höchstens {settings.MAX_LABELS} Etiketten pro Anfrage"
+    # Vor der Abfrage prüfen – sonst landet eine beliebig lange ID-Liste im IN (...)
+    if item_ids is not None and len(set(item_ids)) > settings.MAX_LABELS:
+        raise HTTPException(status_code=413, detail=too_many)
+    ids = crud.get_label_item_ids(db, item_ids=item_ids, tool_id=tool_id)
+    if len(ids) > settings.MAX_LABELS:
+        raise HTTPException(status_code=413, detail=too_many)
+    if item_ids is not None and len(ids) != len(set(item_ids)):
+        missing = sorted(set(item_ids) - set(ids))
+        raise HTTPException(status_code=404, detail=f"Exemplare nicht gefunden: {missing}")
+    if not ids:
+        raise HTTPException(status_code=404, detail="Keine Exemplare gefunden")
+
+    chunks = [ids[i:i + labels.LABELS_PER_PAGE] for i in range(0, len(ids), labels.LABELS_PER_PAGE)]
+    headers = {"X-Total-Pages": str(len(chunks))}
+
+    def page_labels(chunk: list[int]) -> list[labels.Label]:
+        return [labels.Label(*row) for row in crud.get_label_rows(db, chunk)]
+
+    if format == "png":
+        if page > len(chunks):
+            raise HTTPException(status_code=404, detail="Seite nicht vorhanden")
+        return Response(content=labels.png_page(page_labels(chunks[page - 1])),
+                        media_type="image/png", headers=headers)
+
+    headers["Content-Disposition"] = 'inline; filename="labels.pdf"'
+    return StreamingResponse(
+        labels.pdf_pages(page_labels(chunk) for chunk in chunks),
+        media_type="application/pdf",
+        headers=headers,
+    )
 
 
 @router.post("/createtoolitem", response_model=ToolItemRead, status_code=201,
@@ -77,7 +204,10 @@ def update_tool_item(item_id: int, data: ToolItemUpdate, db: Session = Depends(g
     item = crud.get_tool_item(db, item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Tool item not found")
-    return crud.update_tool_item(db, item, data)
+    try:
+        return crud.update_tool_item(db, item, data)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
 
 @router.patch("/retiretoolitm/{item_id}", response_model=ToolItemRead,
@@ -100,5 +230,8 @@ def delete_tool_item(item_id: int, db: Session = Depends(get_db)):
     if not item:
         raise HTTPException(status_code=404, detail="Tool item not found")
     inv_no = item.inventory_no
-    crud.delete_tool_item(db, item)
+    try:
+        crud.delete_tool_item(db, item)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     return {"message": f"Werkzeugexemplar '{inv_no}' wurde gelöscht", "id": item_id}
@@ -1,46 +1,54 @@
-import uuid
-from pathlib import Path
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, UploadFile, File, Form, Query, Request, Response
+from sqlalchemy.orm import Session, sessionmaker
 
+from src.app.api.fieldsets import Fieldset
+from src.app.api.pagination import PageParams
+from src.app.api.serialization import list_response
 from src.app.auth.security import get_current_user, require_role
+from src.app.core import images, tool_import
+from src.app.core.config import settings
 from src.app.core.role_ids import ADMIN_ID, MANAGER_ID, EMPLOYEE_ID
 from src.app.db.deps import get_db
 from src.app.schemas.tool import ToolCreate, ToolUpdate, ToolRead
+from src.app.schemas.tool_import import ImportFormat, ToolImportResult
 from src.app.models.tool import Tool
 import src.app.crud.tool as crud
 
-UPLOAD_DIR = Path("static/tool_images")
-ALLOWED_TYPES = {"image/jpeg", "image/png", "image/webp", "image/gif"}
-
 router = APIRouter(tags=["Tools"])
 
 
-def _save_image(tool: Tool, file: UploadFile, db: Session) -> None:
-    """Speichert eine Bilddatei auf der Festplatte und aktualisiert die DB."""
-    if file.content_type not in ALLOWED_TYPES:
+def _save_image(tool: Tool, file: UploadFile, db: Session, background_tasks: BackgroundTasks) -> None:
+    """
+    Speichert eine Bilddatei blockweise unter ihrem SHA-256-Hash und aktualisiert die DB.
+    Gleiche Bilder werden nur einmal abgelegt; die WebP-Varianten entstehen danach
+    im Hintergrund (core/images.py).
+    """
+    if file.content_type not in images.EXTENSIONS:
         raise HTTPException(status_code=400, detail="Nur Bilddateien erlaubt (jpeg, png, webp, gif)")
-    ext = file.filename.rsplit(".", 1)[-1] if "." in file.filename else "jpg"
-    filename = f"{tool.id}_{uuid.uuid4().hex}.{ext}"
-    UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
-    if tool.image_filename:
-        old = UPLOAD_DIR / tool.image_filename
-        if old.exists():
-            old.unlink()
-    (UPLOAD_DIR / filename).write_bytes(file.file.read())
-    crud.set_tool_image(db, tool, filename)
+    try:
+        staged = images.stage_upload(file.file, settings.TOOL_IMAGE_MAX_BYTES)
+    except images.ImageTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    if images.assign_tool_image(db, tool, staged, file.content_type):
+        background_tasks.add_task(images.build_variants, sessionmaker(bind=db.get_bind()), tool.image_filename)
 
 
 @router.get("/gettools", response_model=list[ToolRead],
             dependencies=[Depends(get_current_user)])
 def list_tools(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     name: Optional[str] = None,
     category_id: Optional[int] = None,
+    page: PageParams = Depends(),
+    fieldset: Fieldset = Depends(Fieldset.for_schema(ToolRead, Tool)),
 ):
-    return crud.get_tools(db, name=name, category_id=category_id)
+    tools = crud.get_tools(db, name=name, category_id=category_id,
+                           limit=page.limit, after_id=page.cursor, options=fieldset.options)
+    return list_response(fieldset.schema, page.finish(tools, request, response), response)
 
 
 @router.get("/gettool/{tool_id}", response_model=ToolRead,
@@ -55,6 +63,7 @@ def get_tool(tool_id: int, db: Session = Depends(get_db)):
 @router.post("/createtool", response_model=ToolRead, status_code=201,
              dependencies=[Depends(require_role(ADMIN_ID))])
 def create_tool(
+    background_tasks: BackgroundTasks,
     tool_name: str = Form(...),
     category_id: int = Form(...),
     description: Optional[str] = Form(None),
@@ -64,15 +73,33 @@ def create_tool(
     data = ToolCreate(tool_name=tool_name, description=description, category_id=category_id)
     tool = crud.create_tool(db, data)
     if image and image.filename:
-        _save_image(tool, image, db)
+        _save_image(tool, image, db, background_tasks)
         db.refresh(tool)
     return tool
 
 
+@router.post("/importtools", response_model=ToolImportResult,
+             dependencies=[Depends(require_role(ADMIN_ID))])
+def import_tools(
+    file: UploadFile = File(...),
+    fmt: Optional[ImportFormat] = Query(None, alias="format"),
+    db: Session = Depends(get_db),
+):
+    """
+    Only ADMIN: creates tools and tool items from a CSV or NDJSON file (row format
+    in core/tool_import.py). Invalid rows are reported by line number and skipped.
+    """
+    fmt = fmt or tool_import.detect_format(file.filename)
+    if fmt is None:
+        raise HTTPException(status_code=400, detail="Dateiformat nicht erkennbar – format=csv oder format=ndjson angeben")
+    return tool_import.import_file(db, tool_import.open_text(file.file), fmt)
+
+
 @router.patch("/updatetool/{tool_id}", response_model=ToolRead,
               dependencies=[Depends(require_role(ADMIN_ID))])
 def update_tool(
     tool_id: int,
+    background_tasks: BackgroundTasks,
     tool_name: Optional[str] = Form(None),
     category_id: Optional[int] = Form(None),
     description: Optional[str] = Form(None),
@@ -91,7 +118,7 @@ def update_tool(
         update_fields["category_id"] = category_id
     tool = crud.update_tool(db, tool, ToolUpdate(**update_fields))
     if image and image.filename:
-        _save_image(tool, image, db)
+        _save_image(tool, image, db, background_tasks)
         db.refresh(tool)
     return tool
 
@@ -102,18 +129,24 @@ def delete_tool(tool_id: int, db: Session = Depends(get_db)):
     tool = crud.get_tool(db, tool_id)
     if not tool:
         raise HTTPException(status_code=404, detail="Tool not found")
-    name = tool.tool_name
+    name, image = tool.tool_name, tool.image_filename
     crud.delete_tool(db, tool)
+    images.release_tool_image(db, image)
     return {"message": f"Werkzeug '{name}' wurde gelöscht", "id": tool_id}
 
 
 @router.post("/uploadtoolimage/{tool_id}", response_model=ToolRead,
              dependencies=[Depends(require_role(ADMIN_ID))])
-def upload_tool_image(tool_id: int, file: UploadFile = File(...), db: Session = Depends(get_db)):
+def upload_tool_image(
+    tool_id: int,
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+):
     tool = crud.get_tool(db, tool_id)
     if not tool:
         raise HTTPException(status_code=404, detail="Tool not found")
-    _save_image(tool, file, db)
+    _save_image(tool, file, db, background_tasks)
     db.refresh(tool)
     return tool
 
@@ -124,9 +157,5 @@ def delete_tool_image(tool_id: int, db: Session = Depends(get_db)):
     tool = crud.get_tool(db, tool_id)
     if not tool:
         raise HTTPException(status_code=404, detail="Tool not found")
-    if tool.image_filename:
-        path = UPLOAD_DIR / tool.image_filename
-        if path.exists():
-            path.unlink()
-    crud.set_tool_image(db, tool, None)
+    images.assign_tool_image(db, tool, None)
     return {"message": f"Bild von Werkzeug '{tool.tool_name}' wurde gelöscht", "id": tool_id}
@@ -1,40 +1,49 @@
 import random
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 
+from src.app.api.fieldsets import Fieldset
+from src.app.api.pagination import PageParams
+from src.app.api.serialization import list_response
+from src.app.auth.principal import Principal
 from src.app.auth.security import get_current_user, require_role
 from src.app.core.role_ids import ADMIN_ID
 from src.app.db.deps import get_db
-from src.app.models.user import User
 from src.app.models.role import Role
+from src.app.models.user import User
 from src.app.models.department import Department
 from src.app.schemas.user import UserCreate, UserUpdate, UserRead
 import src.app.crud.user as crud
 import src.app.crud.department as crud_dept
+from src.app.crud import lookups
 
 router = APIRouter(tags=["Users"])
 
 
 def _role_id_by_name(db: Session, name: str) -> Optional[int]:
-    role = db.query(Role).filter(Role.name == name).first()
-    return role.id if role else None
+    return lookups.get_id(db, Role, name)
 
 
 @router.get("/getusers", response_model=list[UserRead])
 def list_users(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
-    _: User = Depends(get_current_user),
+    _: Principal = Depends(get_current_user),
+    page: PageParams = Depends(),
+    fieldset: Fieldset = Depends(Fieldset.for_schema(UserRead, User)),
 ):
-    return crud.get_users(db)
+    users = crud.get_users(db, limit=page.limit, after_id=page.cursor, options=fieldset.options)
+    return list_response(fieldset.schema, page.finish(users, request, response), response)
 
 
 @router.get("/getuser/{user_id}", response_model=UserRead)
 def get_user(
     user_id: int,
     db: Session = Depends(get_db),
-    _: User = Depends(get_current_user),
+    _: Principal = Depends(get_current_user),
 ):
     user = crud.get_user(db, user_id)
     if not user:
@@ -46,11 +55,11 @@ def get_user(
 def create_user(
     data: UserCreate,
     db: Session = Depends(get_db),
-    _: User = Depends(require_role(ADMIN_ID)),
+    _: Principal = Depends(require_role(ADMIN_ID)),
 ):
     """Only ADMIN may create new user accounts."""
-    role = db.get(Role, data.role_id)
-    if not role:
+    role_name = lookups.get_name(db, Role, data.role_id)
+    if role_name is None:
         raise HTTPException(status_code=404, detail=f"Rolle mit ID {data.role_id} nicht gefunden")
     dept = db.get(Department, data.department_id)
     if not dept:
@@ -61,7 +70,7 @@ def create_user(
     new_user = crud.create_user(db, data)
 
     # Wenn neuer Nutzer DEPARTMENT_MANAGER ist → alten Leiter der Abteilung demoten
-    if role.name == "DEPARTMENT_MANAGER":
+    if role_name == "DEPARTMENT_MANAGER":
         employee_role_id = _role_id_by_name(db, "EMPLOYEE")
         if dept.lead_user_id and dept.lead_user_id != new_user.id:
             old_lead = crud.get_user(db, dept.lead_user_id)
@@ -79,7 +88,7 @@ def update_user(
     user_id: int,
     data: UserUpdate,
     db: Session = Depends(get_db),
-    _: User = Depends(require_role(ADMIN_ID)),
+    _: Principal = Depends(require_role(ADMIN_ID)),
 ):
     """Only ADMIN may update user accounts."""
     user = crud.get_user(db, user_id)
@@ -91,13 +100,13 @@ def update_user(
             raise HTTPException(status_code=409, detail="Email address already in use")
 
     if "role_id" in data.model_fields_set or "department_id" in data.model_fields_set:
-        current_role = db.get(Role, user.role_id)
-        new_role = db.get(Role, data.role_id if "role_id" in data.model_fields_set else user.role_id)
+        current_role = lookups.get_name(db, Role, user.role_id)
+        new_role = lookups.get_name(db, Role, data.role_id if "role_id" in data.model_fields_set else user.role_id)
         old_dept_id = user.department_id
         new_dept_id = data.department_id if "department_id" in data.model_fields_set else user.department_id
 
-        was_manager = current_role and current_role.name == "DEPARTMENT_MANAGER"
-        becomes_manager = new_role and new_role.name == "DEPARTMENT_MANAGER"
+        was_manager = current_role == "DEPARTMENT_MANAGER"
+        becomes_manager = new_role == "DEPARTMENT_MANAGER"
         dept_changed = old_dept_id != new_dept_id
 
         manager_role_id = _role_id_by_name(db, "DEPARTMENT_MANAGER")
@@ -134,7 +143,7 @@ def update_user(
 def delete_user(
     user_id: int,
     db: Session = Depends(get_db),
-    _: User = Depends(require_role(ADMIN_ID)),
+    _: Principal = Depends(require_role(ADMIN_ID)),
 ):
     """Only ADMIN may delete user accounts."""
     user = crud.get_user(db, user_id)
@@ -0,0 +1,55 @@
+# ============================================================
+# api/serialization.py – Schneller Serialisierungsweg für Listen
+#
+# Standardweg von FastAPI bei response_model=list[XRead] und ORM-Objekten:
+#   1. Validierung ORM -> Pydantic (im Threadpool)
+#   2. Dump in dicts/lists (mode="json")
+#   3. json.dumps dieser dicts zu Bytes (JSONResponse)
+#
+# list_response() macht daraus einen Durchgang im Endpunkt selbst:
+#   - ORM-Objekte -> Modelle über einen einmal pro Schema erzeugten und
+#     gecachten TypeAdapter(list[Schema]) (from_attributes)
+#   - Modelle -> JSON-Bytes direkt in pydantic-core (dump_json), ohne
+#     Zwischenschritt über dicts
+#   - Rückgabe als fertige Response: FastAPI validiert sie nicht noch einmal.
+#     response_model bleibt am Endpunkt stehen (Dokumentation/OpenAPI).
+#
+# Alle übrigen Antworten (einzelne Objekte) rendert ORJSONResponse
+# (default_response_class in main.py) statt json.dumps.
+# ============================================================
+
+from functools import lru_cache
+from typing import Any, Iterable, Optional
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+
+# Begrenzt: mit ?fields= (api/fieldsets.py) entstehen Schemas je Client-Auswahl
+@lru_cache(maxsize=1024)
+def list_adapter(schema: type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(list[schema])
+
+
+def dump_list(schema: type[BaseModel], rows: Iterable[Any]) -> bytes:
+    """Validates ORM rows against schema once and returns the JSON array as bytes."""
+    adapter = list_adapter(schema)
+    return adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+
+
+def json_response(body: bytes, response: Optional[Response] = None) -> Response:
+    """
+    Wraps ready JSON bytes. `response` is the Response injected into the endpoint:
+    headers set there (e.g. pagination by PageParams.finish) are carried over.
+    """
+    result = Response(body, media_type="application/json")
+    if response is not None:
+        result.raw_headers.extend(
+            (key, value) for key, value in response.raw_headers if key not in (b"content-length", b"content-type")
+        )
+    return result
+
+
+def list_response(schema: type[BaseModel], rows: Iterable[Any], response: Optional[Response] = None) -> Response:
+    """JSON response for a list endpoint (see json_response for `response`)."""
+    return json_response(dump_list(schema, rows), response)
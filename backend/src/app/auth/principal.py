@@ -0,0 +1,122 @@
+# ============================================================
+# principal.py – Eingeloggter Benutzer als leichtgewichtiges Objekt
+#
+# Für die Rechteprüfung reichen id, role_id, department_id und is_active.
+# Statt bei jeder Anfrage das komplette User-Objekt zu laden, hält dieser
+# Cache kleine Principal-Objekte:
+#
+#   - LRU mit Obergrenze (PRINCIPAL_CACHE_SIZE Einträge)
+#   - jeder Eintrag ist nur PRINCIPAL_CACHE_TTL_SECONDS gültig
+#   - jede committete Änderung oder Löschung eines Users entfernt dessen
+#     Eintrag sofort (Session-Events, siehe unten). Das deckt update_user,
+#     delete_user und auch die Nebenwirkungen von update_department und
+#     delete_department ab (Leiter-Wechsel, Mitglieder in andere Abteilung).
+#
+# Rolle und Abteilung stehen zwar auch im JWT, werden aber bewusst NICHT
+# aus dem Token übernommen: Ändert ein Admin die Rolle oder deaktiviert den
+# Benutzer, soll das nicht erst mit Ablauf des Tokens wirken.
+# ============================================================
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from src.app.core.config import settings
+from src.app.models.user import User
+
+
+@dataclass(frozen=True)
+class Principal:
+    id: int
+    role_id: int
+    department_id: Optional[int]
+    is_active: bool
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        return cls(
+            id=user.id,
+            role_id=user.role_id,
+            department_id=user.department_id,
+            is_active=user.is_active,
+        )
+
+
+class PrincipalCache:
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # user_id -> (Ablaufzeitpunkt laut time.monotonic(), Principal)
+        self._entries: "OrderedDict[int, tuple[float, Principal]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, user_id: int) -> Optional[Principal]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires, principal = entry
+            if expires <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return principal
+
+    def put(self, principal: Principal) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[principal.id] = (time.monotonic() + self.ttl_seconds, principal)
+            self._entries.move_to_end(principal.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Globale Instanz – wird von get_current_user verwendet
+principal_cache = PrincipalCache(
+    max_size=settings.PRINCIPAL_CACHE_SIZE,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+# ---------------------------------------------------------------------------
+# Invalidierung: geänderte/gelöschte User nach dem Commit aus dem Cache entfernen
+# ---------------------------------------------------------------------------
+
+_STALE_KEY = "principal_cache_stale_user_ids"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session, _flush_context):
+    # In after_flush enthalten dirty/deleted noch den Stand vor dem Flush
+    stale = session.info.setdefault(_STALE_KEY, set())
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User) and obj.id is not None:
+            stale.add(obj.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session):
+    for user_id in session.info.pop(_STALE_KEY, ()):
+        principal_cache.invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session):
+    session.info.pop(_STALE_KEY, None)
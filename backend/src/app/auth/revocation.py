@@ -0,0 +1,162 @@
+# ============================================================
+# revocation.py – Gesperrte Tokens im Arbeitsspeicher prüfen
+#
+# get_current_user muss bei JEDER Anfrage wissen, ob der Token per Logout
+# gesperrt wurde. Statt dafür jedes Mal die Tabelle blacklisted_tokens
+# abzufragen, hält dieses Modul die gesperrten Tokens im Speicher:
+#
+#   - Bloom-Filter: beantwortet "sicher NICHT gesperrt" ohne Hash-Lookup
+#     (der Normalfall – fast kein Token ist gesperrt).
+#   - Exakte Menge (SHA-256 → Ablaufzeit): entscheidet bei einem Treffer
+#     im Bloom-Filter endgültig (Bloom-Filter können falsch-positiv sein).
+#   - Heap nach Ablaufzeit: abgelaufene Einträge werden der Reihe nach
+#     entfernt; danach wird der Bloom-Filter neu aufgebaut.
+#
+# Beim Start (main.lifespan) wird der Cache aus blacklisted_tokens geladen,
+# /auth/logout trägt neue Tokens ein. Gespeichert wird nur der SHA-256-Hash
+# des Tokens, nie der Token selbst.
+#
+# Der Cache gilt pro Prozess. Damit ein Logout auf einem Worker auch auf
+# den anderen Workern greift, holt der Wartungsjob sync_revoked_tokens alle
+# MAINTENANCE_REVOCATION_SYNC_INTERVAL_SECONDS die seit dem letzten Abgleich
+# neuen Zeilen nach (sync(): nur id > zuletzt gesehene id, ein Index-Lookup).
+# Die ids steigen streng (AUTOINCREMENT, models/blacklisted_token.py) – auch
+# nachdem cleanup_expired_tokens die Tabelle geleert hat.
+# Mehrere Worker setzen deshalb MAINTENANCE_ENABLED=true voraus.
+# ============================================================
+
+import hashlib
+import heapq
+import threading
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+
+def token_hash(token: str) -> str:
+    """SHA-256 des Tokens als Hex-String (64 Zeichen) – Schlüssel in DB und Cache."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite liefert DateTime-Spalten ohne Zeitzone zurück
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+class BloomFilter:
+    """Einfacher Bloom-Filter über die Bytes eines SHA-256-Hashes."""
+
+    def __init__(self, size_bits: int = 1 << 16, hash_count: int = 4):
+        self.size_bits = size_bits
+        self.hash_count = hash_count
+        self._bits = bytearray(size_bits // 8)
+
+    def _positions(self, digest_hex: str):
+        # Der SHA-256-Hash ist bereits gleichverteilt: je 4 Bytes ergeben eine Position
+        digest = bytes.fromhex(digest_hex)
+        for i in range(self.hash_count):
+            yield int.from_bytes(digest[i * 4:(i + 1) * 4], "big") % self.size_bits
+
+    def add(self, digest_hex: str) -> None:
+        for pos in self._positions(digest_hex):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, digest_hex: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(digest_hex))
+
+
+class RevocationCache:
+    def __init__(self, size_bits: int = 1 << 16, hash_count: int = 4):
+        self._size_bits = size_bits
+        self._hash_count = hash_count
+        self._lock = threading.Lock()
+        self._bloom = BloomFilter(size_bits, hash_count)
+        self._expires: dict[str, datetime] = {}
+        self._heap: list[tuple[datetime, str]] = []
+        # Höchste bereits übernommene blacklisted_tokens.id (für sync)
+        self._last_id = 0
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._bloom = BloomFilter(self._size_bits, self._hash_count)
+            self._expires.clear()
+            self._heap.clear()
+            self._last_id = 0
+
+    def warm(self, db: Session) -> None:
+        """Replaces the cache contents with the non-expired rows of blacklisted_tokens."""
+        from src.app.models.blacklisted_token import BlacklistedToken
+
+        now = datetime.now(tz=timezone.utc)
+        rows = db.query(BlacklistedToken.id, BlacklistedToken.token_hash, BlacklistedToken.expires_at).all()
+        with self._lock:
+            self._bloom = BloomFilter(self._size_bits, self._hash_count)
+            self._expires = {}
+            self._last_id = max((id_ for id_, _, _ in rows), default=0)
+            for _, digest, expires_at in rows:
+                expires_at = _as_utc(expires_at)
+                if expires_at > now:
+                    self._expires[digest] = expires_at
+                    self._bloom.add(digest)
+            self._heap = [(exp, digest) for digest, exp in self._expires.items()]
+            heapq.heapify(self._heap)
+
+    def sync(self, db: Session) -> int:
+        """Adds rows of blacklisted_tokens written since the last warm()/sync() (e.g. by other workers)."""
+        from src.app.models.blacklisted_token import BlacklistedToken
+
+        rows = (
+            db.query(BlacklistedToken.id, BlacklistedToken.token_hash, BlacklistedToken.expires_at)
+            .filter(BlacklistedToken.id > self._last_id)
+            .order_by(BlacklistedToken.id)
+            .all()
+        )
+        added = 0
+        for id_, digest, expires_at in rows:
+            if digest not in self._expires:
+                self.add(digest, expires_at)
+                added += 1
+        if rows:
+            with self._lock:
+                self._last_id = max(self._last_id, rows[-1].id)
+        return added
+
+    def add(self, digest: str, expires_at: datetime) -> None:
+        expires_at = _as_utc(expires_at)
+        with self._lock:
+            self._expires[digest] = expires_at
+            heapq.heappush(self._heap, (expires_at, digest))
+            self._bloom.add(digest)
+
+    def is_revoked(self, digest: str, now: Optional[datetime] = None) -> bool:
+        if digest not in self._bloom:
+            return False
+        expires_at = self._expires.get(digest)
+        if expires_at is None:
+            return False  # falsch-positiv im Bloom-Filter
+        return expires_at > (now or datetime.now(tz=timezone.utc))
+
+    def purge_expired(self, now: Optional[datetime] = None) -> int:
+        """Drops expired entries in expiry order and rebuilds the Bloom filter. Returns the count."""
+        now = now or datetime.now(tz=timezone.utc)
+        removed = 0
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                expires_at, digest = heapq.heappop(self._heap)
+                if self._expires.get(digest) == expires_at:
+                    del self._expires[digest]
+                    removed += 1
+            if removed:
+                bloom = BloomFilter(self._size_bits, self._hash_count)
+                for digest in self._expires:
+                    bloom.add(digest)
+                self._bloom = bloom
+        return removed
+
+
+# Globale Instanz – wird von get_current_user und /auth/logout verwendet
+revoked_tokens = RevocationCache()
@@ -75,8 +75,10 @@ def logout(
     Logout: Sperrt den aktuellen Token durch Eintrag in die Blacklist.
 
     Da JWTs zustandslos sind, kann man sie nicht "löschen".
-    Stattdessen wird der Token in der blacklisted_tokens-Tabelle gespeichert.
+    Stattdessen wird der SHA-256-Hash des Tokens in der blacklisted_tokens-Tabelle
+    gespeichert und in den Sperr-Cache im Speicher eingetragen.
     Bei jeder Anfrage prüft get_current_user ob der Token gesperrt ist.
+    Ein zweiter Logout mit demselben Token ist unschädlich.
     Der Token wird mit seiner originalen Ablaufzeit gespeichert,
     damit abgelaufene Einträge irgendwann bereinigt werden können.
     """
@@ -4,6 +4,7 @@
 # Enthält:
 #   - Passwort-Verifikation (bcrypt)
 #   - get_current_user: FastAPI-Dependency, die aus dem Token den eingeloggten User liest
+#     (als Principal aus dem Principal-Cache, siehe principal.py)
 #   - require_role: Factory-Dependency, die den Zugriff auf bestimmte Rollen beschränkt
 # ============================================================
 
@@ -14,6 +15,7 @@ from passlib.context import CryptContext
 from sqlalchemy.orm import Session
 
 from src.app.auth.jwt import decode_token
+from src.app.auth.principal import Principal, principal_cache
 from src.app.db.deps import get_db
 from src.app.models.user import User
 
@@ -35,19 +37,22 @@ def verify_password(plain: str, hashed: str) -> bool:
 def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db),
-) -> User:
+) -> Principal:
     """
     FastAPI-Dependency – wird in jedem geschützten Endpunkt verwendet.
 
     Ablauf:
       1. Bearer-Token aus dem Authorization-Header lesen
       2. JWT-Signatur und Ablaufzeit prüfen
-      3. Prüfen ob Token gesperrt (Blacklist, nach Logout)
-      4. Benutzer aus der Datenbank laden
+      3. Prüfen ob Token gesperrt (Blacklist im Speicher, nach Logout)
+      4. Benutzer aus dem Principal-Cache lesen (nur bei Cache-Miss aus der Datenbank)
       5. Prüfen ob Benutzer aktiv ist
 
+    Die Session aus get_db öffnet erst bei der ersten Abfrage eine Verbindung –
+    bei einem Cache-Treffer wird die Datenbank also gar nicht berührt.
+
     Returns:
-        Den eingeloggten User (SQLAlchemy-Objekt)
+        Den eingeloggten Benutzer als Principal (id, role_id, department_id, is_active)
 
     Raises:
         401 Unauthorized: Wenn Token ungültig, abgelaufen oder gesperrt ist
@@ -67,20 +72,26 @@ def get_current_user(
     except JWTError:
         raise exc
 
-    # Prüfen ob Token durch Logout gesperrt wurde
+    # Prüfen ob Token durch Logout gesperrt wurde (Speicher-Cache, keine DB-Abfrage)
     from src.app.crud.blacklisted_token import is_token_blacklisted
-    if is_token_blacklisted(db, token):
+    if is_token_blacklisted(token):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token has been revoked",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Benutzer aus der Datenbank laden und auf Aktiv-Status prüfen
-    user = db.get(User, int(user_id))
-    if user is None or not user.is_active:
+    # Benutzer aus dem Cache bzw. der Datenbank laden und auf Aktiv-Status prüfen
+    principal = principal_cache.get(int(user_id))
+    if principal is None:
+        user = db.get(User, int(user_id))
+        if user is None:
+            raise exc
+        principal = Principal.from_user(user)
+        principal_cache.put(principal)
+    if not principal.is_active:
         raise exc
-    return user
+    return principal
 
 
 def require_role(*role_ids: int):
@@ -93,7 +104,7 @@ def require_role(*role_ids: int):
 
     Wirft HTTP 403 Forbidden, wenn der eingeloggte Benutzer keine der erlaubten Rollen hat.
     """
-    def _dependency(current_user: User = Depends(get_current_user)) -> User:
+    def _dependency(current_user: Principal = Depends(get_current_user)) -> Principal:
         if current_user.role_id not in role_ids:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
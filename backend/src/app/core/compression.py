@@ -0,0 +1,116 @@
+# ============================================================
+# core/compression.py – Antworten komprimieren (brotli / gzip)
+#
+# Listen wie /getloans enthalten Tool, Kategorie, Status usw. in jedem
+# Eintrag erneut – solches JSON schrumpft komprimiert auf einen Bruchteil.
+#
+#   - Kodierung nach Accept-Encoding (mit q-Werten): brotli, falls das
+#     Paket "brotli" installiert ist, sonst gzip, sonst unverändert.
+#   - Nur Antworten ab COMPRESSION_MINIMUM_SIZE Bytes und nur
+#     komprimierbare Typen (JSON, NDJSON, Text, SVG …). PNG/WebP/PDF
+#     (QR-Codes, Etiketten, Werkzeugbilder) sind schon komprimiert und
+#     bleiben unangetastet, ebenso Antworten mit eigenem Content-Encoding
+#     (vorkomprimierte statische Dateien) und Teilantworten (206).
+#   - Streamende Antworten (z.B. NDJSON-Export) werden blockweise
+#     komprimiert, nichts wird komplett gepuffert.
+#
+# Baut auf Starlettes GZipMiddleware (Responder-Klassen) auf.
+# ============================================================
+
+from typing import Optional
+
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipResponder, IdentityResponder
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional – ohne das Paket wird nur gzip angeboten
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "application/problem+json",
+    "image/svg+xml",
+    "text/",
+)
+
+
+def is_compressible(content_type: str) -> bool:
+    return content_type.split(";", 1)[0].strip().lower().startswith(COMPRESSIBLE_TYPES)
+
+
+def choose_encoding(accept_encoding: str, brotli_available: bool = brotli is not None) -> Optional[str]:
+    """Best supported encoding from an Accept-Encoding header ("br", "gzip" or None)."""
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, *params = [p.strip() for p in part.split(";")]
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if name:
+            weights[name.lower()] = q
+    candidates = ["br", "gzip"] if brotli_available else ["gzip"]
+    best = max(candidates, key=lambda enc: weights.get(enc, weights.get("*", 0.0)))
+    return best if weights.get(best, weights.get("*", 0.0)) > 0 else None
+
+
+class _SelectiveMixin:
+    """Passes non-compressible types and partial responses through unchanged."""
+
+    async def send_with_compression(self, message: Message) -> None:
+        await super().send_with_compression(message)
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            if message["status"] == 206 or not is_compressible(headers.get("content-type", "")):
+                self.content_type_is_excluded = True
+
+
+class _IdentityResponder(_SelectiveMixin, IdentityResponder):
+    pass
+
+
+class _GZipResponder(_SelectiveMixin, GZipResponder):
+    pass
+
+
+class _BrotliResponder(_SelectiveMixin, IdentityResponder):
+    content_encoding = "br"
+
+    def __init__(self, app: ASGIApp, minimum_size: int, quality: int):
+        super().__init__(app, minimum_size)
+        self.compressor = brotli.Compressor(quality=quality)
+
+    def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        out = self.compressor.process(body)
+        # Beim Streamen jeden Block sofort ausgeben (z.B. NDJSON zeilenweise beim Client)
+        return out + (self.compressor.flush() if more_body else self.compressor.finish())
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = 1000, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding == "br":
+            responder = _BrotliResponder(self.app, self.minimum_size, self.brotli_quality)
+        elif encoding == "gzip":
+            responder = _GZipResponder(self.app, self.minimum_size, compresslevel=self.gzip_level)
+        else:
+            responder = _IdentityResponder(self.app, self.minimum_size)
+        await responder(scope, receive, send)
@@ -17,6 +17,52 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str               # Algorithmus (normalerweise "HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int # Wie lange ein Token gültig ist (z.B. 60 Minuten)
 
+    # SQLite-Performance-Profil (siehe db/session.py) – False = nur foreign_keys + busy_timeout
+    SQLITE_PERFORMANCE_PROFILE: bool = True
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024  # Bytes
+    SQLITE_CACHE_SIZE_KB: int = 64 * 1024      # pro Verbindung
+    SQLITE_TEMP_STORE: str = "MEMORY"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+
+    # Verbindungspool für dateibasierte Datenbanken
+    DB_POOL_SIZE: int = 10     # dauerhaft offene Verbindungen
+    DB_MAX_OVERFLOW: int = 20  # zusätzliche Verbindungen bei Lastspitzen
+
+    # Cache für eingeloggte Benutzer (siehe auth/principal.py)
+    PRINCIPAL_CACHE_SIZE: int = 1024         # Maximale Anzahl gecachter Benutzer
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 30  # Wie lange ein Eintrag ohne DB-Abfrage gilt
+
+    # Wartungsjobs (siehe core/maintenance.py) – Intervalle in Sekunden, 0 = Job aus
+    MAINTENANCE_ENABLED: bool = True
+    MAINTENANCE_TOKEN_PURGE_INTERVAL_SECONDS: float = 3600
+    MAINTENANCE_REVOCATION_SYNC_INTERVAL_SECONDS: float = 5  # Logouts anderer Worker übernehmen
+    MAINTENANCE_OVERDUE_REFRESH_INTERVAL_SECONDS: float = 60
+    MAINTENANCE_SQLITE_OPTIMIZE_INTERVAL_SECONDS: float = 24 * 3600
+    MAINTENANCE_AVAILABILITY_REBUILD_INTERVAL_SECONDS: float = 24 * 3600
+    MAINTENANCE_IMAGE_VARIANTS_INTERVAL_SECONDS: float = 3600
+    MAINTENANCE_IMAGE_GC_INTERVAL_SECONDS: float = 24 * 3600
+
+    # QR-Codes der Exemplare (siehe core/qrcodes.py)
+    QR_CACHE_SIZE: int = 512               # Anzahl PNGs im Speicher-Cache
+    QR_CACHE_DIR: str = "cache/qrcodes"    # Festplatten-Cache, leer = aus
+    QR_RENDER_WORKERS: int = 2             # Threads zum Rendern
+    LABEL_RENDER_PROCESSES: int = 2        # Prozesse für Etikettenbögen, 0 = Thread-Pool
+    MAX_LABELS: int = 1000                 # mehr Exemplare pro Etikettenbogen -> 413
+
+    # Komprimierung der Antworten (siehe core/compression.py)
+    COMPRESSION_MINIMUM_SIZE: int = 1000   # kleinere Antworten bleiben unkomprimiert (Bytes)
+    COMPRESSION_GZIP_LEVEL: int = 6        # 1 (schnell) … 9 (klein)
+    COMPRESSION_BROTLI_QUALITY: int = 4    # 0 … 11, nur mit installiertem "brotli"
+
+    # Werkzeugbilder (siehe core/images.py)
+    TOOL_IMAGE_MAX_BYTES: int = 10 * 1024 * 1024  # größere Uploads werden mit 413 abgelehnt
+    TOOL_IMAGE_GC_GRACE_SECONDS: float = 3600      # so junge Dateien räumt der GC nie weg
+
+    # Massenimport von Werkzeugen/Exemplaren (siehe core/tool_import.py)
+    TOOL_IMPORT_CHUNK_SIZE: int = 500  # Zeilen pro Block (eine Transaktion)
+
     # Startwerte für den ersten Admin-Benutzer – werden beim ersten Start in die DB eingetragen
     SEED_MANAGER_EMAIL: str
     SEED_MANAGER_PASSWORD: str
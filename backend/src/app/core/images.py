@@ -0,0 +1,240 @@
+# ============================================================
+# core/images.py – Werkzeugbilder speichern und Varianten erzeugen
+#
+# Inhaltsadressierter Speicher: jede Datei heißt <sha256>.<endung>.
+# Gleiche Bilder (z.B. dasselbe Produktfoto für viele Werkzeuge) liegen
+# nur einmal auf der Festplatte und im Browser-Cache, und ein Dateiname
+# zeigt nie auf einen anderen Inhalt.
+#
+#   - Uploads werden in Blöcken (CHUNK_SIZE) in eine temporäre Datei im
+#     Bildordner geschrieben und dabei gehasht. Über TOOL_IMAGE_MAX_BYTES
+#     wird sofort abgebrochen – die Datei liegt nie komplett im Speicher.
+#   - Referenzzählung über tools.image_filename (indiziert): eine Datei wird
+#     erst gelöscht, wenn kein Werkzeug mehr auf sie zeigt. Umstellen der
+#     Referenz und Löschen laufen unter einem gemeinsamen Lock.
+#   - Nach dem Upload erzeugt ein Hintergrund-Task (FastAPI BackgroundTasks)
+#     kleinere WebP-Varianten (VARIANTS: Name -> maximale Kantenlänge) und
+#     setzt danach tools.image_variants_ready für alle Werkzeuge mit diesem
+#     Bild. Bis dahin liefert ToolRead für alle Größen das Original aus.
+#     Existieren die Varianten schon (Duplikat), entfällt der Task.
+#   - collect_garbage() entfernt Dateien ohne Referenz und liegengebliebene
+#     temporäre Dateien (Wartungsjob purge_unreferenced_images). Dateien, die
+#     jünger als TOOL_IMAGE_GC_GRACE_SECONDS sind, bleiben liegen – so kommt sich
+#     der Job auch aus einem anderen Prozess (CLI) nicht mit Uploads in die Quere.
+#   - Bilder ohne Varianten (z.B. aus der Zeit vor diesem Modul) holt der
+#     Wartungsjob build_image_variants nach (siehe core/maintenance.py).
+# ============================================================
+
+import hashlib
+import logging
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+from sqlalchemy.orm import Session
+
+from src.app.models.tool import Tool
+
+logger = logging.getLogger(__name__)
+
+IMAGE_DIR = Path("static/tool_images")
+IMAGE_URL_PREFIX = "/static/tool_images"
+CHUNK_SIZE = 64 * 1024
+VARIANTS = {"thumb": 320, "medium": 1024}
+WEBP_QUALITY = 80
+TMP_SUFFIX = ".tmp"
+
+# Content-Type -> Dateiendung (bestimmt auch die erlaubten Uploads)
+EXTENSIONS = {"image/jpeg": "jpg", "image/png": "png", "image/webp": "webp", "image/gif": "gif"}
+
+# Schützt "Referenz umstellen + Datei ablegen" gegen "Referenzen zählen + Datei löschen"
+_store_lock = threading.Lock()
+
+
+class ImageTooLarge(ValueError):
+    pass
+
+
+@dataclass
+class StagedImage:
+    """A fully received upload in a temp file, not yet visible under its final name."""
+    path: Path
+    sha256: str
+    size: int
+
+    def filename(self, content_type: str) -> str:
+        return f"{self.sha256}.{EXTENSIONS[content_type]}"
+
+    def discard(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+
+def _tmp_path(path: Path) -> Path:
+    return path.with_name(f".{path.name}.{uuid.uuid4().hex}{TMP_SUFFIX}")
+
+
+def stage_upload(source: BinaryIO, max_bytes: int) -> StagedImage:
+    """Streams an upload into a temp file while hashing it. Raises ImageTooLarge above max_bytes."""
+    IMAGE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = _tmp_path(IMAGE_DIR / "upload")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(tmp, "wb") as out:
+            while chunk := source.read(CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise ImageTooLarge(f"Bild ist größer als {max_bytes // (1024 * 1024)} MB")
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return StagedImage(tmp, digest.hexdigest(), size)
+
+
+def variant_filename(filename: str, variant: str) -> str:
+    return f"{Path(filename).stem}_{variant}.webp"
+
+
+def image_url(filename: str, variant: Optional[str] = None) -> str:
+    return f"{IMAGE_URL_PREFIX}/{variant_filename(filename, variant) if variant else filename}"
+
+
+def has_variants(filename: str) -> bool:
+    return all((IMAGE_DIR / variant_filename(filename, v)).exists() for v in VARIANTS)
+
+
+def generate_variants(filename: str) -> None:
+    """Writes all VARIANTS of IMAGE_DIR/filename as WebP (each via temp file + rename)."""
+    with Image.open(IMAGE_DIR / filename) as original:
+        image = ImageOps.exif_transpose(original)
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+    for variant, max_size in VARIANTS.items():
+        copy = image.copy()
+        copy.thumbnail((max_size, max_size))
+        target = IMAGE_DIR / variant_filename(filename, variant)
+        tmp = _tmp_path(target)
+        try:
+            copy.save(tmp, format="WEBP", quality=WEBP_QUALITY, method=4)
+            os.replace(tmp, target)
+        finally:
+            tmp.unlink(missing_ok=True)
+
+
+def remove_variants(filename: str) -> None:
+    for variant in VARIANTS:
+        (IMAGE_DIR / variant_filename(filename, variant)).unlink(missing_ok=True)
+
+
+def _remove_if_unreferenced(db: Session, filename: str) -> bool:
+    # Import hier: crud.tool -> schemas.tool -> core.images wäre sonst zirkulär
+    from src.app.crud.tool import count_tools_with_image
+
+    if count_tools_with_image(db, filename):
+        return False
+    remove_variants(filename)
+    (IMAGE_DIR / filename).unlink(missing_ok=True)
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Referenzen der Werkzeuge umstellen
+# ---------------------------------------------------------------------------
+
+def assign_tool_image(db: Session, tool: Tool, staged: Optional[StagedImage], content_type: Optional[str] = None) -> bool:
+    """
+    Points the tool at the staged upload (or at no image for staged=None) and deletes
+    the previous file if nothing references it anymore.
+    Returns True if variants still have to be generated for the new image.
+    """
+    from src.app.crud.tool import set_tool_image
+
+    filename = staged.filename(content_type) if staged else None
+    old = tool.image_filename
+    try:
+        with _store_lock:
+            ready = filename is not None and has_variants(filename)
+            # Erst die DB umstellen, dann Dateien anfassen: ein ToolRead zeigt nie
+            # auf eine bereits gelöschte Datei.
+            set_tool_image(db, tool, filename, variants_ready=ready)
+            if staged:
+                # Immer umbenennen, auch bei Duplikaten: gleicher Inhalt, und eine
+                # gerade parallel gelöschte Datei ist damit wieder da.
+                os.replace(staged.path, IMAGE_DIR / filename)
+            if old and old != filename:
+                _remove_if_unreferenced(db, old)
+    finally:
+        if staged:
+            staged.discard()
+    return filename is not None and not ready
+
+
+def release_tool_image(db: Session, filename: Optional[str]) -> None:
+    """Call after a tool was deleted: removes its image if no other tool uses it."""
+    if filename:
+        with _store_lock:
+            _remove_if_unreferenced(db, filename)
+
+
+def build_variants(session_factory, filename: str) -> bool:
+    """
+    Background task after an upload: generates the variants and marks them as ready
+    for every tool showing this image. Returns False if the file is no image or is
+    no longer referenced.
+    """
+    from src.app.crud.tool import mark_image_variants_ready
+
+    try:
+        generate_variants(filename)
+    except FileNotFoundError:
+        return False  # schon wieder ersetzt/gelöscht
+    except (UnidentifiedImageError, OSError, ValueError):
+        logger.warning("Could not generate variants for %s", filename, exc_info=True)
+        remove_variants(filename)
+        return False
+
+    with session_factory() as db:
+        if mark_image_variants_ready(db, filename):
+            return True
+        # Bild wurde inzwischen ersetzt – eigene Varianten nicht liegen lassen
+        with _store_lock:
+            _remove_if_unreferenced(db, filename)
+    return False
+
+
+# ---------------------------------------------------------------------------
+# Aufräumen
+# ---------------------------------------------------------------------------
+
+def collect_garbage(db: Session, grace_seconds: float) -> int:
+    """Deletes files (originals, variants, temp files) no tool refers to. Returns the number of deleted files."""
+    from src.app.crud.tool import get_referenced_image_filenames
+
+    if not IMAGE_DIR.exists():
+        return 0
+    cutoff = time.time() - grace_seconds
+    removed = 0
+    with _store_lock:
+        keep: set[str] = set()
+        for filename in get_referenced_image_filenames(db):
+            keep.add(filename)
+            keep.update(variant_filename(filename, v) for v in VARIANTS)
+        for path in IMAGE_DIR.iterdir():
+            if not path.is_file() or path.name in keep:
+                continue
+            if path.name.startswith(".") and not path.name.endswith(TMP_SUFFIX):
+                continue  # z.B. .gitkeep
+            try:
+                if path.stat().st_mtime > cutoff:
+                    continue
+                path.unlink()
+                removed += 1
+            except FileNotFoundError:
+                pass
+    return removed
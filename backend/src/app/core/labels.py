@@ -0,0 +1,191 @@
+# ============================================================
+# core/labels.py – Etikettenbögen (QR-Code + Inventarnummer) erzeugen
+#
+# Für GET /api/v1/gettoolitemlabels: viele Exemplare auf DIN-A4-Seiten,
+# LABEL_COLUMNS x LABEL_ROWS Etiketten pro Seite.
+#
+#   - QR-Codes kommen aus dem QR-Cache (core/qrcodes.py). Fehlende werden
+#     seitenweise parallel in einem Prozess-Pool gerendert
+#     (LABEL_RENDER_PROCESSES, 0 = Thread-Pool des QR-Caches) und danach im
+#     Cache abgelegt.
+#   - Es wird immer nur eine Seite gleichzeitig aufgebaut und sofort
+#     ausgegeben – der Speicherbedarf hängt nicht von der Anzahl Etiketten ab.
+#   - PDF: ein kleiner, eigener PDF-Schreiber, der Seite für Seite streamt
+#     (Bilder, Seiten, am Ende Seitenbaum und xref-Tabelle).
+#   - PNG: eine Seite pro Anfrage (?page=), Seitenanzahl im Header.
+# ============================================================
+
+import io
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional, Sequence
+
+from PIL import Image, ImageDraw, ImageFont
+
+from src.app.core.config import settings
+from src.app.core.qrcodes import cache_key, payload_for, qr_codes, render_png
+
+# DIN A4 bei 150 dpi
+PAGE_WIDTH_PX = 1240
+PAGE_HEIGHT_PX = 1754
+PAGE_WIDTH_PT = 595.28
+PAGE_HEIGHT_PT = 841.89
+MARGIN_PX = 60
+LABEL_COLUMNS = 3
+LABEL_ROWS = 7
+LABELS_PER_PAGE = LABEL_COLUMNS * LABEL_ROWS
+TEXT_HEIGHT_PX = 56
+
+
+@dataclass(frozen=True)
+class Label:
+    item_id: int
+    inventory_no: str
+    tool_name: str
+
+    @property
+    def payload(self) -> str:
+        return payload_for(self.item_id, self.inventory_no)
+
+
+# ---------------------------------------------------------------------------
+# QR-Codes parallel rendern
+# ---------------------------------------------------------------------------
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _process_pool() -> Optional[ProcessPoolExecutor]:
+    global _pool
+    if settings.LABEL_RENDER_PROCESSES <= 0:
+        return None
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=settings.LABEL_RENDER_PROCESSES)
+    return _pool
+
+
+def shutdown() -> None:
+    global _pool
+    pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True)
+
+
+def qr_pngs(labels: Sequence[Label]) -> list[bytes]:
+    """PNG per label: cached ones directly, the rest rendered in parallel and then cached."""
+    keys = [cache_key(label.payload) for label in labels]
+    pngs = [qr_codes.lookup(key) for key in keys]
+    missing = [i for i, png in enumerate(pngs) if png is None]
+    if not missing:
+        return pngs
+
+    pool = _process_pool()
+    if pool is None:
+        for i in missing:
+            _, pngs[i] = qr_codes.get_png(labels[i].payload)
+        return pngs
+
+    rendered = pool.map(render_png, [labels[i].payload for i in missing], chunksize=4)
+    for i, png in zip(missing, rendered):
+        qr_codes.store(keys[i], png)
+        pngs[i] = png
+    return pngs
+
+
+# ---------------------------------------------------------------------------
+# Seiten zusammensetzen
+# ---------------------------------------------------------------------------
+
+def _font(size: int):
+    try:
+        return ImageFont.load_default(size=size)
+    except (TypeError, OSError):  # Pillow ohne FreeType
+        return ImageFont.load_default()
+
+
+def render_page(labels: Sequence[Label]) -> Image.Image:
+    """One A4 page (grayscale) with up to LABELS_PER_PAGE labels."""
+    page = Image.new("L", (PAGE_WIDTH_PX, PAGE_HEIGHT_PX), 255)
+    draw = ImageDraw.Draw(page)
+    inv_font, name_font = _font(26), _font(18)
+    cell_w = (PAGE_WIDTH_PX - 2 * MARGIN_PX) // LABEL_COLUMNS
+    cell_h = (PAGE_HEIGHT_PX - 2 * MARGIN_PX) // LABEL_ROWS
+    qr_size = min(cell_w, cell_h - TEXT_HEIGHT_PX) - 10
+
+    for index, (label, png) in enumerate(zip(labels, qr_pngs(labels))):
+        row, col = divmod(index, LABEL_COLUMNS)
+        x = MARGIN_PX + col * cell_w
+        y = MARGIN_PX + row * cell_h
+        with Image.open(io.BytesIO(png)) as qr:
+            qr_img = qr.convert("L").resize((qr_size, qr_size), Image.NEAREST)
+        page.paste(qr_img, (x + (cell_w - qr_size) // 2, y))
+        center = x + cell_w // 2
+        draw.text((center, y + qr_size + 4), label.inventory_no, fill=0, font=inv_font, anchor="ma")
+        draw.text((center, y + qr_size + 34), label.tool_name[:40], fill=0, font=name_font, anchor="ma")
+        # Schneidelinie
+        draw.rectangle((x, y - 5, x + cell_w - 1, y + cell_h - 10), outline=200)
+    return page
+
+
+def png_page(labels: Sequence[Label]) -> bytes:
+    buf = io.BytesIO()
+    render_page(labels).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+# ---------------------------------------------------------------------------
+# Streamendes PDF
+# ---------------------------------------------------------------------------
+
+def pdf_pages(pages: Iterable[Sequence[Label]]) -> Iterator[bytes]:
+    """
+    Writes a PDF page by page. Object numbers are fixed up front:
+    1 = Catalog, 2 = Pages, then per page i: 3+3i = Page, 4+3i = Content, 5+3i = Image.
+    Catalog and page tree are written last, followed by the xref table.
+    """
+    offsets: dict[int, int] = {}
+    position = 0
+
+    def emit(chunk: bytes) -> bytes:
+        nonlocal position
+        position += len(chunk)
+        return chunk
+
+    def obj(number: int, body: bytes, stream: Optional[bytes] = None) -> bytes:
+        offsets[number] = position
+        out = f"{number} 0 obj\n".encode() + body
+        if stream is not None:
+            out += b"\nstream\n" + stream + b"\nendstream"
+        return emit(out + b"\nendobj\n")
+
+    yield emit(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    page_numbers = []
+    for i, labels in enumerate(pages):
+        page_no, content_no, image_no = 3 + 3 * i, 4 + 3 * i, 5 + 3 * i
+        page_numbers.append(page_no)
+        image = render_page(labels)
+        data = zlib.compress(image.tobytes(), 6)
+        image.close()
+        yield obj(image_no, (
+            f"<< /Type /XObject /Subtype /Image /Width {PAGE_WIDTH_PX} /Height {PAGE_HEIGHT_PX} "
+            f"/ColorSpace /DeviceGray /BitsPerComponent 8 /Filter /FlateDecode /Length {len(data)} >>"
+        ).encode(), data)
+        content = f"q {PAGE_WIDTH_PT} 0 0 {PAGE_HEIGHT_PT} 0 0 cm /Im0 Do Q".encode()
+        yield obj(content_no, f"<< /Length {len(content)} >>".encode(), content)
+        yield obj(page_no, (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH_PT} {PAGE_HEIGHT_PT}] "
+            f"/Resources << /XObject << /Im0 {image_no} 0 R >> >> /Contents {content_no} 0 R >>"
+        ).encode())
+
+    kids = " ".join(f"{n} 0 R" for n in page_numbers)
+    yield obj(2, f"<< /Type /Pages /Kids [{kids}] /Count {len(page_numbers)} >>".encode())
+    yield obj(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+
+    size = 3 + 3 * len(page_numbers)
+    xref_at = position
+    lines = [f"xref\n0 {size}\n", "0000000000 65535 f \n"]
+    lines += [f"{offsets[n]:010d} 00000 n \n" for n in range(1, size)]
+    lines.append(f"trailer\n<< /Size {size} /Root 1 0 R >>\nstartxref\n{xref_at}\n%%EOF\n")
+    yield emit("".join(lines).encode())
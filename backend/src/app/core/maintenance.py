@@ -0,0 +1,136 @@
+# ============================================================
+# core/maintenance.py – Wartungsjobs für den Scheduler
+#
+#   purge_revoked_tokens   – löscht abgelaufene Einträge aus blacklisted_tokens
+#                            (und aus dem Sperr-Cache im Speicher)
+#   sync_revoked_tokens    – übernimmt Logouts anderer Worker-Prozesse in den
+#                            Sperr-Cache (auth/revocation.py)
+#   refresh_overdue_flags  – setzt loans.is_overdue für Ausleihen, deren
+#                            Fälligkeit seit dem letzten Schreiben verstrichen ist
+#   sqlite_optimize        – PRAGMA optimize (Statistiken für den Query-Planer)
+#                            und PRAGMA incremental_vacuum (gibt freie Seiten
+#                            zurück, wirkt nur bei auto_vacuum=INCREMENTAL)
+#   rebuild_tool_availability – gleicht die Bestandszähler (tool_availability)
+#                            mit tool_items ab und korrigiert Abweichungen
+#   build_image_variants   – erzeugt fehlende WebP-Varianten der Werkzeugbilder
+#                            (ältere Bilder, abgebrochene Hintergrund-Tasks)
+#   purge_unreferenced_images – löscht Bilddateien, auf die kein Werkzeug mehr
+#                            zeigt, und liegengebliebene temporäre Uploads
+#
+# Intervalle kommen aus den Settings (MAINTENANCE_*_INTERVAL_SECONDS),
+# 0 deaktiviert einen Job. Jeder Job öffnet eine eigene Session.
+#
+# Einzelne Jobs lassen sich auch von Hand starten, z.B.:
+#   python -m src.app.core.maintenance rebuild_tool_availability
+# ============================================================
+
+import sys
+
+from sqlalchemy import text
+
+from src.app.core.config import settings
+from src.app.core.images import build_variants, collect_garbage
+from src.app.core.scheduler import Scheduler
+from src.app.crud.blacklisted_token import cleanup_expired_tokens, sync_blacklisted_tokens
+from src.app.crud.loan import refresh_overdue_flags
+from src.app.crud.tool import get_images_without_variants
+from src.app.crud.tool_availability import rebuild_tool_availability
+from src.app.db.session import SessionLocal
+
+
+def purge_revoked_tokens(session_factory=SessionLocal) -> None:
+    with session_factory() as db:
+        cleanup_expired_tokens(db)
+
+
+def sync_revoked_tokens(session_factory=SessionLocal) -> int:
+    with session_factory() as db:
+        return sync_blacklisted_tokens(db)
+
+
+def refresh_overdue(session_factory=SessionLocal) -> int:
+    with session_factory() as db:
+        return refresh_overdue_flags(db)
+
+
+def sqlite_optimize(session_factory=SessionLocal) -> None:
+    with session_factory() as db:
+        if db.get_bind().dialect.name != "sqlite":
+            return
+        db.execute(text("PRAGMA optimize"))
+        db.execute(text("PRAGMA incremental_vacuum"))
+        db.commit()
+
+
+def rebuild_availability(session_factory=SessionLocal) -> int:
+    with session_factory() as db:
+        return rebuild_tool_availability(db)
+
+
+def build_image_variants(session_factory=SessionLocal) -> int:
+    with session_factory() as db:
+        pending = get_images_without_variants(db)
+    return sum(build_variants(session_factory, filename) for filename in pending)
+
+
+def purge_unreferenced_images(session_factory=SessionLocal) -> int:
+    with session_factory() as db:
+        return collect_garbage(db, settings.TOOL_IMAGE_GC_GRACE_SECONDS)
+
+
+JOBS = {
+    "purge_revoked_tokens": purge_revoked_tokens,
+    "sync_revoked_tokens": sync_revoked_tokens,
+    "refresh_overdue_flags": refresh_overdue,
+    "sqlite_optimize": sqlite_optimize,
+    "rebuild_tool_availability": rebuild_availability,
+    "build_image_variants": build_image_variants,
+    "purge_unreferenced_images": purge_unreferenced_images,
+}
+
+
+def register_jobs(scheduler: Scheduler) -> None:
+    """Registers the maintenance jobs with the intervals from the settings."""
+    scheduler.register(
+        "purge_revoked_tokens",
+        settings.MAINTENANCE_TOKEN_PURGE_INTERVAL_SECONDS,
+        JOBS["purge_revoked_tokens"],
+    )
+    scheduler.register(
+        "sync_revoked_tokens",
+        settings.MAINTENANCE_REVOCATION_SYNC_INTERVAL_SECONDS,
+        JOBS["sync_revoked_tokens"],
+    )
+    scheduler.register(
+        "refresh_overdue_flags",
+        settings.MAINTENANCE_OVERDUE_REFRESH_INTERVAL_SECONDS,
+        JOBS["refresh_overdue_flags"],
+        run_at_startup=True,  # Ausleihen, die während der Downtime fällig wurden
+    )
+    scheduler.register(
+        "sqlite_optimize",
+        settings.MAINTENANCE_SQLITE_OPTIMIZE_INTERVAL_SECONDS,
+        JOBS["sqlite_optimize"],
+    )
+    scheduler.register(
+        "rebuild_tool_availability",
+        settings.MAINTENANCE_AVAILABILITY_REBUILD_INTERVAL_SECONDS,
+        JOBS["rebuild_tool_availability"],
+    )
+    scheduler.register(
+        "build_image_variants",
+        settings.MAINTENANCE_IMAGE_VARIANTS_INTERVAL_SECONDS,
+        JOBS["build_image_variants"],
+        run_at_startup=True,  # Bilder, deren Varianten vor dem Neustart nicht mehr fertig wurden
+    )
+    scheduler.register(
+        "purge_unreferenced_images",
+        settings.MAINTENANCE_IMAGE_GC_INTERVAL_SECONDS,
+        JOBS["purge_unreferenced_images"],
+    )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2 or sys.argv[1] not in JOBS:
+        sys.exit(f"Usage: python -m src.app.core.maintenance {{{'|'.join(JOBS)}}}")
+    print(f"{sys.argv[1]}: {JOBS[sys.argv[1]]()}")
@@ -0,0 +1,204 @@
+# ============================================================
+# core/qrcodes.py – QR-Codes für Werkzeugexemplare rendern und cachen
+#
+# Der Inhalt eines QR-Codes ist deterministisch ("tool_item:{id}:{inventory_no}"),
+# das PNG hängt also nur von diesem Text ab. Deshalb:
+#
+#   - Schlüssel = SHA-256 über Render-Parameter + Inhalt. Er dient zugleich
+#     als starker ETag und als Dateiname im Festplatten-Cache.
+#   - Speicher-Cache: LRU mit Obergrenze (QR_CACHE_SIZE Einträge)
+#   - Festplatten-Cache: QR_CACHE_DIR/<ab>/<schlüssel>.png – überlebt Neustarts
+#   - Rendern (qrcode + PNG-Kodierung) läuft in einem eigenen, begrenzten
+#     Thread-Pool (QR_RENDER_WORKERS). Fragen mehrere Anfragen gleichzeitig
+#     denselben Code an, wird er nur einmal gerendert.
+#   - Ändert sich die Inventarnummer oder wird das Exemplar gelöscht, wird der
+#     alte Eintrag entfernt (ORM-Events unten). Veraltete Bilder kann es ohnehin
+#     nicht geben: ein neuer Inhalt ergibt einen neuen Schlüssel.
+# ============================================================
+
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+import qrcode
+from sqlalchemy import event
+
+from src.app.core.config import settings
+from src.app.models.tool_item import ToolItem
+
+# Teil des Schlüssels: Änderungen an den Render-Parametern ergeben neue Schlüssel
+_BOX_SIZE = 10
+_BORDER = 4
+_RENDER_VERSION = f"v1:box={_BOX_SIZE}:border={_BORDER}"
+
+
+def payload_for(item_id: int, inventory_no: str) -> str:
+    """Text im QR-Code eines Exemplars."""
+    return f"tool_item:{item_id}:{inventory_no}"
+
+
+def cache_key(payload: str) -> str:
+    return hashlib.sha256(f"{_RENDER_VERSION}\n{payload}".encode("utf-8")).hexdigest()
+
+
+def render_png(payload: str) -> bytes:
+    qr = qrcode.QRCode(box_size=_BOX_SIZE, border=_BORDER)
+    qr.add_data(payload)
+    qr.make(fit=True)
+    img = qr.make_image(fill_color="black", back_color="white")
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+class QRCodeCache:
+    def __init__(self, max_entries: int, cache_dir: Optional[str], workers: int):
+        self.max_entries = max_entries
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._workers = workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._pending: dict[str, Future] = {}
+        self.renders = 0  # Anzahl tatsächlich gerenderter Codes (Tests/Diagnose)
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def _path(self, key: str) -> Optional[Path]:
+        return self.cache_dir / key[:2] / f"{key}.png" if self.cache_dir else None
+
+    def _remember(self, key: str, png: bytes) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._memory[key] = png
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _from_memory(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            png = self._memory.get(key)
+            if png is not None:
+                self._memory.move_to_end(key)
+            return png
+
+    def _from_disk(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        if path is None:
+            return None
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def _to_disk(self, key: str, png: bytes) -> None:
+        path = self._path(key)
+        if path is None:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Erst in eine temporäre Datei schreiben, dann atomar umbenennen:
+        # ein paralleler Leser sieht nie eine halb geschriebene Datei.
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(png)
+        os.replace(tmp, path)
+
+    def _render(self, key: str, payload: str) -> bytes:
+        png = render_png(payload)
+        with self._lock:
+            self.renders += 1
+        self._to_disk(key, png)
+        self._remember(key, png)
+        return png
+
+    def _submit(self, key: str, payload: str) -> Future:
+        with self._lock:
+            future = self._pending.get(key)
+            if future is not None:
+                return future  # wird gerade gerendert – auf dasselbe Ergebnis warten
+            png = self._memory.get(key)
+            if png is not None:
+                # Inzwischen fertig gerendert (zwischen Cache-Prüfung und hier)
+                future = Future()
+                future.set_result(png)
+                return future
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="qrcode")
+            future = self._executor.submit(self._render, key, payload)
+            self._pending[key] = future
+
+        def _done(_f: Future) -> None:
+            with self._lock:
+                self._pending.pop(key, None)
+
+        future.add_done_callback(_done)
+        return future
+
+    def get_png(self, payload: str) -> tuple[str, bytes]:
+        """Returns (key, png) for the payload: memory, then disk, then rendered in the worker pool."""
+        key = cache_key(payload)
+        png = self.lookup(key)
+        if png is None:
+            png = self._submit(key, payload).result()
+        return key, png
+
+    def lookup(self, key: str) -> Optional[bytes]:
+        """Cached PNG (memory, then disk) or None – never renders."""
+        png = self._from_memory(key)
+        if png is None:
+            png = self._from_disk(key)
+            if png is not None:
+                self._remember(key, png)
+        return png
+
+    def store(self, key: str, png: bytes) -> None:
+        """Adds a PNG rendered elsewhere (e.g. in the label process pool) to both caches."""
+        self._to_disk(key, png)
+        self._remember(key, png)
+
+    def invalidate(self, payload: str) -> None:
+        key = cache_key(payload)
+        with self._lock:
+            self._memory.pop(key, None)
+        path = self._path(key)
+        if path is not None:
+            path.unlink(missing_ok=True)
+
+    def clear_memory(self) -> None:
+        with self._lock:
+            self._memory.clear()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+# Globale Instanz – wird von GET /gettoolitemqrcode verwendet
+qr_codes = QRCodeCache(
+    max_entries=settings.QR_CACHE_SIZE,
+    cache_dir=settings.QR_CACHE_DIR,
+    workers=settings.QR_RENDER_WORKERS,
+)
+
+
+# ---------------------------------------------------------------------------
+# Invalidierung: alte Codes bei neuer Inventarnummer oder gelöschtem Exemplar entfernen
+# ---------------------------------------------------------------------------
+
+@event.listens_for(ToolItem.inventory_no, "set")
+def _inventory_no_changed(item, value, oldvalue, _initiator):
+    if item.id is not None and isinstance(oldvalue, str) and oldvalue != value:
+        qr_codes.invalidate(payload_for(item.id, oldvalue))
+
+
+@event.listens_for(ToolItem, "after_delete")
+def _tool_item_deleted(_mapper, _connection, item):
+    qr_codes.invalidate(payload_for(item.id, item.inventory_no))
@@ -0,0 +1,147 @@
+# ============================================================
+# core/scheduler.py – Periodische Hintergrund-Jobs (asyncio)
+#
+# Ein kleiner, eingebauter Scheduler ohne externe Abhängigkeit:
+#   - Jobs werden mit Name, Intervall (Sekunden) und Funktion registriert
+#   - start() startet pro Job eine asyncio-Task (in main.lifespan)
+#   - synchrone Jobs (Datenbankarbeit) laufen per asyncio.to_thread,
+#     damit sie die Event-Loop nicht blockieren
+#   - Single-Flight: läuft ein Job noch, wird der nächste Lauf übersprungen
+#     statt parallel gestartet
+#   - pro Job werden Laufzeit, Anzahl Läufe/Fehler/Übersprünge gezählt
+#     und über GET /api/v1/getmaintenancejobs ausgeliefert
+# ============================================================
+
+import asyncio
+import inspect
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class JobStats:
+    runs: int = 0
+    failures: int = 0
+    skipped: int = 0
+    last_started_at: Optional[datetime] = None
+    last_duration_ms: Optional[float] = None
+    total_duration_ms: float = 0.0
+    max_duration_ms: float = 0.0
+    last_result: Any = None
+    last_error: Optional[str] = None
+
+
+@dataclass
+class PeriodicJob:
+    name: str
+    interval_seconds: float
+    func: Callable[[], Any]
+    run_at_startup: bool = False
+    stats: JobStats = field(default_factory=JobStats)
+    running: bool = False
+
+
+class Scheduler:
+    def __init__(self):
+        self._jobs: dict[str, PeriodicJob] = {}
+        self._tasks: list[asyncio.Task] = []
+        self._runs: set[asyncio.Task] = set()
+
+    @property
+    def jobs(self) -> list[PeriodicJob]:
+        return list(self._jobs.values())
+
+    def register(
+        self,
+        name: str,
+        interval_seconds: float,
+        func: Callable[[], Any],
+        run_at_startup: bool = False,
+    ) -> None:
+        """Registers (or replaces) a job. Intervals <= 0 disable the job."""
+        if interval_seconds <= 0:
+            self._jobs.pop(name, None)
+            return
+        self._jobs[name] = PeriodicJob(name, interval_seconds, func, run_at_startup)
+
+    async def run_job(self, name: str) -> bool:
+        """Runs a job once. Returns False if it was skipped because it is still running."""
+        job = self._jobs[name]
+        if job.running:
+            job.stats.skipped += 1
+            return False
+
+        job.running = True
+        job.stats.last_started_at = datetime.now(tz=timezone.utc)
+        started = time.perf_counter()
+        try:
+            if inspect.iscoroutinefunction(job.func):
+                result = await job.func()
+            else:
+                result = await asyncio.to_thread(job.func)
+            job.stats.last_result = result
+            job.stats.last_error = None
+        except Exception as e:  # ein fehlerhafter Job darf den Scheduler nicht beenden
+            logger.exception("Scheduled job %s failed", name)
+            job.stats.failures += 1
+            job.stats.last_error = f"{type(e).__name__}: {e}"
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            job.stats.runs += 1
+            job.stats.last_duration_ms = duration_ms
+            job.stats.total_duration_ms += duration_ms
+            job.stats.max_duration_ms = max(job.stats.max_duration_ms, duration_ms)
+            job.running = False
+        return True
+
+    async def _loop(self, job: PeriodicJob) -> None:
+        if not job.run_at_startup:
+            await asyncio.sleep(job.interval_seconds)
+        while True:
+            # Als eigene Task starten: ein langsamer Lauf verschiebt den Takt nicht,
+            # der nächste Tick wird dann per Single-Flight übersprungen.
+            run = asyncio.create_task(self.run_job(job.name))
+            self._runs.add(run)
+            run.add_done_callback(self._runs.discard)
+            await asyncio.sleep(job.interval_seconds)
+
+    def start(self) -> None:
+        for job in self._jobs.values():
+            self._tasks.append(asyncio.create_task(self._loop(job), name=f"job:{job.name}"))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        # Laufende Jobs zu Ende laufen lassen (Threads lassen sich nicht abbrechen)
+        await asyncio.gather(*self._runs, return_exceptions=True)
+
+    def metrics(self) -> list[dict]:
+        result = []
+        for job in self._jobs.values():
+            s = job.stats
+            result.append({
+                "name": job.name,
+                "interval_seconds": job.interval_seconds,
+                "running": job.running,
+                "runs": s.runs,
+                "failures": s.failures,
+                "skipped": s.skipped,
+                "last_started_at": s.last_started_at,
+                "last_duration_ms": s.last_duration_ms,
+                "avg_duration_ms": s.total_duration_ms / s.runs if s.runs else None,
+                "max_duration_ms": s.max_duration_ms if s.runs else None,
+                "last_result": None if s.last_result is None else str(s.last_result),
+                "last_error": s.last_error,
+            })
+        return result
+
+
+# Globale Instanz – in main.lifespan gestartet, vom Metrik-Endpunkt gelesen
+scheduler = Scheduler()
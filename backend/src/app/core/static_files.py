@@ -0,0 +1,99 @@
+# ============================================================
+# core/static_files.py – Statische Dateien mit Browser-Caching
+#
+# Ersetzt das einfache StaticFiles unter /static:
+#
+#   - Dateinamen, die sich nie ändern (Werkzeugbilder <sha256>.<endung>,
+#     ihre Varianten <sha256>_thumb.webp und ältere {tool_id}_{uuid}.<endung>),
+#     bekommen "Cache-Control: public, max-age=31536000, immutable" – der
+#     Browser fragt dafür gar nicht mehr beim Server nach.
+#   - Alle anderen Dateien: "no-cache" (immer mit ETag revalidieren).
+#   - Bei Hash-Namen ist der Hash selbst der ETag, unabhängig von mtime
+#     (ein erneuter Upload desselben Bildes ersetzt die Datei).
+#   - If-None-Match/If-Modified-Since -> 304, Range/If-Range -> 206
+#     übernimmt Starlettes FileResponse; sie streamt in Blöcken bzw. nutzt
+#     "http.response.pathsend", wenn der Server es anbietet (sendfile).
+#   - Liegt neben einer Datei eine vorkomprimierte Fassung (.br / .gz) und
+#     akzeptiert der Client diese Kodierung, wird sie ausgeliefert.
+# ============================================================
+
+import os
+import re
+from mimetypes import guess_type
+from typing import Optional
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, PathLike, StaticFiles
+from starlette.types import Scope
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+# <sha256>[_variante].<endung> bzw. {tool_id}_{uuid}[_variante].<endung>
+_CONTENT_HASH = re.compile(r"^[0-9a-f]{64}(?:_[a-z]+)?\.[a-z0-9]+$")
+_LEGACY_UNIQUE = re.compile(r"^\d+_[0-9a-f]{32}(?:_[a-z]+)?\.[a-z0-9]+$")
+
+# Kodierung -> Dateiendung der vorkomprimierten Fassung, in Vorzugsreihenfolge
+PRECOMPRESSED = {"br": ".br", "gzip": ".gz"}
+
+
+def _accepted_encodings(headers: Headers) -> set[str]:
+    accepted = set()
+    for part in headers.get("accept-encoding", "").split(","):
+        name, _, params = part.strip().partition(";")
+        if name and params.replace(" ", "") not in ("q=0", "q=0.0"):
+            accepted.add(name.lower())
+    return accepted
+
+
+def cache_control_for(filename: str) -> str:
+    if _CONTENT_HASH.match(filename) or _LEGACY_UNIQUE.match(filename):
+        return IMMUTABLE
+    return REVALIDATE
+
+
+class CachingStaticFiles(StaticFiles):
+    def _precompressed(self, full_path: str, headers: Headers) -> Optional[tuple[str, str, os.stat_result]]:
+        accepted = _accepted_encodings(headers)
+        for encoding, suffix in PRECOMPRESSED.items():
+            if encoding not in accepted:
+                continue
+            try:
+                stat_result = os.stat(full_path + suffix)
+            except OSError:
+                continue
+            return encoding, full_path + suffix, stat_result
+        return None
+
+    def file_response(
+        self,
+        full_path: PathLike,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        full_path = str(full_path)
+        filename = os.path.basename(full_path)
+        headers = {"cache-control": cache_control_for(filename)}
+        if _CONTENT_HASH.match(filename):
+            headers["etag"] = f'"{os.path.splitext(filename)[0]}"'
+
+        path, media_type = full_path, None
+        if any(os.path.exists(full_path + suffix) for suffix in PRECOMPRESSED.values()):
+            headers["vary"] = "Accept-Encoding"
+            encoded = self._precompressed(full_path, request_headers)
+            if encoded is not None:
+                encoding, path, stat_result = encoded
+                headers["content-encoding"] = encoding
+                # Typ der Originaldatei, nicht "application/gzip"
+                media_type = guess_type(full_path)[0] or "application/octet-stream"
+                if "etag" in headers:
+                    headers["etag"] = headers["etag"][:-1] + f'-{encoding}"'
+
+        response = FileResponse(path, status_code=status_code, headers=headers,
+                                media_type=media_type, stat_result=stat_result)
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
@@ -0,0 +1,244 @@
+# ============================================================
+# core/tool_import.py – Massenimport von Werkzeugen und Exemplaren
+#
+# Eine CSV-Datei (mit Kopfzeile) oder NDJSON-Datei (ein JSON-Objekt pro
+# Zeile) beschreibt je Zeile ein Werkzeug und wie viele Exemplare davon neu
+# angelegt werden (schemas/tool_import.ToolImportRow):
+#
+#   tool_name,category,description,quantity,condition,status,item_description
+#   Akkuschrauber,Elektrowerkzeug,18 V,5,OK,,
+#
+# Die Datei wird gestreamt und in Blöcken von TOOL_IMPORT_CHUNK_SIZE Zeilen
+# verarbeitet, ein Block = eine Transaktion:
+#   1. Validierung gegen ToolImportRow – ein TypeAdapter-Durchlauf pro Block
+#   2. Kategorie-, Zustands- und Statusnamen -> IDs; jeder Name wird pro
+#      Import nur einmal nachgeschlagen (auch unbekannte)
+#   3. Werkzeuge über (Name, Kategorie) zuordnen – bestehende werden
+#      wiederverwendet, fehlende als ToolCreate per executemany angelegt
+#   4. Exemplare als ToolItemCreate mit einem Block Inventarnummern per
+#      executemany anlegen (Bestandszähler und Suchindex laufen mit)
+#   5. Commit
+#
+# Fehlerhafte Zeilen werden mit Zeilennummer gemeldet und übersprungen, der
+# Rest der Datei wird weiter importiert. Scheitert ein Block an der
+# Datenbank, wird nur dieser Block zurückgerollt und als fehlerhaft gemeldet.
+#
+# Von Hand:
+#   python -m src.app.core.tool_import werkzeuge.csv
+# ============================================================
+
+import argparse
+import csv
+import io
+import json
+import sys
+from collections import defaultdict
+from itertools import islice
+from pathlib import Path
+from typing import Any, BinaryIO, Iterable, Iterator, Optional, TextIO
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from src.app.core.config import settings
+from src.app.crud import lookups
+from src.app.crud.tool import create_tools_bulk, get_tool_ids_by_name
+from src.app.crud.tool_category import get_tool_category_ids
+from src.app.crud.tool_item import create_tool_items_bulk
+from src.app.db.session import SessionLocal
+from src.app.models.tool_condition import ToolCondition
+from src.app.models.tool_status import ToolStatus
+from src.app.schemas.tool import ToolCreate
+from src.app.schemas.tool_import import ImportFormat, ToolImportError, ToolImportResult, ToolImportRow
+from src.app.schemas.tool_item import ToolItemCreate
+
+# Mehr Fehler werden nur gezählt, nicht einzeln zurückgegeben
+MAX_REPORTED_ERRORS = 1000
+
+_ROWS = TypeAdapter(list[ToolImportRow])
+
+# (Zeilennummer, Objekt aus der Datei) – oder eine Fehlermeldung statt des Objekts
+Record = tuple[int, Any]
+
+
+def detect_format(filename: Optional[str]) -> Optional[ImportFormat]:
+    """Import format from the file extension (.csv, .ndjson, .jsonl), or None."""
+    return {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}.get(Path(filename or "").suffix.lower())
+
+
+def open_text(binary: BinaryIO) -> TextIO:
+    """Decodes an uploaded file as UTF-8 (with or without BOM) while it is read."""
+    return io.TextIOWrapper(binary, encoding="utf-8-sig", newline="")
+
+
+def _read_csv(stream: TextIO) -> Iterator[Record]:
+    reader = csv.DictReader(stream)
+    for row in reader:
+        if None in row:
+            yield reader.line_num, "Mehr Spalten als in der Kopfzeile"
+        else:
+            yield reader.line_num, row
+
+
+def _read_ndjson(stream: TextIO) -> Iterator[Record]:
+    for line_no, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_no, json.loads(line)
+        except ValueError as exc:
+            yield line_no, f"Ungültiges JSON: {exc}"
+
+
+def read_records(stream: TextIO, fmt: ImportFormat) -> Iterator[Record]:
+    """Streams the rows of a CSV or NDJSON file; a broken file ends with one error record."""
+    line_no = 0
+    try:
+        for line_no, value in (_read_csv if fmt == "csv" else _read_ndjson)(stream):
+            yield line_no, value
+    except UnicodeDecodeError:
+        yield line_no + 1, "Datei ist nicht UTF-8-kodiert – Import abgebrochen"
+    except csv.Error as exc:
+        yield line_no + 1, f"CSV-Fehler: {exc} – Import abgebrochen"
+
+
+class _Importer:
+    def __init__(self, db: Session):
+        self.db = db
+        self.result = ToolImportResult()
+        self._categories: Optional[dict[str, int]] = None
+        self._lookup_ids: dict[tuple[type, str], Optional[int]] = {}
+
+    def error(self, line: int, message: str) -> None:
+        self.result.error_count += 1
+        if len(self.result.errors) < MAX_REPORTED_ERRORS:
+            self.result.errors.append(ToolImportError(line=line, message=message))
+
+    def category_id(self, name: str) -> Optional[int]:
+        if self._categories is None:
+            self._categories = get_tool_category_ids(self.db)
+        return self._categories.get(name)
+
+    def lookup_id(self, model: type, name: str) -> Optional[int]:
+        # Merkt sich auch unbekannte Namen – sonst lädt lookups bei jedem Tippfehler die Tabelle neu
+        key = (model, name)
+        if key not in self._lookup_ids:
+            self._lookup_ids[key] = lookups.get_id(self.db, model, name)
+        return self._lookup_ids[key]
+
+    def validate(self, records: list[Record]) -> list[tuple[int, ToolImportRow]]:
+        lines, data = [], []
+        for line, value in records:
+            if isinstance(value, str):
+                self.error(line, value)
+            else:
+                lines.append(line)
+                data.append(value)
+        try:
+            return list(zip(lines, _ROWS.validate_python(data)))
+        except ValidationError as exc:
+            messages = defaultdict(list)
+            for err in exc.errors(include_url=False):
+                index, *loc = err["loc"]
+                messages[index].append(f"{'.'.join(map(str, loc))}: {err['msg']}" if loc else err["msg"])
+        for index in sorted(messages):
+            self.error(lines[index], "; ".join(messages[index]))
+        keep = [i for i in range(len(data)) if i not in messages]
+        return list(zip([lines[i] for i in keep], _ROWS.validate_python([data[i] for i in keep])))
+
+    def resolve(self, line: int, row: ToolImportRow) -> Optional[tuple[int, Optional[int], Optional[int]]]:
+        """(category_id, status_id, condition_id) of a row, or None after reporting an unknown name."""
+        category_id = self.category_id(row.category)
+        if category_id is None:
+            self.error(line, f"Unbekannte Kategorie: {row.category}")
+            return None
+        if not row.quantity:
+            return category_id, None, None
+        condition_id = self.lookup_id(ToolCondition, row.condition)
+        if condition_id is None:
+            self.error(line, f"Unbekannter Zustand: {row.condition}")
+            return None
+        status_id = None
+        if row.status is not None:
+            status_id = self.lookup_id(ToolStatus, row.status)
+            if status_id is None:
+                self.error(line, f"Unbekannter Status: {row.status}")
+                return None
+        return category_id, status_id, condition_id
+
+    def import_chunk(self, records: list[Record]) -> None:
+        self.result.rows += len(records)
+        rows = []
+        for line, row in self.validate(records):
+            ids = self.resolve(line, row)
+            if ids is not None:
+                rows.append((line, row, *ids))
+        if not rows:
+            return
+
+        try:
+            tool_ids = get_tool_ids_by_name(self.db, (row.tool_name for _, row, *_ in rows))
+            new_tools: dict[tuple[str, int], ToolCreate] = {}
+            for _, row, category_id, _, _ in rows:
+                key = (row.tool_name, category_id)
+                if key not in tool_ids and key not in new_tools:
+                    new_tools[key] = ToolCreate(tool_name=row.tool_name, description=row.description,
+                                                category_id=category_id)
+            tool_ids.update(create_tools_bulk(self.db, list(new_tools.values())))
+            items = [
+                ToolItemCreate(tool_id=tool_ids[(row.tool_name, category_id)], status_id=status_id,
+                               condition_id=condition_id, description=row.item_description)
+                for _, row, category_id, status_id, condition_id in rows
+                for _ in range(row.quantity)
+            ]
+            create_tool_items_bulk(self.db, items)
+            self.db.commit()
+        except SQLAlchemyError as exc:
+            self.db.rollback()
+            for line, *_ in rows:
+                self.error(line, f"Block nicht importiert (Datenbankfehler: {type(exc).__name__})")
+            return
+        self.result.tools_created += len(new_tools)
+        self.result.items_created += len(items)
+
+
+def import_records(db: Session, records: Iterable[Record], chunk_size: Optional[int] = None) -> ToolImportResult:
+    """Imports (line, row) records chunk by chunk, one transaction per chunk."""
+    chunk_size = chunk_size or settings.TOOL_IMPORT_CHUNK_SIZE
+    importer = _Importer(db)
+    records = iter(records)
+    while chunk := list(islice(records, chunk_size)):
+        importer.import_chunk(chunk)
+    # Lese-, Validierungs- und Zuordnungsfehler eines Blocks entstehen in getrennten Durchläufen
+    importer.result.errors.sort(key=lambda error: error.line)
+    return importer.result
+
+
+def import_file(db: Session, stream: TextIO, fmt: ImportFormat, chunk_size: Optional[int] = None) -> ToolImportResult:
+    """Streams a CSV/NDJSON file into the database; see the module header for the row format."""
+    return import_records(db, read_records(stream, fmt), chunk_size)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.app.core.tool_import",
+                                     description="Werkzeuge und Exemplare aus CSV/NDJSON importieren")
+    parser.add_argument("file")
+    parser.add_argument("--format", choices=("csv", "ndjson"))
+    parser.add_argument("--chunk-size", type=int, default=settings.TOOL_IMPORT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+    fmt = args.format or detect_format(args.file)
+    if fmt is None:
+        parser.error("Format nicht erkennbar – --format csv oder --format ndjson angeben")
+
+    with open(args.file, encoding="utf-8-sig", newline="") as stream, SessionLocal() as db:
+        result = import_file(db, stream, fmt, args.chunk_size)
+    print(f"{result.rows} Zeilen: {result.tools_created} Werkzeuge und {result.items_created} Exemplare angelegt, "
+          f"{result.error_count} Fehler")
+    for error in result.errors:
+        print(f"  Zeile {error.line}: {error.message}", file=sys.stderr)
+    return 1 if result.error_count else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
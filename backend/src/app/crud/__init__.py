@@ -8,9 +8,12 @@ from src.app.crud import (
     tool_condition,
     tool,
     tool_item,
+    tool_availability,
     tool_item_issue_status,
     tool_item_issue,
     loan_request_status,
     loan_request,
     loan,
+    dashboard,
+    sequence_counter,
 )
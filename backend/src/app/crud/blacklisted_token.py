@@ -2,23 +2,34 @@ from datetime import datetime, timezone
 
 from sqlalchemy.orm import Session
 
+from src.app.auth.revocation import revoked_tokens, token_hash
 from src.app.models.blacklisted_token import BlacklistedToken
 
 
-def blacklist_token(db: Session, token: str, expires_at: datetime) -> BlacklistedToken:
-    entry = BlacklistedToken(token=token, expires_at=expires_at)
-    db.add(entry)
-    db.commit()
-    return entry
+def blacklist_token(db: Session, token: str, expires_at: datetime) -> None:
+    """Stores the token's hash and adds it to the in-memory revocation cache."""
+    digest = token_hash(token)
+    if revoked_tokens.is_revoked(digest):
+        return
+    if db.query(BlacklistedToken.id).filter(BlacklistedToken.token_hash == digest).first() is None:
+        db.add(BlacklistedToken(token_hash=digest, expires_at=expires_at))
+        db.commit()
+    revoked_tokens.add(digest, expires_at)
+
+
+def is_token_blacklisted(token: str) -> bool:
+    """Checks the in-memory revocation cache – no database query."""
+    return revoked_tokens.is_revoked(token_hash(token))
+
+
+def load_blacklisted_tokens(db: Session) -> None:
+    """Warms the revocation cache from blacklisted_tokens (called once at startup)."""
+    revoked_tokens.warm(db)
 
 
-def is_token_blacklisted(db: Session, token: str) -> bool:
-    return (
-        db.query(BlacklistedToken)
-        .filter(BlacklistedToken.token == token)
-        .first()
-        is not None
-    )
+def sync_blacklisted_tokens(db: Session) -> int:
+    """Pulls tokens revoked by other worker processes into the cache. Returns the number added."""
+    return revoked_tokens.sync(db)
 
 
 def cleanup_expired_tokens(db: Session) -> None:
@@ -26,3 +37,4 @@ def cleanup_expired_tokens(db: Session) -> None:
     now = datetime.now(tz=timezone.utc)
     db.query(BlacklistedToken).filter(BlacklistedToken.expires_at < now).delete()
     db.commit()
+    revoked_tokens.purge_expired(now)
@@ -0,0 +1,131 @@
+from typing import Optional
+from datetime import datetime, timezone
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload
+
+from src.app.models.loan import Loan
+from src.app.models.loan_request import LoanRequest
+from src.app.models.loan_request_status import LoanRequestStatus
+from src.app.models.tool import Tool
+from src.app.models.tool_category import ToolCategory
+from src.app.models.tool_item import ToolItem
+from src.app.models.tool_item_issue import ToolItemIssue
+from src.app.models.tool_item_issue_status import ToolItemIssueStatus
+from src.app.models.tool_status import ToolStatus
+from src.app.models.user import User
+
+
+def _scope(q, user_column, borrower_user_id: Optional[int], department_id: Optional[int]):
+    """Restricts a loan/request query to one user or one department (same rules as list_loans)."""
+    if borrower_user_id is not None:
+        return q.filter(user_column == borrower_user_id)
+    if department_id is not None:
+        return q.join(User, user_column == User.id).filter(User.department_id == department_id)
+    return q
+
+
+def get_tools_by_category(db: Session) -> dict[str, int]:
+    rows = (
+        db.query(ToolCategory.name, func.count(Tool.id))
+        .join(Tool, Tool.category_id == ToolCategory.id)
+        .group_by(ToolCategory.id)
+        .all()
+    )
+    return dict(rows)
+
+
+def get_tool_items_by_status(db: Session) -> dict[str, int]:
+    rows = (
+        db.query(ToolStatus.name, func.count(ToolItem.id))
+        .join(ToolItem, ToolItem.status_id == ToolStatus.id)
+        .group_by(ToolStatus.id)
+        .all()
+    )
+    return dict(rows)
+
+
+def get_loan_requests_by_status(
+    db: Session,
+    borrower_user_id: Optional[int] = None,
+    department_id: Optional[int] = None,
+) -> dict[str, int]:
+    q = (
+        db.query(LoanRequestStatus.name, func.count(LoanRequest.id))
+        .join(LoanRequest, LoanRequest.request_status_id == LoanRequestStatus.id)
+    )
+    q = _scope(q, LoanRequest.requester_user_id, borrower_user_id, department_id)
+    return dict(q.group_by(LoanRequestStatus.id).all())
+
+
+def get_issues_by_status(db: Session) -> dict[str, int]:
+    rows = (
+        db.query(ToolItemIssueStatus.name, func.count(ToolItemIssue.id))
+        .join(ToolItemIssue, ToolItemIssue.status_id == ToolItemIssueStatus.id)
+        .group_by(ToolItemIssueStatus.id)
+        .all()
+    )
+    return dict(rows)
+
+
+def get_loan_counts(
+    db: Session,
+    borrower_user_id: Optional[int] = None,
+    department_id: Optional[int] = None,
+) -> tuple[int, int]:
+    """Returns (active, overdue) loan counts in a single aggregate query."""
+    now = datetime.now(tz=timezone.utc)
+    q = db.query(
+        func.count(Loan.id),
+        func.count(Loan.id).filter(Loan.due_at < now),
+    ).filter(Loan.returned_at.is_(None))
+    q = _scope(q, Loan.borrower_user_id, borrower_user_id, department_id)
+    active, overdue = q.one()
+    return active, overdue
+
+
+def get_top_overdue_loans(
+    db: Session,
+    limit: int,
+    borrower_user_id: Optional[int] = None,
+    department_id: Optional[int] = None,
+) -> list[Loan]:
+    """Returns the `limit` most overdue active loans, oldest due date first."""
+    now = datetime.now(tz=timezone.utc)
+    q = (
+        db.query(Loan)
+        .options(joinedload(Loan.borrower))
+        .filter(Loan.returned_at.is_(None), Loan.due_at < now)
+    )
+    q = _scope(q, Loan.borrower_user_id, borrower_user_id, department_id)
+    return q.order_by(Loan.due_at.asc(), Loan.id.asc()).limit(limit).all()
+
+
+def get_dashboard_stats(
+    db: Session,
+    borrower_user_id: Optional[int] = None,
+    department_id: Optional[int] = None,
+    include_admin_stats: bool = False,
+    overdue_limit: int = 5,
+) -> dict:
+    """
+    Aggregates all dashboard counters with GROUP BY queries instead of loading full lists.
+    Loan and request counters are scoped to a borrower or department if given.
+    """
+    tools_by_category = get_tools_by_category(db)
+    items_by_status = get_tool_items_by_status(db)
+    active, overdue = get_loan_counts(db, borrower_user_id, department_id)
+    stats = {
+        "tool_count": sum(tools_by_category.values()),
+        "tools_by_category": tools_by_category,
+        "tool_item_count": sum(items_by_status.values()),
+        "tool_items_by_status": items_by_status,
+        "active_loans": active,
+        "overdue_loans": overdue,
+        "loan_requests_by_status": get_loan_requests_by_status(db, borrower_user_id, department_id),
+        "top_overdue_loans": get_top_overdue_loans(db, overdue_limit, borrower_user_id, department_id),
+    }
+    if include_admin_stats:
+        stats["issues_by_status"] = get_issues_by_status(db)
+        stats["user_count"] = db.query(func.count(User.id)).scalar()
+    return stats
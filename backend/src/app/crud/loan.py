@@ -1,12 +1,18 @@
 from typing import Optional
 from datetime import datetime, timezone
 
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, case, event, exists, func, not_, or_, select, tuple_, update
+from sqlalchemy.orm import Session, joinedload, selectinload
 
+from src.app.crud import lookups, tool_availability
+from src.app.db.pagination import keyset_page
 from src.app.models.loan import Loan
 from src.app.models.loan_item import LoanItem
 from src.app.models.tool_item import ToolItem
+from src.app.models.tool_status import ToolStatus
+from src.app.models.tool_condition import ToolCondition
 from src.app.schemas.loan import LoanCreate, LoanUpdate
+from src.app.crud.tool_item import TOOL_ITEM_READ_OPTIONS, commit_item_changes
 
 # ToolStatus name constants – must match seeded values
 STATUS_LOANED = "LOANED"
@@ -16,11 +22,61 @@ STATUS_DEFECT = "DEFECT"
 # ToolCondition name constants – must match seeded values
 CONDITION_DEFECT = "DEFECT"
 
+# Wie oft eine verlorene Compare-and-Swap-Vergabe neu versucht wird
+MAX_CLAIM_ATTEMPTS = 5
+
+# Loader-Plan passend zu LoanRead: Benutzer per JOIN, Positionen per zweitem SELECT (IN)
+LOAN_READ_OPTIONS = (
+    joinedload(Loan.borrower),
+    joinedload(Loan.issuer),
+    joinedload(Loan.return_processor),
+    selectinload(Loan.items).options(
+        joinedload(LoanItem.tool_item).options(*TOOL_ITEM_READ_OPTIONS),
+        joinedload(LoanItem.return_condition),
+    ),
+)
+
+
+def _is_overdue(loan: Loan, now: datetime) -> bool:
+    if loan.returned_at is not None or loan.due_at is None:
+        return False
+    due = loan.due_at if loan.due_at.tzinfo else loan.due_at.replace(tzinfo=timezone.utc)
+    return due < now
+
+
+@event.listens_for(Loan, "before_insert")
+@event.listens_for(Loan, "before_update")
+def _sync_overdue_flag(_mapper, _connection, loan: Loan) -> None:
+    # Jeder Schreibvorgang (anlegen, due_at ändern, zurückgeben) setzt das Flag sofort;
+    # den reinen Zeitablauf holt refresh_overdue_flags nach.
+    loan.is_overdue = _is_overdue(loan, datetime.now(tz=timezone.utc))
+
+
+def refresh_overdue_flags(db: Session, now: Optional[datetime] = None) -> int:
+    """Materializes is_overdue for loans whose due date passed since the last write.
+
+    Returns the number of rows whose flag changed.
+    """
+    now = now or datetime.now(tz=timezone.utc)
+    overdue = and_(Loan.returned_at.is_(None), Loan.due_at < now)
+    became_overdue = db.execute(
+        update(Loan)
+        .where(overdue, Loan.is_overdue.is_(False))
+        .values(is_overdue=True)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    no_longer_overdue = db.execute(
+        update(Loan)
+        .where(Loan.is_overdue.is_(True), or_(Loan.returned_at.is_not(None), not_(Loan.due_at < now)))
+        .values(is_overdue=False)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+    return became_overdue + no_longer_overdue
+
 
 def _get_status_id_by_name(db: Session, name: str) -> Optional[int]:
-    from src.app.models.tool_status import ToolStatus
-    status = db.query(ToolStatus).filter(ToolStatus.name == name).first()
-    return status.id if status else None
+    return lookups.get_id(db, ToolStatus, name)
 
 
 def get_loan(db: Session, loan_id: int) -> Optional[Loan]:
@@ -31,34 +87,49 @@ def get_loans(
     db: Session,
     borrower_user_id: Optional[int] = None,
     active_only: bool = False,
+    limit: Optional[int] = None,
+    after_id: Optional[int] = None,
+    options: Optional[tuple] = None,
 ) -> list[Loan]:
-    q = db.query(Loan)
+    q = db.query(Loan).options(*(LOAN_READ_OPTIONS if options is None else options))
     if borrower_user_id is not None:
         q = q.filter(Loan.borrower_user_id == borrower_user_id)
     if active_only:
         q = q.filter(Loan.returned_at.is_(None))
-    return q.all()
+    return keyset_page(q, Loan.id, limit, after_id)
 
 
 def get_loans_by_borrower(db: Session, user_id: int) -> list[Loan]:
-    return db.query(Loan).filter(Loan.borrower_user_id == user_id).all()
+    return db.query(Loan).options(*LOAN_READ_OPTIONS).filter(Loan.borrower_user_id == user_id).all()
 
 
-def get_loans_by_department(db: Session, department_id: int) -> list[Loan]:
+def get_loans_by_department(
+    db: Session,
+    department_id: int,
+    limit: Optional[int] = None,
+    after_id: Optional[int] = None,
+    options: Optional[tuple] = None,
+) -> list[Loan]:
     from src.app.models.user import User
-    return (
+    q = (
         db.query(Loan)
+        .options(*(LOAN_READ_OPTIONS if options is None else options))
         .join(User, Loan.borrower_user_id == User.id)
         .filter(User.department_id == department_id)
-        .all()
     )
+    return keyset_page(q, Loan.id, limit, after_id)
 
 
-def get_overdue_loans(db: Session, department_id: Optional[int] = None) -> list[Loan]:
+def get_overdue_loans(
+    db: Session,
+    department_id: Optional[int] = None,
+    options: Optional[tuple] = None,
+) -> list[Loan]:
     """Returns all active loans past their due date."""
     now = datetime.now(tz=timezone.utc)
     q = (
         db.query(Loan)
+        .options(*(LOAN_READ_OPTIONS if options is None else options))
         .filter(Loan.returned_at.is_(None), Loan.due_at < now)
     )
     if department_id is not None:
@@ -67,27 +138,138 @@ def get_overdue_loans(db: Session, department_id: Optional[int] = None) -> list[
     return q.all()
 
 
-def _check_tool_item_availability(db: Session, tool_item_id: int) -> None:
-    """Raises ValueError if the tool item is not AVAILABLE or is on an active loan."""
+def _on_active_loan():
+    """Correlated EXISTS: the ToolItem in the outer query is on an active loan."""
+    return exists().where(
+        LoanItem.tool_item_id == ToolItem.id,
+        LoanItem.loan_id == Loan.id,
+        Loan.returned_at.is_(None),
+    )
+
+
+def _validate_items_available(db: Session, tool_item_ids: list[int]) -> dict[int, int]:
+    """
+    Checks all directly issued items in one IN query.
+    Raises ValueError for the first item (in request order) that is missing,
+    not AVAILABLE, already on an active loan or listed twice.
+    Returns {tool_item_id: version} for the compare-and-swap in _claim_items.
+    """
+    available_id = _get_status_id_by_name(db, STATUS_AVAILABLE)
+    rows = db.execute(
+        select(ToolItem.id, ToolItem.status_id, ToolItem.version, _on_active_loan().label("on_loan"))
+        .where(ToolItem.id.in_(tool_item_ids))
+    ).all()
+    by_id = {row.id: row for row in rows}
+
+    seen: set[int] = set()
+    for tool_item_id in tool_item_ids:
+        if tool_item_id in seen:
+            raise ValueError(f"Exemplar {tool_item_id} ist mehrfach angegeben.")
+        seen.add(tool_item_id)
+        row = by_id.get(tool_item_id)
+        if row is None or row.status_id != available_id:
+            raise ValueError(f"Exemplar {tool_item_id} ist nicht verfügbar.")
+        if row.on_loan:
+            raise ValueError(f"Exemplar {tool_item_id} ist bereits aktiv ausgeliehen.")
+    return {tool_item_id: by_id[tool_item_id].version for tool_item_id in tool_item_ids}
+
+
+def _allocate_items(db: Session, quantities: dict[int, int]) -> dict[int, dict[int, int]]:
+    """
+    Picks `quantity` AVAILABLE items per tool in a single windowed query:
+    ROW_NUMBER() per tool_id over the free items, keep rows with rn <= quantity.
+    Returns {tool_id: {tool_item_id: version, ...}} (lowest ids first).
+    Raises ValueError for the first tool without enough free items.
+    """
     available_id = _get_status_id_by_name(db, STATUS_AVAILABLE)
-    item = db.get(ToolItem, tool_item_id)
-    if not item or item.status_id != available_id:
-        raise ValueError(f"Exemplar {tool_item_id} ist nicht verfügbar.")
-    active_loan = (
-        db.query(LoanItem)
-        .join(Loan, LoanItem.loan_id == Loan.id)
-        .filter(LoanItem.tool_item_id == tool_item_id, Loan.returned_at.is_(None))
-        .first()
+    ranked = (
+        select(
+            ToolItem.id,
+            ToolItem.tool_id,
+            ToolItem.version,
+            func.row_number().over(partition_by=ToolItem.tool_id, order_by=ToolItem.id).label("rn"),
+        )
+        .where(
+            ToolItem.tool_id.in_(quantities),
+            ToolItem.status_id == available_id,
+            ~_on_active_loan(),
+        )
+        .subquery()
     )
-    if active_loan:
-        raise ValueError(f"Exemplar {tool_item_id} ist bereits aktiv ausgeliehen.")
+    wanted = case(quantities, value=ranked.c.tool_id, else_=0)
+    rows = db.execute(
+        select(ranked.c.id, ranked.c.tool_id, ranked.c.version)
+        .where(ranked.c.rn <= wanted)
+        .order_by(ranked.c.tool_id, ranked.c.rn)
+    ).all()
+
+    allocation: dict[int, dict[int, int]] = {tool_id: {} for tool_id in quantities}
+    for item_id, tool_id, version in rows:
+        allocation[tool_id][item_id] = version
+    for tool_id, quantity in quantities.items():
+        if len(allocation[tool_id]) < quantity:
+            raise ValueError(f"Nicht genügend verfügbare Exemplare für Werkzeug {tool_id}.")
+    return allocation
+
+
+def _claim_items(db: Session, candidates: dict[int, int]) -> set[int]:
+    """
+    Compare-and-swap AVAILABLE -> LOANED for {tool_item_id: version} in one UPDATE.
 
+    Only rows that still have the version read during allocation (and are still
+    AVAILABLE) are updated; their version is incremented. Returns the ids that
+    were claimed – the rest were changed concurrently by another transaction.
+    """
+    if not candidates:
+        return set()
+    available_id = _get_status_id_by_name(db, STATUS_AVAILABLE)
+    loaned_id = _get_status_id_by_name(db, STATUS_LOANED)
+    if available_id is None or loaned_id is None:
+        raise ValueError("Status 'AVAILABLE' oder 'LOANED' fehlt in der Datenbank. Bitte Seed ausführen.")
+    claimed = db.execute(
+        update(ToolItem)
+        .where(
+            tuple_(ToolItem.id, ToolItem.version).in_(list(candidates.items())),
+            ToolItem.status_id == available_id,
+        )
+        .values(status_id=loaned_id, version=ToolItem.version + 1)
+        .returning(ToolItem.id, ToolItem.tool_id)
+        .execution_options(synchronize_session="fetch")
+    ).all()
+    # Am ORM vorbei – Bestandszähler selbst buchen
+    tool_availability.record_transitions(db, [tool_id for _, tool_id in claimed], STATUS_AVAILABLE, STATUS_LOANED)
+    return {item_id for item_id, _ in claimed}
+
+
+def _claim_with_retry(db: Session, pick) -> list[int]:
+    """
+    Claims items picked by `pick(claimed)` until nothing is left to pick.
+
+    `pick` receives the ids claimed so far and returns {tool_item_id: version}
+    for what is still missing (empty dict = done); it raises ValueError when
+    the request can no longer be satisfied. Lost CAS races are simply picked
+    again with fresh versions, up to MAX_CLAIM_ATTEMPTS rounds.
+    """
+    claimed: list[int] = []
+    for _ in range(MAX_CLAIM_ATTEMPTS):
+        candidates = pick(claimed)
+        if not candidates:
+            return claimed
+        won = _claim_items(db, candidates)
+        claimed.extend(item_id for item_id in candidates if item_id in won)
+        if len(won) == len(candidates):
+            return claimed
+    raise ValueError("Exemplare wurden gleichzeitig anderweitig vergeben. Bitte erneut versuchen.")
+
+
+def _add_loan_items(db: Session, loan: Loan, tool_item_ids: list[int]) -> None:
+    db.add_all([LoanItem(loan_id=loan.id, tool_item_id=item_id) for item_id in tool_item_ids])
 
-def create_loan(db: Session, data: LoanCreate) -> Loan:
-    for item_data in data.items:
-        _check_tool_item_availability(db, item_data.tool_item_id)
 
-    loaned_status_id = _get_status_id_by_name(db, STATUS_LOANED)
+def create_loan(db: Session, data: LoanCreate) -> Loan:
+    tool_item_ids = [item_data.tool_item_id for item_data in data.items]
+    # Vorab prüfen, damit fachliche Fehler (nicht verfügbar, doppelt) vor dem Anlegen auffallen
+    versions = _validate_items_available(db, tool_item_ids)
 
     loan = Loan(
         due_at=data.due_at,
@@ -99,17 +281,13 @@ def create_loan(db: Session, data: LoanCreate) -> Loan:
     db.add(loan)
     db.flush()
 
-    for item_data in data.items:
-        loan_item = LoanItem(
-            loan_id=loan.id,
-            tool_item_id=item_data.tool_item_id,
-        )
-        db.add(loan_item)
+    def pick(claimed: list[int]) -> dict[int, int]:
+        if not claimed:
+            return versions
+        pending = [item_id for item_id in tool_item_ids if item_id not in claimed]
+        return _validate_items_available(db, pending) if pending else {}
 
-        if loaned_status_id:
-            tool_item = db.get(ToolItem, item_data.tool_item_id)
-            if tool_item:
-                tool_item.status_id = loaned_status_id
+    _add_loan_items(db, loan, _claim_with_retry(db, pick))
 
     db.commit()
     db.refresh(loan)
@@ -119,11 +297,13 @@ def create_loan(db: Session, data: LoanCreate) -> Loan:
 def create_loan_from_request(db: Session, request, approver_user_id: int) -> Loan:
     """
     Auto-creates a Loan when a LoanRequest is approved.
-    Picks the first AVAILABLE ToolItem for each requested Tool.
+    Picks the first AVAILABLE ToolItems for all requested Tools in one query
+    and claims them with a compare-and-swap; lost races are re-allocated.
     Raises ValueError if not enough available items exist.
     """
-    available_id = _get_status_id_by_name(db, STATUS_AVAILABLE)
-    loaned_id = _get_status_id_by_name(db, STATUS_LOANED)
+    quantities: dict[int, int] = {}
+    for req_item in request.items:
+        quantities[req_item.tool_id] = quantities.get(req_item.tool_id, 0) + req_item.quantity
 
     loan = Loan(
         due_at=request.due_at,
@@ -132,34 +312,30 @@ def create_loan_from_request(db: Session, request, approver_user_id: int) -> Loa
         created_from_request_id=request.id,
         comment=request.comment,
     )
+
     db.add(loan)
     db.flush()
 
-    active_loan_item_ids = (
-        db.query(LoanItem.tool_item_id)
-        .join(Loan, LoanItem.loan_id == Loan.id)
-        .filter(Loan.returned_at.is_(None))
-    )
-
-    for req_item in request.items:
-        available_items = (
-            db.query(ToolItem)
-            .filter(
-                ToolItem.tool_id == req_item.tool_id,
-                ToolItem.status_id == available_id,
-                ~ToolItem.id.in_(active_loan_item_ids),
-            )
-            .limit(req_item.quantity)
-            .all()
-        )
-        if len(available_items) < req_item.quantity:
-            raise ValueError(
-                f"Nicht genügend verfügbare Exemplare für Werkzeug {req_item.tool_id}."
-            )
-        for tool_item in available_items:
-            db.add(LoanItem(loan_id=loan.id, tool_item_id=tool_item.id))
-            tool_item.status_id = loaned_id
-
+    tool_of: dict[int, int] = {}  # tool_item_id -> tool_id der bisher ausgewählten Exemplare
+
+    def pick(claimed: list[int]) -> dict[int, int]:
+        have: dict[int, int] = {}
+        for item_id in claimed:
+            have[tool_of[item_id]] = have.get(tool_of[item_id], 0) + 1
+        missing = {
+            tool_id: quantity - have.get(tool_id, 0)
+            for tool_id, quantity in quantities.items()
+            if quantity > have.get(tool_id, 0)
+        }
+        if not missing:
+            return {}
+        candidates: dict[int, int] = {}
+        for tool_id, items in _allocate_items(db, missing).items():
+            candidates.update(items)
+            tool_of.update(dict.fromkeys(items, tool_id))
+        return candidates
+
+    _add_loan_items(db, loan, _claim_with_retry(db, pick))
     return loan
 
 
@@ -180,12 +356,28 @@ def return_loan(
     """
     Process loan return.
     item_returns: list of {"loan_item_id": int, "return_comment": str|None, "return_condition_id": int|None}
+    Raises ValueError if the loan was already returned (also by a concurrent request)
+    or if one of its items was changed concurrently.
     """
     available_status_id = _get_status_id_by_name(db, STATUS_AVAILABLE)
     defect_status_id = _get_status_id_by_name(db, STATUS_DEFECT)
 
-    loan.returned_at = datetime.now(tz=timezone.utc)
-    loan.returned_by_user_id = returned_by_user_id
+    # Compare-and-swap auf returned_at: Von zwei gleichzeitigen Rückgaben derselben
+    # Ausleihe gewinnt genau eine. Die zweite würde sonst Exemplare freigeben, die
+    # inzwischen schon wieder neu verliehen sind.
+    returned = db.execute(
+        update(Loan)
+        .where(Loan.id == loan.id, Loan.returned_at.is_(None))
+        .values(
+            returned_at=datetime.now(tz=timezone.utc),
+            returned_by_user_id=returned_by_user_id,
+            is_overdue=False,
+        )
+        .execution_options(synchronize_session="fetch")
+    ).rowcount
+    if not returned:
+        db.rollback()
+        raise ValueError("Diese Ausleihe wurde bereits zurückgegeben")
 
     for ret in item_returns:
         loan_item = db.get(LoanItem, ret["loan_item_id"])
@@ -196,18 +388,13 @@ def return_loan(
 
         tool_item = db.get(ToolItem, loan_item.tool_item_id)
         if tool_item:
-            from src.app.models.tool_condition import ToolCondition
-            condition = (
-                db.get(ToolCondition, loan_item.return_condition_id)
-                if loan_item.return_condition_id
-                else None
-            )
-            if condition and condition.name == CONDITION_DEFECT:
+            condition_name = lookups.get_name(db, ToolCondition, loan_item.return_condition_id)
+            if condition_name == CONDITION_DEFECT:
                 tool_item.status_id = defect_status_id
             else:
                 tool_item.status_id = available_status_id
 
-    db.commit()
+    commit_item_changes(db)
     db.refresh(loan)
     return loan
 
@@ -1,9 +1,10 @@
 from typing import Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
 from src.app.models.loan_item import LoanItem
 from src.app.schemas.loan_item import LoanItemUpdate
+from src.app.crud.tool_item import TOOL_ITEM_READ_OPTIONS
 
 
 def get_loan_item(db: Session, item_id: int) -> Optional[LoanItem]:
@@ -11,7 +12,14 @@ def get_loan_item(db: Session, item_id: int) -> Optional[LoanItem]:
 
 
 def get_loan_items(db: Session) -> list[LoanItem]:
-    return db.query(LoanItem).all()
+    return (
+        db.query(LoanItem)
+        .options(
+            joinedload(LoanItem.tool_item).options(*TOOL_ITEM_READ_OPTIONS),
+            joinedload(LoanItem.return_condition),
+        )
+        .all()
+    )
 
 
 def create_loan_item(db: Session, loan_id: int, tool_item_id: int) -> LoanItem:
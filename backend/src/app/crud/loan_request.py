@@ -1,73 +1,111 @@
 from typing import Optional
 from datetime import datetime, timezone, timedelta
 
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload, selectinload
 
+from src.app.crud import lookups
+from src.app.db.pagination import keyset_page
 from src.app.models.loan_request import LoanRequest
 from src.app.models.loan_request_item import LoanRequestItem
 from src.app.models.loan_request_status import LoanRequestStatus
-from src.app.models.tool_item import ToolItem
-from src.app.models.tool_status import ToolStatus
+from src.app.models.tool_availability import ToolAvailability
 from src.app.schemas.loan_request import LoanRequestCreate, LoanRequestUpdate
+from src.app.crud.tool import TOOL_READ_OPTIONS
 
 _STATUS_REQUESTED = "REQUESTED"
 _STATUS_APPROVED = "APPROVED"
-_STATUS_AVAILABLE = "AVAILABLE"
+
+# Loader-Plan passend zu LoanRequestRead
+LOAN_REQUEST_READ_OPTIONS = (
+    joinedload(LoanRequest.requester),
+    joinedload(LoanRequest.approver),
+    joinedload(LoanRequest.status),
+    selectinload(LoanRequest.items).options(
+        joinedload(LoanRequestItem.tool).options(*TOOL_READ_OPTIONS),
+    ),
+)
 
 
 def _get_requested_status_id(db: Session) -> int:
-    status = db.query(LoanRequestStatus).filter(LoanRequestStatus.name == _STATUS_REQUESTED).first()
-    if not status:
+    status_id = lookups.get_id(db, LoanRequestStatus, _STATUS_REQUESTED)
+    if status_id is None:
         raise ValueError(f"LoanRequestStatus '{_STATUS_REQUESTED}' not found. Run the seed first.")
-    return status.id
-
-
-def _get_tool_status_id(db: Session, name: str) -> Optional[int]:
-    status = db.query(ToolStatus).filter(ToolStatus.name == name).first()
-    return status.id if status else None
-
-
-def _check_tool_availability(db: Session, tool_id: int, quantity: int) -> None:
-    """Raises ValueError if not enough available tool items exist for the given tool."""
-    available_id = _get_tool_status_id(db, _STATUS_AVAILABLE)
-    count = (
-        db.query(ToolItem)
-        .filter(ToolItem.tool_id == tool_id, ToolItem.status_id == available_id)
-        .count()
+    return status_id
+
+
+def _check_tool_availability(db: Session, quantities: dict[int, int]) -> None:
+    """
+    Raises ValueError if a tool has fewer AVAILABLE items than requested.
+    Reads the maintained counters (tool_availability) for all tools in one primary-key query.
+    """
+    available = dict(
+        db.execute(
+            select(ToolAvailability.tool_id, ToolAvailability.available)
+            .where(ToolAvailability.tool_id.in_(quantities))
+        ).all()
     )
-    if count < quantity:
-        raise ValueError(
-            f"Not enough available items for tool {tool_id}: "
-            f"requested {quantity}, available {count}."
-        )
+    for tool_id, quantity in quantities.items():
+        count = available.get(tool_id, 0)
+        if count < quantity:
+            raise ValueError(
+                f"Not enough available items for tool {tool_id}: "
+                f"requested {quantity}, available {count}."
+            )
 
 
 def get_loan_request(db: Session, request_id: int) -> Optional[LoanRequest]:
     return db.get(LoanRequest, request_id)
 
 
-def get_loan_requests(db: Session) -> list[LoanRequest]:
-    return db.query(LoanRequest).all()
+def get_loan_requests(
+    db: Session,
+    limit: Optional[int] = None,
+    after_id: Optional[int] = None,
+    options: Optional[tuple] = None,
+) -> list[LoanRequest]:
+    q = db.query(LoanRequest).options(*(LOAN_REQUEST_READ_OPTIONS if options is None else options))
+    return keyset_page(q, LoanRequest.id, limit, after_id)
 
 
-def get_loan_requests_by_user(db: Session, user_id: int) -> list[LoanRequest]:
-    return db.query(LoanRequest).filter(LoanRequest.requester_user_id == user_id).all()
+def get_loan_requests_by_user(
+    db: Session,
+    user_id: int,
+    limit: Optional[int] = None,
+    after_id: Optional[int] = None,
+    options: Optional[tuple] = None,
+) -> list[LoanRequest]:
+    q = (
+        db.query(LoanRequest)
+        .options(*(LOAN_REQUEST_READ_OPTIONS if options is None else options))
+        .filter(LoanRequest.requester_user_id == user_id)
+    )
+    return keyset_page(q, LoanRequest.id, limit, after_id)
 
 
-def get_loan_requests_by_department(db: Session, department_id: int) -> list[LoanRequest]:
+def get_loan_requests_by_department(
+    db: Session,
+    department_id: int,
+    limit: Optional[int] = None,
+    after_id: Optional[int] = None,
+    options: Optional[tuple] = None,
+) -> list[LoanRequest]:
     """Returns all loan requests from users in the given department."""
     from src.app.models.user import User
-    return (
+    q = (
         db.query(LoanRequest)
+        .options(*(LOAN_REQUEST_READ_OPTIONS if options is None else options))
         .join(User, LoanRequest.requester_user_id == User.id)
         .filter(User.department_id == department_id)
-        .all()
     )
+    return keyset_page(q, LoanRequest.id, limit, after_id)
 
 
 def create_loan_request(db: Session, data: LoanRequestCreate) -> LoanRequest:
+    quantities: dict[int, int] = {}
     for item_data in data.items:
-        _check_tool_availability(db, item_data.tool_id, item_data.quantity)
+        quantities[item_data.tool_id] = quantities.get(item_data.tool_id, 0) + item_data.quantity
+    _check_tool_availability(db, quantities)
 
     request = LoanRequest(
         comment=data.comment,
@@ -114,8 +152,7 @@ def decide_loan_request(
     request.decision_at = datetime.now(tz=timezone.utc)
 
     # Auto-create a Loan when the request is approved
-    status_obj = db.get(LoanRequestStatus, status_id)
-    if status_obj and status_obj.name == _STATUS_APPROVED:
+    if lookups.get_name(db, LoanRequestStatus, status_id) == _STATUS_APPROVED:
         # Calculate due_at from decision_at + days_needed
         if request.days_needed and request.due_at is None:
             request.due_at = request.decision_at + timedelta(days=request.days_needed)
@@ -1,6 +1,7 @@
 from typing import Optional
 from sqlalchemy.orm import Session
 
+from src.app.crud import lookups
 from src.app.models.loan_request_status import LoanRequestStatus
 from src.app.schemas.loan_request_status import LoanRequestStatusCreate, LoanRequestStatusUpdate
 
@@ -17,6 +18,7 @@ def create_loan_request_status(db: Session, data: LoanRequestStatusCreate) -> Lo
     status = LoanRequestStatus(**data.model_dump())
     db.add(status)
     db.commit()
+    lookups.invalidate(LoanRequestStatus)
     db.refresh(status)
     return status
 
@@ -27,6 +29,7 @@ def update_loan_request_status(
     for field, value in data.model_dump(exclude_unset=True).items():
         setattr(status, field, value)
     db.commit()
+    lookups.invalidate(LoanRequestStatus)
     db.refresh(status)
     return status
 
@@ -34,3 +37,4 @@ def update_loan_request_status(
 def delete_loan_request_status(db: Session, status: LoanRequestStatus) -> None:
     db.delete(status)
     db.commit()
+    lookups.invalidate(LoanRequestStatus)
@@ -0,0 +1,93 @@
+# ============================================================
+# crud/lookups.py – Zwischenspeicher für Lookup-Tabellen
+#
+# Status-, Zustands- und Rollennamen (z.B. "AVAILABLE", "DEFECT", "ADMIN")
+# ändern sich praktisch nie, werden aber in fast jedem Schreibvorgang
+# in IDs übersetzt. Die Registry hält name↔id für alle Lookup-Tabellen im
+# Speicher, damit dafür keine SELECTs mehr nötig sind.
+#
+#   - Beim Start (main.lifespan) werden alle Tabellen einmal geladen.
+#   - create/update/delete der Lookup-CRUD-Module rufen invalidate() auf.
+#   - Unbekannte Namen/IDs lösen genau ein Nachladen der Tabelle aus
+#     (falls Einträge z.B. per Seed-Skript direkt eingefügt wurden).
+# ============================================================
+
+import threading
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from src.app.models.loan_request_status import LoanRequestStatus
+from src.app.models.role import Role
+from src.app.models.tool_condition import ToolCondition
+from src.app.models.tool_item_issue_status import ToolItemIssueStatus
+from src.app.models.tool_status import ToolStatus
+
+LOOKUP_MODELS = (ToolStatus, ToolCondition, Role, LoanRequestStatus, ToolItemIssueStatus)
+
+
+class LookupRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        # model -> (name -> id, id -> name)
+        self._tables: dict[type, tuple[dict[str, int], dict[int, str]]] = {}
+
+    def _load(self, db: Session, model) -> tuple[dict[str, int], dict[int, str]]:
+        rows = db.query(model.id, model.name).all()
+        table = ({name: id_ for id_, name in rows}, {id_: name for id_, name in rows})
+        with self._lock:
+            self._tables[model] = table
+        return table
+
+    def _table(self, db: Session, model, reload: bool = False):
+        table = None if reload else self._tables.get(model)
+        return table if table is not None else self._load(db, model)
+
+    def load_all(self, db: Session) -> None:
+        for model in LOOKUP_MODELS:
+            self._load(db, model)
+
+    def get_id(self, db: Session, model, name: str) -> Optional[int]:
+        by_name, _ = self._table(db, model)
+        if name not in by_name:
+            by_name, _ = self._table(db, model, reload=True)
+        return by_name.get(name)
+
+    def get_name(self, db: Session, model, id_: Optional[int]) -> Optional[str]:
+        if id_ is None:
+            return None
+        _, by_id = self._table(db, model)
+        if id_ not in by_id:
+            _, by_id = self._table(db, model, reload=True)
+        return by_id.get(id_)
+
+    def invalidate(self, model=None) -> None:
+        with self._lock:
+            if model is None:
+                self._tables.clear()
+            else:
+                self._tables.pop(model, None)
+
+
+# Globale Instanz – wird von allen CRUD-Modulen verwendet
+registry = LookupRegistry()
+
+
+def load_all(db: Session) -> None:
+    """Loads every lookup table into memory (called once at startup)."""
+    registry.load_all(db)
+
+
+def get_id(db: Session, model, name: str) -> Optional[int]:
+    """Resolves a lookup name (e.g. ToolStatus "AVAILABLE") to its id, or None."""
+    return registry.get_id(db, model, name)
+
+
+def get_name(db: Session, model, id_: Optional[int]) -> Optional[str]:
+    """Resolves a lookup id to its name, or None."""
+    return registry.get_name(db, model, id_)
+
+
+def invalidate(model=None) -> None:
+    """Drops the cached table for `model` (or all tables) after a change."""
+    registry.invalidate(model)
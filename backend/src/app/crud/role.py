@@ -1,6 +1,7 @@
 from typing import Optional
 from sqlalchemy.orm import Session
 
+from src.app.crud import lookups
 from src.app.models.role import Role
 from src.app.schemas.role import RoleCreate, RoleUpdate
 
@@ -17,6 +18,7 @@ def create_role(db: Session, data: RoleCreate) -> Role:
     role = Role(**data.model_dump())
     db.add(role)
     db.commit()
+    lookups.invalidate(Role)
     db.refresh(role)
     return role
 
@@ -25,6 +27,7 @@ def update_role(db: Session, role: Role, data: RoleUpdate) -> Role:
     for field, value in data.model_dump(exclude_unset=True).items():
         setattr(role, field, value)
     db.commit()
+    lookups.invalidate(Role)
     db.refresh(role)
     return role
 
@@ -32,3 +35,4 @@ def update_role(db: Session, role: Role, data: RoleUpdate) -> Role:
 def delete_role(db: Session, role: Role) -> None:
     db.delete(role)
     db.commit()
+    lookups.invalidate(Role)
@@ -0,0 +1,98 @@
+import re
+from typing import Optional, Sequence
+
+from sqlalchemy import column, select, table, text
+from sqlalchemy.orm import Session
+
+from src.app.models.search_index import SearchIndex
+
+SEARCH_TYPES = ("tool", "tool_item", "issue")
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Je Typ: Treffer aus dem FTS-Index mit Titel/Untertitel aus den Quelltabellen.
+# bm25-Gewichte: Name/Inventarnummer/Titel zählen zehnfach gegenüber der Beschreibung.
+_SEARCH_SQL = {
+    "tool": """
+        SELECT 'tool' AS type, t.id, t.tool_name AS title, c.name AS subtitle,
+               snippet(tools_fts, -1, '**', '**', '…', 12) AS snippet,
+               -bm25(tools_fts, 10.0, 1.0) AS score
+        FROM tools_fts
+        JOIN tools t ON t.id = tools_fts.rowid
+        JOIN tool_categories c ON c.id = t.category_id
+        WHERE tools_fts MATCH :match
+        ORDER BY score DESC LIMIT :limit
+    """,
+    "tool_item": """
+        SELECT 'tool_item' AS type, i.id, i.inventory_no AS title, t.tool_name AS subtitle,
+               snippet(tool_items_fts, -1, '**', '**', '…', 12) AS snippet,
+               -bm25(tool_items_fts, 10.0, 1.0) AS score
+        FROM tool_items_fts
+        JOIN tool_items i ON i.id = tool_items_fts.rowid
+        JOIN tools t ON t.id = i.tool_id
+        WHERE tool_items_fts MATCH :match
+        ORDER BY score DESC LIMIT :limit
+    """,
+    "issue": """
+        SELECT 'issue' AS type, x.id, x.title, i.inventory_no AS subtitle,
+               snippet(tool_item_issues_fts, -1, '**', '**', '…', 12) AS snippet,
+               -bm25(tool_item_issues_fts, 10.0, 1.0) AS score
+        FROM tool_item_issues_fts
+        JOIN tool_item_issues x ON x.id = tool_item_issues_fts.rowid
+        JOIN tool_items i ON i.id = x.tool_item_id
+        WHERE tool_item_issues_fts MATCH :match {scope}
+        ORDER BY score DESC LIMIT :limit
+    """,
+}
+
+
+def match_expression(term: str) -> Optional[str]:
+    """FTS5 query for free text: every word becomes a quoted prefix term, all words must match."""
+    tokens = _TOKEN_RE.findall(term)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def substring_ids(index: SearchIndex, column_name: str, term: str):
+    """
+    SELECT rowid FROM <trigram index> WHERE <column> LIKE '%term%' – case-insensitive
+    substring match like ilike. Plain LIKE on purpose: ilike wraps the column in lower(),
+    which the trigram index cannot answer.
+    """
+    fts = table(index.name, column("rowid"), column(column_name))
+    return select(fts.c.rowid).where(fts.c[column_name].like(f"%{term}%"))
+
+
+def search(
+    db: Session,
+    term: str,
+    types: Sequence[str] = SEARCH_TYPES,
+    limit: int = 20,
+    reporter_user_id: Optional[int] = None,
+    department_id: Optional[int] = None,
+) -> list[dict]:
+    """
+    Ranked full-text search over tools, tool items and issues.
+
+    Issues can be restricted to those reported by one user (reporter_user_id)
+    or by the users of one department (department_id).
+    """
+    match = match_expression(term)
+    if match is None:
+        return []
+    params = {"match": match, "limit": limit}
+    scope = ""
+    if reporter_user_id is not None:
+        scope = "AND x.reported_by_user_id = :reporter_user_id"
+        params["reporter_user_id"] = reporter_user_id
+    elif department_id is not None:
+        scope = "AND x.reported_by_user_id IN (SELECT id FROM users WHERE department_id = :department_id)"
+        params["department_id"] = department_id
+
+    hits = []
+    for search_type in dict.fromkeys(types):
+        sql = _SEARCH_SQL[search_type].format(scope=scope)
+        hits.extend(dict(row) for row in db.execute(text(sql), params).mappings())
+    hits.sort(key=lambda hit: hit["score"], reverse=True)
+    return hits[:limit]
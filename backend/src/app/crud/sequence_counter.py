@@ -0,0 +1,37 @@
+from typing import Callable
+
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from src.app.models.sequence_counter import SequenceCounter
+
+
+def _ensure_counter(db: Session, name: str, initial: Callable[[Session], int]) -> None:
+    """Creates the counter row on first use, starting at initial(db)."""
+    if db.get(SequenceCounter, name) is not None:
+        return
+    try:
+        with db.begin_nested():
+            db.add(SequenceCounter(name=name, value=initial(db)))
+    except IntegrityError:
+        # Another writer created the row in the meantime – nothing to do
+        pass
+
+
+def reserve(db: Session, name: str, count: int, initial: Callable[[Session], int]) -> int:
+    """
+    Atomically reserves `count` consecutive values and returns the first one.
+    Runs a single UPDATE ... RETURNING, so the cost does not depend on the table size.
+    The reservation becomes permanent with the caller's commit.
+    """
+    if count < 1:
+        raise ValueError("count must be at least 1")
+    _ensure_counter(db, name, initial)
+    last = db.execute(
+        update(SequenceCounter)
+        .where(SequenceCounter.name == name)
+        .values(value=SequenceCounter.value + count)
+        .returning(SequenceCounter.value)
+    ).scalar_one()
+    return last - count + 1
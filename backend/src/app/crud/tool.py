@@ -1,9 +1,16 @@
-from typing import Optional
-from sqlalchemy.orm import Session
+from typing import Iterable, Optional
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session, joinedload
 
+from src.app.crud import search, tool_availability
+from src.app.db.pagination import keyset_page
+from src.app.models.search_index import TOOL_NAMES_TRIGRAMS
 from src.app.models.tool import Tool
 from src.app.schemas.tool import ToolCreate, ToolUpdate
 
+# Loader-Plan passend zu ToolRead (category und Bestandszähler werden immer mitgeladen)
+TOOL_READ_OPTIONS = (joinedload(Tool.category), joinedload(Tool.availability))
+
 
 def get_tool(db: Session, tool_id: int) -> Optional[Tool]:
     return db.get(Tool, tool_id)
@@ -13,13 +20,17 @@ def get_tools(
     db: Session,
     name: Optional[str] = None,
     category_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    after_id: Optional[int] = None,
+    options: Optional[tuple] = None,
 ) -> list[Tool]:
-    q = db.query(Tool)
+    q = db.query(Tool).options(*(TOOL_READ_OPTIONS if options is None else options))
     if name:
-        q = q.filter(Tool.tool_name.ilike(f"%{name}%"))
+        # Teilstring wie ilike('%…%'), aber über den Trigramm-Index statt Full Scan
+        q = q.filter(Tool.id.in_(search.substring_ids(TOOL_NAMES_TRIGRAMS, "tool_name", name)))
     if category_id is not None:
         q = q.filter(Tool.category_id == category_id)
-    return q.all()
+    return keyset_page(q, Tool.id, limit, after_id)
 
 
 def create_tool(db: Session, data: ToolCreate) -> Tool:
@@ -30,6 +41,33 @@ def create_tool(db: Session, data: ToolCreate) -> Tool:
     return tool
 
 
+def get_tool_ids_by_name(db: Session, names: Iterable[str]) -> dict[tuple[str, int], int]:
+    """(tool_name, category_id) -> id for tools with one of the given names (lowest id for duplicates)."""
+    rows = db.execute(
+        select(Tool.id, Tool.tool_name, Tool.category_id)
+        .where(Tool.tool_name.in_(set(names)))
+        .order_by(Tool.id.desc())
+    )
+    return {(name, category_id): id_ for id_, name, category_id in rows}
+
+
+def create_tools_bulk(db: Session, data: list[ToolCreate]) -> dict[tuple[str, int], int]:
+    """
+    Inserts all tools with one executemany INSERT ... RETURNING. Returns
+    (tool_name, category_id) -> id, so the rows should be unique by that pair.
+    Does not commit – the caller decides the transaction boundary.
+    """
+    if not data:
+        return {}
+    # RETURNING ohne sort_by_parameter_order, sonst fügt SQLAlchemy bei SQLite zeilenweise ein
+    rows = db.execute(
+        insert(Tool).returning(Tool.id, Tool.tool_name, Tool.category_id),
+        [row.model_dump() for row in data],
+    ).all()
+    tool_availability.recount(db, (row.id for row in rows))
+    return {(row.tool_name, row.category_id): row.id for row in rows}
+
+
 def update_tool(db: Session, tool: Tool, data: ToolUpdate) -> Tool:
     for field, value in data.model_dump(exclude_unset=True).items():
         setattr(tool, field, value)
@@ -43,8 +81,40 @@ def delete_tool(db: Session, tool: Tool) -> None:
     db.commit()
 
 
-def set_tool_image(db: Session, tool: Tool, filename: Optional[str]) -> Tool:
+def set_tool_image(db: Session, tool: Tool, filename: Optional[str], variants_ready: bool = False) -> Tool:
     tool.image_filename = filename
+    tool.image_variants_ready = variants_ready
     db.commit()
     db.refresh(tool)
     return tool
+
+
+def count_tools_with_image(db: Session, filename: str) -> int:
+    """Reference count of an image file (uses the index on tools.image_filename)."""
+    return db.scalar(select(func.count()).select_from(Tool).where(Tool.image_filename == filename))
+
+
+def get_referenced_image_filenames(db: Session) -> list[str]:
+    return list(db.scalars(select(Tool.image_filename).where(Tool.image_filename.is_not(None)).distinct()))
+
+
+def mark_image_variants_ready(db: Session, filename: str) -> bool:
+    """Marks the variants as ready for all tools showing this image. Returns False if none was updated."""
+    updated = db.execute(
+        update(Tool)
+        .where(Tool.image_filename == filename, Tool.image_variants_ready.is_(False))
+        .values(image_variants_ready=True)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+    return bool(updated)
+
+
+def get_images_without_variants(db: Session) -> list[str]:
+    """Image files that are referenced by at least one tool without ready variants."""
+    return list(db.scalars(
+        select(Tool.image_filename)
+        .where(Tool.image_filename.is_not(None), Tool.image_variants_ready.is_(False))
+        .distinct()
+        .order_by(Tool.image_filename)
+    ))
@@ -0,0 +1,188 @@
+# ============================================================
+# crud/tool_availability.py – Bestandszähler pro Werkzeug pflegen
+#
+# Jede Statusänderung eines Exemplars passt die Zeile in
+# tool_availability in DERSELBEN Transaktion an:
+#
+#   - ORM-Änderungen (Exemplar anlegen/löschen, status_id oder tool_id
+#     ändern) erkennt ein after_flush-Listener an der Attribut-History.
+#     Damit sind return_loan, retire_tool_item, update_tool_item und die
+#     Störungsmeldungen abgedeckt, ohne dass sie selbst zählen müssen.
+#   - Massen-UPDATEs am ORM vorbei (Vergabe in crud/loan._claim_items)
+#     melden ihre Übergänge über record_transitions(). Nach Massen-INSERTs
+#     (Import, crud/tool.create_tools_bulk und crud/tool_item.create_tool_items_bulk)
+#     zählt recount() die betroffenen Tools neu – zwei Statements statt
+#     eines UPDATEs pro Tool.
+#
+# Die Zähler werden per "SET spalte = spalte + n" verändert (atomar, O(1)).
+# Fehlt die Zeile eines Tools, wird sie aus tool_items nachgezählt.
+# rebuild_tool_availability() gleicht alle Zeilen mit tool_items ab.
+# ============================================================
+
+from collections import defaultdict
+from typing import Iterable, Optional
+
+from sqlalchemy import case, delete, event, func, inspect, insert, select, update
+from sqlalchemy.orm import Session
+
+from src.app.crud import lookups
+from src.app.models.tool import Tool
+from src.app.models.tool_availability import ToolAvailability
+from src.app.models.tool_item import ToolItem
+from src.app.models.tool_status import ToolStatus
+
+# ToolStatus-Name -> Zählerspalte. Exemplare mit anderen Status zählen nur in total.
+STATUS_COLUMNS = {
+    "AVAILABLE": "available",
+    "LOANED": "loaned",
+    "DEFECT": "defect",
+    "MAINTENANCE": "maintenance",
+    "RETIRED": "retired",
+}
+COUNTER_COLUMNS = ("total", *STATUS_COLUMNS.values())
+
+# tool_id -> Spalte -> Änderung
+Deltas = dict[int, dict[str, int]]
+
+
+def _column_for(db: Session, status_id: Optional[int]) -> Optional[str]:
+    return STATUS_COLUMNS.get(lookups.get_name(db, ToolStatus, status_id))
+
+
+def _counts_query(tool_ids: Optional[Iterable[int]] = None):
+    """Counts per tool (all columns of ToolAvailability) straight from tool_items."""
+    def count_status(name: str):
+        return func.coalesce(func.sum(case((ToolStatus.name == name, 1), else_=0)), 0)
+
+    q = (
+        select(
+            Tool.id.label("tool_id"),
+            func.count(ToolItem.id).label("total"),
+            *(count_status(name).label(column) for name, column in STATUS_COLUMNS.items()),
+        )
+        .select_from(Tool)
+        .outerjoin(ToolItem, ToolItem.tool_id == Tool.id)
+        .outerjoin(ToolStatus, ToolStatus.id == ToolItem.status_id)
+        .group_by(Tool.id)
+    )
+    if tool_ids is not None:
+        q = q.where(Tool.id.in_(list(tool_ids)))
+    return q
+
+
+def _recount(db: Session, tool_ids: set[int]) -> None:
+    """(Re)creates the rows of the given tools from tool_items."""
+    if not tool_ids:
+        return
+    db.execute(
+        delete(ToolAvailability)
+        .where(ToolAvailability.tool_id.in_(tool_ids))
+        .execution_options(synchronize_session=False)
+    )
+    db.execute(insert(ToolAvailability).from_select(["tool_id", *COUNTER_COLUMNS], _counts_query(tool_ids)))
+
+
+def apply_deltas(db: Session, deltas: Deltas) -> None:
+    """Adds the deltas to the counters, one UPDATE per tool. Missing rows are recounted."""
+    missing: set[int] = set()
+    for tool_id, columns in deltas.items():
+        values = {column: getattr(ToolAvailability, column) + n for column, n in columns.items() if n}
+        if not values:
+            continue
+        updated = db.execute(
+            update(ToolAvailability)
+            .where(ToolAvailability.tool_id == tool_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if not updated:
+            missing.add(tool_id)
+    _recount(db, missing)
+
+
+def record_transitions(db: Session, tool_ids: Iterable[int], from_status: str, to_status: str) -> None:
+    """Books one status change per entry of tool_ids (an id may repeat) for bulk UPDATEs."""
+    old, new = STATUS_COLUMNS.get(from_status), STATUS_COLUMNS.get(to_status)
+    deltas: Deltas = defaultdict(lambda: defaultdict(int))
+    for tool_id in tool_ids:
+        if old:
+            deltas[tool_id][old] -= 1
+        if new:
+            deltas[tool_id][new] += 1
+    apply_deltas(db, deltas)
+
+
+def recount(db: Session, tool_ids: Iterable[int]) -> None:
+    """Recounts the rows of the given tools from tool_items (after bulk INSERTs)."""
+    _recount(db, set(tool_ids))
+
+
+def rebuild_tool_availability(db: Session) -> int:
+    """Recounts all tools from tool_items and fixes deviating rows. Returns the number of fixed tools."""
+    actual = {row.tool_id: row for row in db.execute(_counts_query()).all()}
+    stored = {
+        row.tool_id: row
+        for row in db.execute(select(ToolAvailability.tool_id, *(getattr(ToolAvailability, c) for c in COUNTER_COLUMNS)))
+    }
+
+    fixed = set(stored) - set(actual)  # Zeilen ohne Tool
+    for tool_id, row in actual.items():
+        current = stored.get(tool_id)
+        if current is None or any(getattr(current, c) != getattr(row, c) for c in COUNTER_COLUMNS):
+            fixed.add(tool_id)
+    _recount(db, fixed)
+    db.commit()
+    return len(fixed)
+
+
+# ---------------------------------------------------------------------------
+# Zählung der ORM-Änderungen beim Flush
+# ---------------------------------------------------------------------------
+
+def _collect_deltas(session: Session) -> tuple[Deltas, set[int]]:
+    deltas: Deltas = defaultdict(lambda: defaultdict(int))
+    new_tools = {obj.id for obj in session.new if isinstance(obj, Tool)}
+
+    def book(tool_id: Optional[int], status_id: Optional[int], n: int) -> None:
+        if tool_id is None or tool_id in new_tools:
+            return  # neue Tools werden nach dem Flush komplett gezählt
+        deltas[tool_id]["total"] += n
+        column = _column_for(session, status_id)
+        if column:
+            deltas[tool_id][column] += n
+
+    for obj in session.new:
+        if isinstance(obj, ToolItem):
+            book(obj.tool_id, obj.status_id, 1)
+    for obj in session.deleted:
+        if isinstance(obj, ToolItem):
+            state = inspect(obj)
+            book(_committed(state, "tool_id"), _committed(state, "status_id"), -1)
+    for obj in session.dirty:
+        if isinstance(obj, ToolItem):
+            state = inspect(obj)
+            tool_hist = state.attrs.tool_id.history
+            status_hist = state.attrs.status_id.history
+            if not (tool_hist.has_changes() or status_hist.has_changes()):
+                continue
+            book(_committed(state, "tool_id"), _committed(state, "status_id"), -1)
+            book(obj.tool_id, obj.status_id, 1)
+    return deltas, new_tools
+
+
+def _committed(state, key: str):
+    """Value of the attribute as loaded from the database (before this flush)."""
+    history = state.attrs[key].history
+    if history.deleted:
+        return history.deleted[0]
+    return history.unchanged[0] if history.unchanged else None
+
+
+@event.listens_for(Session, "after_flush")
+def _update_counters(session, _flush_context):
+    # In after_flush enthalten new/dirty/deleted und die History noch den Stand vor dem Flush
+    if not any(isinstance(obj, (ToolItem, Tool)) for obj in (*session.new, *session.dirty, *session.deleted)):
+        return
+    deltas, new_tools = _collect_deltas(session)
+    apply_deltas(session, deltas)
+    _recount(session, new_tools)
@@ -1,4 +1,5 @@
 from typing import Optional
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from src.app.models.tool_category import ToolCategory
@@ -13,6 +14,11 @@ def get_tool_categories(db: Session) -> list[ToolCategory]:
     return db.query(ToolCategory).all()
 
 
+def get_tool_category_ids(db: Session) -> dict[str, int]:
+    """name -> id of all categories (one query)."""
+    return {name: id_ for id_, name in db.execute(select(ToolCategory.id, ToolCategory.name))}
+
+
 def create_tool_category(db: Session, data: ToolCategoryCreate) -> ToolCategory:
     category = ToolCategory(**data.model_dump())
     db.add(category)
@@ -1,6 +1,7 @@
 from typing import Optional
 from sqlalchemy.orm import Session
 
+from src.app.crud import lookups
 from src.app.models.tool_condition import ToolCondition
 from src.app.schemas.tool_condition import ToolConditionCreate, ToolConditionUpdate
 
@@ -17,6 +18,7 @@ def create_tool_condition(db: Session, data: ToolConditionCreate) -> ToolConditi
     condition = ToolCondition(**data.model_dump())
     db.add(condition)
     db.commit()
+    lookups.invalidate(ToolCondition)
     db.refresh(condition)
     return condition
 
@@ -25,6 +27,7 @@ def update_tool_condition(db: Session, condition: ToolCondition, data: ToolCondi
     for field, value in data.model_dump(exclude_unset=True).items():
         setattr(condition, field, value)
     db.commit()
+    lookups.invalidate(ToolCondition)
     db.refresh(condition)
     return condition
 
@@ -32,3 +35,4 @@ def update_tool_condition(db: Session, condition: ToolCondition, data: ToolCondi
 def delete_tool_condition(db: Session, condition: ToolCondition) -> None:
     db.delete(condition)
     db.commit()
+    lookups.invalidate(ToolCondition)
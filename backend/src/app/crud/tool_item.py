@@ -1,29 +1,74 @@
 import re
-from typing import Optional
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Iterator, Optional
 
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm.exc import StaleDataError
+
+from src.app.db.pagination import keyset_page, keyset_select
+from src.app.models.loan import Loan
+from src.app.models.loan_item import LoanItem
+from src.app.models.search_index import INVENTORY_NOS_TRIGRAMS
+from src.app.models.tool import Tool
+from src.app.models.tool_condition import ToolCondition
 from src.app.models.tool_item import ToolItem
 from src.app.models.tool_status import ToolStatus
+from src.app.models.user import User
+from src.app.crud import lookups, search, sequence_counter, tool_availability
+from src.app.crud.tool import TOOL_READ_OPTIONS
 from src.app.schemas.tool_item import ToolItemCreate, ToolItemUpdate
 
 _STATUS_AVAILABLE = "AVAILABLE"
 _STATUS_RETIRED = "RETIRED"
+_INVENTORY_SEQUENCE = "inventory_no"
+CONCURRENT_ITEM_UPDATE = "Das Exemplar wurde gleichzeitig geändert (z.B. verliehen). Bitte neu laden und erneut versuchen."
 
+# Loader-Plan passend zu ToolItemRead – wird auch von Loans und Issues wiederverwendet
+TOOL_ITEM_READ_OPTIONS = (
+    joinedload(ToolItem.tool).options(*TOOL_READ_OPTIONS),
+    joinedload(ToolItem.status),
+    joinedload(ToolItem.condition),
+)
 
-def _next_inventory_no(db: Session) -> str:
-    """Returns the next inventory number in format INV-XXXX, incrementing from the current maximum."""
+
+def commit_item_changes(db: Session) -> None:
+    """
+    Commits ORM changes that touch tool items. ToolItem is version-checked
+    (version_id_col); if crud/loan._claim_items changed a row in between, the
+    transaction is rolled back and a ValueError is raised (the routes answer 409).
+    """
+    try:
+        db.commit()
+    except StaleDataError:
+        db.rollback()
+        raise ValueError(CONCURRENT_ITEM_UPDATE)
+
+
+def _max_inventory_no(db: Session) -> int:
+    """Highest existing INV-XXXX number. Only used once to initialise the counter."""
     rows = db.query(ToolItem.inventory_no).all()
     max_num = 0
     for (inv_no,) in rows:
         m = re.fullmatch(r"INV-(\d+)", inv_no or "")
         if m:
             max_num = max(max_num, int(m.group(1)))
-    return f"INV-{max_num + 1:04d}"
+    return max_num
+
+
+def reserve_inventory_nos(db: Session, count: int) -> list[str]:
+    """Reserves `count` consecutive inventory numbers (INV-XXXX) in one atomic counter update."""
+    first = sequence_counter.reserve(db, _INVENTORY_SEQUENCE, count, initial=_max_inventory_no)
+    return [f"INV-{n:04d}" for n in range(first, first + count)]
+
+
+def _next_inventory_no(db: Session) -> str:
+    """Returns the next inventory number in format INV-XXXX."""
+    return reserve_inventory_nos(db, 1)[0]
 
 
 def _get_status_id_by_name(db: Session, name: str) -> Optional[int]:
-    status = db.query(ToolStatus).filter(ToolStatus.name == name).first()
-    return status.id if status else None
+    return lookups.get_id(db, ToolStatus, name)
 
 
 def get_tool_item(db: Session, item_id: int) -> Optional[ToolItem]:
@@ -36,8 +81,11 @@ def get_tool_items(
     status_id: Optional[int] = None,
     condition_id: Optional[int] = None,
     inventory_no: Optional[str] = None,
+    limit: Optional[int] = None,
+    after_id: Optional[int] = None,
+    options: Optional[tuple] = None,
 ) -> list[ToolItem]:
-    q = db.query(ToolItem)
+    q = db.query(ToolItem).options(*(TOOL_ITEM_READ_OPTIONS if options is None else options))
     if tool_id is not None:
         q = q.filter(ToolItem.tool_id == tool_id)
     if status_id is not None:
@@ -45,12 +93,35 @@ def get_tool_items(
     if condition_id is not None:
         q = q.filter(ToolItem.condition_id == condition_id)
     if inventory_no:
-        q = q.filter(ToolItem.inventory_no.ilike(f"%{inventory_no}%"))
-    return q.all()
+        q = q.filter(ToolItem.id.in_(search.substring_ids(INVENTORY_NOS_TRIGRAMS, "inventory_no", inventory_no)))
+    return keyset_page(q, ToolItem.id, limit, after_id)
+
+
+def get_label_item_ids(
+    db: Session,
+    item_ids: Optional[list[int]] = None,
+    tool_id: Optional[int] = None,
+) -> list[int]:
+    """Existing item ids for a label sheet: the given ids in request order, or all items of a tool."""
+    if item_ids is not None:
+        found = set(db.scalars(select(ToolItem.id).where(ToolItem.id.in_(item_ids))))
+        return [item_id for item_id in dict.fromkeys(item_ids) if item_id in found]
+    return list(db.scalars(select(ToolItem.id).where(ToolItem.tool_id == tool_id).order_by(ToolItem.id)))
+
+
+def get_label_rows(db: Session, item_ids: list[int]) -> list[tuple[int, str, str]]:
+    """(id, inventory_no, tool_name) for the given items, in the given order – one query."""
+    rows = db.execute(
+        select(ToolItem.id, ToolItem.inventory_no, Tool.tool_name)
+        .join(Tool, ToolItem.tool_id == Tool.id)
+        .where(ToolItem.id.in_(item_ids))
+    ).all()
+    by_id = {row.id: tuple(row) for row in rows}
+    return [by_id[item_id] for item_id in item_ids if item_id in by_id]
 
 
 def get_tool_items_by_tool(db: Session, tool_id: int) -> list[ToolItem]:
-    return db.query(ToolItem).filter(ToolItem.tool_id == tool_id).all()
+    return db.query(ToolItem).options(*TOOL_ITEM_READ_OPTIONS).filter(ToolItem.tool_id == tool_id).all()
 
 
 def create_tool_item(db: Session, data: ToolItemCreate) -> ToolItem:
@@ -71,19 +142,40 @@ def create_tool_item(db: Session, data: ToolItemCreate) -> ToolItem:
     return item
 
 
+def create_tool_items_bulk(db: Session, data: list[ToolItemCreate]) -> list[str]:
+    """
+    Inserts all items with one block of inventory numbers and one executemany INSERT.
+    Returns the inventory numbers in input order. Does not commit.
+    """
+    if not data:
+        return []
+    available_id = _get_status_id_by_name(db, _STATUS_AVAILABLE)
+    inventory_nos = reserve_inventory_nos(db, len(data))
+    rows = [
+        {
+            "inventory_no": inventory_no,
+            "description": item.description,
+            "tool_id": item.tool_id,
+            "status_id": item.status_id if item.status_id is not None else available_id,
+            "condition_id": item.condition_id,
+        }
+        for item, inventory_no in zip(data, inventory_nos)
+    ]
+    db.execute(insert(ToolItem), rows)
+    tool_availability.recount(db, (row["tool_id"] for row in rows))
+    return inventory_nos
+
+
 def update_tool_item(db: Session, item: ToolItem, data: ToolItemUpdate) -> ToolItem:
     for field, value in data.model_dump(exclude_unset=True).items():
         setattr(item, field, value)
-    db.commit()
+    commit_item_changes(db)
     db.refresh(item)
     return item
 
 
 def retire_tool_item(db: Session, item: ToolItem) -> ToolItem:
     """Sets tool item status to RETIRED. Fails if item has an active (non-returned) loan."""
-    from src.app.models.loan_item import LoanItem
-    from src.app.models.loan import Loan
-
     active_loan = (
         db.query(Loan)
         .join(LoanItem, LoanItem.loan_id == Loan.id)
@@ -98,46 +190,76 @@ def retire_tool_item(db: Session, item: ToolItem) -> ToolItem:
         raise ValueError("Status 'RETIRED' not found in database. Run the seed first.")
 
     item.status_id = retired_id
-    db.commit()
+    commit_item_changes(db)
     db.refresh(item)
     return item
 
 
 def delete_tool_item(db: Session, item: ToolItem) -> None:
     db.delete(item)
-    db.commit()
+    commit_item_changes(db)
 
 
-def get_tool_item_loan_history(db: Session, item_id: int) -> list[dict]:
-    """Returns chronological loan history for a specific tool item."""
-    from src.app.models.loan_item import LoanItem
-    from src.app.models.loan import Loan
-    from src.app.models.tool_condition import ToolCondition
-    from src.app.models.user import User
-
-    rows = (
-        db.query(LoanItem, Loan)
+def _loan_history_select(item_id: int, since: Optional[datetime] = None):
+    """One query for the whole history: loan, borrower and return condition joined."""
+    stmt = (
+        select(
+            Loan.id,
+            User,
+            Loan.issued_at,
+            Loan.due_at,
+            Loan.returned_at,
+            ToolCondition,
+            LoanItem.return_comment,
+        )
+        .select_from(LoanItem)
         .join(Loan, LoanItem.loan_id == Loan.id)
-        .filter(LoanItem.tool_item_id == item_id)
-        .order_by(Loan.issued_at.asc())
-        .all()
+        .join(User, Loan.borrower_user_id == User.id)
+        .outerjoin(ToolCondition, LoanItem.return_condition_id == ToolCondition.id)
+        .where(LoanItem.tool_item_id == item_id)
     )
+    if since is not None:
+        stmt = stmt.where(Loan.issued_at >= since)
+    return stmt
 
-    history = []
-    for loan_item, loan in rows:
-        condition = (
-            db.get(ToolCondition, loan_item.return_condition_id)
-            if loan_item.return_condition_id
-            else None
-        )
-        borrower = db.get(User, loan.borrower_user_id)
-        history.append({
-            "loan_id": loan.id,
-            "borrower": borrower,
-            "issued_at": loan.issued_at,
-            "due_at": loan.due_at,
-            "returned_at": loan.returned_at,
-            "return_condition": condition,
-            "return_comment": loan_item.return_comment,
-        })
-    return history
+
+def _history_entry(row) -> dict:
+    loan_id, borrower, issued_at, due_at, returned_at, condition, comment = row
+    return {
+        "loan_id": loan_id,
+        "borrower": borrower,
+        "issued_at": issued_at,
+        "due_at": due_at,
+        "returned_at": returned_at,
+        "return_condition": condition,
+        "return_comment": comment,
+    }
+
+
+def get_tool_item_loan_history(
+    db: Session,
+    item_id: int,
+    since: Optional[datetime] = None,
+    limit: Optional[int] = None,
+    after_loan_id: Optional[int] = None,
+) -> list[dict]:
+    """
+    Returns chronological loan history for a specific tool item, ordered by (issued_at, loan_id).
+    since: only loans issued at or after this time. Paging: keyset on (issued_at, loan_id),
+    after_loan_id is the loan_id of the previous page's last entry; up to limit + 1 entries.
+    """
+    stmt = keyset_select(_loan_history_select(item_id, since), Loan.issued_at, Loan.id, limit, after_loan_id)
+    return [_history_entry(row) for row in db.execute(stmt)]
+
+
+def iter_tool_item_loan_history(
+    db: Session,
+    item_id: int,
+    since: Optional[datetime] = None,
+    batch_size: int = 500,
+) -> Iterator[dict]:
+    """Like get_tool_item_loan_history, but fetches batch_size rows at a time (for streaming exports)."""
+    stmt = keyset_select(_loan_history_select(item_id, since), Loan.issued_at, Loan.id)
+    result = db.execute(stmt.execution_options(yield_per=batch_size))
+    for row in result:
+        yield _history_entry(row)
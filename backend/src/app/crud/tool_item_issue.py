@@ -1,8 +1,10 @@
 from typing import Optional
 from datetime import datetime, timezone
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
+from src.app.crud import lookups
+from src.app.db.pagination import keyset_page
 from src.app.models.tool_item_issue import ToolItemIssue
 from src.app.models.tool_item import ToolItem
 from src.app.models.tool_status import ToolStatus
@@ -11,19 +13,25 @@ from src.app.models.tool_item_issue_status import ToolItemIssueStatus
 from src.app.models.loan_item import LoanItem
 from src.app.models.loan import Loan
 from src.app.schemas.tool_item_issue import ToolItemIssueCreate, ToolItemIssueUpdate
+from src.app.crud.tool_item import TOOL_ITEM_READ_OPTIONS, commit_item_changes
 
 _RESOLVED_STATUSES = {"RESOLVED", "CLOSED"}
 _OPEN_STATUSES = {"OPEN", "IN_PROGRESS"}
 
+# Loader-Plan passend zu ToolItemIssueRead
+TOOL_ITEM_ISSUE_READ_OPTIONS = (
+    joinedload(ToolItemIssue.tool_item).options(*TOOL_ITEM_READ_OPTIONS),
+    joinedload(ToolItemIssue.reported_by),
+    joinedload(ToolItemIssue.status),
+)
+
 
 def _get_tool_status_id(db: Session, name: str) -> Optional[int]:
-    s = db.query(ToolStatus).filter(ToolStatus.name == name).first()
-    return s.id if s else None
+    return lookups.get_id(db, ToolStatus, name)
 
 
 def _get_tool_condition_id(db: Session, name: str) -> Optional[int]:
-    c = db.query(ToolCondition).filter(ToolCondition.name == name).first()
-    return c.id if c else None
+    return lookups.get_id(db, ToolCondition, name)
 
 
 def _set_tool_item_status(db: Session, tool_item_id: int, status_name: str) -> None:
@@ -56,10 +64,8 @@ def _is_on_active_loan(db: Session, tool_item_id: int) -> bool:
 
 def _has_open_issues(db: Session, tool_item_id: int, exclude_issue_id: Optional[int] = None) -> bool:
     """Returns True if the tool item still has open (OPEN/IN_PROGRESS) issues."""
-    open_status_ids = [
-        s.id for s in db.query(ToolItemIssueStatus).all()
-        if s.name in _OPEN_STATUSES
-    ]
+    open_status_ids = [lookups.get_id(db, ToolItemIssueStatus, name) for name in _OPEN_STATUSES]
+    open_status_ids = [status_id for status_id in open_status_ids if status_id is not None]
     query = db.query(ToolItemIssue).filter(
         ToolItemIssue.tool_item_id == tool_item_id,
         ToolItemIssue.status_id.in_(open_status_ids),
@@ -73,12 +79,23 @@ def get_tool_item_issue(db: Session, issue_id: int) -> Optional[ToolItemIssue]:
     return db.get(ToolItemIssue, issue_id)
 
 
-def get_tool_item_issues(db: Session) -> list[ToolItemIssue]:
-    return db.query(ToolItemIssue).all()
+def get_tool_item_issues(
+    db: Session,
+    limit: Optional[int] = None,
+    after_id: Optional[int] = None,
+    options: Optional[tuple] = None,
+) -> list[ToolItemIssue]:
+    q = db.query(ToolItemIssue).options(*(TOOL_ITEM_ISSUE_READ_OPTIONS if options is None else options))
+    return keyset_page(q, ToolItemIssue.id, limit, after_id)
 
 
 def get_issues_by_tool_item(db: Session, tool_item_id: int) -> list[ToolItemIssue]:
-    return db.query(ToolItemIssue).filter(ToolItemIssue.tool_item_id == tool_item_id).all()
+    return (
+        db.query(ToolItemIssue)
+        .options(*TOOL_ITEM_ISSUE_READ_OPTIONS)
+        .filter(ToolItemIssue.tool_item_id == tool_item_id)
+        .all()
+    )
 
 
 def create_tool_item_issue(db: Session, data: ToolItemIssueCreate) -> ToolItemIssue:
@@ -86,7 +103,7 @@ def create_tool_item_issue(db: Session, data: ToolItemIssueCreate) -> ToolItemIs
     db.add(issue)
     _set_tool_item_status(db, data.tool_item_id, "MAINTENANCE")
     _set_tool_item_condition(db, data.tool_item_id, "WORN")
-    db.commit()
+    commit_item_changes(db)
     db.refresh(issue)
     return issue
 
@@ -98,17 +115,17 @@ def update_tool_item_issue(
         setattr(issue, field, value)
 
     if data.status_id is not None:
-        status = db.get(ToolItemIssueStatus, data.status_id)
-        if status and status.name in _RESOLVED_STATUSES:
+        status_name = lookups.get_name(db, ToolItemIssueStatus, data.status_id)
+        if status_name in _RESOLVED_STATUSES:
             if not _has_open_issues(db, issue.tool_item_id, exclude_issue_id=issue.id) \
                     and not _is_on_active_loan(db, issue.tool_item_id):
                 _set_tool_item_status(db, issue.tool_item_id, "AVAILABLE")
                 _set_tool_item_condition(db, issue.tool_item_id, "OK")
-        elif status and status.name in _OPEN_STATUSES:
+        elif status_name in _OPEN_STATUSES:
             _set_tool_item_status(db, issue.tool_item_id, "MAINTENANCE")
             _set_tool_item_condition(db, issue.tool_item_id, "WORN")
 
-    db.commit()
+    commit_item_changes(db)
     db.refresh(issue)
     return issue
 
@@ -119,17 +136,16 @@ def resolve_tool_item_issue(db: Session, issue: ToolItemIssue) -> ToolItemIssue:
             and not _is_on_active_loan(db, issue.tool_item_id):
         _set_tool_item_status(db, issue.tool_item_id, "AVAILABLE")
         _set_tool_item_condition(db, issue.tool_item_id, "OK")
-    db.commit()
+    commit_item_changes(db)
     db.refresh(issue)
     return issue
 
 
 def delete_tool_item_issue(db: Session, issue: ToolItemIssue) -> None:
-    current_status = db.get(ToolItemIssueStatus, issue.status_id)
-    if current_status and current_status.name in _OPEN_STATUSES:
+    if lookups.get_name(db, ToolItemIssueStatus, issue.status_id) in _OPEN_STATUSES:
         if not _has_open_issues(db, issue.tool_item_id, exclude_issue_id=issue.id) \
                 and not _is_on_active_loan(db, issue.tool_item_id):
             _set_tool_item_status(db, issue.tool_item_id, "AVAILABLE")
             _set_tool_item_condition(db, issue.tool_item_id, "OK")
     db.delete(issue)
-    db.commit()
+    commit_item_changes(db)
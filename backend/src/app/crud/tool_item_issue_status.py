@@ -1,6 +1,7 @@
 from typing import Optional
 from sqlalchemy.orm import Session
 
+from src.app.crud import lookups
 from src.app.models.tool_item_issue_status import ToolItemIssueStatus
 from src.app.schemas.tool_item_issue_status import ToolItemIssueStatusCreate, ToolItemIssueStatusUpdate
 
@@ -19,6 +20,7 @@ def create_tool_item_issue_status(db: Session, data: ToolItemIssueStatusCreate)
     status = ToolItemIssueStatus(**data.model_dump())
     db.add(status)
     db.commit()
+    lookups.invalidate(ToolItemIssueStatus)
     db.refresh(status)
     return status
 
@@ -29,6 +31,7 @@ def update_tool_item_issue_status(
     for field, value in data.model_dump(exclude_unset=True).items():
         setattr(status, field, value)
     db.commit()
+    lookups.invalidate(ToolItemIssueStatus)
     db.refresh(status)
     return status
 
@@ -36,3 +39,4 @@ def update_tool_item_issue_status(
 def delete_tool_item_issue_status(db: Session, status: ToolItemIssueStatus) -> None:
     db.delete(status)
     db.commit()
+    lookups.invalidate(ToolItemIssueStatus)
@@ -1,6 +1,7 @@
 from typing import Optional
 from sqlalchemy.orm import Session
 
+from src.app.crud import lookups
 from src.app.models.tool_status import ToolStatus
 from src.app.schemas.tool_status import ToolStatusCreate, ToolStatusUpdate
 
@@ -17,6 +18,7 @@ def create_tool_status(db: Session, data: ToolStatusCreate) -> ToolStatus:
     status = ToolStatus(**data.model_dump())
     db.add(status)
     db.commit()
+    lookups.invalidate(ToolStatus)
     db.refresh(status)
     return status
 
@@ -25,6 +27,7 @@ def update_tool_status(db: Session, status: ToolStatus, data: ToolStatusUpdate)
     for field, value in data.model_dump(exclude_unset=True).items():
         setattr(status, field, value)
     db.commit()
+    lookups.invalidate(ToolStatus)
     db.refresh(status)
     return status
 
@@ -32,3 +35,4 @@ def update_tool_status(db: Session, status: ToolStatus, data: ToolStatusUpdate)
 def delete_tool_status(db: Session, status: ToolStatus) -> None:
     db.delete(status)
     db.commit()
+    lookups.invalidate(ToolStatus)
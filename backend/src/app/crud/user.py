@@ -1,12 +1,16 @@
 from typing import Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from passlib.context import CryptContext
 
+from src.app.db.pagination import keyset_page
 from src.app.models.user import User
 from src.app.schemas.user import UserCreate, UserUpdate
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Loader-Plan passend zu UserRead
+USER_READ_OPTIONS = (joinedload(User.role), joinedload(User.department))
+
 
 def hash_password(plain: str) -> str:
     return pwd_context.hash(plain)
@@ -20,8 +24,14 @@ def get_user_by_email(db: Session, email: str) -> Optional[User]:
     return db.query(User).filter(User.email == email).first()
 
 
-def get_users(db: Session) -> list[User]:
-    return db.query(User).all()
+def get_users(
+    db: Session,
+    limit: Optional[int] = None,
+    after_id: Optional[int] = None,
+    options: Optional[tuple] = None,
+) -> list[User]:
+    q = db.query(User).options(*(USER_READ_OPTIONS if options is None else options))
+    return keyset_page(q, User.id, limit, after_id)
 
 
 def get_users_by_department(db: Session, department_id: int) -> list[User]:
@@ -0,0 +1,52 @@
+# ============================================================
+# db/pagination.py – Keyset-Pagination für Listenabfragen
+#
+# Statt OFFSET (wird mit jeder Seite langsamer) wird nach dem Primärschlüssel
+# sortiert und ab dem zuletzt gelieferten Wert weitergelesen:
+#   WHERE id > :cursor ORDER BY id LIMIT :limit + 1
+# Die zusätzliche Zeile zeigt an, ob es eine weitere Seite gibt.
+#
+# Listen, die nach einer anderen Spalte sortiert sind (z.B. issued_at),
+# blättern über keyset_select mit dem Paar (Sortierwert, Schlüssel):
+#   WHERE issued_at > :s OR (issued_at = :s AND id > :cursor)
+# Der Cursor bleibt der Schlüssel der letzten Zeile, :s liest eine
+# Unterabfrage nach – gleiche Sortierwerte kommen so weder doppelt noch
+# fallen sie weg.
+# ============================================================
+
+from typing import Optional
+
+from sqlalchemy import Select, and_, or_, select
+from sqlalchemy.orm import Query
+
+
+def keyset_page(q: Query, key_column, limit: Optional[int] = None, after: Optional[int] = None) -> list:
+    """
+    Führt eine Abfrage seitenweise aus.
+
+    Liefert bis zu limit + 1 Zeilen – die API-Schicht schneidet die letzte ab
+    und nutzt sie nur als Hinweis auf eine Folgeseite. Ohne limit werden wie
+    bisher alle Zeilen geliefert (z.B. für interne Aufrufer).
+    """
+    if after is not None:
+        q = q.filter(key_column > after)
+    q = q.order_by(key_column.asc())
+    if limit is not None:
+        q = q.limit(limit + 1)
+    return q.all()
+
+
+def keyset_select(stmt: Select, sort_column, key_column, limit: Optional[int] = None,
+                  after: Optional[int] = None) -> Select:
+    """
+    Wie keyset_page, aber für Select-Anweisungen mit Sortierung nach
+    (sort_column, key_column). after ist der Schlüssel der letzten Zeile der
+    vorherigen Seite.
+    """
+    if after is not None:
+        last = select(sort_column).where(key_column == after).correlate(None).scalar_subquery()
+        stmt = stmt.where(or_(sort_column > last, and_(sort_column == last, key_column > after)))
+    stmt = stmt.order_by(sort_column.asc(), key_column.asc())
+    if limit is not None:
+        stmt = stmt.limit(limit + 1)
+    return stmt
@@ -4,14 +4,20 @@
 # Aufgaben:
 #   1. SQLAlchemy-Engine erstellen (Verbindung zur Datenbank)
 #   2. SQLite-Fremdschlüssel-Constraints aktivieren (standardmäßig aus)
-#   3. SessionLocal-Factory für Datenbankoperationen bereitstellen
+#   3. SQLite-Performance-Profil anwenden (WAL, synchronous, mmap, Cache, busy_timeout)
+#   4. Schreibzugriffe innerhalb des Prozesses serialisieren (Writer-Lock)
+#   5. SessionLocal-Factory für Datenbankoperationen bereitstellen
 # ============================================================
 
 import sqlite3
+import threading
 from pathlib import Path
+from typing import Optional
 
 from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 
 from src.app.core.config import settings
 
@@ -25,33 +31,153 @@ def _ensure_sqlite_dir_exists(db_url: str) -> None:
             p.parent.mkdir(parents=True, exist_ok=True)
 
 
+def _is_sqlite_file(db_url: str) -> bool:
+    """True für dateibasierte SQLite-URLs (nicht :memory:)."""
+    return db_url.startswith("sqlite") and ":memory:" not in db_url and db_url not in ("sqlite://", "sqlite:///")
+
+
+def sqlite_pragmas(performance_profile: bool) -> list[str]:
+    """
+    PRAGMAs, die bei jeder neuen SQLite-Verbindung gesetzt werden.
+
+    Ohne Performance-Profil nur foreign_keys und busy_timeout. Mit Profil zusätzlich:
+      - journal_mode=WAL:    Leser blockieren Schreiber nicht mehr (und umgekehrt)
+      - synchronous=NORMAL:  in WAL sicher gegen Abstürze, spart ein fsync pro Commit
+      - mmap_size:           Datenbankseiten per Memory-Mapping lesen
+      - cache_size:          Seiten-Cache pro Verbindung (negativ = KiB)
+      - temp_store=MEMORY:   temporäre Tabellen/Indizes (ORDER BY, GROUP BY) im RAM
+    """
+    pragmas = [
+        "PRAGMA foreign_keys=ON",
+        f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}",
+    ]
+    if performance_profile:
+        pragmas += [
+            f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}",
+            f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}",
+            f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}",
+            f"PRAGMA cache_size={-int(settings.SQLITE_CACHE_SIZE_KB)}",
+            f"PRAGMA temp_store={settings.SQLITE_TEMP_STORE}",
+        ]
+    return pragmas
+
+
+class WriterLock:
+    """
+    Serialisiert Schreibtransaktionen innerhalb des Prozesses.
+
+    SQLite erlaubt ohnehin nur einen Schreiber. Ohne Lock warten konkurrierende
+    Threads im busy-Handler von SQLite (Polling mit wachsenden Pausen) oder
+    bekommen "database is locked". Mit Lock warten sie geordnet in Python.
+
+    Der Lock wird beim ersten schreibenden Statement einer Verbindung genommen
+    und beim Zurückgeben der Verbindung an den Pool (nach commit/rollback)
+    freigegeben. Ein zweiter Schreiber im selben Thread (zweite Session) läuft
+    ohne erneutes Sperren durch. Nach busy_timeout wird ohne Lock weitergemacht –
+    dann entscheidet SQLite selbst (kein Hängenbleiben bei Fehlbedienung).
+    """
+
+    _KEY = "writer_lock"
+
+    def __init__(self, timeout_seconds: float):
+        self._lock = threading.Lock()
+        self._owner: Optional[int] = None
+        self._timeout = timeout_seconds
+
+    def acquire(self, info: dict) -> None:
+        if info.get(self._KEY):
+            return
+        me = threading.get_ident()
+        if self._owner == me:
+            info[self._KEY] = "nested"
+            return
+        if self._lock.acquire(timeout=self._timeout):
+            self._owner = me
+            info[self._KEY] = "owner"
+
+    def release(self, info: dict) -> None:
+        if info.pop(self._KEY, None) == "owner":
+            self._owner = None
+            self._lock.release()
+
+
+_READ_PREFIXES = ("SELECT", "PRAGMA", "EXPLAIN", "WITH")
+
+
+def _install_writer_lock(engine: Engine, lock: WriterLock) -> None:
+    @event.listens_for(engine, "before_cursor_execute")
+    def _acquire_for_writes(conn, _cursor, statement, _parameters, _context, _executemany):
+        if not statement.lstrip()[:7].upper().startswith(_READ_PREFIXES):
+            lock.acquire(conn.info)
+
+    @event.listens_for(engine, "checkin")
+    def _release_on_checkin(_dbapi_connection, connection_record):
+        lock.release(connection_record.info)
+
+    @event.listens_for(engine, "invalidate")
+    def _release_on_invalidate(_dbapi_connection, connection_record, _exception):
+        lock.release(connection_record.info)
+
+
+def create_db_engine(db_url: str, performance_profile: Optional[bool] = None) -> Engine:
+    """
+    Erstellt die Engine inklusive SQLite-PRAGMAs, Pool und Writer-Lock.
+
+    Für dateibasierte SQLite-Datenbanken:
+      QueuePool mit DB_POOL_SIZE dauerhaften Verbindungen (Leser) plus
+      DB_MAX_OVERFLOW zusätzlichen, und ein Writer-Lock für die Schreiber.
+    Für :memory: bleibt SQLAlchemys Standard-Pool (eine Verbindung pro Thread).
+    """
+    if performance_profile is None:
+        performance_profile = settings.SQLITE_PERFORMANCE_PROFILE
+
+    # check_same_thread=False: Erlaubt mehrere Threads auf dieselbe SQLite-Verbindung zuzugreifen.
+    # FastAPI nutzt mehrere Threads – ohne diese Option würde SQLite Fehler werfen.
+    connect_args = {"check_same_thread": False} if db_url.startswith("sqlite") else {}
+
+    kwargs = {}
+    if _is_sqlite_file(db_url):
+        kwargs = {
+            "poolclass": QueuePool,
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_pre_ping": False,  # lokale Datei – Verbindungen brechen nicht weg
+        }
+
+    # SQLAlchemy-Engine erstellen (verwaltet den Verbindungspool zur Datenbank)
+    new_engine = create_engine(db_url, connect_args=connect_args, **kwargs)
+
+    if db_url.startswith("sqlite"):
+        pragmas = sqlite_pragmas(performance_profile)
+
+        @event.listens_for(new_engine, "connect")
+        def _set_sqlite_pragmas(dbapi_connection, _connection_record):
+            """
+            Setzt die PRAGMAs für jede neue SQLite-Verbindung.
+
+            WICHTIG: SQLite hat Fremdschlüssel standardmäßig DEAKTIVIERT.
+            Ohne foreign_keys=ON könnte man z.B. einen Benutzer löschen,
+            obwohl er noch aktive Ausleihen hat – ohne Fehlermeldung.
+            Dieses Event wird bei JEDER neuen Datenbankverbindung ausgeführt.
+            """
+            if isinstance(dbapi_connection, sqlite3.Connection):
+                cursor = dbapi_connection.cursor()
+                for pragma in pragmas:
+                    cursor.execute(pragma)
+                cursor.close()
+
+        if performance_profile and _is_sqlite_file(db_url):
+            _install_writer_lock(new_engine, WriterLock(settings.SQLITE_BUSY_TIMEOUT_MS / 1000))
+
+    return new_engine
+
+
 # Ordner anlegen bevor die Engine erstellt wird
 _ensure_sqlite_dir_exists(settings.DATABASE_URL)
 
-# check_same_thread=False: Erlaubt mehrere Threads auf dieselbe SQLite-Verbindung zuzugreifen.
-# FastAPI nutzt mehrere Threads – ohne diese Option würde SQLite Fehler werfen.
-connect_args = {"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {}
-
-# SQLAlchemy-Engine erstellen (verwaltet den Verbindungspool zur Datenbank)
-engine = create_engine(settings.DATABASE_URL, connect_args=connect_args)
-
-if settings.DATABASE_URL.startswith("sqlite"):
-    @event.listens_for(engine, "connect")
-    def _set_sqlite_fk_pragma(dbapi_connection, _connection_record):
-        """
-        Aktiviert Fremdschlüssel-Constraints für SQLite.
-
-        WICHTIG: SQLite hat Fremdschlüssel standardmäßig DEAKTIVIERT.
-        Ohne dieses PRAGMA könnte man z.B. einen Benutzer löschen,
-        obwohl er noch aktive Ausleihen hat – ohne Fehlermeldung.
-        Dieses Event wird bei JEDER neuen Datenbankverbindung ausgeführt.
-        """
-        if isinstance(dbapi_connection, sqlite3.Connection):
-            cursor = dbapi_connection.cursor()
-            cursor.execute("PRAGMA foreign_keys=ON")
-            cursor.close()
+engine = create_db_engine(settings.DATABASE_URL)
 
 # Session-Factory: Jede Datenbankoperation bekommt eine eigene Session.
 # autocommit=False: Änderungen müssen explizit mit db.commit() gespeichert werden.
 # autoflush=False:  SQLAlchemy sendet SQL erst bei commit(), nicht schon früher.
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
\ No newline at end of file
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -4,6 +4,7 @@
 # Hier wird die gesamte App zusammengebaut:
 #   1. FastAPI-Instanz erstellen
 #   2. CORS-Middleware konfigurieren (Frontend darf auf Backend zugreifen)
+#      und Antworten komprimieren (gzip/brotli)
 #   3. Statische Dateien (Werkzeugbilder) bereitstellen
 #   4. Alle API-Router einbinden
 # ============================================================
@@ -13,7 +14,7 @@ from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import ORJSONResponse
 from sqlalchemy import text
 
 from src.app.db.session import SessionLocal, engine
@@ -21,6 +22,15 @@ from src.app.db.base import Base
 import src.app.models  # noqa: F401 – alle Modelle bei Base.metadata registrieren
 from src.app.api.router import api_router
 from src.app.auth.router import router as auth_router
+from src.app.crud import lookups
+from src.app.crud.blacklisted_token import load_blacklisted_tokens
+from src.app.core.compression import CompressionMiddleware
+from src.app.core.config import settings
+from src.app.core.maintenance import register_jobs
+from src.app.core import labels
+from src.app.core.qrcodes import qr_codes
+from src.app.core.scheduler import scheduler
+from src.app.core.static_files import CachingStaticFiles
 
 # Ordner für hochgeladene Werkzeugbilder
 STATIC_DIR = Path("static")
@@ -32,14 +42,35 @@ async def lifespan(app: FastAPI):
     Wird beim Start der Anwendung ausgeführt.
     - Erstellt alle Datenbanktabellen (falls nicht vorhanden)
     - Stellt sicher, dass der Ordner für Werkzeugbilder existiert
+    - Lädt die Lookup-Tabellen (Status, Zustände, Rollen) in den Speicher
+    - Lädt die gesperrten Tokens (Logout) in den Sperr-Cache
+    - Startet die periodischen Wartungsjobs (und stoppt sie beim Beenden)
     """
     Base.metadata.create_all(bind=engine)
     (STATIC_DIR / "tool_images").mkdir(parents=True, exist_ok=True)
-    yield
+    with SessionLocal() as db:
+        lookups.load_all(db)
+        load_blacklisted_tokens(db)
+    if settings.MAINTENANCE_ENABLED:
+        register_jobs(scheduler)
+        scheduler.start()
+    try:
+        yield
+    finally:
+        await scheduler.stop()
+        qr_codes.shutdown()
+        labels.shutdown()
 
 
 # FastAPI-App-Instanz erstellen
-app = FastAPI(title="Werkzeugverwaltungstool API", version="0.1.0", lifespan=lifespan)
+# ORJSONResponse: Einzelobjekte per orjson statt json.dumps rendern.
+# Listen-Endpunkte liefern ihre Bytes selbst (api/serialization.py).
+app = FastAPI(
+    title="Werkzeugverwaltungstool API",
+    version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 # CORS-Middleware: Erlaubt dem React-Frontend (Port 5173/5174) API-Anfragen zu stellen.
 # Ohne diese Konfiguration würde der Browser alle Anfragen blockieren,
@@ -55,11 +86,21 @@ app.add_middleware(
     allow_credentials=True,  # Cookies und Auth-Header erlauben
     allow_methods=["*"],     # GET, POST, PATCH, DELETE etc. erlauben
     allow_headers=["*"],     # Authorization-Header (JWT) erlauben
+    expose_headers=["Link", "X-Next-Cursor", "X-Total-Pages"],  # Pagination-Header für das Frontend lesbar machen
+)
+
+# Komprimierung: JSON-Listen ab COMPRESSION_MINIMUM_SIZE Bytes, Bilder/PDF bleiben unverändert
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
 )
 
 # Statische Dateien bereitstellen: Werkzeugbilder abrufbar unter /static/tool_images/
+# (mit Cache-Headern, ETag und Range-Anfragen – siehe core/static_files.py)
 STATIC_DIR.mkdir(parents=True, exist_ok=True)
-app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
+app.mount("/static", CachingStaticFiles(directory=str(STATIC_DIR)), name="static")
 
 # Login/Logout-Endpunkte unter /auth/...
 app.include_router(auth_router)
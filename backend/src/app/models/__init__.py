@@ -7,6 +7,7 @@ from .tool_status import ToolStatus
 from .tool_condition import ToolCondition
 from .tool import Tool
 from .tool_item import ToolItem
+from .tool_availability import ToolAvailability
 
 from .loan_request_status import LoanRequestStatus
 from .loan_request import LoanRequest
@@ -18,11 +19,14 @@ from .tool_item_issue_status import ToolItemIssueStatus
 from .tool_item_issue import ToolItemIssue
 
 from .blacklisted_token import BlacklistedToken
+from .sequence_counter import SequenceCounter
+
+from . import search_index  # noqa: F401 – FTS5-Tabellen und Trigger bei create_all anlegen
 
 __all__ = [
     "Role", "Department", "User",
-    "ToolCategory", "ToolStatus", "ToolCondition", "Tool", "ToolItem",
+    "ToolCategory", "ToolStatus", "ToolCondition", "Tool", "ToolItem", "ToolAvailability",
     "LoanRequestStatus", "LoanRequest", "LoanRequestItem",
     "Loan", "LoanItem", "ToolItemIssueStatus", "ToolItemIssue",
-    "BlacklistedToken",
+    "BlacklistedToken", "SequenceCounter",
 ]
\ No newline at end of file
@@ -8,7 +8,11 @@ from src.app.db.base import Base
 
 class BlacklistedToken(Base):
     __tablename__ = "blacklisted_tokens"
+    # AUTOINCREMENT: SQLite vergibt ids nie doppelt, auch wenn der Purge-Job die
+    # Tabelle leert – RevocationCache.sync liest nur id > zuletzt gesehene id
+    __table_args__ = {"sqlite_autoincrement": True}
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    token: Mapped[str] = mapped_column(String, unique=True, nullable=False, index=True)
+    # SHA-256 des Tokens (hex) statt des kompletten JWT – feste Länge, kleinerer Index
+    token_hash: Mapped[str] = mapped_column(String(64), unique=True, nullable=False, index=True)
     expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -8,11 +8,17 @@
 # Status: Aktiv = returned_at ist NULL
 #         Abgeschlossen = returned_at ist gesetzt
 #         Überfällig = returned_at ist NULL UND due_at liegt in der Vergangenheit
+#
+# is_overdue speichert den Überfällig-Status als Spalte (für indexierte
+# Abfragen). Beim Schreiben setzt crud/loan.py den Wert, den Übergang
+# "Fälligkeit überschritten" übernimmt der Wartungsjob refresh_overdue_flags
+# (core/maintenance.py). Die API rechnet bis dahin live nach
+# (schemas/loan.LoanOverdue).
 # ============================================================
 
 from typing import Optional
 
-from sqlalchemy import ForeignKey, DateTime, Text, func
+from sqlalchemy import Boolean, ForeignKey, DateTime, Index, Text, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.app.db.base import Base
@@ -20,6 +26,17 @@ from src.app.db.base import Base
 
 class Loan(Base):
     __tablename__ = "loans"
+    __table_args__ = (
+        # Partieller Index nur über aktive Ausleihen (returned_at IS NULL):
+        # klein, und deckt Überfällig-Abfragen (due_at < jetzt) sowie die
+        # Suche nach aktiv ausgeliehenen Exemplaren ab.
+        Index(
+            "ix_loans_active_due_at",
+            "due_at",
+            sqlite_where=text("returned_at IS NULL"),
+            postgresql_where=text("returned_at IS NULL"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
 
@@ -27,9 +44,12 @@ class Loan(Base):
     returned_at: Mapped[Optional["DateTime"]] = mapped_column(DateTime(timezone=True))  # NULL = noch nicht zurückgegeben
     due_at: Mapped["DateTime"] = mapped_column(DateTime(timezone=True), nullable=False)  # Fälligkeitsdatum
     comment: Mapped[Optional[str]] = mapped_column(Text)  # Optionaler Kommentar
+    is_overdue: Mapped[bool] = mapped_column(
+        Boolean, default=False, server_default=text("0"), nullable=False, index=True,
+    )  # Materialisiert: aktiv und Fälligkeit überschritten
 
     # Drei verschiedene Benutzerrollen bei einer Ausleihe:
-    borrower_user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)     # Wer leiht aus?
+    borrower_user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)  # Wer leiht aus?
     issued_by_user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)    # Wer hat ausgestellt?
     returned_by_user_id: Mapped[Optional[int]] = mapped_column(ForeignKey("users.id"))        # Wer hat zurückgenommen?
 
@@ -17,7 +17,8 @@ class LoanItem(Base):
     return_comment: Mapped[Optional[str]] = mapped_column(Text)
     return_condition_id: Mapped[Optional[int]] = mapped_column(ForeignKey("tool_condition.id"))
 
-    tool_item_id: Mapped[int] = mapped_column(ForeignKey("tool_items.id"), nullable=False)
+    # Index: Verfügbarkeitsprüfung sucht aktive Ausleihen pro Exemplar
+    tool_item_id: Mapped[int] = mapped_column(ForeignKey("tool_items.id"), nullable=False, index=True)
     loan_id: Mapped[int] = mapped_column(ForeignKey("loans.id"), nullable=False)
 
     loan: Mapped["Loan"] = relationship(back_populates="items")
@@ -31,12 +31,12 @@ class LoanRequest(Base):
     decision_comment: Mapped[Optional[str]] = mapped_column(Text)  # Kommentar des Genehmigers
 
     # Wer hat den Antrag gestellt?
-    requester_user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
+    requester_user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
     # Wer hat genehmigt/abgelehnt? (leer solange noch offen)
     approver_user_id: Mapped[Optional[int]] = mapped_column(ForeignKey("users.id"))
 
     # Status des Antrags: REQUESTED / APPROVED / REJECTED / CANCELLED
-    request_status_id: Mapped[int] = mapped_column(ForeignKey("loan_request_status.id"), nullable=False)
+    request_status_id: Mapped[int] = mapped_column(ForeignKey("loan_request_status.id"), nullable=False, index=True)
 
     # Beziehungen – foreign_keys nötig, da beide auf User zeigen
     requester: Mapped["User"] = relationship(
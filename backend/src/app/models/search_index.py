@@ -0,0 +1,100 @@
+# ============================================================
+# models/search_index.py – FTS5-Volltextindex für Werkzeuge, Exemplare und Issues
+#
+# Je Quelltabelle eine FTS5-Tabelle mit "external content": der Index
+# speichert nur die Tokens, der Text bleibt in der Quelltabelle.
+#
+#   tools_fts             tool_name, description
+#   tool_items_fts        inventory_no, description
+#   tool_item_issues_fts  title, description
+#
+# Trigger auf den Quelltabellen halten den Index in derselben Transaktion
+# aktuell (INSERT, DELETE und UPDATE der indexierten Spalten – Statuswechsel
+# von Exemplaren berühren den Index nicht).
+#
+# Tokenizer unicode61 mit remove_diacritics: "große" findet auch "grosse",
+# Bindestriche trennen Tokens ("INV-0042" -> "inv", "0042"). prefix='2 3'
+# legt Präfix-Indizes an, damit Suchen wie "ham*" nicht den ganzen Index lesen.
+#
+# Die Listenfilter ?name= (/gettools) und ?inventory_no= (/gettoolitems)
+# suchen dagegen Teilstrings ("ohr" findet "Bohrmaschine"). Dafür gibt es
+# je einen Trigramm-Index nur über diese Spalte:
+#
+#   tools_trigram_fts       tool_name
+#   tool_items_trigram_fts  inventory_no
+#
+# SQLite beantwortet "LIKE '%ohr%'" darauf aus dem Index (ab drei Zeichen;
+# kürzere Muster liest es aus der Quelltabelle).
+#
+# Die Tabellen entstehen per Alembic-Migration und – für Tests und frisch
+# angelegte Datenbanken – nach Base.metadata.create_all (Listener unten).
+# Fehlt ein Index in einer bestehenden Datenbank, wird er dabei aus der
+# Quelltabelle aufgebaut ('rebuild').
+# ============================================================
+
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event, text
+
+from src.app.db.base import Base
+
+
+@dataclass(frozen=True)
+class SearchIndex:
+    name: str
+    source: str
+    columns: tuple[str, ...]
+    tokenize: str = "unicode61 remove_diacritics 2"
+    prefix: Optional[str] = "2 3"
+
+    def create_statements(self) -> list[str]:
+        cols = ", ".join(self.columns)
+        new = ", ".join(f"new.{c}" for c in self.columns)
+        old = ", ".join(f"old.{c}" for c in self.columns)
+        delete = f"INSERT INTO {self.name}({self.name}, rowid, {cols}) VALUES ('delete', old.id, {old});"
+        insert = f"INSERT INTO {self.name}(rowid, {cols}) VALUES (new.id, {new});"
+        prefix = f", prefix='{self.prefix}'" if self.prefix else ""
+        return [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.name} USING fts5({cols}, content='{self.source}', "
+            f"content_rowid='id', tokenize='{self.tokenize}'{prefix})",
+            f"CREATE TRIGGER IF NOT EXISTS {self.name}_ai AFTER INSERT ON {self.source} BEGIN {insert} END",
+            f"CREATE TRIGGER IF NOT EXISTS {self.name}_ad AFTER DELETE ON {self.source} BEGIN {delete} END",
+            f"CREATE TRIGGER IF NOT EXISTS {self.name}_au AFTER UPDATE OF {cols} ON {self.source} "
+            f"BEGIN {delete} {insert} END",
+        ]
+
+    def rebuild_statement(self) -> str:
+        return f"INSERT INTO {self.name}({self.name}) VALUES ('rebuild')"
+
+
+TOOLS_INDEX = SearchIndex("tools_fts", "tools", ("tool_name", "description"))
+TOOL_ITEMS_INDEX = SearchIndex("tool_items_fts", "tool_items", ("inventory_no", "description"))
+ISSUES_INDEX = SearchIndex("tool_item_issues_fts", "tool_item_issues", ("title", "description"))
+TOOL_NAMES_TRIGRAMS = SearchIndex("tools_trigram_fts", "tools", ("tool_name",), tokenize="trigram", prefix=None)
+INVENTORY_NOS_TRIGRAMS = SearchIndex("tool_items_trigram_fts", "tool_items", ("inventory_no",),
+                                     tokenize="trigram", prefix=None)
+SEARCH_INDEXES = (TOOLS_INDEX, TOOL_ITEMS_INDEX, ISSUES_INDEX, TOOL_NAMES_TRIGRAMS, INVENTORY_NOS_TRIGRAMS)
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_search_indexes(_metadata, connection, **_kw) -> None:
+    if connection.dialect.name != "sqlite":
+        return
+    for index in SEARCH_INDEXES:
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": index.name}
+        ).first()
+        for statement in index.create_statements():
+            connection.exec_driver_sql(statement)
+        if not exists:
+            connection.exec_driver_sql(index.rebuild_statement())
+
+
+@event.listens_for(Base.metadata, "before_drop")
+def _drop_search_indexes(_metadata, connection, **_kw) -> None:
+    if connection.dialect.name != "sqlite":
+        return
+    # Die Trigger verschwinden mit ihren Quelltabellen
+    for index in SEARCH_INDEXES:
+        connection.exec_driver_sql(f"DROP TABLE IF EXISTS {index.name}")
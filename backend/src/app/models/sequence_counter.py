@@ -0,0 +1,20 @@
+# ============================================================
+# models/sequence_counter.py – Zähler für fortlaufende Nummern
+#
+# Eine Zeile pro Nummernkreis (z.B. "inventory_no"). value enthält die
+# zuletzt vergebene Nummer. Neue Nummern werden mit einem einzigen
+# UPDATE ... SET value = value + n reserviert – atomar und in O(1),
+# statt alle vorhandenen Inventarnummern zu lesen.
+# ============================================================
+
+from sqlalchemy import Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.app.db.base import Base
+
+
+class SequenceCounter(Base):
+    __tablename__ = "sequence_counters"
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    value: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
@@ -1,6 +1,6 @@
 from typing import Optional
 
-from sqlalchemy import String, Text, ForeignKey, DateTime, func
+from sqlalchemy import Boolean, String, Text, ForeignKey, DateTime, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.app.db.base import Base
@@ -12,7 +12,13 @@ class Tool(Base):
     id: Mapped[int] = mapped_column(primary_key=True)
     tool_name: Mapped[str] = mapped_column(String(200), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text)
-    image_filename: Mapped[Optional[str]] = mapped_column(String(255))
+    # Inhaltsadressiert (<sha256>.<endung>) – mehrere Tools können dieselbe Datei nutzen,
+    # der Index dient der Referenzzählung (core/images.py)
+    image_filename: Mapped[Optional[str]] = mapped_column(String(255), index=True)
+    # True, sobald die WebP-Varianten (Vorschau, mittel) des aktuellen Bildes erzeugt sind (core/images.py)
+    image_variants_ready: Mapped[bool] = mapped_column(
+        Boolean, default=False, server_default=text("0"), nullable=False,
+    )
 
     created_at: Mapped["DateTime"] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at: Mapped["DateTime"] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -22,4 +28,11 @@ class Tool(Base):
     category: Mapped["ToolCategory"] = relationship(back_populates="tools")
     items: Mapped[list["ToolItem"]] = relationship(back_populates="tool")
 
-    request_items: Mapped[list["LoanRequestItem"]] = relationship(back_populates="tool")
\ No newline at end of file
+    request_items: Mapped[list["LoanRequestItem"]] = relationship(back_populates="tool")
+
+    # Bestandszähler je Status (eine Zeile pro Tool, siehe models/tool_availability.py)
+    availability: Mapped[Optional["ToolAvailability"]] = relationship(
+        back_populates="tool",
+        cascade="all, delete-orphan",
+        uselist=False,
+    )
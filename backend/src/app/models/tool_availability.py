@@ -0,0 +1,33 @@
+# ============================================================
+# models/tool_availability.py – Bestandszähler pro Werkzeug
+#
+# Eine Zeile pro Tool mit der Anzahl Exemplare je Status
+# ("3 von 12 verfügbar"). Die Zähler werden in derselben Transaktion
+# angepasst, in der sich tool_items.status_id ändert
+# (crud/tool_availability.py), statt bei jeder Anfrage zu zählen.
+#
+# total zählt alle Exemplare, auch solche mit selbst angelegten Status.
+# Bei Abweichungen (z.B. direkte Änderungen per SQL) baut
+#   python -m src.app.core.maintenance rebuild_tool_availability
+# die Zähler aus tool_items neu auf.
+# ============================================================
+
+from sqlalchemy import ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from src.app.db.base import Base
+
+
+class ToolAvailability(Base):
+    __tablename__ = "tool_availability"
+
+    tool_id: Mapped[int] = mapped_column(ForeignKey("tools.id", ondelete="CASCADE"), primary_key=True)
+
+    total: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    available: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    loaned: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    defect: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    maintenance: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    retired: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
+    tool: Mapped["Tool"] = relationship(back_populates="availability")
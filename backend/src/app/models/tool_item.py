@@ -1,6 +1,6 @@
 from typing import Optional
 
-from sqlalchemy import String, Text, ForeignKey, DateTime, func
+from sqlalchemy import Integer, String, Text, ForeignKey, DateTime, Index, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.app.db.base import Base
@@ -8,6 +8,10 @@ from src.app.db.base import Base
 
 class ToolItem(Base):
     __tablename__ = "tool_items"
+    __table_args__ = (
+        # Verfügbarkeit pro Werkzeug: WHERE tool_id = ? AND status_id = ?
+        Index("ix_tool_items_tool_id_status_id", "tool_id", "status_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     inventory_no: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
@@ -16,14 +20,23 @@ class ToolItem(Base):
     created_at: Mapped["DateTime"] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at: Mapped["DateTime"] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
-    tool_id: Mapped[int] = mapped_column(ForeignKey("tools.id"), nullable=False)
-    status_id: Mapped[int] = mapped_column(ForeignKey("tool_status.id"), nullable=False)
+    # active_history: der alte Wert wird vor dem Überschreiben geladen, damit
+    # crud/tool_availability.py den Bestandszähler des alten Status verringern kann
+    tool_id: Mapped[int] = mapped_column(ForeignKey("tools.id"), nullable=False, active_history=True)
+    status_id: Mapped[int] = mapped_column(ForeignKey("tool_status.id"), nullable=False, index=True, active_history=True)
     condition_id: Mapped[int] = mapped_column(ForeignKey("tool_condition.id"), nullable=False)
 
+    # Optimistische Versionierung: jede Änderung erhöht version. ORM-Updates prüfen
+    # die Version automatisch (version_id_col), die Ausleih-Vergabe nutzt sie für
+    # Compare-and-Swap (AVAILABLE → LOANED nur, wenn niemand dazwischen kam).
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default=text("1"))
+
     tool: Mapped["Tool"] = relationship(back_populates="items")
     status: Mapped["ToolStatus"] = relationship(back_populates="tool_items")
     condition: Mapped["ToolCondition"] = relationship(back_populates="tool_items")
 
     loan_items: Mapped[list["LoanItem"]] = relationship(back_populates="tool_item")
 
-    issues: Mapped[list["ToolItemIssue"]] = relationship(back_populates="tool_item", cascade="all, delete-orphan")
\ No newline at end of file
+    issues: Mapped[list["ToolItemIssue"]] = relationship(back_populates="tool_item", cascade="all, delete-orphan")
+
+    __mapper_args__ = {"version_id_col": version}
\ No newline at end of file
@@ -1,6 +1,6 @@
 from typing import Optional
 
-from sqlalchemy import String, Text, ForeignKey, DateTime, func
+from sqlalchemy import String, Text, ForeignKey, DateTime, Index, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.app.db.base import Base
@@ -8,6 +8,10 @@ from src.app.db.base import Base
 
 class ToolItemIssue(Base):
     __tablename__ = "tool_item_issues"
+    __table_args__ = (
+        # Offene Issues pro Exemplar: WHERE tool_item_id = ? AND status_id IN (...)
+        Index("ix_tool_item_issues_tool_item_id_status_id", "tool_item_id", "status_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
 
@@ -15,7 +19,7 @@ class ToolItemIssue(Base):
     reported_at: Mapped["DateTime"] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     reported_by_user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
 
-    status_id: Mapped[int] = mapped_column(ForeignKey("tool_item_issue_status.id"), nullable=False)
+    status_id: Mapped[int] = mapped_column(ForeignKey("tool_item_issue_status.id"), nullable=False, index=True)
 
     title: Mapped[str] = mapped_column(String(200), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text)
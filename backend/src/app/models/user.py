@@ -34,7 +34,7 @@ class User(Base):
 
     # Fremdschlüssel zu den Lookup-Tabellen
     role_id: Mapped[int] = mapped_column(ForeignKey("roles.id"), nullable=False)
-    department_id: Mapped[int] = mapped_column(ForeignKey("departments.id"), nullable=False)
+    department_id: Mapped[int] = mapped_column(ForeignKey("departments.id"), nullable=False, index=True)  # Index: Filter nach Abteilung
 
     # Beziehungen (SQLAlchemy lädt diese automatisch als Python-Objekte)
     role: Mapped["Role"] = relationship(back_populates="users")
@@ -13,6 +13,8 @@ from src.app.schemas.loan_request_item import LoanRequestItemCreate, LoanRequest
 from src.app.schemas.loan_request import LoanRequestCreate, LoanRequestUpdate, LoanRequestRead
 from src.app.schemas.loan_item import LoanItemCreate, LoanItemUpdate, LoanItemRead
 from src.app.schemas.loan import LoanCreate, LoanUpdate, LoanRead
+from src.app.schemas.dashboard import DashboardStats, OverdueLoanEntry
+from src.app.schemas.maintenance import MaintenanceJobStats
 
 __all__ = [
     "RoleCreate", "RoleUpdate", "RoleRead", "DepartmentCreate", "DepartmentUpdate", "DepartmentRead", "UserCreate", "UserUpdate", "UserRead", "UserSlim",
@@ -21,5 +23,6 @@ __all__ = [
     "ToolItemUpdate", "ToolItemRead", "ToolItemSlim","ToolItemIssueStatusCreate", "ToolItemIssueStatusUpdate", "ToolItemIssueStatusRead",
     "ToolItemIssueCreate", "ToolItemIssueUpdate", "ToolItemIssueRead", "LoanRequestStatusCreate", "LoanRequestStatusUpdate", "LoanRequestStatusRead",
     "LoanRequestItemCreate", "LoanRequestItemUpdate", "LoanRequestItemRead", "LoanRequestCreate", "LoanRequestUpdate", "LoanRequestRead",
-    "LoanItemCreate", "LoanItemUpdate", "LoanItemRead", "LoanCreate", "LoanUpdate", "LoanRead"
+    "LoanItemCreate", "LoanItemUpdate", "LoanItemRead", "LoanCreate", "LoanUpdate", "LoanRead",
+    "DashboardStats", "OverdueLoanEntry", "MaintenanceJobStats"
 ]
\ No newline at end of file
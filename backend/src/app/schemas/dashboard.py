@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+from src.app.schemas.user import UserSlim
+
+
+class OverdueLoanEntry(BaseModel):
+    id: int
+    due_at: datetime
+    borrower: UserSlim
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class DashboardStats(BaseModel):
+    tool_count: int
+    tools_by_category: dict[str, int]
+    tool_item_count: int
+    tool_items_by_status: dict[str, int]
+    active_loans: int
+    overdue_loans: int
+    loan_requests_by_status: dict[str, int]
+    issues_by_status: dict[str, int] = {}
+    user_count: int = 0
+    top_overdue_loans: list[OverdueLoanEntry]
@@ -1,10 +1,10 @@
-from typing import Optional
-from datetime import datetime
+from typing import ClassVar, Optional
+from datetime import datetime, timezone
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, computed_field
 
 from src.app.schemas.user import UserSlim
-from src.app.schemas.loan_item import LoanItemCreate, LoanItemRead
+from src.app.schemas.loan_item import LoanItemCreate, LoanItemFlat, LoanItemRead
 
 
 class LoanBase(BaseModel):
@@ -35,15 +35,47 @@ class ReturnLoanRequest(BaseModel):
     items: list[LoanItemReturn]
 
 
-class LoanRead(LoanBase):
+class LoanOverdue(BaseModel):
+    """
+    is_overdue for the read schemas: the stored flag (loans.is_overdue, indexed for
+    queries, refreshed by a maintenance job) OR the due date has passed right now.
+    """
+    stored_is_overdue: bool = Field(False, validation_alias="is_overdue", exclude=True)
+
+    # Felder, aus denen is_overdue berechnet wird (für ?fields=, api/fieldsets.py)
+    computed_sources: ClassVar[dict[str, tuple[str, ...]]] = {"is_overdue": ("is_overdue", "returned_at", "due_at")}
+
+    @computed_field
+    @property
+    def is_overdue(self) -> bool:
+        if self.stored_is_overdue:
+            return True
+        if self.returned_at is not None:
+            return False
+        # SQLite liefert DateTime-Spalten ohne Zeitzone zurück
+        due = self.due_at if self.due_at.tzinfo else self.due_at.replace(tzinfo=timezone.utc)
+        return due < datetime.now(tz=timezone.utc)
+
+
+class LoanRead(LoanBase, LoanOverdue):
     id: int
     issued_at: datetime
     returned_at: Optional[datetime] = None
     returned_by_user_id: Optional[int] = None
-    is_overdue: bool = False
     borrower: UserSlim
     issuer: UserSlim
     return_processor: Optional[UserSlim] = None
     items: list[LoanItemRead]
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class LoanFlat(LoanBase, LoanOverdue):
+    """LoanRead without nested users; items reference tool items by ID."""
+    id: int
+    issued_at: datetime
+    returned_at: Optional[datetime] = None
+    returned_by_user_id: Optional[int] = None
+    items: list[LoanItemFlat]
+
+    model_config = ConfigDict(from_attributes=True)
@@ -27,9 +27,13 @@ class LoanItemUpdate(BaseModel):
     return_condition_id: Optional[int] = None
 
 
-class LoanItemRead(LoanItemBase):
+class LoanItemFlat(LoanItemBase):
+    """LoanItemRead without nested objects (tool item and return condition only as IDs)."""
     id: int
-    tool_item: ToolItemRead
-    return_condition: Optional[ToolConditionRead] = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class LoanItemRead(LoanItemFlat):
+    tool_item: ToolItemRead
+    return_condition: Optional[ToolConditionRead] = None
@@ -0,0 +1,19 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class MaintenanceJobStats(BaseModel):
+    name: str
+    interval_seconds: float
+    running: bool
+    runs: int
+    failures: int
+    skipped: int
+    last_started_at: Optional[datetime] = None
+    last_duration_ms: Optional[float] = None
+    avg_duration_ms: Optional[float] = None
+    max_duration_ms: Optional[float] = None
+    last_result: Optional[str] = None
+    last_error: Optional[str] = None
@@ -0,0 +1,14 @@
+from typing import Literal, Optional
+
+from pydantic import BaseModel
+
+SearchType = Literal["tool", "tool_item", "issue"]
+
+
+class SearchHit(BaseModel):
+    type: SearchType
+    id: int
+    title: str
+    subtitle: Optional[str] = None
+    snippet: str  # Ausschnitt mit Treffern in **…**
+    score: float  # höher = relevanter (negiertes bm25)
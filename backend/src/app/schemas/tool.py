@@ -1,7 +1,9 @@
-from typing import Optional
+from typing import ClassVar, Optional
 from datetime import datetime
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, computed_field
+
+from src.app.core import images
 
 from src.app.schemas.tool_category import ToolCategoryRead
 
@@ -22,11 +24,58 @@ class ToolUpdate(BaseModel):
     category_id: Optional[int] = None
 
 
-class ToolRead(ToolBase):
+class ToolAvailabilityRead(BaseModel):
+    total: int = 0
+    available: int = 0
+    loaned: int = 0
+    defect: int = 0
+    maintenance: int = 0
+    retired: int = 0
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ToolFlat(ToolBase):
+    """ToolRead without nested objects (category only as category_id)."""
     id: int
     image_filename: Optional[str] = None
+    image_variants_ready: bool = False
     created_at: datetime
     updated_at: datetime
-    category: ToolCategoryRead
+    availability: Optional[ToolAvailabilityRead] = None
 
     model_config = ConfigDict(from_attributes=True)
+
+    # Felder, aus denen die computed fields berechnet werden (für ?fields=, api/fieldsets.py)
+    computed_sources: ClassVar[dict[str, tuple[str, ...]]] = {
+        "image_url": ("image_filename",),
+        "image_thumb_url": ("image_filename", "image_variants_ready"),
+        "image_medium_url": ("image_filename", "image_variants_ready"),
+    }
+
+    def _image_url(self, variant: str) -> Optional[str]:
+        if not self.image_filename:
+            return None
+        # Bis die Varianten erzeugt sind, wird das Original ausgeliefert
+        return images.image_url(self.image_filename, variant if self.image_variants_ready else None)
+
+    @computed_field
+    @property
+    def image_url(self) -> Optional[str]:
+        return images.image_url(self.image_filename) if self.image_filename else None
+
+    @computed_field
+    @property
+    def image_thumb_url(self) -> Optional[str]:
+        """Small WebP variant for lists and cards."""
+        return self._image_url("thumb")
+
+    @computed_field
+    @property
+    def image_medium_url(self) -> Optional[str]:
+        """Medium WebP variant for detail views."""
+        return self._image_url("medium")
+
+
+class ToolRead(ToolFlat):
+    category: ToolCategoryRead
@@ -0,0 +1,48 @@
+from typing import Any, Literal, Optional
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+ImportFormat = Literal["csv", "ndjson"]
+
+
+class ToolImportRow(BaseModel):
+    """
+    One line of an import file: a tool (matched by name and category, created if missing)
+    plus `quantity` new items of it. Lookups are given by name, not by id.
+    """
+    tool_name: str = Field(min_length=1, max_length=200)
+    category: str = Field(min_length=1)
+    description: Optional[str] = None
+    quantity: int = Field(0, ge=0, le=1000)
+    condition: Optional[str] = None  # Pflicht, sobald quantity > 0
+    status: Optional[str] = None     # Standard: AVAILABLE
+    item_description: Optional[str] = None
+
+    model_config = ConfigDict(extra="forbid", str_strip_whitespace=True)
+
+    @model_validator(mode="before")
+    @classmethod
+    def _drop_empty_cells(cls, data: Any) -> Any:
+        # Leere CSV-Zellen bedeuten "nicht angegeben"
+        if isinstance(data, dict):
+            return {key: value for key, value in data.items() if value not in ("", None)}
+        return data
+
+    @model_validator(mode="after")
+    def _condition_for_items(self) -> "ToolImportRow":
+        if self.quantity and not self.condition:
+            raise ValueError("condition is required when quantity > 0")
+        return self
+
+
+class ToolImportError(BaseModel):
+    line: int  # Zeile in der Datei (CSV: inklusive Kopfzeile)
+    message: str
+
+
+class ToolImportResult(BaseModel):
+    rows: int = 0
+    tools_created: int = 0
+    items_created: int = 0
+    error_count: int = 0
+    errors: list[ToolImportError] = []  # die ersten MAX_REPORTED_ERRORS Fehler
@@ -1,7 +1,9 @@
-from typing import Optional
+from typing import ClassVar, Optional
 from datetime import datetime
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, computed_field
+
+from src.app.core.qrcodes import cache_key, payload_for
 
 from src.app.schemas.tool import ToolRead
 from src.app.schemas.tool_status import ToolStatusRead
@@ -39,16 +41,29 @@ class ToolItemSlim(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
-class ToolItemRead(ToolItemBase):
+class ToolItemFlat(ToolItemBase):
+    """ToolItemRead without nested objects (tool, status and condition only as IDs)."""
     id: int
     created_at: datetime
     updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+    # Felder, aus denen qrcode_url berechnet wird (für ?fields=, api/fieldsets.py)
+    computed_sources: ClassVar[dict[str, tuple[str, ...]]] = {"qrcode_url": ("id", "inventory_no")}
+
+    @computed_field
+    @property
+    def qrcode_url(self) -> str:
+        """Content-addressed QR code URL – changes with the inventory number, so it can be cached forever."""
+        return f"/api/v1/gettoolitemqrcode/{self.id}?v={cache_key(payload_for(self.id, self.inventory_no))}"
+
+
+class ToolItemRead(ToolItemFlat):
     tool: ToolRead
     status: ToolStatusRead
     condition: ToolConditionRead
 
-    model_config = ConfigDict(from_attributes=True)
-
 
 class ToolItemHistoryEntry(BaseModel):
     loan_id: int
@@ -29,12 +29,16 @@ class ToolItemIssueUpdate(BaseModel):
     resolved_at: Optional[datetime] = None
 
 
-class ToolItemIssueRead(ToolItemIssueBase):
+class ToolItemIssueFlat(ToolItemIssueBase):
+    """ToolItemIssueRead without nested objects."""
     id: int
     reported_at: datetime
     resolved_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ToolItemIssueRead(ToolItemIssueFlat):
     tool_item: ToolItemRead
     reported_by: UserSlim
     status: ToolItemIssueStatusRead
-
-    model_config = ConfigDict(from_attributes=True)
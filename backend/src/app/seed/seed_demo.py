@@ -32,6 +32,7 @@ from sqlalchemy.orm import Session
 from src.app.db.session import engine
 from src.app.db.base import Base
 import src.app.models  # noqa – alle Modelle registrieren
+import src.app.crud  # noqa – Listener (u.a. Bestandszähler tool_availability) registrieren
 
 from src.app.models.role import Role
 from src.app.models.department import Department
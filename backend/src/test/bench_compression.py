@@ -0,0 +1,92 @@
+"""
+Benchmark for response compression (core/compression.py).
+
+Seeds the demo dataset (seed_demo) into a temporary database, logs in as the
+demo admin and fetches the large list endpoints with Accept-Encoding
+identity, gzip and – if the brotli package is installed – br. Prints the
+bytes on the wire, the server-side latency and the estimated total time on
+a link of --mbit Mbit/s for each combination.
+
+    cd backend
+    python -m src.test.bench_compression [--runs 20] [--mbit 20]
+
+Not collected by pytest (file name does not start with test_);
+test_compression.py runs measure() once as a regression check.
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+if "DATABASE_URL" not in os.environ:  # beim Import aus den Tests schon gesetzt
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='bench-compression-')}/bench.db"
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+os.environ.setdefault("JWT_ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+os.environ.setdefault("SEED_MANAGER_EMAIL", "seed@test.local")
+os.environ.setdefault("SEED_MANAGER_PASSWORD", "Test123!")
+os.environ.setdefault("SEED_MANAGER_FIRSTNAME", "Seed")
+os.environ.setdefault("SEED_MANAGER_LASTNAME", "User")
+os.environ.setdefault("MAINTENANCE_ENABLED", "false")
+
+from src.app.core.compression import brotli
+
+PATHS = (
+    "/api/v1/getloans?limit=500",
+    "/api/v1/gettoolitems?limit=500",
+    "/api/v1/getloanrequests?limit=500",
+    "/api/v1/gettools?limit=500",
+)
+ENCODINGS = ("identity", "gzip", "br") if brotli is not None else ("identity", "gzip")
+
+
+def measure(client, path: str, encoding: str, runs: int, headers: dict = None) -> dict:
+    """Fetches path `runs` times; returns the bytes on the wire and the median latency in ms."""
+    headers = {**(headers or {}), "Accept-Encoding": encoding}
+    timings = []
+    wire_bytes = 0
+    for _ in range(runs):
+        started = time.perf_counter()
+        r = client.get(path, headers=headers)
+        timings.append((time.perf_counter() - started) * 1000)
+        assert r.status_code == 200, (path, r.status_code)
+        wire_bytes = r.num_bytes_downloaded
+    return {
+        "bytes": wire_bytes,
+        "encoding": r.headers.get("content-encoding", "identity"),
+        "median_ms": statistics.median(timings),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--mbit", type=float, default=20.0, help="simulated link speed for the total time")
+    args = parser.parse_args()
+
+    from fastapi.testclient import TestClient
+
+    from src.app.crud import lookups
+    from src.app.db.session import SessionLocal
+    from src.app.main import app
+    from src.app.seed.seed_demo import run_demo_seed
+
+    run_demo_seed()
+    with SessionLocal() as db:
+        lookups.load_all(db)
+
+    client = TestClient(app)
+    token = client.post("/auth/login", data={"username": "admin@admin.local", "password": "admin"}).json()["access_token"]
+    auth = {"Authorization": f"Bearer {token}"}
+
+    print(f"\n{'endpoint':36} {'encoding':9} {'bytes':>10} {'server ms':>10} {f'total ms @ {args.mbit:g} Mbit/s':>24}")
+    for path in PATHS:
+        for encoding in ENCODINGS:
+            r = measure(client, path, encoding, args.runs, auth)
+            transfer_ms = r["bytes"] * 8 / (args.mbit * 1_000_000) * 1000
+            print(f"{path:36} {r['encoding']:9} {r['bytes']:10d} {r['median_ms']:10.1f} {r['median_ms'] + transfer_ms:24.1f}")
+
+
+if __name__ == "__main__":
+    main()
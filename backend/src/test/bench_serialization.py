@@ -0,0 +1,125 @@
+"""
+Microbenchmark for the list serialization path (api/serialization.py).
+
+Seeds the demo dataset (seed_demo) into a temporary database and compares
+requests/s for /getloans and /gettoolitems:
+
+  before – FastAPI's default path: the route returns ORM rows, FastAPI
+           validates them against response_model in the threadpool, dumps
+           them to dicts and renders them with json.dumps
+  after  – the real routes: one TypeAdapter pass, JSON bytes from pydantic-core
+
+Both run the same queries with the same authentication. A second table
+compares the default nested shape with ?shape=normalized (api/normalization.py)
+for /getloans, /gettoolitems and /gettoolitemissues: response bytes and req/s.
+A third table shows what a sparse fieldset (?fields=, api/fieldsets.py) for a
+loan overview saves against the full nested list.
+
+    cd backend
+    python -m src.test.bench_serialization [--seconds 3] [--limit 500]
+
+Not collected by pytest (file name does not start with test_);
+test_serialization.py runs requests_per_second() briefly as a regression check.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+if "DATABASE_URL" not in os.environ:  # beim Import aus den Tests schon gesetzt
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='bench-serialization-')}/bench.db"
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+os.environ.setdefault("JWT_ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+os.environ.setdefault("SEED_MANAGER_EMAIL", "seed@test.local")
+os.environ.setdefault("SEED_MANAGER_PASSWORD", "Test123!")
+os.environ.setdefault("SEED_MANAGER_FIRSTNAME", "Seed")
+os.environ.setdefault("SEED_MANAGER_LASTNAME", "User")
+os.environ.setdefault("MAINTENANCE_ENABLED", "false")
+
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+
+import src.app.crud.loan as loan_crud
+import src.app.crud.tool_item as tool_item_crud
+from src.app.auth.security import get_current_user
+from src.app.db.deps import get_db
+from src.app.schemas.loan import LoanRead
+from src.app.schemas.tool_item import ToolItemRead
+
+legacy_router = APIRouter(prefix="/legacy", dependencies=[Depends(get_current_user)])
+
+
+@legacy_router.get("/getloans", response_model=list[LoanRead], response_class=JSONResponse)
+def legacy_loans(limit: int = 100, db: Session = Depends(get_db)):
+    return loan_crud.get_loans(db, limit=limit)
+
+
+@legacy_router.get("/gettoolitems", response_model=list[ToolItemRead], response_class=JSONResponse)
+def legacy_tool_items(limit: int = 100, db: Session = Depends(get_db)):
+    return tool_item_crud.get_tool_items(db, limit=limit)
+
+
+def requests_per_second(client, path: str, seconds: float, headers: dict = None) -> float:
+    """Sends GET requests to path for `seconds` (at least one) and returns the rate."""
+    count = 0
+    started = time.perf_counter()
+    while True:
+        r = client.get(path, headers=headers)
+        assert r.status_code == 200, (path, r.status_code)
+        count += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= seconds:
+            return count / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--limit", type=int, default=500)
+    args = parser.parse_args()
+
+    from fastapi.testclient import TestClient
+
+    from src.app.crud import lookups
+    from src.app.db.session import SessionLocal
+    from src.app.main import app
+    from src.app.seed.seed_demo import run_demo_seed
+
+    run_demo_seed()
+    with SessionLocal() as db:
+        lookups.load_all(db)
+    app.include_router(legacy_router)
+
+    client = TestClient(app)
+    token = client.post("/auth/login", data={"username": "admin@admin.local", "password": "admin"}).json()["access_token"]
+    auth = {"Authorization": f"Bearer {token}", "Accept-Encoding": "identity"}
+
+    print(f"\n{'endpoint':16} {'before req/s':>13} {'after req/s':>12} {'speedup':>8}")
+    for name in ("getloans", "gettoolitems"):
+        query = f"?limit={args.limit}"
+        assert client.get(f"/legacy/{name}{query}", headers=auth).json() == client.get(f"/api/v1/{name}{query}", headers=auth).json()
+        before = requests_per_second(client, f"/legacy/{name}{query}", args.seconds, auth)
+        after = requests_per_second(client, f"/api/v1/{name}{query}", args.seconds, auth)
+        print(f"/{name:15} {before:13.1f} {after:12.1f} {after / before:7.2f}x")
+
+    print(f"\n{'endpoint':20} {'nested bytes':>13} {'normalized':>11} {'nested req/s':>13} {'normalized':>11}")
+    for name in ("getloans", "gettoolitems", "gettoolitemissues"):
+        path = f"/api/v1/{name}?limit={args.limit}"
+        nested = len(client.get(path, headers=auth).content)
+        normalized = len(client.get(f"{path}&shape=normalized", headers=auth).content)
+        nested_rate = requests_per_second(client, path, args.seconds, auth)
+        normalized_rate = requests_per_second(client, f"{path}&shape=normalized", args.seconds, auth)
+        print(f"/{name:19} {nested:13d} {normalized:11d} {nested_rate:13.1f} {normalized_rate:11.1f}")
+
+    sparse = f"/api/v1/getloans?limit={args.limit}&fields=due_at,returned_at,borrower.firstname,borrower.lastname,items.id"
+    full = f"/api/v1/getloans?limit={args.limit}"
+    print(f"\n{'getloans':20} {'bytes':>13} {'req/s':>11}")
+    for label, path in (("full", full), ("sparse fields", sparse)):
+        size = len(client.get(path, headers=auth).content)
+        print(f"{label:20} {size:13d} {requests_per_second(client, path, args.seconds, auth):11.1f}")
+
+
+if __name__ == "__main__":
+    main()
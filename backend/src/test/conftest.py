@@ -7,6 +7,7 @@ Auth (get_current_user) is bypassed with a mock ADMIN user so that
 existing CRUD tests don't need to send Bearer tokens.
 """
 import os
+import tempfile
 
 # DATABASE_URL and JWT_SECRET_KEY must be set BEFORE src.app.* is imported,
 # because config.py evaluates Settings on import.
@@ -18,10 +19,17 @@ os.environ.setdefault("SEED_MANAGER_EMAIL", "seed@test.local")
 os.environ.setdefault("SEED_MANAGER_PASSWORD", "Test123!")
 os.environ.setdefault("SEED_MANAGER_FIRSTNAME", "Seed")
 os.environ.setdefault("SEED_MANAGER_LASTNAME", "User")
+# Keine Hintergrundjobs gegen die App-Engine während der Tests
+os.environ.setdefault("MAINTENANCE_ENABLED", "false")
+# QR-Code-Festplattencache in ein temporäres Verzeichnis statt ins Arbeitsverzeichnis
+os.environ.setdefault("QR_CACHE_DIR", tempfile.mkdtemp(prefix="qr-cache-"))
+
+from contextlib import contextmanager
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
@@ -66,6 +74,12 @@ def _mock_get_current_user():
 @pytest.fixture()
 def db():
     """Creates all tables, yields a session, then cleans up."""
+    from src.app.crud import lookups
+    lookups.invalidate()  # cached lookup ids belong to the previous test's database
+    from src.app.auth.revocation import revoked_tokens
+    revoked_tokens.clear()
+    from src.app.auth.principal import principal_cache
+    principal_cache.clear()
     Base.metadata.create_all(bind=engine)
     session = TestingSessionLocal()
     try:
@@ -97,6 +111,47 @@ def client(db):
     app.dependency_overrides.clear()
 
 
+@pytest.fixture()
+def image_dir(tmp_path, monkeypatch):
+    """
+    Redirects tool image uploads and the /static mount into tmp_path,
+    so image tests never touch the real static/tool_images.
+    """
+    from src.app.core import images
+    static = next(route.app for route in app.routes if getattr(route, "name", None) == "static")
+    path = tmp_path / "tool_images"
+    path.mkdir()
+    monkeypatch.setattr(images, "IMAGE_DIR", path)
+    monkeypatch.setattr(static, "all_directories", [tmp_path])
+    return path
+
+
+@contextmanager
+def count_queries(with_parameters: bool = False):
+    """
+    Counts the SQL statements executed inside the block.
+    With with_parameters=True the list holds (statement, parameters) tuples.
+
+    Listens on the Engine class rather than on the local engine, because this
+    module is imported twice (once by pytest, once via "from src.test.conftest").
+
+    Usage:
+        with count_queries() as queries:
+            client.get("/api/v1/getloans")
+        assert len(queries) <= 3
+    """
+    statements: list = []
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters) if with_parameters else statement)
+
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(Engine, "before_cursor_execute", _before_cursor_execute)
+
+
 # ---------------------------------------------------------------------------
 # Helper functions: create test data via the API
 # ---------------------------------------------------------------------------
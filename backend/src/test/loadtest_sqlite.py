@@ -0,0 +1,117 @@
+"""
+Load test for the SQLite tuning profile (db/session.py).
+
+Runs the same mixed workload – concurrent writer threads committing small
+transactions while reader threads run aggregate queries – against a
+file database with and without SQLITE_PERFORMANCE_PROFILE and prints
+throughput and lock errors for both.
+
+    cd backend
+    python -m src.test.loadtest_sqlite [--writers 8] [--readers 8] [--seconds 5]
+
+Not collected by pytest (file name does not start with test_);
+test_sqlite_tuning.py runs a short version of run_workload as a regression check.
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("JWT_SECRET_KEY", "loadtest")
+os.environ.setdefault("JWT_ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+os.environ.setdefault("SEED_MANAGER_EMAIL", "seed@test.local")
+os.environ.setdefault("SEED_MANAGER_PASSWORD", "Test123!")
+os.environ.setdefault("SEED_MANAGER_FIRSTNAME", "Seed")
+os.environ.setdefault("SEED_MANAGER_LASTNAME", "User")
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, func, insert, select
+from sqlalchemy.exc import OperationalError
+
+from src.app.db.session import create_db_engine
+
+_metadata = MetaData()
+_events = Table(
+    "loadtest_events", _metadata,
+    Column("id", Integer, primary_key=True),
+    Column("writer", Integer, nullable=False, index=True),
+    Column("payload", String(200), nullable=False),
+)
+# Feste Referenzdaten für die Leser – unabhängig davon, wie viel geschrieben wird
+_reference = Table(
+    "loadtest_reference", _metadata,
+    Column("id", Integer, primary_key=True),
+    Column("bucket", Integer, nullable=False, index=True),
+)
+
+
+def run_workload(db_path: str, performance_profile: bool, writers: int, readers: int, seconds: float) -> dict:
+    """Runs the mixed workload for `seconds` and returns counts of commits, reads and lock errors."""
+    engine = create_db_engine(f"sqlite:///{db_path}", performance_profile=performance_profile)
+    _metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(_reference), [{"bucket": i % 20} for i in range(5000)])
+    stop = threading.Event()
+    lock = threading.Lock()
+    result = {"writes": 0, "reads": 0, "errors": 0}
+
+    def bump(key: str) -> None:
+        with lock:
+            result[key] += 1
+
+    def writer(n: int) -> None:
+        while not stop.is_set():
+            try:
+                with engine.begin() as conn:
+                    conn.execute(insert(_events).values(writer=n, payload="x" * 100))
+                bump("writes")
+            except OperationalError:
+                bump("errors")
+
+    def reader(_n: int) -> None:
+        while not stop.is_set():
+            try:
+                with engine.connect() as conn:
+                    conn.execute(
+                        select(_reference.c.bucket, func.count()).group_by(_reference.c.bucket)
+                    ).all()
+                bump("reads")
+            except OperationalError:
+                bump("errors")
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    threads += [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+
+    with engine.connect() as conn:
+        result["rows"] = conn.execute(select(func.count()).select_from(_events)).scalar_one()
+    engine.dispose()
+    result["writes_per_s"] = result["writes"] / seconds
+    result["reads_per_s"] = result["reads"] / seconds
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    for profile in (False, True):
+        with tempfile.TemporaryDirectory() as tmp:
+            r = run_workload(os.path.join(tmp, "load.db"), profile, args.writers, args.readers, args.seconds)
+        label = "performance profile" if profile else "default settings   "
+        print(f"{label}: {r['writes_per_s']:8.0f} commits/s  {r['reads_per_s']:8.0f} reads/s  "
+              f"{r['errors']:4d} lock errors")
+
+
+if __name__ == "__main__":
+    main()
@@ -31,6 +31,12 @@ _Session = sessionmaker(autocommit=False, autoflush=False, bind=_engine)
 
 @pytest.fixture()
 def auth_db():
+    from src.app.crud import lookups
+    lookups.invalidate()
+    from src.app.auth.revocation import revoked_tokens
+    revoked_tokens.clear()
+    from src.app.auth.principal import principal_cache
+    principal_cache.clear()
     Base.metadata.create_all(bind=_engine)
     session = _Session()
     try:
@@ -189,3 +195,177 @@ def test_logout_without_token(auth_client, auth_db):
     """POST /auth/logout without token returns 401."""
     r = auth_client.post("/auth/logout")
     assert r.status_code == 401
+
+
+def test_logout_twice_is_harmless(auth_client, auth_db):
+    """A second logout with the same token does not hit the unique constraint."""
+    _seed_admin(auth_db)
+    login = auth_client.post("/auth/login", data={"username": "admin@example.com", "password": "Admin123!"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    assert auth_client.post("/auth/logout", headers=headers).status_code == 204
+    assert auth_client.post("/auth/logout", headers=headers).status_code == 204
+
+
+def test_logout_stores_hash_not_token(auth_client, auth_db):
+    """blacklisted_tokens only holds the SHA-256 hash of the token."""
+    from src.app.auth.revocation import token_hash
+    from src.app.models.blacklisted_token import BlacklistedToken
+
+    _seed_admin(auth_db)
+    login = auth_client.post("/auth/login", data={"username": "admin@example.com", "password": "Admin123!"})
+    token = login.json()["access_token"]
+    auth_client.post("/auth/logout", headers={"Authorization": f"Bearer {token}"})
+
+    stored = auth_db.query(BlacklistedToken.token_hash).scalar()
+    assert stored == token_hash(token)
+    assert len(stored) == 64
+
+
+def test_revocation_check_does_not_query_blacklist(auth_client, auth_db):
+    """Authenticated requests no longer touch blacklisted_tokens."""
+    from src.test.conftest import count_queries
+
+    _seed_admin(auth_db)
+    login = auth_client.post("/auth/login", data={"username": "admin@example.com", "password": "Admin123!"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    with count_queries() as queries:
+        assert auth_client.get("/api/v1/getusers", headers=headers).status_code == 200
+    assert not any("blacklisted_tokens" in q for q in queries)
+
+
+def test_revocation_cache_warms_from_db(auth_db):
+    """Revoked tokens survive a restart: warm() reloads them from the table."""
+    from datetime import datetime, timedelta, timezone
+    from src.app.auth.revocation import RevocationCache, token_hash
+    from src.app.models.blacklisted_token import BlacklistedToken
+
+    now = datetime.now(tz=timezone.utc)
+    auth_db.add(BlacklistedToken(token_hash=token_hash("live"), expires_at=now + timedelta(hours=1)))
+    auth_db.add(BlacklistedToken(token_hash=token_hash("old"), expires_at=now - timedelta(hours=1)))
+    auth_db.commit()
+
+    cache = RevocationCache()
+    cache.warm(auth_db)
+    assert cache.is_revoked(token_hash("live"))
+    assert not cache.is_revoked(token_hash("old"))
+    assert not cache.is_revoked(token_hash("never"))
+    assert len(cache) == 1
+
+
+def test_revocation_cache_syncs_logouts_of_other_workers(auth_db):
+    """sync() picks up rows another process wrote after warm() – only the new ones."""
+    from datetime import datetime, timedelta, timezone
+    from src.app.auth.revocation import RevocationCache, token_hash
+    from src.app.models.blacklisted_token import BlacklistedToken
+    from src.test.conftest import count_queries
+
+    expires = datetime.now(tz=timezone.utc) + timedelta(hours=1)
+    auth_db.add(BlacklistedToken(token_hash=token_hash("before"), expires_at=expires))
+    auth_db.commit()
+    cache = RevocationCache()
+    cache.warm(auth_db)
+
+    # Logout auf einem anderen Worker: nur die Tabelle ändert sich
+    auth_db.add(BlacklistedToken(token_hash=token_hash("elsewhere"), expires_at=expires))
+    auth_db.commit()
+    assert not cache.is_revoked(token_hash("elsewhere"))
+    assert cache.sync(auth_db) == 1
+    assert cache.is_revoked(token_hash("elsewhere"))
+
+    with count_queries() as queries:
+        assert cache.sync(auth_db) == 0
+    assert len(queries) == 1 and "blacklisted_tokens.id >" in queries[0]
+
+
+def test_revocation_sync_after_purge_emptied_the_table(auth_client, auth_db):
+    """The purge job may empty blacklisted_tokens – new ids must still lie above every worker's watermark."""
+    from datetime import datetime, timedelta, timezone
+    from src.app.auth.revocation import RevocationCache, token_hash
+    from src.app.crud.blacklisted_token import cleanup_expired_tokens
+    from src.app.models.blacklisted_token import BlacklistedToken
+
+    _seed_admin(auth_db)
+    expired = datetime.now(tz=timezone.utc) - timedelta(minutes=1)
+    auth_db.add_all([BlacklistedToken(token_hash=token_hash(f"old {i}"), expires_at=expired) for i in range(3)])
+    auth_db.commit()
+    worker_b = RevocationCache()
+    worker_b.warm(auth_db)
+
+    cleanup_expired_tokens(auth_db)
+    assert auth_db.query(BlacklistedToken).count() == 0
+
+    # Logout auf Worker A (dieser Prozess), Abgleich auf Worker B
+    headers = _login_headers(auth_client)
+    assert auth_client.post("/auth/logout", headers=headers).status_code == 204
+    token = headers["Authorization"].removeprefix("Bearer ")
+    assert worker_b.sync(auth_db) == 1
+    assert worker_b.is_revoked(token_hash(token))
+
+
+def test_revocation_cache_purges_in_expiry_order():
+    from datetime import datetime, timedelta, timezone
+    from src.app.auth.revocation import RevocationCache, token_hash
+
+    now = datetime.now(tz=timezone.utc)
+    cache = RevocationCache()
+    cache.add(token_hash("a"), now + timedelta(minutes=1))
+    cache.add(token_hash("b"), now + timedelta(minutes=10))
+
+    assert cache.purge_expired(now + timedelta(minutes=5)) == 1
+    assert not cache.is_revoked(token_hash("a"), now)
+    assert cache.is_revoked(token_hash("b"), now)
+
+
+# ---------------------------------------------------------------------------
+# Principal cache tests
+# ---------------------------------------------------------------------------
+
+def _login_headers(auth_client) -> dict:
+    login = auth_client.post("/auth/login", data={"username": "admin@example.com", "password": "Admin123!"})
+    return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+def test_cached_principal_skips_user_query(auth_client, auth_db):
+    """After the first request the user is authorized without a users query."""
+    from src.test.conftest import count_queries
+
+    _seed_admin(auth_db)
+    headers = _login_headers(auth_client)
+    assert auth_client.get("/api/v1/getdepartments", headers=headers).status_code == 200
+
+    with count_queries() as queries:
+        assert auth_client.get("/api/v1/getdepartments", headers=headers).status_code == 200
+    assert not any("FROM users" in q for q in queries)
+
+
+def test_deactivated_user_rejected_despite_cache(auth_client, auth_db):
+    """Committing a change to the user drops the cached principal immediately."""
+    from src.app.models.user import User
+
+    _seed_admin(auth_db)
+    headers = _login_headers(auth_client)
+    assert auth_client.get("/api/v1/getdepartments", headers=headers).status_code == 200
+
+    user = auth_db.query(User).filter(User.email == "admin@example.com").one()
+    user.is_active = False
+    auth_db.commit()
+
+    assert auth_client.get("/api/v1/getdepartments", headers=headers).status_code == 401
+
+
+def test_principal_cache_ttl_and_lru():
+    from src.app.auth.principal import Principal, PrincipalCache
+
+    cache = PrincipalCache(max_size=2, ttl_seconds=60)
+    for uid in (1, 2):
+        cache.put(Principal(id=uid, role_id=1, department_id=1, is_active=True))
+    cache.get(1)  # 1 is now most recently used
+    cache.put(Principal(id=3, role_id=1, department_id=1, is_active=True))
+    assert cache.get(2) is None
+    assert cache.get(1) is not None and cache.get(3) is not None
+
+    expired = PrincipalCache(max_size=2, ttl_seconds=0)
+    expired.put(Principal(id=1, role_id=1, department_id=1, is_active=True))
+    assert expired.get(1) is None
@@ -0,0 +1,123 @@
+"""Tests for the response compression middleware."""
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from src.app.core.compression import CompressionMiddleware, choose_encoding, is_compressible
+from src.test.conftest import create_tool, create_tool_category, create_tool_item, seed_lookup_data
+
+
+def _create_tools(client, n=30):
+    cat = create_tool_category(client)
+    for i in range(n):
+        create_tool(client, cat["id"], f"Werkzeug {i}")
+
+
+def test_choose_encoding():
+    assert choose_encoding("gzip, deflate, br", brotli_available=True) == "br"
+    assert choose_encoding("gzip, deflate, br", brotli_available=False) == "gzip"
+    assert choose_encoding("br;q=0.5, gzip", brotli_available=True) == "gzip"
+    assert choose_encoding("gzip;q=0", brotli_available=False) is None
+    assert choose_encoding("identity", brotli_available=True) is None
+    assert choose_encoding("*", brotli_available=False) == "gzip"
+    assert choose_encoding("", brotli_available=True) is None
+
+
+def test_is_compressible():
+    assert is_compressible("application/json")
+    assert is_compressible("application/x-ndjson; charset=utf-8")
+    assert is_compressible("text/html; charset=utf-8")
+    assert not is_compressible("image/png")
+    assert not is_compressible("application/pdf")
+    assert not is_compressible("")
+
+
+def test_large_json_list_is_gzipped(client):
+    _create_tools(client)
+    r = client.get("/api/v1/gettools", headers={"Accept-Encoding": "gzip"})
+    assert r.status_code == 200
+    assert r.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in r.headers["vary"]
+    assert len(r.json()) == 30  # httpx entpackt
+    assert r.num_bytes_downloaded < len(r.content) / 3
+
+    plain = client.get("/api/v1/gettools", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.json() == r.json()
+
+
+def test_small_responses_stay_uncompressed(client):
+    cat = create_tool_category(client)
+    r = client.get(f"/api/v1/gettoolcategory/{cat['id']}", headers={"Accept-Encoding": "gzip"})
+    assert r.status_code == 200
+    assert "content-encoding" not in r.headers
+
+
+def test_qr_code_png_is_not_recompressed(client):
+    ids = seed_lookup_data(client)
+    tool = create_tool(client, ids["category_id"])
+    item = create_tool_item(client, tool["id"], ids["status_id"], ids["condition_id"])
+    r = client.get(f"/api/v1/gettoolitemqrcode/{item['id']}", headers={"Accept-Encoding": "gzip"})
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "image/png"
+    assert "content-encoding" not in r.headers
+
+
+@pytest.fixture
+def small_app_client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @app.get("/ndjson")
+    def ndjson():
+        return StreamingResponse((b'{"n": %d, "pad": "%s"}\n' % (i, b"x" * 50) for i in range(200)),
+                                 media_type="application/x-ndjson")
+
+    @app.get("/partial")
+    def partial():
+        return PlainTextResponse("a" * 1000, status_code=206, headers={"Content-Range": "bytes 0-999/5000"})
+
+    @app.get("/binary")
+    def binary():
+        return Response(b"\x00" * 5000, media_type="application/octet-stream")
+
+    return TestClient(app)
+
+
+def test_streaming_ndjson_is_compressed(small_app_client):
+    r = small_app_client.get("/ndjson", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["content-encoding"] == "gzip"
+    assert "content-length" not in r.headers
+    assert len(r.text.splitlines()) == 200
+
+
+def test_partial_and_binary_responses_pass_through(small_app_client):
+    for path in ("/partial", "/binary"):
+        r = small_app_client.get(path, headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in r.headers, path
+
+
+def test_brotli_when_available(small_app_client):
+    pytest.importorskip("brotli")
+    r = small_app_client.get("/ndjson", headers={"Accept-Encoding": "br, gzip"})
+    assert r.headers["content-encoding"] == "br"
+    assert len(r.text.splitlines()) == 200
+
+
+def test_gzip_body_is_valid(small_app_client):
+    # Rohdaten ohne automatisches Entpacken prüfen
+    with small_app_client.stream("GET", "/ndjson", headers={"Accept-Encoding": "gzip"}) as r:
+        raw = b"".join(r.iter_raw())
+    assert gzip.decompress(raw).count(b"\n") == 200
+
+
+def test_benchmark_measure_runs(client):
+    from src.test.bench_compression import measure
+    _create_tools(client)
+    identity = measure(client, "/api/v1/gettools", "identity", runs=1)
+    compressed = measure(client, "/api/v1/gettools", "gzip", runs=1)
+    assert compressed["encoding"] == "gzip"
+    assert compressed["bytes"] < identity["bytes"]
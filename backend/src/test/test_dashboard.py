@@ -0,0 +1,40 @@
+"""Tests for the aggregated dashboard endpoint."""
+from src.test.conftest import seed_lookup_data, create_tool, create_tool_item, create_user
+
+def _setup(client):
+    ids = seed_lookup_data(client)
+    tool = create_tool(client, ids["category_id"])
+    item1 = create_tool_item(client, tool["id"], ids["status_id"], ids["condition_id"])
+    create_tool_item(client, tool["id"], ids["status_id"], ids["condition_id"])
+    borrower = create_user(client, ids["role_id"], ids["department_id"])
+    issuer = create_user(client, ids["role_id"], ids["department_id"], email="issuer@example.com")
+    return {"ids": ids, "item_id": item1["id"], "borrower_id": borrower["id"], "issuer_id": issuer["id"]}
+
+def test_dashboard_stats_empty(client):
+    r = client.get("/api/v1/getdashboardstats")
+    assert r.status_code == 200
+    data = r.json()
+    assert data["tool_count"] == 0
+    assert data["tool_item_count"] == 0
+    assert data["active_loans"] == 0
+    assert data["top_overdue_loans"] == []
+
+def test_dashboard_stats_counts(client):
+    setup = _setup(client)
+    client.post("/api/v1/createloan", json={"borrower_user_id": setup["borrower_id"], "issued_by_user_id": setup["issuer_id"], "due_at": "2020-01-01T12:00:00Z", "items": [{"tool_item_id": setup["item_id"]}]})
+    data = client.get("/api/v1/getdashboardstats").json()
+    assert data["tool_count"] == 1
+    assert data["tools_by_category"] == {"Hand Tools": 1}
+    assert data["tool_item_count"] == 2
+    assert data["tool_items_by_status"] == {"AVAILABLE": 1, "LOANED": 1}
+    assert data["active_loans"] == 1
+    assert data["overdue_loans"] == 1
+    assert data["user_count"] == 2
+    assert data["top_overdue_loans"][0]["borrower"]["id"] == setup["borrower_id"]
+
+def test_dashboard_overdue_limit(client):
+    setup = _setup(client)
+    client.post("/api/v1/createloan", json={"borrower_user_id": setup["borrower_id"], "issued_by_user_id": setup["issuer_id"], "due_at": "2020-01-01T12:00:00Z", "items": [{"tool_item_id": setup["item_id"]}]})
+    data = client.get("/api/v1/getdashboardstats", params={"overdue_limit": 0}).json()
+    assert data["overdue_loans"] == 1
+    assert data["top_overdue_loans"] == []
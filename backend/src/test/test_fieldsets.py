@@ -0,0 +1,119 @@
+"""Tests for sparse fieldsets and relationship expansion (?fields= / ?expand=, api/fieldsets.py)."""
+import pytest
+
+from src.app.api.fieldsets import Selection, parse_selection
+from src.app.schemas.loan import LoanRead
+from src.test.conftest import count_queries, create_tool, create_tool_item, create_user, seed_lookup_data
+
+
+@pytest.fixture
+def loans(client):
+    ids = seed_lookup_data(client)
+    user = create_user(client, ids["role_id"], ids["department_id"])
+    tool = create_tool(client, ids["category_id"])
+    for _ in range(3):
+        item = create_tool_item(client, tool["id"], ids["status_id"], ids["condition_id"])
+        r = client.post("/api/v1/createloan", json={"borrower_user_id": user["id"], "issued_by_user_id": user["id"],
+                                                    "due_at": "2030-01-01T12:00:00Z", "items": [{"tool_item_id": item["id"]}]})
+        assert r.status_code == 201
+    return client.get("/api/v1/getloans").json()
+
+
+def _statements(client, db, url):
+    db.expire_all()
+    with count_queries() as queries:
+        r = client.get(url)
+    assert r.status_code == 200, r.text
+    return r.json(), queries
+
+
+def test_parse_selection():
+    sel = parse_selection(LoanRead, "due_at,borrower.lastname,items.id", None)
+    assert sel.fields == {"due_at"}
+    expand = dict(sel.expand)
+    assert expand["borrower"] == Selection(frozenset({"lastname"}))
+    assert expand["items"] == Selection(frozenset({"id"}))
+
+    # expand bettet mit allen Feldern ein und gewinnt gegenüber einer Feldliste
+    sel = parse_selection(LoanRead, "borrower.lastname", "borrower,items.tool_item")
+    expand = dict(sel.expand)
+    assert expand["borrower"].fields is None
+    assert dict(expand["items"].expand)["tool_item"] == Selection(None)
+
+    with pytest.raises(ValueError, match="borrower.nope"):
+        parse_selection(LoanRead, "borrower.nope", None)
+    with pytest.raises(ValueError, match="due_at.x"):
+        parse_selection(LoanRead, "due_at.x", None)
+
+
+def test_fields_project_columns_and_skip_joins(client, db, loans):
+    rows, queries = _statements(client, db, "/api/v1/getloans?fields=due_at,borrower.firstname,borrower.lastname")
+    assert rows == [
+        {"id": loan["id"], "due_at": loan["due_at"],
+         "borrower": {"id": loan["borrower"]["id"], "firstname": "Max", "lastname": "Mustermann"}}
+        for loan in loans
+    ]
+    assert len(queries) == 1
+    sql = queries[0]
+    assert "loan_items" not in sql and "tool_items" not in sql
+    assert "comment" not in sql and "email" not in sql
+
+
+def test_item_count_needs_only_item_ids(client, db, loans):
+    rows, queries = _statements(client, db, "/api/v1/getloans?fields=due_at,items.id")
+    assert [len(row["items"]) for row in rows] == [1, 1, 1]
+    assert rows[0]["items"] == [{"id": loans[0]["items"][0]["id"]}]
+    assert len(queries) == 2  # Ausleihen + Positionen (IN), keine Werkzeug-Joins
+    assert "tools" not in queries[1]
+
+
+def test_expand_keeps_plain_fields_and_drops_other_relations(client, db, loans):
+    rows, _ = _statements(client, db, "/api/v1/getloans?expand=borrower")
+    expected = {k: v for k, v in loans[0].items() if k not in ("issuer", "return_processor", "items")}
+    assert rows[0] == expected
+
+    rows, _ = _statements(client, db, "/api/v1/getloans?expand=")
+    assert "borrower" not in rows[0] and rows[0]["due_at"] == loans[0]["due_at"]
+
+
+def test_computed_fields_load_their_sources(client, db, loans):
+    item = loans[0]["items"][0]["tool_item"]
+    rows, _ = _statements(client, db, "/api/v1/gettoolitems?fields=qrcode_url,tool.image_thumb_url")
+    assert rows[0] == {"id": item["id"], "qrcode_url": item["qrcode_url"], "tool": {"id": item["tool"]["id"], "image_thumb_url": None}}
+
+
+def test_deep_expand_matches_full_response(client, db, loans):
+    rows, _ = _statements(client, db, "/api/v1/getloans?fields=items.tool_item.tool.category.name")
+    assert rows[0]["items"][0]["tool_item"]["tool"]["category"] == {
+        "id": loans[0]["items"][0]["tool_item"]["tool"]["category"]["id"], "name": "Hand Tools",
+    }
+
+
+def test_other_list_endpoints_accept_fieldsets(client, db, loans):
+    for url in ("/api/v1/getusers?fields=email", "/api/v1/gettools?fields=tool_name",
+                "/api/v1/gettoolitemissues?fields=title", "/api/v1/getloanrequests?fields=comment",
+                "/api/v1/getoverdueloans?fields=due_at"):
+        r = client.get(url)
+        assert r.status_code == 200, url
+    users = client.get("/api/v1/getusers?fields=email").json()
+    assert users and set(users[0]) == {"id", "email"}
+
+
+def test_invalid_fieldsets_are_rejected(client):
+    assert client.get("/api/v1/getloans?fields=password").status_code == 400
+    assert client.get("/api/v1/getloans?expand=due_at").status_code == 400
+    assert client.get("/api/v1/getloans?fields=due_at&shape=normalized").status_code == 400
+
+
+def test_fieldset_keeps_pagination(client, loans):
+    r = client.get("/api/v1/getloans?fields=due_at&limit=2")
+    assert r.headers["x-next-cursor"] == str(r.json()[-1]["id"])
+    assert "fields=due_at" in r.headers["link"]
+
+
+def test_relation_with_other_primary_key(client, db, loans):
+    # tool_availability hat tool_id statt id als Primärschlüssel
+    tools, queries = _statements(client, db, "/api/v1/gettools?fields=availability.total")
+    assert [tool["availability"] for tool in tools] == [{"total": 3}]
+    assert len(queries) == 1
+    assert "loaned" not in queries[0]
@@ -0,0 +1,301 @@
+"""
+Concurrency tests for loan allocation (optimistic versioning on ToolItem).
+
+The stress test runs against a file database with the production engine setup
+(WAL, pool, writer lock) and lets several threads approve competing loan
+requests, issue loans directly and return loans at the same time.
+"""
+import random
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session, sessionmaker
+
+import src.app.crud.loan as crud_loan
+import src.app.crud.loan_request as crud_loan_request
+from src.app.crud import lookups
+from src.app.crud.tool_availability import rebuild_tool_availability
+from src.app.db.base import Base
+from src.app.db.session import create_db_engine
+from src.app.models.department import Department
+from src.app.models.loan import Loan
+from src.app.models.loan_item import LoanItem
+from src.app.models.loan_request import LoanRequest
+from src.app.models.loan_request_item import LoanRequestItem
+from src.app.models.loan_request_status import LoanRequestStatus
+from src.app.models.role import Role
+from src.app.models.tool import Tool
+from src.app.models.tool_category import ToolCategory
+from src.app.models.tool_condition import ToolCondition
+from src.app.models.tool_item import ToolItem
+from src.app.models.tool_item_issue_status import ToolItemIssueStatus
+from src.app.models.tool_status import ToolStatus
+from src.app.models.user import User
+from src.app.schemas.loan import LoanCreate
+from src.test.conftest import seed_lookup_data, create_tool, create_tool_item, create_user
+
+TOOLS = 3
+ITEMS_PER_TOOL = 10
+REQUESTS = 300
+THREADS = 8
+
+
+# ---------------------------------------------------------------------------
+# Deterministic CAS / retry tests (in-memory DB)
+# ---------------------------------------------------------------------------
+
+def _items(client, n):
+    ids = seed_lookup_data(client)
+    tool = create_tool(client, ids["category_id"])
+    items = [create_tool_item(client, tool["id"], ids["status_id"], ids["condition_id"])["id"] for _ in range(n)]
+    user = create_user(client, ids["role_id"], ids["department_id"])
+    return ids, tool["id"], items, user["id"]
+
+
+def test_claim_only_matching_versions(client, db):
+    _, _, items, _ = _items(client, 2)
+    lookups.load_all(db)
+    # Version von items[0] hat sich "zwischendurch" geändert
+    db.get(ToolItem, items[0]).description = "edited"
+    db.commit()
+
+    won = crud_loan._claim_items(db, {items[0]: 1, items[1]: 1})
+    assert won == {items[1]}
+    assert db.get(ToolItem, items[1]).version == 2
+
+
+def test_lost_race_is_reallocated(client, db, monkeypatch):
+    _, tool_id, items, user_id = _items(client, 3)
+    real_allocate = crud_loan._allocate_items
+    calls = []
+
+    def stale_first(db_, quantities):
+        allocation = real_allocate(db_, quantities)
+        calls.append(quantities)
+        if len(calls) == 1:
+            # Erste Runde mit veralteten Versionen → CAS verliert
+            return {t: {item_id: 0 for item_id in picked} for t, picked in allocation.items()}
+        return allocation
+
+    monkeypatch.setattr(crud_loan, "_allocate_items", stale_first)
+    request = LoanRequest(requester_user_id=user_id, request_status_id=1,
+                          due_at=datetime.now(tz=timezone.utc) + timedelta(days=1))
+    request.items = [LoanRequestItem(tool_id=tool_id, quantity=2)]
+    db.add(LoanRequestStatus(id=1, name="REQUESTED"))
+    db.add(request)
+    db.flush()
+
+    loan = crud_loan.create_loan_from_request(db, request, user_id)
+    db.commit()
+    assert len(calls) == 2
+    assert calls[1] == {tool_id: 2}
+    assert sorted(i.tool_item_id for i in loan.items) == items[:2]
+
+
+def test_gives_up_after_max_attempts(client, db, monkeypatch):
+    _, _, items, user_id = _items(client, 1)
+    monkeypatch.setattr(crud_loan, "_validate_items_available", lambda db_, ids: {i: 0 for i in ids})
+    with pytest.raises(ValueError, match="gleichzeitig"):
+        crud_loan.create_loan(db, LoanCreate(
+            borrower_user_id=user_id, issued_by_user_id=user_id,
+            due_at=datetime.now(tz=timezone.utc) + timedelta(days=1),
+            items=[{"tool_item_id": items[0]}],
+        ))
+    db.rollback()
+
+
+def test_concurrent_return_only_releases_once(client, db):
+    _, _, items, user_id = _items(client, 1)
+    r = client.post("/api/v1/createloan", json={"borrower_user_id": user_id, "issued_by_user_id": user_id,
+                                                "due_at": "2030-01-01T12:00:00Z", "items": [{"tool_item_id": items[0]}]})
+    loan_id = r.json()["id"]
+
+    # Zweite Session hat die Ausleihe noch als aktiv geladen
+    other = sessionmaker(bind=db.get_bind())()
+    stale_loan = other.get(Loan, loan_id)
+    stale_items = [{"loan_item_id": li.id} for li in stale_loan.items]
+
+    assert client.patch(f"/api/v1/returnloan/{loan_id}", json={"returned_by_user_id": user_id, "items": stale_items}).status_code == 200
+    with pytest.raises(ValueError, match="bereits zurückgegeben"):
+        crud_loan.return_loan(other, stale_loan, user_id, stale_items)
+    other.close()
+
+
+def _bump_version_behind_the_session(db, item_id):
+    """
+    Loads the item into the session, then changes its version like a concurrent _claim_items.
+    Returns the loaded item – the caller must keep it, the identity map only holds weak references.
+    """
+    item = db.get(ToolItem, item_id)
+    assert item.version  # Attribute laden, sonst lädt die Session sie später frisch
+    table = ToolItem.__table__
+    db.connection().execute(update(table).where(table.c.id == item_id).values(version=table.c.version + 1))
+    return item
+
+
+@pytest.mark.parametrize("method, path, body", [
+    ("patch", "/api/v1/updatetoolitem/{id}", {"description": "edited"}),
+    ("patch", "/api/v1/retiretoolitm/{id}", None),
+    ("delete", "/api/v1/deletetoolitem/{id}", None),
+])
+def test_stale_item_write_returns_409(client, db, method, path, body):
+    _, _, items, _ = _items(client, 1)
+    stale = _bump_version_behind_the_session(db, items[0])  # noqa: F841
+    kwargs = {"json": body} if body is not None else {}
+    r = getattr(client, method)(path.format(id=items[0]), **kwargs)
+    assert r.status_code == 409
+    assert "gleichzeitig geändert" in r.json()["detail"]
+    assert client.get(f"/api/v1/gettoolitem/{items[0]}").json()["description"] is None
+
+
+def test_stale_item_on_issue_and_return_returns_409(client, db):
+    _, _, items, user_id = _items(client, 2)
+    db.add_all([ToolItemIssueStatus(name="OPEN"), ToolStatus(name="MAINTENANCE"), ToolCondition(name="WORN")])
+    db.commit()
+    stale = _bump_version_behind_the_session(db, items[0])  # noqa: F841
+    r = client.post("/api/v1/createtoolitemissue", json={"tool_item_id": items[0], "reported_by_user_id": user_id,
+                                                         "status_id": 1, "title": "Defekt"})
+    assert r.status_code == 409
+    assert client.get("/api/v1/gettoolitemissues").json() == []
+
+    loan = client.post("/api/v1/createloan", json={"borrower_user_id": user_id, "issued_by_user_id": user_id,
+                                                   "due_at": "2030-01-01T12:00:00Z",
+                                                   "items": [{"tool_item_id": items[1]}]}).json()
+    stale = _bump_version_behind_the_session(db, items[1])  # noqa: F841
+    r = client.patch(f"/api/v1/returnloan/{loan['id']}", json={"returned_by_user_id": user_id,
+                                                              "items": [{"loan_item_id": loan["items"][0]["id"]}]})
+    assert r.status_code == 409
+    # Zurückgerollt: die Ausleihe ist weiter aktiv
+    assert client.get(f"/api/v1/getloan/{loan['id']}").json()["returned_at"] is None
+
+
+def test_claim_fails_cleanly_without_loaned_status(client, db):
+    _, _, items, user_id = _items(client, 1)
+    db.query(ToolStatus).filter(ToolStatus.name == "LOANED").delete()
+    db.commit()
+    lookups.invalidate()
+    with pytest.raises(ValueError, match="LOANED"):
+        crud_loan._claim_items(db, {items[0]: 1})
+    db.rollback()
+    assert db.get(ToolItem, items[0]).status_id is not None
+
+
+# ---------------------------------------------------------------------------
+# Multi-threaded stress test (file DB, WAL)
+# ---------------------------------------------------------------------------
+
+def _seed(engine) -> dict:
+    with Session(engine) as db:
+        db.add_all([ToolStatus(name=n) for n in ("AVAILABLE", "LOANED", "DEFECT")])
+        db.add(ToolCondition(name="OK"))
+        db.add_all([LoanRequestStatus(name="REQUESTED"), LoanRequestStatus(name="APPROVED")])
+        db.add(Role(name="ADMIN"))
+        db.add(Department(name="Werkstatt"))
+        db.add(ToolCategory(name="Elektro"))
+        db.flush()
+        status = {s.name: s.id for s in db.query(ToolStatus)}
+        user = User(firstname="Stress", lastname="Test", email="stress@example.com", passwordhash="x",
+                    role_id=db.query(Role.id).scalar(), department_id=db.query(Department.id).scalar())
+        db.add(user)
+        tools = [Tool(tool_name=f"Tool {t}", category_id=db.query(ToolCategory.id).scalar()) for t in range(TOOLS)]
+        db.add_all(tools)
+        db.flush()
+        condition_id = db.query(ToolCondition.id).scalar()
+        db.add_all([
+            ToolItem(inventory_no=f"INV-{t.id}-{i}", tool_id=t.id, status_id=status["AVAILABLE"], condition_id=condition_id)
+            for t in tools for i in range(ITEMS_PER_TOOL)
+        ])
+        requested_id = db.query(LoanRequestStatus.id).filter_by(name="REQUESTED").scalar()
+        rng = random.Random(42)
+        due = datetime.now(tz=timezone.utc) + timedelta(days=7)
+        requests = []
+        for _ in range(REQUESTS):
+            r = LoanRequest(requester_user_id=user.id, request_status_id=requested_id, due_at=due)
+            r.items = [LoanRequestItem(tool_id=rng.choice(tools).id, quantity=rng.choice((1, 1, 2)))]
+            requests.append(r)
+        db.add_all(requests)
+        db.commit()
+        return {
+            "user_id": user.id,
+            "approved_id": db.query(LoanRequestStatus.id).filter_by(name="APPROVED").scalar(),
+            "request_ids": [r.id for r in requests],
+            "item_ids": [i for (i,) in db.query(ToolItem.id)],
+        }
+
+
+def test_competing_approvals_never_double_loan(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'stress.db'}", performance_profile=True)
+    Base.metadata.create_all(engine)
+    lookups.invalidate()
+    try:
+        seed = _seed(engine)
+        pending = list(seed["request_ids"])
+        pending_lock = threading.Lock()
+        stats = {"approved": 0, "rejected": 0, "issued": 0, "returned": 0, "errors": []}
+
+        def worker(n: int) -> None:
+            rng = random.Random(n)
+            while True:
+                with pending_lock:
+                    if not pending:
+                        return
+                    request_id = pending.pop()
+                with Session(engine) as db:
+                    try:
+                        action = rng.random()
+                        if action < 0.2:
+                            # Direkt ausgeben: zufällige (evtl. schon vergebene) Exemplare
+                            picked = rng.sample(seed["item_ids"], 2)
+                            crud_loan.create_loan(db, LoanCreate(
+                                borrower_user_id=seed["user_id"], issued_by_user_id=seed["user_id"],
+                                due_at=datetime.now(tz=timezone.utc) + timedelta(days=1),
+                                items=[{"tool_item_id": i} for i in picked],
+                            ))
+                            stats["issued"] += 1
+                        elif action < 0.45:
+                            # Eine aktive Ausleihe zurückgeben → Exemplare wieder verfügbar
+                            loan = db.query(Loan).filter(Loan.returned_at.is_(None)).order_by(func.random()).first()
+                            if loan is not None:
+                                crud_loan.return_loan(db, loan, seed["user_id"],
+                                                      [{"loan_item_id": li.id} for li in loan.items])
+                                stats["returned"] += 1
+                        else:
+                            request = db.get(LoanRequest, request_id)
+                            crud_loan_request.decide_loan_request(db, request, seed["user_id"], seed["approved_id"])
+                            stats["approved"] += 1
+                    except ValueError:
+                        db.rollback()
+                        stats["rejected"] += 1
+                    except Exception as e:  # alles andere ist ein Testfehler
+                        db.rollback()
+                        stats["errors"].append(repr(e))
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(THREADS)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert stats["errors"] == []
+        assert stats["approved"] > 0
+
+        with Session(engine) as db:
+            active = db.execute(
+                select(LoanItem.tool_item_id, func.count())
+                .join(Loan, LoanItem.loan_id == Loan.id)
+                .where(Loan.returned_at.is_(None))
+                .group_by(LoanItem.tool_item_id)
+            ).all()
+            assert all(count == 1 for _, count in active), "Exemplar doppelt ausgeliehen"
+
+            loaned_id = db.query(ToolStatus.id).filter_by(name="LOANED").scalar()
+            loaned = {i for (i,) in db.query(ToolItem.id).filter(ToolItem.status_id == loaned_id)}
+            assert loaned == {item_id for item_id, _ in active}
+
+            # Bestandszähler sind trotz paralleler Vergabe/Rückgabe exakt
+            assert rebuild_tool_availability(db) == 0
+    finally:
+        lookups.invalidate()
+        engine.dispose()
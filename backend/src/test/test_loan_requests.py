@@ -1,4 +1,6 @@
 """Tests for loan requests endpoints."""
+import pytest
+
 from src.test.conftest import seed_lookup_data, create_tool, create_tool_item, create_user
 
 def _setup(client, db):
@@ -53,3 +55,42 @@ def test_delete_loan_request(client, db):
     req = client.post("/api/v1/createloanrequest", json={"requester_user_id": d["user_id"],"due_at": "2026-03-01T10:00:00Z","items": [{"tool_id": d["tool_id"], "quantity": 1}]}).json()
     assert client.delete(f"/api/v1/deleteloanrequest/{req['id']}").status_code == 200
     assert client.get(f"/api/v1/getloanrequest/{req['id']}").status_code == 404
+
+def _approve_setup(client, db, tools, items_per_tool):
+    from src.app.models.loan_request_status import LoanRequestStatus
+    d = _setup(client, db)
+    approved = LoanRequestStatus(name="APPROVED")
+    db.add(approved); db.commit()
+    tool_ids = [d["tool_id"]] + [create_tool(client, d["ids"]["category_id"], name=f"Tool {i}")["id"] for i in range(tools - 1)]
+    for tool_id in tool_ids:
+        have = 1 if tool_id == d["tool_id"] else 0
+        for _ in range(items_per_tool - have):
+            create_tool_item(client, tool_id, d["ids"]["status_id"], d["ids"]["condition_id"])
+    return d, approved.id, tool_ids
+
+def test_approve_allocates_all_tools_in_one_query(client, db):
+    from src.test.conftest import count_queries
+    import src.app.crud.loan as crud_loan
+    from src.app.crud import lookups
+    d, _, tool_ids = _approve_setup(client, db, tools=4, items_per_tool=3)
+    lookups.load_all(db)
+    with count_queries() as queries:
+        allocation = crud_loan._allocate_items(db, {tool_id: 2 for tool_id in tool_ids})
+    assert len(queries) == 1
+    assert all(len(item_ids) == 2 for item_ids in allocation.values())
+
+def test_approve_multi_tool_request_creates_loan(client, db):
+    d, approved_id, tool_ids = _approve_setup(client, db, tools=3, items_per_tool=2)
+    req = client.post("/api/v1/createloanrequest", json={"requester_user_id": d["user_id"],"due_at": "2030-03-01T10:00:00Z","items": [{"tool_id": t, "quantity": 2} for t in tool_ids]}).json()
+    r = client.patch(f"/api/v1/decideloanrequest/{req['id']}", json={"approver_user_id": d["user_id"],"status_id": approved_id})
+    assert r.status_code == 200
+    loans = client.get("/api/v1/getloans").json()
+    assert len(loans) == 1
+    assert len(loans[0]["items"]) == 6
+    assert {i["tool_item"]["status"]["name"] for i in loans[0]["items"]} == {"LOANED"}
+
+def test_allocation_fails_when_not_enough_items(client, db):
+    import src.app.crud.loan as crud_loan
+    d, _, tool_ids = _approve_setup(client, db, tools=2, items_per_tool=1)
+    with pytest.raises(ValueError, match=f"Werkzeug {tool_ids[1]}"):
+        crud_loan._allocate_items(db, {tool_ids[0]: 1, tool_ids[1]: 2})
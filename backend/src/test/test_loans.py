@@ -65,3 +65,38 @@ def test_delete_loan(client, db):
     loan = _create_loan(client, setup)
     assert client.delete(f"/api/v1/deleteloan/{loan['id']}").status_code == 200
     assert client.get(f"/api/v1/getloan/{loan['id']}").status_code == 404
+
+def _extra_items(client, setup, n):
+    return [create_tool_item(client, create_tool(client, setup["ids"]["category_id"], name=f"Tool {i}")["id"],
+                             setup["ids"]["status_id"], setup["ids"]["condition_id"])["id"] for i in range(n)]
+
+def test_create_loan_validates_items_in_one_query(client, db):
+    from src.test.conftest import count_queries
+    import src.app.crud.loan as crud_loan
+    setup = _setup_loan(client, db)
+    from src.app.crud import lookups
+    item_ids = [setup["tool_item_id"]] + _extra_items(client, setup, 4)
+    lookups.load_all(db)
+    with count_queries() as queries:
+        crud_loan._validate_items_available(db, item_ids)
+    assert len(queries) == 1
+
+def test_create_loan_multiple_items_bulk_status(client, db):
+    setup = _setup_loan(client, db)
+    item_ids = [setup["tool_item_id"]] + _extra_items(client, setup, 2)
+    r = client.post("/api/v1/createloan", json={"borrower_user_id": setup["borrower_id"],"issued_by_user_id": setup["issuer_id"],"due_at": "2030-01-01T12:00:00Z","items": [{"tool_item_id": i} for i in item_ids]})
+    assert r.status_code == 201
+    assert sorted(i["tool_item"]["id"] for i in r.json()["items"]) == sorted(item_ids)
+    assert {i["tool_item"]["status"]["name"] for i in r.json()["items"]} == {"LOANED"}
+
+def test_create_loan_rejects_item_on_active_loan(client, db):
+    setup = _setup_loan(client, db)
+    _create_loan(client, setup)
+    r = client.post("/api/v1/createloan", json={"borrower_user_id": setup["borrower_id"],"issued_by_user_id": setup["issuer_id"],"due_at": "2030-01-01T12:00:00Z","items": [{"tool_item_id": setup["tool_item_id"]}]})
+    assert r.status_code == 409
+
+def test_create_loan_rejects_duplicate_item(client, db):
+    setup = _setup_loan(client, db)
+    r = client.post("/api/v1/createloan", json={"borrower_user_id": setup["borrower_id"],"issued_by_user_id": setup["issuer_id"],"due_at": "2030-01-01T12:00:00Z","items": [{"tool_item_id": setup["tool_item_id"]}, {"tool_item_id": setup["tool_item_id"]}]})
+    assert r.status_code == 409
+    assert "mehrfach" in r.json()["detail"]
@@ -0,0 +1,28 @@
+"""Tests for the in-memory lookup registry."""
+from src.app.crud import lookups
+from src.app.models.tool_status import ToolStatus
+from src.test.conftest import create_tool_status, count_queries
+
+def test_resolves_without_queries_after_load(client, db):
+    available = create_tool_status(client, "AVAILABLE")
+    lookups.load_all(db)
+    with count_queries() as queries:
+        assert lookups.get_id(db, ToolStatus, "AVAILABLE") == available["id"]
+        assert lookups.get_name(db, ToolStatus, available["id"]) == "AVAILABLE"
+    assert queries == []
+
+def test_create_route_invalidates(client, db):
+    create_tool_status(client, "AVAILABLE")
+    lookups.load_all(db)
+    loaned = create_tool_status(client, "LOANED")
+    assert lookups.get_id(db, ToolStatus, "LOANED") == loaned["id"]
+
+def test_update_route_invalidates(client, db):
+    status = create_tool_status(client, "AVAILABLE")
+    lookups.load_all(db)
+    client.patch(f"/api/v1/updatetoolstatus/{status['id']}", json={"name": "FREE"})
+    assert lookups.get_name(db, ToolStatus, status["id"]) == "FREE"
+
+def test_unknown_name_returns_none(client, db):
+    lookups.load_all(db)
+    assert lookups.get_id(db, ToolStatus, "DOES_NOT_EXIST") is None
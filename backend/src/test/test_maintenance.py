@@ -0,0 +1,163 @@
+"""Tests for the background scheduler and the maintenance jobs."""
+import asyncio
+import threading
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.orm import sessionmaker
+
+from src.app.core.maintenance import purge_revoked_tokens, refresh_overdue
+from src.app.core.scheduler import Scheduler
+from src.app.crud.loan import refresh_overdue_flags
+from src.app.models.blacklisted_token import BlacklistedToken
+from src.app.models.loan import Loan
+from src.test.test_loans import _setup_loan
+
+
+def _create_loan(client, setup, due_at):
+    r = client.post("/api/v1/createloan", json={
+        "borrower_user_id": setup["borrower_id"],
+        "issued_by_user_id": setup["issuer_id"],
+        "due_at": due_at.isoformat(),
+        "items": [{"tool_item_id": setup["tool_item_id"]}],
+    })
+    assert r.status_code == 201
+    return r.json()
+
+
+# ---------------------------------------------------------------------------
+# Overdue flag
+# ---------------------------------------------------------------------------
+
+def test_overdue_flag_set_on_write(client, db):
+    setup = _setup_loan(client, db)
+    loan = _create_loan(client, setup, datetime.now(tz=timezone.utc) - timedelta(days=1))
+    assert loan["is_overdue"] is True
+    assert client.get("/api/v1/getoverdueloans").json()[0]["is_overdue"] is True
+
+
+def test_overdue_flag_cleared_on_return(client, db):
+    setup = _setup_loan(client, db)
+    loan = _create_loan(client, setup, datetime.now(tz=timezone.utc) - timedelta(days=1))
+    r = client.patch(f"/api/v1/returnloan/{loan['id']}", json={
+        "returned_by_user_id": setup["issuer_id"],
+        "items": [{"loan_item_id": loan["items"][0]["id"]}],
+    })
+    assert r.json()["is_overdue"] is False
+
+
+def test_refresh_materializes_elapsed_due_dates(client, db):
+    setup = _setup_loan(client, db)
+    due = datetime.now(tz=timezone.utc) + timedelta(hours=1)
+    loan = _create_loan(client, setup, due)
+    assert loan["is_overdue"] is False
+
+    assert refresh_overdue_flags(db, now=due + timedelta(minutes=1)) == 1
+    assert db.get(Loan, loan["id"]).is_overdue is True
+    # Zweiter Lauf ändert nichts mehr
+    assert refresh_overdue_flags(db, now=due + timedelta(minutes=2)) == 0
+    # Zurück vor die Fälligkeit (z.B. due_at verlängert) → Flag wird zurückgesetzt
+    assert refresh_overdue_flags(db, now=due - timedelta(minutes=1)) == 1
+
+
+def test_overdue_is_live_before_the_job_runs(client, db):
+    setup = _setup_loan(client, db)
+    loan = _create_loan(client, setup, datetime.now(tz=timezone.utc) + timedelta(days=1))
+    # Fälligkeit verstreicht ohne Schreibvorgang und ohne Wartungsjob
+    db.query(Loan).filter(Loan.id == loan["id"]).update(
+        {Loan.due_at: datetime.now(tz=timezone.utc) - timedelta(minutes=1)}, synchronize_session=False)
+    db.commit()
+    assert db.get(Loan, loan["id"]).is_overdue is False
+
+    assert client.get("/api/v1/getloans").json()[0]["is_overdue"] is True
+    assert client.get("/api/v1/getoverdueloans").json()[0]["is_overdue"] is True
+    assert client.get("/api/v1/getloans?fields=is_overdue").json() == [{"id": loan["id"], "is_overdue": True}]
+    assert client.get("/api/v1/getloans?shape=normalized").json()["data"][0]["is_overdue"] is True
+    assert client.get("/api/v1/getloans?fields=stored_is_overdue").status_code == 400
+
+
+def test_overdue_job_uses_own_session(client, db):
+    setup = _setup_loan(client, db)
+    loan = _create_loan(client, setup, datetime.now(tz=timezone.utc) + timedelta(days=1))
+    db.query(Loan).filter(Loan.id == loan["id"]).update(
+        {Loan.due_at: datetime.now(tz=timezone.utc) - timedelta(days=1)}, synchronize_session=False)
+    db.commit()
+    assert refresh_overdue(session_factory=sessionmaker(bind=db.get_bind())) == 1
+
+
+def test_purge_revoked_tokens_job(db):
+    now = datetime.now(tz=timezone.utc)
+    db.add(BlacklistedToken(token_hash="a" * 64, expires_at=now - timedelta(hours=1)))
+    db.add(BlacklistedToken(token_hash="b" * 64, expires_at=now + timedelta(hours=1)))
+    db.commit()
+    purge_revoked_tokens(session_factory=sessionmaker(bind=db.get_bind()))
+    assert [t.token_hash for t in db.query(BlacklistedToken).all()] == ["b" * 64]
+
+
+# ---------------------------------------------------------------------------
+# Scheduler
+# ---------------------------------------------------------------------------
+
+def test_scheduler_single_flight():
+    scheduler = Scheduler()
+    release = threading.Event()
+    scheduler.register("slow", 60, lambda: release.wait(5))
+
+    async def scenario():
+        first = asyncio.create_task(scheduler.run_job("slow"))
+        await asyncio.sleep(0.05)
+        second = await scheduler.run_job("slow")
+        release.set()
+        return await first, second
+
+    assert asyncio.run(scenario()) == (True, False)
+    stats = scheduler.metrics()[0]
+    assert stats["runs"] == 1
+    assert stats["skipped"] == 1
+
+
+def test_scheduler_records_failures():
+    scheduler = Scheduler()
+
+    def broken():
+        raise RuntimeError("boom")
+
+    scheduler.register("broken", 60, broken)
+    asyncio.run(scheduler.run_job("broken"))
+    stats = scheduler.metrics()[0]
+    assert stats["failures"] == 1
+    assert stats["last_error"] == "RuntimeError: boom"
+
+
+def test_scheduler_runs_periodically():
+    scheduler = Scheduler()
+    calls = []
+    scheduler.register("tick", 0.01, lambda: calls.append(1), run_at_startup=True)
+    scheduler.register("disabled", 0, lambda: calls.append(2))
+
+    async def scenario():
+        scheduler.start()
+        await asyncio.sleep(0.1)
+        await scheduler.stop()
+
+    asyncio.run(scenario())
+    assert len(calls) >= 2
+    assert 2 not in calls
+    assert [job.name for job in scheduler.jobs] == ["tick"]
+
+
+def test_metrics_endpoint(client, monkeypatch):
+    import src.app.api.routes.maintenance as route
+
+    scheduler = Scheduler()
+    scheduler.register("noop", 30, lambda: 7)
+    asyncio.run(scheduler.run_job("noop"))
+    monkeypatch.setattr(route, "scheduler", scheduler)
+
+    r = client.get("/api/v1/getmaintenancejobs")
+    assert r.status_code == 200
+    job = r.json()[0]
+    assert job["name"] == "noop"
+    assert job["interval_seconds"] == 30
+    assert job["runs"] == 1
+    assert job["last_result"] == "7"
+    assert job["last_duration_ms"] is not None
@@ -0,0 +1,100 @@
+"""Tests for the normalized list shape (?shape=normalized, api/normalization.py)."""
+import pytest
+
+from src.test.conftest import create_tool, create_tool_item, create_user, seed_lookup_data
+
+
+@pytest.fixture
+def loans_setup(client, db):
+    """Two loans by the same borrower over items of the same tool, plus one issue per item."""
+    from src.app.models.tool_item_issue_status import ToolItemIssueStatus
+    ids = seed_lookup_data(client)
+    issue_status = ToolItemIssueStatus(name="OPEN")
+    db.add(issue_status)
+    db.commit()
+    user = create_user(client, ids["role_id"], ids["department_id"])
+    tool = create_tool(client, ids["category_id"])
+    items = [create_tool_item(client, tool["id"], ids["status_id"], ids["condition_id"]) for _ in range(2)]
+    for item in items:
+        r = client.post("/api/v1/createloan", json={"borrower_user_id": user["id"], "issued_by_user_id": user["id"],
+                                                    "due_at": "2030-01-01T12:00:00Z", "items": [{"tool_item_id": item["id"]}]})
+        assert r.status_code == 201
+        r = client.post("/api/v1/createtoolitemissue", json={"tool_item_id": item["id"], "reported_by_user_id": user["id"],
+                                                             "status_id": issue_status.id, "title": "Broken"})
+        assert r.status_code == 201
+    return {"user": user, "tool": tool, "items": items}
+
+
+def _tool_item(included, item_id):
+    item = dict(included["tool_items"][str(item_id)])
+    tool = dict(included["tools"][str(item["tool_id"])])
+    tool["category"] = included["categories"][str(tool["category_id"])]
+    item["tool"] = tool
+    item["status"] = included["tool_statuses"][str(item["status_id"])]
+    item["condition"] = included["tool_conditions"][str(item["condition_id"])]
+    return item
+
+
+def _user(included, user_id):
+    return included["users"][str(user_id)] if user_id is not None else None
+
+
+def test_normalized_loans_rebuild_nested_response(client, loans_setup):
+    nested = client.get("/api/v1/getloans").json()
+    r = client.get("/api/v1/getloans?shape=normalized")
+    assert r.status_code == 200
+    body = r.json()
+    included = body["included"]
+    assert set(included) == {"users", "tool_items", "tools", "categories", "tool_statuses", "tool_conditions"}
+    # Derselbe Benutzer und dasselbe Werkzeug stehen nur einmal drin
+    assert list(included["users"]) == [str(loans_setup["user"]["id"])]
+    assert list(included["tools"]) == [str(loans_setup["tool"]["id"])]
+    assert len(included["tool_items"]) == 2
+
+    rebuilt = []
+    for loan in body["data"]:
+        loan = dict(loan)
+        loan["borrower"] = _user(included, loan["borrower_user_id"])
+        loan["issuer"] = _user(included, loan["issued_by_user_id"])
+        loan["return_processor"] = _user(included, loan["returned_by_user_id"])
+        loan["items"] = [
+            {**li, "tool_item": _tool_item(included, li["tool_item_id"]),
+             "return_condition": included["tool_conditions"].get(str(li["return_condition_id"]))}
+            for li in loan["items"]
+        ]
+        rebuilt.append(loan)
+    assert rebuilt == nested
+
+
+def test_normalized_tool_items(client, loans_setup):
+    nested = client.get("/api/v1/gettoolitems").json()
+    body = client.get("/api/v1/gettoolitems?shape=normalized").json()
+    assert set(body["included"]) == {"tools", "categories", "tool_statuses", "tool_conditions"}
+    assert [row["id"] for row in body["data"]] == [item["id"] for item in nested]
+    assert "tool" not in body["data"][0]
+    assert body["data"][0]["qrcode_url"] == nested[0]["qrcode_url"]
+    assert body["included"]["tools"][str(loans_setup["tool"]["id"])]["image_url"] is None
+
+
+def test_normalized_issues(client, loans_setup):
+    nested = client.get("/api/v1/gettoolitemissues").json()
+    body = client.get("/api/v1/gettoolitemissues?shape=normalized").json()
+    included = body["included"]
+    for flat, full in zip(body["data"], nested, strict=True):
+        assert included["users"][str(flat["reported_by_user_id"])] == full["reported_by"]
+        assert included["issue_statuses"][str(flat["status_id"])] == full["status"]
+        assert _tool_item(included, flat["tool_item_id"]) == full["tool_item"]
+
+
+def test_normalized_shape_keeps_pagination_headers(client, loans_setup):
+    r = client.get("/api/v1/getloans?shape=normalized&limit=1")
+    assert len(r.json()["data"]) == 1
+    assert r.headers["x-next-cursor"] == str(r.json()["data"][0]["id"])
+    assert "shape=normalized" in r.headers["link"]
+
+
+def test_normalized_empty_list_and_invalid_shape(client):
+    assert client.get("/api/v1/gettoolitems?shape=normalized").json() == {
+        "data": [], "included": {"tools": {}, "categories": {}, "tool_statuses": {}, "tool_conditions": {}},
+    }
+    assert client.get("/api/v1/gettoolitems?shape=flat").status_code == 422
@@ -0,0 +1,46 @@
+"""Tests for keyset pagination on the list endpoints."""
+from src.test.conftest import seed_lookup_data, create_tool, create_tool_item
+
+def test_page_limit_and_next_cursor(client):
+    ids = seed_lookup_data(client)
+    tools = [create_tool(client, ids["category_id"], name=f"Tool {i}") for i in range(5)]
+    r = client.get("/api/v1/gettools", params={"limit": 2})
+    assert r.status_code == 200
+    assert [t["id"] for t in r.json()] == [tools[0]["id"], tools[1]["id"]]
+    assert r.headers["X-Next-Cursor"] == str(tools[1]["id"])
+    assert 'rel="next"' in r.headers["Link"]
+
+def test_follow_cursor_until_last_page(client):
+    ids = seed_lookup_data(client)
+    tool = create_tool(client, ids["category_id"])
+    created = [create_tool_item(client, tool["id"], ids["status_id"], ids["condition_id"])["id"] for _ in range(5)]
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        r = client.get("/api/v1/gettoolitems", params=params)
+        seen += [i["id"] for i in r.json()]
+        cursor = r.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert seen == created
+
+def test_last_page_has_no_next_cursor(client):
+    ids = seed_lookup_data(client)
+    create_tool(client, ids["category_id"])
+    r = client.get("/api/v1/gettools", params={"limit": 1})
+    assert len(r.json()) == 1
+    assert "X-Next-Cursor" not in r.headers
+    assert "Link" not in r.headers
+
+def test_link_keeps_filters(client):
+    ids = seed_lookup_data(client)
+    create_tool(client, ids["category_id"])
+    create_tool(client, ids["category_id"])
+    r = client.get("/api/v1/gettools", params={"limit": 1, "category_id": ids["category_id"]})
+    assert f"category_id={ids['category_id']}" in r.headers["Link"]
+
+def test_limit_out_of_range_rejected(client):
+    assert client.get("/api/v1/gettools", params={"limit": 0}).status_code == 422
+    assert client.get("/api/v1/gettools", params={"limit": 10000}).status_code == 422
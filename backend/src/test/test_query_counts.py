@@ -0,0 +1,50 @@
+"""Asserts that list endpoints run a bounded number of SQL statements, independent of row count."""
+import pytest
+
+from src.test.conftest import seed_lookup_data, create_tool, create_tool_item, create_user, count_queries
+
+ENDPOINTS = ["/api/v1/getloans", "/api/v1/gettoolitems", "/api/v1/gettoolitemissues",
+             "/api/v1/getloanrequests", "/api/v1/gettools", "/api/v1/getusers"]
+
+
+def _add_rows(client, db, ids, n):
+    """Creates n tools, each with two items, one loan, one loan request and one issue."""
+    for i in range(n):
+        tool = create_tool(client, ids["category_id"], name=f"Tool {i}")
+        item = create_tool_item(client, tool["id"], ids["status_id"], ids["condition_id"])
+        create_tool_item(client, tool["id"], ids["status_id"], ids["condition_id"])
+        user = create_user(client, ids["role_id"], ids["department_id"], email=f"user{i}-{tool['id']}@example.com")
+        r = client.post("/api/v1/createloanrequest", json={"requester_user_id": user["id"], "items": [{"tool_id": tool["id"], "quantity": 1}]})
+        assert r.status_code == 201
+        r = client.post("/api/v1/createloan", json={"borrower_user_id": user["id"], "issued_by_user_id": user["id"], "due_at": "2030-01-01T12:00:00Z", "items": [{"tool_item_id": item["id"]}]})
+        assert r.status_code == 201
+        r = client.post("/api/v1/createtoolitemissue", json={"tool_item_id": item["id"], "reported_by_user_id": user["id"], "status_id": ids["issue_status_id"], "title": "Broken"})
+        assert r.status_code == 201
+
+
+def _statement_count(client, db, url):
+    db.expire_all()
+    with count_queries() as queries:
+        r = client.get(url)
+    assert r.status_code == 200
+    return len(queries)
+
+
+@pytest.mark.parametrize("url", ENDPOINTS)
+def test_list_endpoint_statement_count_is_bounded(client, db, url):
+    from src.app.models.loan_request_status import LoanRequestStatus
+    from src.app.models.tool_item_issue_status import ToolItemIssueStatus
+    ids = seed_lookup_data(client)
+    db.add(LoanRequestStatus(name="REQUESTED"))
+    issue_status = ToolItemIssueStatus(name="OPEN")
+    db.add(issue_status)
+    db.commit()
+    ids["issue_status_id"] = issue_status.id
+
+    _add_rows(client, db, ids, 1)
+    small = _statement_count(client, db, url)
+    _add_rows(client, db, ids, 4)
+    large = _statement_count(client, db, url)
+
+    assert large == small
+    assert small <= 3
@@ -0,0 +1,81 @@
+"""
+EXPLAIN QUERY PLAN regression tests.
+
+Runs the availability/overdue/scoping queries of the crud layer, captures the
+emitted SQL and fails if SQLite plans a full table scan on one of the large tables.
+"""
+import re
+
+import src.app.crud.loan as crud_loan
+import src.app.crud.loan_request as crud_loan_request
+import src.app.crud.tool_item as crud_tool_item
+import src.app.crud.tool_item_issue as crud_issue
+from src.test.conftest import count_queries, seed_lookup_data, create_tool, create_tool_item, create_user
+
+# Tabellen, die mit dem Datenbestand wachsen – hier ist ein "SCAN <table>" ohne Index verboten
+HOT_TABLES = {"loans", "loan_items", "tool_items", "tool_item_issues", "loan_requests", "users"}
+_FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+
+def _full_scans(db, captured):
+    scans = []
+    conn = db.connection()
+    for statement, parameters in captured:
+        if not statement.lstrip().upper().startswith("SELECT"):
+            continue
+        for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters):
+            m = _FULL_SCAN.match(row[-1])
+            if m and m.group(1) in HOT_TABLES:
+                scans.append((row[-1], statement))
+    return scans
+
+
+def _setup(client, db):
+    from src.app.models.loan_request_status import LoanRequestStatus
+    from src.app.models.tool_item_issue_status import ToolItemIssueStatus
+    ids = seed_lookup_data(client)
+    db.add_all([LoanRequestStatus(name="REQUESTED"), ToolItemIssueStatus(name="OPEN")])
+    db.commit()
+    tool = create_tool(client, ids["category_id"])
+    items = [create_tool_item(client, tool["id"], ids["status_id"], ids["condition_id"]) for _ in range(3)]
+    user = create_user(client, ids["role_id"], ids["department_id"])
+    r = client.post("/api/v1/createloan", json={"borrower_user_id": user["id"], "issued_by_user_id": user["id"], "due_at": "2020-01-01T12:00:00Z", "items": [{"tool_item_id": items[0]["id"]}]})
+    assert r.status_code == 201
+    r = client.post("/api/v1/createloanrequest", json={"requester_user_id": user["id"], "due_at": "2030-01-01T12:00:00Z", "items": [{"tool_id": tool["id"], "quantity": 1}]})
+    assert r.status_code == 201
+    return {"ids": ids, "tool_id": tool["id"], "item_ids": [i["id"] for i in items], "user_id": user["id"], "request_id": r.json()["id"]}
+
+
+def test_hot_queries_use_indexes(client, db):
+    d = _setup(client, db)
+    free_item = d["item_ids"][1]
+
+    with count_queries(with_parameters=True) as captured:
+        crud_loan._validate_items_available(db, [free_item])
+        crud_loan._allocate_items(db, {d["tool_id"]: 1})
+        crud_loan.get_overdue_loans(db)
+        crud_loan.get_overdue_loans(db, department_id=d["ids"]["department_id"])
+        crud_loan.get_loans(db, borrower_user_id=d["user_id"], active_only=True, limit=10)
+        crud_loan.get_loans_by_department(db, d["ids"]["department_id"], limit=10)
+        crud_tool_item.get_tool_items(db, tool_id=d["tool_id"], status_id=d["ids"]["status_id"], limit=10)
+        crud_tool_item.get_tool_items(db, inventory_no="0002", limit=10)
+        crud_issue._is_on_active_loan(db, free_item)
+        crud_issue._has_open_issues(db, free_item)
+        crud_loan_request._check_tool_availability(db, {d["tool_id"]: 1})
+        crud_loan_request.get_loan_requests_by_user(db, d["user_id"], limit=10)
+        crud_loan_request.get_loan_requests_by_department(db, d["ids"]["department_id"], limit=10)
+        request = crud_loan_request.get_loan_request(db, d["request_id"])
+        crud_loan.create_loan_from_request(db, request, d["user_id"])
+    db.rollback()
+
+    assert captured
+    assert _full_scans(db, captured) == []
+
+
+def test_detects_full_scan(client, db):
+    """Sanity check: an unindexed predicate must be reported."""
+    from src.app.models.tool_item import ToolItem
+    seed_lookup_data(client)
+    with count_queries(with_parameters=True) as captured:
+        db.query(ToolItem).filter(ToolItem.description == "x").all()
+    assert _full_scans(db, captured)
@@ -0,0 +1,140 @@
+"""Tests for the FTS5 search index and the /search endpoint."""
+import pytest
+
+from src.app.auth.principal import Principal
+from src.app.core.role_ids import EMPLOYEE_ID, MANAGER_ID
+from src.app.crud.search import match_expression
+from src.test.conftest import create_department, create_tool, create_tool_item, create_user, seed_lookup_data
+
+
+@pytest.fixture
+def catalog(client, db):
+    from src.app.models.tool_item_issue_status import ToolItemIssueStatus
+    ids = seed_lookup_data(client)
+    issue_status = ToolItemIssueStatus(name="OPEN")
+    db.add(issue_status)
+    db.commit()
+    other_dept = create_department(client, "Lager")
+    alice = create_user(client, ids["role_id"], ids["department_id"], email="alice@firma.local")
+    bob = create_user(client, ids["role_id"], other_dept["id"], email="bob@firma.local")
+    hammer = create_tool(client, ids["category_id"], "Hammer 300 g")
+    drill = create_tool(client, ids["category_id"], "Akku-Bohrschrauber")
+    client.patch(f"/api/v1/updatetool/{drill['id']}", data={"description": "Mit Hammerfunktion und zwei Akkus"})
+    hammer_item = create_tool_item(client, hammer["id"], ids["status_id"], ids["condition_id"])
+    drill_item = create_tool_item(client, drill["id"], ids["status_id"], ids["condition_id"])
+    issues = {}
+    for user, item, title in ((alice, hammer_item, "Stiel gebrochen"), (bob, drill_item, "Akku lädt nicht")):
+        r = client.post("/api/v1/createtoolitemissue", json={"tool_item_id": item["id"], "reported_by_user_id": user["id"],
+                                                             "status_id": issue_status.id, "title": title,
+                                                             "description": "Beim Hammerschlag bemerkt"})
+        assert r.status_code == 201
+        issues[user["email"]] = r.json()
+    return {"ids": ids, "alice": alice, "bob": bob, "hammer": hammer, "drill": drill,
+            "hammer_item": hammer_item, "drill_item": drill_item, "issues": issues}
+
+
+def _search(client, q, **params):
+    r = client.get("/api/v1/search", params={"q": q, **params})
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def _as(client, user, role_id):
+    from src.app.auth.security import get_current_user
+    principal = Principal(id=user["id"], role_id=role_id, department_id=user["department_id"], is_active=True)
+    client.app.dependency_overrides[get_current_user] = lambda: principal
+
+
+def test_match_expression():
+    assert match_expression("Akku-Bohr") == '"Akku"* "Bohr"*'
+    assert match_expression("INV-0042") == '"INV"* "0042"*'
+    assert match_expression(' "* -- ') is None
+
+
+def test_prefix_search_ranks_names_above_descriptions(client, catalog):
+    hits = _search(client, "hamm", types="tool")
+    assert [h["id"] for h in hits] == [catalog["hammer"]["id"], catalog["drill"]["id"]]
+    assert hits[0]["title"] == "Hammer 300 g" and hits[0]["subtitle"] == "Hand Tools"
+    assert hits[0]["score"] > hits[1]["score"]
+    assert "**Hammerfunktion**" in hits[1]["snippet"]
+
+
+def test_search_covers_all_types(client, catalog):
+    hits = _search(client, "akku")
+    assert {(h["type"], h["id"]) for h in hits} == {
+        ("tool", catalog["drill"]["id"]),
+        ("issue", catalog["issues"]["bob@firma.local"]["id"]),
+    }
+    inventory_no = catalog["hammer_item"]["inventory_no"]
+    hits = _search(client, inventory_no.split("-")[1], types="tool_item")
+    assert hits == [{**hits[0], "type": "tool_item", "id": catalog["hammer_item"]["id"], "title": inventory_no,
+                     "subtitle": "Hammer 300 g"}]
+
+
+def test_umlauts_and_no_match(client, catalog):
+    assert [h["title"] for h in _search(client, "ladt", types="issue")] == ["Akku lädt nicht"]
+    assert _search(client, "schraubstock") == []
+    assert _search(client, "--") == []
+    assert client.get("/api/v1/search?q=").status_code == 422
+    assert client.get("/api/v1/search?q=a&types=loan").status_code == 422
+
+
+def test_index_follows_updates_and_deletes(client, catalog):
+    tool_id = catalog["hammer"]["id"]
+    client.patch(f"/api/v1/updatetool/{tool_id}", data={"tool_name": "Fäustel"})
+    assert tool_id not in [h["id"] for h in _search(client, "300", types="tool")]
+    assert [h["id"] for h in _search(client, "faust", types="tool")] == [tool_id]
+
+    issue_id = catalog["issues"]["alice@firma.local"]["id"]
+    assert client.delete(f"/api/v1/deletetoolitemissue/{issue_id}").status_code in (200, 204)
+    assert issue_id not in [h["id"] for h in _search(client, "stiel", types="issue")]
+
+
+def test_issue_results_are_scoped_by_role(client, catalog):
+    all_issues = {h["title"] for h in _search(client, "hammerschlag", types="issue")}
+    assert all_issues == {"Stiel gebrochen", "Akku lädt nicht"}
+
+    _as(client, catalog["alice"], EMPLOYEE_ID)
+    assert {h["title"] for h in _search(client, "hammerschlag", types="issue")} == {"Stiel gebrochen"}
+    # Werkzeuge sehen alle Rollen
+    assert len(_search(client, "hamm", types="tool")) == 2
+
+    _as(client, catalog["bob"], MANAGER_ID)
+    assert {h["title"] for h in _search(client, "hammerschlag", types="issue")} == {"Akku lädt nicht"}
+
+
+def _tool_ids(client, name):
+    r = client.get("/api/v1/gettools", params={"name": name})
+    assert r.status_code == 200, r.text
+    return [t["id"] for t in r.json()]
+
+
+def test_list_filters_match_substrings(client, catalog):
+    hammer, drill = catalog["hammer"]["id"], catalog["drill"]["id"]
+    # nur der Name, nicht die Beschreibung ("Mit Hammerfunktion")
+    assert _tool_ids(client, "hamm") == [hammer]
+    assert _tool_ids(client, "hammerfunktion") == []
+    # Teilstrings mitten im Wort, ohne Rücksicht auf Groß-/Kleinschreibung – wie früher ilike
+    assert _tool_ids(client, "ohr") == [drill]
+    assert _tool_ids(client, "BOHRSCHRAUBER") == [drill]
+    assert _tool_ids(client, "r 3") == [hammer]
+    # Muster ohne Wortzeichen und kürzer als ein Trigramm filtern trotzdem
+    assert _tool_ids(client, "-") == [drill]
+    assert _tool_ids(client, " -- ") == []
+    assert _tool_ids(client, "e") == [hammer, drill]
+
+    number = catalog["drill_item"]["inventory_no"]
+    items = client.get("/api/v1/gettoolitems", params={"inventory_no": number[2:]}).json()
+    assert [i["id"] for i in items] == [catalog["drill_item"]["id"]]
+    assert client.get("/api/v1/gettoolitems", params={"inventory_no": "X-"}).json() == []
+
+
+def test_substring_index_follows_updates(client, catalog):
+    tool_id = catalog["hammer"]["id"]
+    client.patch(f"/api/v1/updatetool/{tool_id}", data={"tool_name": "Fäustel"}).raise_for_status()
+    assert _tool_ids(client, "300") == []
+    assert _tool_ids(client, "äust") == [tool_id]
+    pipe_wrench = create_tool(client, catalog["ids"]["category_id"], "Rohrzange")
+    assert _tool_ids(client, "ohr") == [catalog["drill"]["id"], pipe_wrench["id"]]
+    assert client.delete(f"/api/v1/deletetool/{pipe_wrench['id']}").status_code in (200, 204)
+    assert _tool_ids(client, "ohr") == [catalog["drill"]["id"]]
@@ -0,0 +1,53 @@
+"""Tests for the single-pass list serialization (api/serialization.py)."""
+import json
+
+from src.app.api.serialization import dump_list, list_adapter, list_response
+from src.app.schemas.tool import ToolRead
+from src.test.conftest import create_tool, create_tool_category
+
+
+def test_adapters_are_cached():
+    assert list_adapter(ToolRead) is list_adapter(ToolRead)
+
+
+def test_dump_list_matches_response_model_output(client, db):
+    from fastapi.encoders import jsonable_encoder
+    import src.app.crud.tool as crud
+    cat = create_tool_category(client)
+    for name in ("Hammer", "Säge"):
+        create_tool(client, cat["id"], name)
+    tools = crud.get_tools(db)
+    expected = jsonable_encoder([ToolRead.model_validate(t) for t in tools])
+    assert json.loads(dump_list(ToolRead, tools)) == expected
+
+
+def test_list_route_returns_json_bytes_with_pagination_headers(client):
+    cat = create_tool_category(client)
+    for i in range(3):
+        create_tool(client, cat["id"], f"Werkzeug {i}")
+    r = client.get("/api/v1/gettools?limit=2")
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/json"
+    assert [t["tool_name"] for t in r.json()] == ["Werkzeug 0", "Werkzeug 1"]
+    assert r.headers["x-next-cursor"] == str(r.json()[-1]["id"])
+    assert 'rel="next"' in r.headers["link"]
+    assert int(r.headers["content-length"]) == len(r.content)
+
+
+def test_list_response_without_injected_response():
+    r = list_response(ToolRead, [])
+    assert r.body == b"[]"
+    assert r.media_type == "application/json"
+
+
+def test_openapi_still_documents_list_schema(client):
+    schema = client.get("/openapi.json").json()
+    ok = schema["paths"]["/api/v1/getloans"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+    assert ok["type"] == "array"
+    assert ok["items"]["$ref"].endswith("/LoanRead")
+
+
+def test_benchmark_requests_per_second_runs(client):
+    from src.test.bench_serialization import requests_per_second
+    create_tool(client, create_tool_category(client)["id"])
+    assert requests_per_second(client, "/api/v1/gettools", seconds=0) > 0
@@ -0,0 +1,69 @@
+"""Tests for the SQLite performance profile, pool choice and writer lock in db/session.py."""
+import threading
+
+from sqlalchemy import text
+from sqlalchemy.pool import QueuePool
+
+from src.app.db.session import WriterLock, create_db_engine
+from src.test.loadtest_sqlite import run_workload
+
+
+def _pragma(engine, name: str):
+    with engine.connect() as conn:
+        return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def test_performance_profile_pragmas(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'app.db'}", performance_profile=True)
+    try:
+        assert _pragma(engine, "journal_mode") == "wal"
+        assert _pragma(engine, "synchronous") == 1   # NORMAL
+        assert _pragma(engine, "temp_store") == 2    # MEMORY
+        assert _pragma(engine, "busy_timeout") == 5000
+        assert _pragma(engine, "foreign_keys") == 1
+        assert _pragma(engine, "cache_size") < 0     # KiB
+        assert isinstance(engine.pool, QueuePool)
+    finally:
+        engine.dispose()
+
+
+def test_profile_off_keeps_defaults(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'app.db'}", performance_profile=False)
+    try:
+        assert _pragma(engine, "journal_mode") == "delete"
+        assert _pragma(engine, "foreign_keys") == 1
+    finally:
+        engine.dispose()
+
+
+def test_memory_database_keeps_default_pool():
+    engine = create_db_engine("sqlite:///:memory:", performance_profile=True)
+    assert not isinstance(engine.pool, QueuePool)
+    assert _pragma(engine, "foreign_keys") == 1
+
+
+def test_writer_lock_is_reentrant_per_thread_and_released():
+    lock = WriterLock(timeout_seconds=1)
+    first, second = {}, {}
+    lock.acquire(first)
+    lock.acquire(second)  # zweite Verbindung im selben Thread – kein Deadlock
+    assert first["writer_lock"] == "owner"
+    assert second["writer_lock"] == "nested"
+
+    acquired_elsewhere = []
+    t = threading.Thread(target=lambda: acquired_elsewhere.append(lock._lock.acquire(timeout=0.05)))
+    t.start()
+    t.join()
+    assert acquired_elsewhere == [False]
+
+    lock.release(second)
+    lock.release(first)
+    assert lock._lock.acquire(timeout=0.05)
+
+
+def test_concurrent_writers_without_lock_errors(tmp_path):
+    """Short run of the load test: every commit lands, no 'database is locked'."""
+    result = run_workload(str(tmp_path / "load.db"), True, writers=6, readers=4, seconds=1)
+    assert result["errors"] == 0
+    assert result["writes"] > 0
+    assert result["rows"] == result["writes"]
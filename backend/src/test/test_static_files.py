@@ -0,0 +1,87 @@
+"""Tests for the caching static files layer (Cache-Control, ETag, ranges, precompressed files)."""
+import gzip
+from io import BytesIO
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.app.core.static_files import IMMUTABLE, REVALIDATE, CachingStaticFiles, cache_control_for
+from src.test.conftest import create_tool, create_tool_category
+
+HASH = "ab" * 32
+
+
+@pytest.fixture
+def static_client(tmp_path):
+    app = FastAPI()
+    app.mount("/static", CachingStaticFiles(directory=str(tmp_path)), name="static")
+    (tmp_path / f"{HASH}.png").write_bytes(bytes(range(256)) * 4)
+    (tmp_path / "logo.svg").write_text("<svg>" + "x" * 500 + "</svg>")
+    (tmp_path / "logo.svg.gz").write_bytes(gzip.compress((tmp_path / "logo.svg").read_bytes()))
+    return TestClient(app)
+
+
+def test_cache_control_by_filename():
+    assert cache_control_for(f"{HASH}.png") == IMMUTABLE
+    assert cache_control_for(f"{HASH}_thumb.webp") == IMMUTABLE
+    assert cache_control_for(f"12_{'c' * 32}.jpg") == IMMUTABLE
+    assert cache_control_for("logo.svg") == REVALIDATE
+
+
+def test_hashed_file_is_immutable_with_content_etag(static_client):
+    r = static_client.get(f"/static/{HASH}.png")
+    assert r.status_code == 200
+    assert r.headers["cache-control"] == IMMUTABLE
+    assert r.headers["etag"] == f'"{HASH}"'
+    assert r.headers["accept-ranges"] == "bytes"
+
+    r = static_client.get(f"/static/{HASH}.png", headers={"If-None-Match": f'"{HASH}"'})
+    assert r.status_code == 304
+    assert r.content == b""
+    assert r.headers["cache-control"] == IMMUTABLE
+
+
+def test_other_files_revalidate(static_client):
+    r = static_client.get("/static/logo.svg")
+    assert r.headers["cache-control"] == REVALIDATE
+    etag = r.headers["etag"]
+    assert static_client.get("/static/logo.svg", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_range_requests(static_client):
+    r = static_client.get(f"/static/{HASH}.png", headers={"Range": "bytes=10-19"})
+    assert r.status_code == 206
+    assert r.content == bytes(range(10, 20))
+    assert r.headers["content-range"] == "bytes 10-19/1024"
+
+    # Veralteter If-Range -> komplette Datei
+    r = static_client.get(f"/static/{HASH}.png", headers={"Range": "bytes=10-19", "If-Range": '"other"'})
+    assert r.status_code == 200
+    assert len(r.content) == 1024
+
+
+def test_precompressed_variant_is_served_when_accepted(static_client):
+    r = static_client.get("/static/logo.svg", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["content-encoding"] == "gzip"
+    assert r.headers["content-type"].startswith("image/svg+xml")
+    assert r.headers["vary"] == "Accept-Encoding"
+    assert r.text.startswith("<svg>")  # httpx entpackt
+
+    r = static_client.get("/static/logo.svg", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in r.headers
+    assert r.headers["vary"] == "Accept-Encoding"
+
+
+def test_uploaded_tool_images_are_cached_forever(client, image_dir):
+    from PIL import Image
+    cat = create_tool_category(client)
+    tool = create_tool(client, cat["id"])
+    buf = BytesIO()
+    Image.new("RGB", (64, 48), (10, 20, 30)).save(buf, format="PNG")
+    buf.seek(0)
+    body = client.post(f"/api/v1/uploadtoolimage/{tool['id']}", files={"file": ("a.png", buf, "image/png")}).json()
+    for url in (body["image_url"], client.get(f"/api/v1/gettool/{tool['id']}").json()["image_thumb_url"]):
+        r = client.get(url)
+        assert r.status_code == 200
+        assert r.headers["cache-control"] == IMMUTABLE
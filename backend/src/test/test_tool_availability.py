@@ -0,0 +1,144 @@
+"""Tests for the per-tool availability counters (tool_availability)."""
+from sqlalchemy import update
+
+from src.app.crud import lookups
+from src.app.crud.tool_availability import rebuild_tool_availability
+from src.app.models.tool_availability import ToolAvailability
+from src.app.models.tool_condition import ToolCondition
+from src.test.conftest import (
+    seed_lookup_data, create_tool, create_tool_item, create_tool_status, create_user, count_queries,
+)
+
+
+def _setup(client, n=3):
+    ids = seed_lookup_data(client)
+    ids["maintenance_status_id"] = create_tool_status(client, "MAINTENANCE")["id"]
+    tool = create_tool(client, ids["category_id"])
+    items = [create_tool_item(client, tool["id"], ids["status_id"], ids["condition_id"])["id"] for _ in range(n)]
+    user = create_user(client, ids["role_id"], ids["department_id"])
+    return ids, tool["id"], items, user["id"]
+
+
+def _availability(client, tool_id):
+    r = client.get(f"/api/v1/gettool/{tool_id}")
+    assert r.status_code == 200
+    return r.json()["availability"]
+
+
+def _create_loan(client, user_id, item_ids):
+    r = client.post("/api/v1/createloan", json={
+        "borrower_user_id": user_id, "issued_by_user_id": user_id, "due_at": "2030-01-01T12:00:00Z",
+        "items": [{"tool_item_id": i} for i in item_ids],
+    })
+    assert r.status_code == 201
+    return r.json()
+
+
+def test_new_tool_has_zero_counters(client, db):
+    ids = seed_lookup_data(client)
+    tool = create_tool(client, ids["category_id"])
+    assert tool["availability"] == {"total": 0, "available": 0, "loaned": 0, "defect": 0, "maintenance": 0, "retired": 0}
+
+
+def test_counters_follow_loan_and_return(client, db):
+    ids, tool_id, items, user_id = _setup(client)
+    assert _availability(client, tool_id)["available"] == 3
+
+    loan = _create_loan(client, user_id, items[:2])
+    counters = _availability(client, tool_id)
+    assert (counters["available"], counters["loaned"], counters["total"]) == (1, 2, 3)
+
+    returns = [{"loan_item_id": li["id"]} for li in loan["items"]]
+    returns[0]["return_condition_id"] = lookups.get_id(db, ToolCondition, "DEFECT")
+    r = client.patch(f"/api/v1/returnloan/{loan['id']}", json={"returned_by_user_id": user_id, "items": returns})
+    assert r.status_code == 200
+    counters = _availability(client, tool_id)
+    assert (counters["available"], counters["loaned"], counters["defect"]) == (2, 0, 1)
+
+
+def test_counters_follow_request_approval(client, db):
+    ids, tool_id, items, user_id = _setup(client)
+    client.post("/api/v1/createloanrequeststatus", json={"name": "REQUESTED"})
+    approved = client.post("/api/v1/createloanrequeststatus", json={"name": "APPROVED"}).json()
+    r = client.post("/api/v1/createloanrequest", json={
+        "requester_user_id": user_id, "due_at": "2030-01-01T12:00:00Z", "items": [{"tool_id": tool_id, "quantity": 2}],
+    })
+    assert r.status_code == 201
+    r = client.patch(f"/api/v1/decideloanrequest/{r.json()['id']}",
+                     json={"status_id": approved["id"], "approver_user_id": user_id})
+    assert r.status_code == 200
+    counters = _availability(client, tool_id)
+    assert (counters["available"], counters["loaned"]) == (1, 2)
+
+
+def test_counters_follow_retire_update_and_delete(client, db):
+    ids, tool_id, items, _ = _setup(client)
+    assert client.patch(f"/api/v1/retiretoolitm/{items[0]}").status_code == 200
+    assert client.patch(f"/api/v1/updatetoolitem/{items[1]}", json={"status_id": ids["defect_status_id"]}).status_code == 200
+    assert client.delete(f"/api/v1/deletetoolitem/{items[2]}").status_code == 200
+    assert _availability(client, tool_id) == {
+        "total": 2, "available": 0, "loaned": 0, "defect": 1, "maintenance": 0, "retired": 1,
+    }
+
+
+def test_counters_follow_issue_lifecycle(client, db):
+    ids, tool_id, items, user_id = _setup(client, n=1)
+    open_status = client.post("/api/v1/createtoolitemissuestatus", json={"name": "OPEN"}).json()
+    assert client.post("/api/v1/createtoolcondition", json={"name": "WORN"}).status_code == 201
+    issue = client.post("/api/v1/createtoolitemissue", json={
+        "tool_item_id": items[0], "reported_by_user_id": user_id, "status_id": open_status["id"],
+        "title": "Griff locker", "description": "Der Griff wackelt.",
+    }).json()
+    counters = _availability(client, tool_id)
+    assert (counters["available"], counters["maintenance"]) == (0, 1)
+
+    assert client.patch(f"/api/v1/resolvetoolitemissue/{issue['id']}").status_code == 200
+    counters = _availability(client, tool_id)
+    assert (counters["available"], counters["maintenance"]) == (1, 0)
+
+
+def test_loan_request_checks_counters_in_one_query(client, db):
+    _, tool_id, _, user_id = _setup(client, n=2)
+    client.post("/api/v1/createloanrequeststatus", json={"name": "REQUESTED"})
+    lookups.load_all(db)
+    import src.app.crud.loan_request as crud_loan_request
+    with count_queries() as queries:
+        crud_loan_request._check_tool_availability(db, {tool_id: 2})
+    assert len(queries) == 1
+    assert "tool_items" not in queries[0]
+
+    # Mehrere Positionen desselben Werkzeugs werden zusammengezählt
+    r = client.post("/api/v1/createloanrequest", json={
+        "requester_user_id": user_id, "due_at": "2030-01-01T12:00:00Z",
+        "items": [{"tool_id": tool_id, "quantity": 1}, {"tool_id": tool_id, "quantity": 2}],
+    })
+    assert r.status_code == 409
+
+
+def test_tool_list_includes_counters_without_extra_query(client, db):
+    _setup(client)
+    lookups.load_all(db)
+    db.expire_all()
+    with count_queries() as queries:
+        r = client.get("/api/v1/gettools")
+    assert r.status_code == 200
+    assert r.json()[0]["availability"]["available"] == 3
+    assert len(queries) == 1
+
+
+def test_rebuild_fixes_drift(client, db):
+    _, tool_id, _, _ = _setup(client)
+    db.execute(update(ToolAvailability).values(available=99, loaned=5))
+    db.commit()
+    assert rebuild_tool_availability(db) == 1
+    assert _availability(client, tool_id)["available"] == 3
+    assert rebuild_tool_availability(db) == 0
+
+
+def test_missing_row_is_recounted(client, db):
+    _, tool_id, items, _ = _setup(client)
+    db.query(ToolAvailability).delete()
+    db.commit()
+    assert client.patch(f"/api/v1/retiretoolitm/{items[0]}").status_code == 200
+    counters = _availability(client, tool_id)
+    assert (counters["total"], counters["available"], counters["retired"]) == (3, 2, 1)
@@ -0,0 +1,127 @@
+"""Tests for the bulk import of tools and tool items (core/tool_import.py, /importtools)."""
+import io
+import json
+
+from src.app.core import tool_import
+from src.app.crud.tool_availability import rebuild_tool_availability
+from src.test.conftest import count_queries, create_tool, seed_lookup_data
+
+CSV_HEADER = "tool_name,category,description,quantity,condition,status,item_description\n"
+
+
+def _import(client, content: str, filename: str = "werkzeuge.csv", **params):
+    r = client.post("/api/v1/importtools", params=params, files={"file": (filename, content.encode(), "text/plain")})
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def _tools(client):
+    return {t["tool_name"]: t for t in client.get("/api/v1/gettools").json()}
+
+
+def test_csv_import_creates_tools_and_items(client, db):
+    ids = seed_lookup_data(client)
+    existing = create_tool(client, ids["category_id"], "Hammer")
+    result = _import(client, CSV_HEADER + (
+        "Akkuschrauber,Hand Tools,18 V,3,OK,,Koffer blau\n"
+        "Hammer,Hand Tools,,2,OK,DEFECT,\n"
+        "Wasserwaage,Hand Tools,60 cm,,,,\n"
+        "Akkuschrauber,Hand Tools,,1,DEFECT,,\n"
+    ))
+    assert result == {"rows": 4, "tools_created": 2, "items_created": 6, "error_count": 0, "errors": []}
+
+    tools = _tools(client)
+    assert tools["Hammer"]["id"] == existing["id"]
+    assert tools["Akkuschrauber"]["description"] == "18 V"
+    assert tools["Akkuschrauber"]["availability"]["total"] == 4
+    assert tools["Hammer"]["availability"] == {**tools["Hammer"]["availability"], "total": 2, "defect": 2}
+    assert tools["Wasserwaage"]["availability"]["total"] == 0
+
+    items = client.get(f"/api/v1/gettoolitems?tool_id={tools['Akkuschrauber']['id']}").json()
+    assert [i["inventory_no"] for i in items] == ["INV-0001", "INV-0002", "INV-0003", "INV-0006"]
+    assert {i["status"]["name"] for i in items} == {"AVAILABLE"}
+    assert items[0]["description"] == "Koffer blau"
+    # Zähler und Suchindex sind ohne Nacharbeit aktuell
+    assert rebuild_tool_availability(db) == 0
+    assert [h["title"] for h in client.get("/api/v1/search?q=akkuschr").json()] == ["Akkuschrauber"]
+
+
+def test_invalid_rows_are_reported_and_skipped(client):
+    seed_lookup_data(client)
+    result = _import(client, CSV_HEADER + (
+        "Zange,Hand Tools,,1,OK,,\n"
+        "Säge,Gartengeräte,,1,OK,,\n"
+        "Feile,Hand Tools,,1,NEU,,\n"
+        "Meißel,Hand Tools,,2,,,\n"
+        "Bohrer,Hand Tools,,viele,OK,,\n"
+        "Hobel,Hand Tools,,1,OK,VERLIEHEN,\n"
+        ",Hand Tools,,,,,\n"
+        "Schere,Hand Tools,,1,OK,,,zu viel\n"
+        "Spachtel,Hand Tools,,1,OK,,\n"
+    ))
+    assert (result["rows"], result["tools_created"], result["items_created"]) == (9, 2, 2)
+    assert [(e["line"], e["message"]) for e in result["errors"]] == [
+        (3, "Unbekannte Kategorie: Gartengeräte"),
+        (4, "Unbekannter Zustand: NEU"),
+        (5, "Value error, condition is required when quantity > 0"),
+        (6, "quantity: Input should be a valid integer, unable to parse string as an integer"),
+        (7, "Unbekannter Status: VERLIEHEN"),
+        (8, "tool_name: Field required"),
+        (9, "Mehr Spalten als in der Kopfzeile"),
+    ]
+    assert set(_tools(client)) == {"Zange", "Spachtel"}
+
+
+def test_ndjson_import(client):
+    seed_lookup_data(client)
+    lines = [
+        json.dumps({"tool_name": "Zange", "category": "Hand Tools", "quantity": 2, "condition": "OK"}),
+        "",
+        "{kein json",
+        json.dumps(["Zange"]),
+        json.dumps({"tool_name": "Zange", "category": "Hand Tools", "colour": "rot"}),
+    ]
+    result = _import(client, "\n".join(lines), filename="werkzeuge.jsonl")
+    assert (result["tools_created"], result["items_created"]) == (1, 2)
+    assert [e["line"] for e in result["errors"]] == [3, 4, 5]
+    assert result["errors"][0]["message"].startswith("Ungültiges JSON")
+    assert result["errors"][2]["message"] == "colour: Extra inputs are not permitted"
+
+    # Format ohne passende Endung nur per Parameter
+    r = client.post("/api/v1/importtools", files={"file": ("export.txt", b"", "text/plain")})
+    assert r.status_code == 400
+    assert _import(client, lines[0], filename="export.txt", format="ndjson")["items_created"] == 2
+
+
+def test_chunks_use_a_constant_number_of_statements(client, db):
+    seed_lookup_data(client)
+
+    def records(n):
+        return [(line, {"tool_name": f"Werkzeug {line}", "category": "Hand Tools", "quantity": 3, "condition": "OK"})
+                for line in range(2, n + 2)]
+
+    tool_import.import_records(db, records(1))  # Inventarnummern-Zähler und Lookups anlegen
+    with count_queries() as small:
+        tool_import.import_records(db, records(5), chunk_size=5)
+    with count_queries() as large:
+        result = tool_import.import_records(db, records(100), chunk_size=50)
+    assert result.items_created == 300
+    # Zwei Blöcke kosten doppelt so viel wie einer – unabhängig von der Zeilenzahl
+    assert len(large) <= 2 * len(small)
+
+
+def test_cli(client, db, tmp_path, monkeypatch, capsys):
+    seed_lookup_data(client)
+    path = tmp_path / "werkzeuge.csv"
+    path.write_text(CSV_HEADER + "Zange,Hand Tools,,2,OK,,\nSäge,Garten,,1,OK,,\n", encoding="utf-8")
+    monkeypatch.setattr(tool_import, "SessionLocal", lambda: db)
+    assert tool_import.main([str(path)]) == 1
+    out, err = capsys.readouterr()
+    assert "1 Werkzeuge und 2 Exemplare angelegt, 1 Fehler" in out
+    assert "Zeile 3: Unbekannte Kategorie: Garten" in err
+
+
+def test_broken_encoding_stops_with_an_error():
+    stream = tool_import.open_text(io.BytesIO(CSV_HEADER.encode() + b"Zange,Hand Tools,,1,OK,,\n\xff\xfe\n"))
+    records = list(tool_import.read_records(stream, "csv"))
+    assert records[-1][1] == "Datei ist nicht UTF-8-kodiert – Import abgebrochen"
@@ -55,3 +55,227 @@ def test_delete_tool_item(client):
     item = create_tool_item(client, tool["id"], ids["status_id"], ids["condition_id"])
     assert client.delete(f"/api/v1/deletetoolitem/{item['id']}").status_code == 200
     assert client.get(f"/api/v1/gettoolitem/{item['id']}").status_code == 404
+
+def test_inventory_no_continues_after_existing_items(client, db):
+    from src.app.models.tool_item import ToolItem
+    ids = seed_lookup_data(client)
+    tool = create_tool(client, ids["category_id"])
+    db.add(ToolItem(inventory_no="INV-0041", tool_id=tool["id"], status_id=ids["status_id"], condition_id=ids["condition_id"]))
+    db.commit()
+    item = create_tool_item(client, tool["id"], ids["status_id"], ids["condition_id"])
+    assert item["inventory_no"] == "INV-0042"
+
+def test_reserve_inventory_nos_block(client, db):
+    import src.app.crud.tool_item as crud
+    ids = seed_lookup_data(client)
+    tool = create_tool(client, ids["category_id"])
+    create_tool_item(client, tool["id"], ids["status_id"], ids["condition_id"])
+    block = crud.reserve_inventory_nos(db, 3)
+    db.commit()
+    assert block == ["INV-0002", "INV-0003", "INV-0004"]
+    item = create_tool_item(client, tool["id"], ids["status_id"], ids["condition_id"])
+    assert item["inventory_no"] == "INV-0005"
+
+def _item_with_loans(client, db, n):
+    """Creates a tool item that was loaned and returned n times (last return marks it DEFECT)."""
+    from src.test.conftest import create_user
+    from src.app.crud import lookups
+    from src.app.models.tool_condition import ToolCondition
+    ids = seed_lookup_data(client)
+    tool = create_tool(client, ids["category_id"])
+    item = create_tool_item(client, tool["id"], ids["status_id"], ids["condition_id"])
+    user = create_user(client, ids["role_id"], ids["department_id"])
+    defect_id = lookups.get_id(db, ToolCondition, "DEFECT")
+    for i in range(n):
+        r = client.post("/api/v1/createloan", json={"borrower_user_id": user["id"], "issued_by_user_id": user["id"], "due_at": "2030-01-01T12:00:00Z", "items": [{"tool_item_id": item["id"]}]})
+        assert r.status_code == 201
+        loan = r.json()
+        ret = {"loan_item_id": loan["items"][0]["id"], "return_comment": f"Rückgabe {i}"}
+        if i == n - 1:
+            ret["return_condition_id"] = defect_id
+        r = client.patch(f"/api/v1/returnloan/{loan['id']}", json={"returned_by_user_id": user["id"], "items": [ret]})
+        assert r.status_code == 200
+    return item["id"], user["id"]
+
+def test_tool_item_history_single_query(client, db):
+    from src.test.conftest import count_queries
+    item_id, user_id = _item_with_loans(client, db, 5)
+    db.expire_all()
+    with count_queries() as queries:
+        r = client.get(f"/api/v1/gettoolitemhistory/{item_id}")
+    assert r.status_code == 200
+    history = r.json()
+    assert len(history) == 5
+    assert all(entry["borrower"]["id"] == user_id for entry in history)
+    assert history[-1]["return_condition"]["name"] == "DEFECT"
+    assert history[0]["return_comment"] == "Rückgabe 0"
+    # Exemplar prüfen + eine Abfrage für die gesamte Historie, unabhängig von der Anzahl Ausleihen
+    assert len(queries) == 2
+
+def test_tool_item_history_since_and_cursor(client, db):
+    from datetime import datetime
+    from src.app.models.loan import Loan
+    item_id, _ = _item_with_loans(client, db, 5)
+    # Alle in derselben Sekunde ausgegeben: issued_at allein kann die Seiten nicht trennen
+    db.query(Loan).update({Loan.issued_at: datetime(2025, 1, 1, 8, 0, 0)})
+    db.commit()
+    history = client.get(f"/api/v1/gettoolitemhistory/{item_id}").json()
+    assert "x-next-cursor" not in client.get(f"/api/v1/gettoolitemhistory/{item_id}").headers
+
+    paged, params = [], {"limit": 2}
+    while True:
+        r = client.get(f"/api/v1/gettoolitemhistory/{item_id}", params=params)
+        paged += r.json()
+        if "x-next-cursor" not in r.headers:
+            break
+        assert r.headers["x-next-cursor"] == str(r.json()[-1]["loan_id"])
+        params["cursor"] = r.headers["x-next-cursor"]
+    assert [e["loan_id"] for e in paged] == [e["loan_id"] for e in history]
+    assert len(history) == 5
+
+    r = client.get(f"/api/v1/gettoolitemhistory/{item_id}", params={"since": "2999-01-01T00:00:00Z"})
+    assert r.json() == []
+
+def test_export_tool_item_history_ndjson(client, db):
+    import json
+    item_id, _ = _item_with_loans(client, db, 3)
+    r = client.get(f"/api/v1/exporttoolitemhistory/{item_id}")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in r.text.splitlines()]
+    assert lines == client.get(f"/api/v1/gettoolitemhistory/{item_id}").json()
+    assert client.get("/api/v1/exporttoolitemhistory/9999").status_code == 404
+
+def test_qrcode_etag_and_304(client, db):
+    from src.app.core.qrcodes import qr_codes
+    ids = seed_lookup_data(client)
+    tool = create_tool(client, ids["category_id"])
+    item = create_tool_item(client, tool["id"], ids["status_id"], ids["condition_id"])
+    r = client.get(f"/api/v1/gettoolitemqrcode/{item['id']}")
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "image/png"
+    assert r.content.startswith(b"\x89PNG")
+    etag = r.headers["etag"]
+    assert r.headers["cache-control"] == "private, no-cache"
+
+    renders = qr_codes.renders
+    r = client.get(f"/api/v1/gettoolitemqrcode/{item['id']}", headers={"If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.content == b""
+    assert qr_codes.renders == renders
+
+    # Inhaltsadressierte URL aus ToolItemRead darf unbegrenzt gecacht werden
+    r = client.get(item["qrcode_url"])
+    assert r.headers["etag"] == etag
+    assert "immutable" in r.headers["cache-control"]
+
+def test_qrcode_cached_in_memory_and_on_disk(client, db):
+    from src.app.core.qrcodes import qr_codes
+    ids = seed_lookup_data(client)
+    tool = create_tool(client, ids["category_id"])
+    item = create_tool_item(client, tool["id"], ids["status_id"], ids["condition_id"])
+    from src.app.models.tool_item import ToolItem
+    db_item = db.get(ToolItem, item["id"])
+    db_item.inventory_no = "QR-TEST-1"  # eindeutiger Inhalt, unabhängig von anderen Tests
+    db.commit()
+
+    renders = qr_codes.renders
+    first = client.get(f"/api/v1/gettoolitemqrcode/{item['id']}").content
+    assert qr_codes.renders == renders + 1
+    assert client.get(f"/api/v1/gettoolitemqrcode/{item['id']}").content == first
+    qr_codes.clear_memory()
+    assert client.get(f"/api/v1/gettoolitemqrcode/{item['id']}").content == first
+    assert qr_codes.renders == renders + 1  # aus dem Festplatten-Cache
+
+def test_qrcode_invalidated_on_inventory_no_change(client, db):
+    from src.app.core.qrcodes import cache_key, payload_for, qr_codes
+    from src.app.models.tool_item import ToolItem
+    ids = seed_lookup_data(client)
+    tool = create_tool(client, ids["category_id"])
+    item = create_tool_item(client, tool["id"], ids["status_id"], ids["condition_id"])
+    old = client.get(f"/api/v1/gettoolitemqrcode/{item['id']}")
+    old_path = qr_codes._path(cache_key(payload_for(item["id"], item["inventory_no"])))
+    assert old_path.exists()
+
+    db_item = db.get(ToolItem, item["id"])
+    db_item.inventory_no = "INV-9999"
+    db.commit()
+    assert not old_path.exists()
+    new = client.get(f"/api/v1/gettoolitemqrcode/{item['id']}")
+    assert new.headers["etag"] != old.headers["etag"]
+    assert client.get(f"/api/v1/gettoolitemqrcode/{item['id']}", headers={"If-None-Match": old.headers["etag"]}).status_code == 200
+
+    client.delete(f"/api/v1/deletetoolitem/{item['id']}")
+    assert not qr_codes._path(cache_key(payload_for(item["id"], "INV-9999"))).exists()
+
+def test_qrcode_cache_concurrent_requests_render_once(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+    from src.app.core.qrcodes import QRCodeCache
+    cache = QRCodeCache(max_entries=2, cache_dir=str(tmp_path), workers=2)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: cache.get_png("tool_item:1:INV-0001"), range(8)))
+    assert len({png for _, png in results}) == 1
+    assert cache.renders == 1
+    for i in range(3):
+        cache.get_png(f"tool_item:{i}:X")
+    assert len(cache) == 2  # LRU-Obergrenze
+    cache.shutdown()
+
+def _label_items(client, n):
+    ids = seed_lookup_data(client)
+    tool = create_tool(client, ids["category_id"], name="Akkuschrauber")
+    return tool["id"], [create_tool_item(client, tool["id"], ids["status_id"], ids["condition_id"])["id"] for _ in range(n)]
+
+def test_tool_item_labels_pdf_streams_all_pages(client, db):
+    from src.app.core.labels import LABELS_PER_PAGE
+    tool_id, item_ids = _label_items(client, LABELS_PER_PAGE + 1)
+    r = client.get("/api/v1/gettoolitemlabels", params={"tool_id": tool_id})
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/pdf"
+    assert r.headers["x-total-pages"] == "2"
+    pdf = r.content
+    assert pdf.startswith(b"%PDF-1.4") and pdf.rstrip().endswith(b"%%EOF")
+    assert b"/Type /Pages /Kids [3 0 R 6 0 R] /Count 2" in pdf
+    # xref-Offsets zeigen auf die Objekte
+    startxref = int(pdf.rsplit(b"startxref\n", 1)[1].split(b"\n", 1)[0])
+    entries = pdf[startxref:].split(b"\n")[3:3 + 7]
+    for number, entry in enumerate(entries, start=1):
+        assert pdf[int(entry[:10]):].startswith(f"{number} 0 obj".encode())
+
+def test_tool_item_labels_png_page(client, db):
+    import io
+    from PIL import Image
+    from src.app.core.labels import PAGE_WIDTH_PX, PAGE_HEIGHT_PX
+    _, item_ids = _label_items(client, 3)
+    r = client.get("/api/v1/gettoolitemlabels", params={"item_ids": item_ids, "format": "png"})
+    assert r.status_code == 200
+    assert r.headers["x-total-pages"] == "1"
+    assert Image.open(io.BytesIO(r.content)).size == (PAGE_WIDTH_PX, PAGE_HEIGHT_PX)
+    assert client.get("/api/v1/gettoolitemlabels", params={"item_ids": item_ids, "format": "png", "page": 2}).status_code == 404
+
+def test_tool_item_labels_validation(client, db):
+    _, item_ids = _label_items(client, 1)
+    assert client.get("/api/v1/gettoolitemlabels").status_code == 400
+    r = client.get("/api/v1/gettoolitemlabels", params={"item_ids": [item_ids[0], 9999]})
+    assert r.status_code == 404
+    assert "9999" in r.json()["detail"]
+
+def test_tool_item_labels_are_capped(client, db, monkeypatch):
+    from src.app.core.config import settings
+    monkeypatch.setattr(settings, "MAX_LABELS", 2)
+    tool_id, item_ids = _label_items(client, 3)
+    r = client.get("/api/v1/gettoolitemlabels", params={"item_ids": item_ids})
+    assert r.status_code == 413
+    assert "2" in r.json()["detail"]
+    assert client.get("/api/v1/gettoolitemlabels", params={"tool_id": tool_id}).status_code == 413
+    # Doppelte IDs zählen einmal
+    r = client.get("/api/v1/gettoolitemlabels", params={"item_ids": item_ids[:2] * 3, "format": "png"})
+    assert r.status_code == 200
+
+def test_tool_item_labels_render_in_process_pool_and_fill_cache(client, db):
+    from src.app.core.labels import Label, qr_pngs
+    from src.app.core.qrcodes import cache_key, qr_codes
+    labels = [Label(i, f"POOL-{i}", "Test") for i in range(1, 6)]
+    pngs = qr_pngs(labels)
+    assert all(png.startswith(b"\x89PNG") for png in pngs)
+    assert all(qr_codes.lookup(cache_key(label.payload)) == png for label, png in zip(labels, pngs))
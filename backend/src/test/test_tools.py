@@ -71,7 +71,7 @@ def test_delete_tool(client):
     assert client.get(f"/api/v1/gettool/{tool['id']}").status_code == 404
 
 
-def test_create_tool_with_image(client):
+def test_create_tool_with_image(client, image_dir):
     cat = create_tool_category(client)
     fake_image = BytesIO(b"\x89PNG\r\n\x1a\n" + b"\x00" * 20)
     r = client.post(
@@ -83,7 +83,7 @@ def test_create_tool_with_image(client):
     assert r.json()["image_filename"] is not None
 
 
-def test_upload_tool_image(client):
+def test_upload_tool_image(client, image_dir):
     cat = create_tool_category(client)
     tool = create_tool(client, cat["id"])
     fake_image = BytesIO(b"\x89PNG\r\n\x1a\n" + b"\x00" * 20)
@@ -95,7 +95,7 @@ def test_upload_tool_image(client):
     assert r.json()["image_filename"] is not None
 
 
-def test_upload_tool_image_invalid_type(client):
+def test_upload_tool_image_invalid_type(client, image_dir):
     cat = create_tool_category(client)
     tool = create_tool(client, cat["id"])
     r = client.post(
@@ -105,7 +105,7 @@ def test_upload_tool_image_invalid_type(client):
     assert r.status_code == 400
 
 
-def test_delete_tool_image(client):
+def test_delete_tool_image(client, image_dir):
     cat = create_tool_category(client)
     tool = create_tool(client, cat["id"])
     fake_image = BytesIO(b"\x89PNG\r\n\x1a\n" + b"\x00" * 20)
@@ -116,3 +116,158 @@ def test_delete_tool_image(client):
     assert client.delete(f"/api/v1/deletetoolimage/{tool['id']}").status_code == 200
     r = client.get(f"/api/v1/gettool/{tool['id']}")
     assert r.json()["image_filename"] is None
+
+
+def _png(size=(1600, 1200)) -> BytesIO:
+    from PIL import Image
+    buf = BytesIO()
+    Image.new("RGB", size, (200, 40, 40)).save(buf, format="PNG")
+    buf.seek(0)
+    return buf
+
+
+def test_upload_generates_webp_variants(client, image_dir):
+    from PIL import Image
+    from src.app.core import images
+    cat = create_tool_category(client)
+    tool = create_tool(client, cat["id"])
+    r = client.post(f"/api/v1/uploadtoolimage/{tool['id']}", files={"file": ("big.png", _png(), "image/png")})
+    assert r.status_code == 200
+    filename = r.json()["image_filename"]
+
+    # Der Hintergrund-Task ist nach der Antwort gelaufen
+    body = client.get(f"/api/v1/gettool/{tool['id']}").json()
+    assert body["image_variants_ready"] is True
+    assert body["image_url"] == f"/static/tool_images/{filename}"
+    assert body["image_thumb_url"].endswith("_thumb.webp")
+    assert body["image_medium_url"].endswith("_medium.webp")
+    for variant, max_size in images.VARIANTS.items():
+        with Image.open(images.IMAGE_DIR / images.variant_filename(filename, variant)) as img:
+            assert img.format == "WEBP"
+            assert max(img.size) == max_size
+    assert client.get(body["image_thumb_url"]).status_code == 200
+
+
+def test_variant_urls_fall_back_to_original(client, image_dir):
+    cat = create_tool_category(client)
+    tool = create_tool(client, cat["id"])
+    fake_image = BytesIO(b"\x89PNG\r\n\x1a\n" + b"\x00" * 20)
+    client.post(f"/api/v1/uploadtoolimage/{tool['id']}", files={"file": ("test.png", fake_image, "image/png")})
+    body = client.get(f"/api/v1/gettool/{tool['id']}").json()
+    assert body["image_variants_ready"] is False
+    assert body["image_thumb_url"] == body["image_medium_url"] == body["image_url"]
+
+
+def test_upload_too_large_is_rejected(client, image_dir, monkeypatch):
+    from src.app.core import images
+    from src.app.core.config import settings
+    monkeypatch.setattr(settings, "TOOL_IMAGE_MAX_BYTES", 1000)
+    cat = create_tool_category(client)
+    tool = create_tool(client, cat["id"])
+    r = client.post(
+        f"/api/v1/uploadtoolimage/{tool['id']}",
+        files={"file": ("big.png", BytesIO(b"\x89PNG" + b"\x00" * 5000), "image/png")},
+    )
+    assert r.status_code == 413
+    assert list(image_dir.iterdir()) == []  # keine halbe Datei, keine .tmp-Reste
+    assert client.get(f"/api/v1/gettool/{tool['id']}").json()["image_filename"] is None
+
+
+def test_replace_and_delete_remove_old_variants(client, image_dir):
+    from src.app.core import images
+    cat = create_tool_category(client)
+    tool = create_tool(client, cat["id"])
+    first = client.post(f"/api/v1/uploadtoolimage/{tool['id']}", files={"file": ("a.png", _png(), "image/png")}).json()
+    old_files = [first["image_filename"], *(images.variant_filename(first["image_filename"], v) for v in images.VARIANTS)]
+    assert all((images.IMAGE_DIR / f).exists() for f in old_files)
+
+    second = client.post(f"/api/v1/uploadtoolimage/{tool['id']}", files={"file": ("b.png", _png((400, 300)), "image/png")}).json()
+    assert not any((images.IMAGE_DIR / f).exists() for f in old_files)
+    new_files = [second["image_filename"], *(images.variant_filename(second["image_filename"], v) for v in images.VARIANTS)]
+    assert all((images.IMAGE_DIR / f).exists() for f in new_files)
+
+    assert client.delete(f"/api/v1/deletetoolimage/{tool['id']}").status_code == 200
+    assert not any((images.IMAGE_DIR / f).exists() for f in new_files)
+
+
+def test_stale_variant_task_cleans_up(client, image_dir, db):
+    from sqlalchemy.orm import sessionmaker
+    from src.app.core import images
+    cat = create_tool_category(client)
+    tool = create_tool(client, cat["id"])
+    current = client.post(f"/api/v1/uploadtoolimage/{tool['id']}", files={"file": ("a.png", _png(), "image/png")}).json()
+
+    # Ein verspäteter Task für ein nicht mehr referenziertes Bild räumt Original und Varianten weg
+    stale = "0" * 64 + ".png"
+    (images.IMAGE_DIR / stale).write_bytes(_png((200, 200)).getvalue())
+    assert images.build_variants(sessionmaker(bind=db.get_bind()), stale) is False
+    assert not (images.IMAGE_DIR / stale).exists()
+    assert not any((images.IMAGE_DIR / images.variant_filename(stale, v)).exists() for v in images.VARIANTS)
+    assert client.get(f"/api/v1/gettool/{tool['id']}").json()["image_filename"] == current["image_filename"]
+
+
+def test_identical_uploads_are_stored_once(client, image_dir):
+    import hashlib
+    from src.app.core import images
+    cat = create_tool_category(client)
+    tools = [create_tool(client, cat["id"], f"Variante {i}") for i in range(3)]
+    data = _png((640, 480)).getvalue()
+    names = {
+        client.post(f"/api/v1/uploadtoolimage/{t['id']}", files={"file": (f"{i}.png", BytesIO(data), "image/png")}).json()["image_filename"]
+        for i, t in enumerate(tools)
+    }
+    assert names == {f"{hashlib.sha256(data).hexdigest()}.png"}
+    filename = names.pop()
+    # Das Duplikat übernimmt die fertigen Varianten sofort
+    for t in tools:
+        assert client.get(f"/api/v1/gettool/{t['id']}").json()["image_variants_ready"] is True
+
+    # Die Datei verschwindet erst mit der letzten Referenz
+    client.delete(f"/api/v1/deletetoolimage/{tools[0]['id']}")
+    client.delete(f"/api/v1/deletetool/{tools[1]['id']}")
+    assert (images.IMAGE_DIR / filename).exists()
+    client.post(f"/api/v1/uploadtoolimage/{tools[2]['id']}", files={"file": ("x.png", _png((300, 300)), "image/png")})
+    assert not (images.IMAGE_DIR / filename).exists()
+    assert not any((images.IMAGE_DIR / images.variant_filename(filename, v)).exists() for v in images.VARIANTS)
+
+
+def test_garbage_collector_removes_unreferenced_files(client, db, image_dir):
+    import os
+    import time
+    from src.app.core import images
+    from src.app.models.tool import Tool
+    cat = create_tool_category(client)
+    tool = create_tool(client, cat["id"])
+    referenced = "a" * 64 + ".png"
+    db.get(Tool, tool["id"]).image_filename = referenced
+    db.commit()
+
+    kept = [referenced, *(images.variant_filename(referenced, v) for v in images.VARIANTS), ".gitkeep"]
+    removed = ["f" * 64 + ".png", images.variant_filename("f" * 64 + ".png", "thumb"), ".upload.deadbeef.tmp"]
+    fresh = "e" * 64 + ".png"
+    old = time.time() - 7200
+    for name in (*kept, *removed, fresh):
+        (image_dir / name).write_bytes(b"x")
+        if name != fresh:
+            os.utime(image_dir / name, (old, old))
+
+    assert images.collect_garbage(db, grace_seconds=3600) == len(removed)
+    assert sorted(p.name for p in image_dir.iterdir()) == sorted([*kept, fresh])  # fresh: jünger als die Karenzzeit
+
+
+def test_maintenance_builds_missing_variants(client, image_dir, db):
+    from sqlalchemy.orm import sessionmaker
+    from src.app.core import images
+    from src.app.core.maintenance import build_image_variants
+    from src.app.models.tool import Tool
+    cat = create_tool_category(client)
+    tool = create_tool(client, cat["id"])
+    filename = client.post(f"/api/v1/uploadtoolimage/{tool['id']}", files={"file": ("a.png", _png(), "image/png")}).json()["image_filename"]
+    # Zustand wie nach der Migration: Bild vorhanden, Varianten fehlen
+    images.remove_variants(filename)
+    db.get(Tool, tool["id"]).image_variants_ready = False
+    db.commit()
+
+    assert build_image_variants(sessionmaker(bind=db.get_bind())) == 1
+    assert all((images.IMAGE_DIR / images.variant_filename(filename, v)).exists() for v in images.VARIANTS)
+    assert client.get(f"/api/v1/gettool/{tool['id']}").json()["image_variants_ready"] is True
@@ -3,7 +3,8 @@
 //
 // Hier sind alle HTTP-Aufrufe an das Backend organisiert.
 // Jede Entität hat ein eigenes Objekt mit CRUD-Methoden:
-//   .list()   → GET alle Einträge
+//   .list()   → GET alle Einträge (folgt bei Listen automatisch allen Seiten)
+//   .pages()  → Seiten einzeln und erst bei Bedarf laden (for await ... of)
 //   .get(id)  → GET einzelnen Eintrag
 //   .create() → POST neuen Eintrag
 //   .update() → PATCH Eintrag
@@ -13,7 +14,29 @@
 // ============================================================
 
 import api from './client'
-import type { User, Department, Role, Tool, ToolItem, ToolItemHistoryEntry, ToolItemIssue, LoanRequest, Loan, ToolCategory, ToolStatus, ToolCondition, ToolItemIssueStatus, LoanRequestStatus } from '../types'
+import type { User, Department, Role, Tool, ToolItem, ToolItemHistoryEntry, ToolItemIssue, LoanRequest, Loan, ToolCategory, ToolStatus, ToolCondition, ToolItemIssueStatus, LoanRequestStatus, DashboardStats } from '../types'
+
+// ── Pagination ────────────────────────────────────────────────────────────────
+// Die get*s-Endpunkte liefern seitenweise (Keyset-Pagination über die ID).
+// Gibt es eine weitere Seite, steht der nächste Cursor im Header "X-Next-Cursor".
+const PAGE_SIZE = 100
+
+// pages: Lädt eine Seite nach der anderen – erst wenn der Aufrufer die nächste anfordert
+async function* pages<T>(url: string, params?: object, pageSize = PAGE_SIZE): AsyncGenerator<T[]> {
+  let cursor: string | undefined
+  do {
+    const res = await api.get<T[]>(url, { params: { ...params, limit: pageSize, cursor } })
+    yield res.data
+    cursor = res.headers['x-next-cursor']
+  } while (cursor)
+}
+
+// listAll: Sammelt alle Seiten zu einer Liste (für Seiten, die alles anzeigen)
+async function listAll<T>(url: string, params?: object): Promise<T[]> {
+  const all: T[] = []
+  for await (const page of pages<T>(url, params)) all.push(...page)
+  return all
+}
 
 // ── Auth ──────────────────────────────────────────────────────────────────────
 export const authApi = {
@@ -36,7 +59,8 @@ export const authApi = {
 
 // ── Users ─────────────────────────────────────────────────────────────────────
 export const usersApi = {
-  list: () => api.get<User[]>('/api/v1/getusers').then(r => r.data),
+  list: () => listAll<User>('/api/v1/getusers'),
+  pages: () => pages<User>('/api/v1/getusers'),
   get: (id: number) => api.get<User>(`/api/v1/getuser/${id}`).then(r => r.data),
   create: (data: object) => api.post<User>('/api/v1/createuser', data).then(r => r.data),
   update: (id: number, data: object) => api.patch<User>(`/api/v1/updateuser/${id}`, data).then(r => r.data),
@@ -72,7 +96,8 @@ export const lookupsApi = {
 
 // ── Tools ─────────────────────────────────────────────────────────────────────
 export const toolsApi = {
-  list: () => api.get<Tool[]>('/api/v1/gettools').then(r => r.data),
+  list: () => listAll<Tool>('/api/v1/gettools'),
+  pages: () => pages<Tool>('/api/v1/gettools'),
   get: (id: number) => api.get<Tool>(`/api/v1/gettool/${id}`).then(r => r.data),
   create: (data: FormData) => api.post<Tool>('/api/v1/createtool', data, { headers: { 'Content-Type': 'multipart/form-data' } }).then(r => r.data),
   update: (id: number, data: FormData) => api.patch<Tool>(`/api/v1/updatetool/${id}`, data, { headers: { 'Content-Type': 'multipart/form-data' } }).then(r => r.data),
@@ -81,14 +106,14 @@ export const toolsApi = {
 
 // ── Tool Items ────────────────────────────────────────────────────────────────
 export const toolItemsApi = {
-  list: (params?: { tool_id?: number; status_id?: number }) =>
-    api.get<ToolItem[]>('/api/v1/gettoolitems', { params }).then(r => r.data),
+  list: (params?: { tool_id?: number; status_id?: number }) => listAll<ToolItem>('/api/v1/gettoolitems', params),
+  pages: (params?: { tool_id?: number; status_id?: number }) => pages<ToolItem>('/api/v1/gettoolitems', params),
   get: (id: number) => api.get<ToolItem>(`/api/v1/gettoolitem/${id}`).then(r => r.data),
   create: (data: object) => api.post<ToolItem>('/api/v1/createtoolitem', data).then(r => r.data),
   update: (id: number, data: object) => api.patch<ToolItem>(`/api/v1/updatetoolitem/${id}`, data).then(r => r.data),
   retire: (id: number) => api.patch<ToolItem>(`/api/v1/retiretoolitm/${id}`).then(r => r.data),  // setzt Status auf RETIRED
   delete: (id: number) => api.delete(`/api/v1/deletetoolitem/${id}`).then(r => r.data),
-  history: (id: number) => api.get<ToolItemHistoryEntry[]>(`/api/v1/gettoolitemhistory/${id}`).then(r => r.data),  // alle vergangenen Ausleihen
+  history: (id: number) => listAll<ToolItemHistoryEntry>(`/api/v1/gettoolitemhistory/${id}`),  // alle vergangenen Ausleihen
   // qrCode gibt direkt eine URL zurück (für <img src=...>)
   qrCode: (id: number) => `http://localhost:8000/api/v1/gettoolitemqrcode/${id}`,
   // qrCodeBlob lädt das Bild und erstellt eine lokale Blob-URL (für Downloads)
@@ -97,7 +122,8 @@ export const toolItemsApi = {
 
 // ── Issues ────────────────────────────────────────────────────────────────────
 export const issuesApi = {
-  list: () => api.get<ToolItemIssue[]>('/api/v1/gettoolitemissues').then(r => r.data),
+  list: () => listAll<ToolItemIssue>('/api/v1/gettoolitemissues'),
+  pages: () => pages<ToolItemIssue>('/api/v1/gettoolitemissues'),
   get: (id: number) => api.get<ToolItemIssue>(`/api/v1/gettoolitemissue/${id}`).then(r => r.data),
   create: (data: object) => api.post<ToolItemIssue>('/api/v1/createtoolitemissue', data).then(r => r.data),
   update: (id: number, data: object) => api.patch<ToolItemIssue>(`/api/v1/updatetoolitemissue/${id}`, data).then(r => r.data),
@@ -106,7 +132,8 @@ export const issuesApi = {
 
 // ── Loan Requests ─────────────────────────────────────────────────────────────
 export const loanRequestsApi = {
-  list: () => api.get<LoanRequest[]>('/api/v1/getloanrequests').then(r => r.data),
+  list: () => listAll<LoanRequest>('/api/v1/getloanrequests'),
+  pages: () => pages<LoanRequest>('/api/v1/getloanrequests'),
   get: (id: number) => api.get<LoanRequest>(`/api/v1/getloanrequest/${id}`).then(r => r.data),
   create: (data: object) => api.post<LoanRequest>('/api/v1/createloanrequest', data).then(r => r.data),
   update: (id: number, data: object) => api.patch<LoanRequest>(`/api/v1/updateloanrequest/${id}`, data).then(r => r.data),
@@ -116,11 +143,17 @@ export const loanRequestsApi = {
 
 // ── Loans ─────────────────────────────────────────────────────────────────────
 export const loansApi = {
-  list: (params?: { active_only?: boolean }) =>
-    api.get<Loan[]>('/api/v1/getloans', { params }).then(r => r.data),
+  list: (params?: { active_only?: boolean }) => listAll<Loan>('/api/v1/getloans', params),
+  pages: (params?: { active_only?: boolean }) => pages<Loan>('/api/v1/getloans', params),
   overdue: () => api.get<Loan[]>('/api/v1/getoverdueloans').then(r => r.data),
   get: (id: number) => api.get<Loan>(`/api/v1/getloan/${id}`).then(r => r.data),
   create: (data: object) => api.post<Loan>('/api/v1/createloan', data).then(r => r.data),
   return: (id: number, data: object) => api.patch<Loan>(`/api/v1/returnloan/${id}`, data).then(r => r.data),
   delete: (id: number) => api.delete(`/api/v1/deleteloan/${id}`).then(r => r.data),
 }
+
+// ── Dashboard ─────────────────────────────────────────────────────────────────
+export const dashboardApi = {
+  // Alle Kennzahlen in einer Anfrage – serverseitig aggregiert und nach Rolle gefiltert
+  stats: () => api.get<DashboardStats>('/api/v1/getdashboardstats').then(r => r.data),
+}
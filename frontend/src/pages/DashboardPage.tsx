@@ -1,7 +1,7 @@
 import { useEffect, useState } from 'react'
 import { useNavigate } from 'react-router-dom'
-import { toolsApi, toolItemsApi, loansApi, loanRequestsApi, usersApi, issuesApi } from '../api/services'
-import type { Tool, ToolItem, Loan, LoanRequest, User, ToolItemIssue } from '../types'
+import { dashboardApi } from '../api/services'
+import type { DashboardStats } from '../types'
 import { Card, CardContent, CardHeader, CardTitle } from '../components/ui/card'
 import { Badge } from '../components/ui/badge'
 import { Skeleton } from '../components/ui/skeleton'
@@ -38,49 +38,34 @@ function StatCard({ title, value, icon: Icon, color, to }: { title: string; valu
 export default function DashboardPage() {
   const { isAdmin, isManager } = useAuth()
   const navigate = useNavigate()
-  const [tools, setTools] = useState<Tool[]>([])
-  const [items, setItems] = useState<ToolItem[]>([])
-  const [loans, setLoans] = useState<Loan[]>([])
-  const [requests, setRequests] = useState<LoanRequest[]>([])
-  const [users, setUsers] = useState<User[]>([])
-  const [issues, setIssues] = useState<ToolItemIssue[]>([])
+  const [stats, setStats] = useState<DashboardStats | null>(null)
   const [loading, setLoading] = useState(true)
 
   useEffect(() => {
-    Promise.all([
-      toolsApi.list(),
-      toolItemsApi.list(),
-      loansApi.list(),
-      loanRequestsApi.list(),
-      isAdmin ? usersApi.list() : Promise.resolve([]),
-      isAdmin ? issuesApi.list() : Promise.resolve([]),
-    ]).then(([t, i, l, r, u, iss]) => {
-      setTools(t); setItems(i); setLoans(l)
-      setRequests(r); setUsers(u as User[]); setIssues(iss)
-    }).finally(() => setLoading(false))
+    dashboardApi.stats()
+      .then(setStats)
+      .finally(() => setLoading(false))
   }, [isAdmin])
 
   // Chart data
   const statusData = ['AVAILABLE', 'LOANED', 'DEFECT', 'MAINTENANCE', 'RETIRED'].map(s => ({
     name: t(toolStatusLabel, s),
-    value: items.filter(i => i.status.name === s).length,
+    value: stats?.tool_items_by_status[s] ?? 0,
   })).filter(d => d.value > 0)
 
-  const categoryData = tools.reduce<Record<string, number>>((acc, t) => {
-    acc[t.category.name] = (acc[t.category.name] || 0) + 1
-    return acc
-  }, {})
-  const catChartData = Object.entries(categoryData).map(([name, value]) => ({ name, value }))
+  const catChartData = Object.entries(stats?.tools_by_category ?? {}).map(([name, value]) => ({ name, value }))
 
   const issueStatusData = ['OPEN', 'IN_PROGRESS', 'RESOLVED', 'CLOSED'].map(s => ({
     key: s,
     name: t(issueStatusLabel, s),
-    value: issues.filter(i => i.status.name === s).length,
+    value: stats?.issues_by_status[s] ?? 0,
   })).filter(d => d.value > 0)
 
-  const activeLoans = loans.filter(l => !l.returned_at).length
-  const overdueLoans = loans.filter(l => l.is_overdue).length
-  const openRequests = requests.filter(r => r.status.name === 'REQUESTED').length
+  const requestsByStatus = stats?.loan_requests_by_status ?? {}
+  const totalRequests = Object.values(requestsByStatus).reduce((a, b) => a + b, 0)
+  const activeLoans = stats?.active_loans ?? 0
+  const overdueLoans = stats?.overdue_loans ?? 0
+  const openRequests = requestsByStatus['REQUESTED'] ?? 0
 
   if (loading) return (
     <div className="p-8 space-y-6">
@@ -100,11 +85,11 @@ export default function DashboardPage() {
 
       {/* Stats */}
       <div className={cn('grid grid-cols-2 gap-4', isAdmin ? 'lg:grid-cols-3 xl:grid-cols-5' : 'lg:grid-cols-2 xl:grid-cols-4')}>
-        <StatCard title="Werkzeugtypen"   value={tools.length}   icon={Wrench}        color="bg-blue-500"    to="/tools" />
-        <StatCard title="Exemplare"        value={items.length}   icon={Package}       color="bg-indigo-500"  to="/inventory" />
+        <StatCard title="Werkzeugtypen"   value={stats?.tool_count ?? 0}   icon={Wrench}        color="bg-blue-500"    to="/tools" />
+        <StatCard title="Exemplare"        value={stats?.tool_item_count ?? 0}   icon={Package}       color="bg-indigo-500"  to="/inventory" />
         <StatCard title="Aktive Ausleihen" value={activeLoans}    icon={ArrowLeftRight} color="bg-emerald-500" to="/loans?filter=active" />
         <StatCard title="Offene Anfragen"  value={openRequests}   icon={ClipboardList} color="bg-amber-500"   to="/loan-requests?filter=REQUESTED" />
-        {isAdmin && <StatCard title="Nutzer" value={users.length} icon={Users}         color="bg-purple-500"  to="/users" />}
+        {isAdmin && <StatCard title="Nutzer" value={stats?.user_count ?? 0} icon={Users}         color="bg-purple-500"  to="/users" />}
       </div>
 
       {/* Charts Row 1 */}
@@ -182,8 +167,8 @@ export default function DashboardPage() {
           <CardContent>
             <div className="space-y-3 pt-2">
               {['REQUESTED', 'APPROVED', 'REJECTED', 'CANCELLED'].map(status => {
-                const count = requests.filter(r => r.status.name === status).length
-                const total = requests.length || 1
+                const count = requestsByStatus[status] ?? 0
+                const total = totalRequests || 1
                 const pct = Math.round((count / total) * 100)
                 const colors: Record<string, string> = { REQUESTED: 'bg-amber-500', APPROVED: 'bg-emerald-500', REJECTED: 'bg-red-500', CANCELLED: 'bg-slate-400' }
                 return (
@@ -213,7 +198,7 @@ export default function DashboardPage() {
           </CardHeader>
           <CardContent>
             <div className="space-y-2">
-              {loans.filter(l => l.is_overdue).slice(0, 5).map(loan => (
+              {(stats?.top_overdue_loans ?? []).map(loan => (
                 <div key={loan.id} className="flex items-center justify-between text-sm py-1 border-b border-slate-100 last:border-0">
                   <span className="text-slate-700">#{loan.id} – {loan.borrower.firstname} {loan.borrower.lastname}</span>
                   <Badge variant="destructive">{loan.due_at ? new Date(loan.due_at).toLocaleDateString('de-DE', { day: '2-digit', month: '2-digit', year: 'numeric' }) : '–'}</Badge>
@@ -114,8 +114,8 @@ export default function ToolItemDetailPage() {
         {/* Linke Spalte: Bild + QR in einer Karte */}
         <div className="bg-white rounded-xl border border-slate-200 shadow-sm p-4 flex flex-col gap-4">
           <div className="rounded-lg overflow-hidden aspect-square flex items-center justify-center bg-slate-50">
-            {item.tool.image_filename ? (
-              <img src={`${import.meta.env.VITE_API_URL ?? 'http://localhost:8000'}/static/tool_images/${item.tool.image_filename}`} alt={item.tool.tool_name} className="w-full h-full object-cover" />
+            {item.tool.image_medium_url ? (
+              <img src={`${import.meta.env.VITE_API_URL ?? 'http://localhost:8000'}${item.tool.image_medium_url}`} alt={item.tool.tool_name} className="w-full h-full object-cover" />
             ) : (
               <div className="flex flex-col items-center gap-2 text-slate-300">
                 <Package size={52} />
@@ -130,8 +130,8 @@ export default function ToolsPage() {
             >
               <div className="flex items-start justify-between mb-3">
                 <div className="w-10 h-10 rounded-lg bg-blue-50 flex items-center justify-center overflow-hidden">
-                  {t.image_filename
-                    ? <img src={`${API_URL}/static/tool_images/${t.image_filename}`} alt={t.tool_name} className="w-full h-full object-cover" />
+                  {t.image_thumb_url
+                    ? <img src={`${API_URL}${t.image_thumb_url}`} alt={t.tool_name} className="w-full h-full object-cover" />
                     : <Wrench size={18} className="text-blue-600" />}
                 </div>
                 {isAdmin && (
@@ -162,9 +162,9 @@ export default function ToolsPage() {
           </DialogHeader>
           <div className="space-y-4">
             <div className="rounded-lg overflow-hidden aspect-square flex items-center justify-center bg-slate-50">
-              {detailTool?.image_filename ? (
+              {detailTool?.image_medium_url ? (
                 <img
-                  src={`${API_URL}/static/tool_images/${detailTool.image_filename}`}
+                  src={`${API_URL}${detailTool.image_medium_url}`}
                   alt={detailTool.tool_name}
                   className="w-full h-full object-cover"
                 />
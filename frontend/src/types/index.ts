@@ -64,6 +64,9 @@ export interface Tool {
   category_id: number
   category: ToolCategory
   image_filename: string | null
+  image_url: string | null
+  image_thumb_url: string | null
+  image_medium_url: string | null
 }
 
 export interface ToolItem {
@@ -154,7 +157,7 @@ export interface Loan {
   return_processor: UserSlim | null  // null = noch nicht zurückgegeben
   comment: string | null
   items: LoanItem[]
-  is_overdue: boolean  // berechnet vom Backend: returned_at === null UND due_at < jetzt
+  is_overdue: boolean  // vom Backend: gespeichertes Flag ODER (returned_at === null UND due_at < jetzt beim Abruf)
 }
 
 export interface ToolItemHistoryEntry {
@@ -167,6 +170,23 @@ export interface ToolItemHistoryEntry {
   return_comment: string | null
 }
 
+// ── Dashboard ──────────────────────────────────────────────────────────────────
+
+// DashboardStats: Vom Backend aggregierte Kennzahlen (GROUP BY statt kompletter Listen).
+// Schlüssel der Maps sind die Statusnamen bzw. Kategorienamen.
+export interface DashboardStats {
+  tool_count: number
+  tools_by_category: Record<string, number>
+  tool_item_count: number
+  tool_items_by_status: Record<string, number>
+  active_loans: number
+  overdue_loans: number
+  loan_requests_by_status: Record<string, number>
+  issues_by_status: Record<string, number>  // nur für ADMIN befüllt
+  user_count: number                         // nur für ADMIN befüllt
+  top_overdue_loans: { id: number; due_at: string; borrower: UserSlim }[]
+}
+
 // ── Auth ───────────────────────────────────────────────────────────────────────
 
 // AuthUser: Minimale Benutzerinfos, die aus dem JWT-Token gelesen werden.